@@ -0,0 +1,2 @@
+"""Station records benchmarks (a category): `acquisition_listing` (full manifest listing vs cursor-paginated
+summaries). Run e.g. `uv run -m bench.records.acquisition_listing`."""
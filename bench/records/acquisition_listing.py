@@ -0,0 +1,159 @@
+"""Measure acquisition listing cost: full manifests vs cursor-paginated summaries from indexed columns.
+
+Seeds a temporary SQLite catalog with ``--rows`` synthetic acquisitions, each carrying a state snapshot of
+``--snapshot-kb`` KiB, through the legacy file-catalog import (one transaction). Then times, ``--repeats``
+times each, what a listing client pays per mode: ``manifests`` loads and validates every manifest;
+``first_page`` reads one ``--limit`` page of summaries; ``all_pages`` walks every page by cursor. Bytes are
+the JSON response bodies the station API would send.
+
+    uv run -m bench.records.acquisition_listing [--rows 10000] [--limit 100] [--snapshot-kb 8] [--repeats 5]
+
+Records one row per (rows, mode) to results/acquisition_listing/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import tempfile
+import time
+from pathlib import Path, PurePosixPath
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, JsonValue, TypeAdapter
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from vxl_records import (
+    AcquisitionManifest,
+    AcquisitionOrigin,
+    AcquisitionStatus,
+    AcquisitionVolume,
+    SQLiteRecords,
+    StorageSpec,
+)
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+
+console = Console()
+
+BENCH = "acquisition_listing"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("vxl-records", "pydantic")  # versions recorded per run
+
+_MANIFESTS = TypeAdapter(list[AcquisitionManifest])
+_EPOCH = dt.datetime(2025, 1, 1, tzinfo=dt.UTC)
+
+type Mode = Literal["manifests", "first_page", "all_pages"]
+
+
+class AcquisitionListingRun(BaseModel):
+    mode: Mode
+    rows: int
+    limit: int  # summary page size (unused by ``manifests``)
+    snapshot_kb: int
+    repeats: int
+
+
+class AcquisitionListingResult(BaseModel):
+    items: int  # acquisitions returned per listing
+    response_bytes: int  # JSON bytes per listing
+    wall_s: list[float]  # one sample per repeat
+
+
+def _manifest(index: int, snapshot: dict[str, JsonValue]) -> AcquisitionManifest:
+    acquisition_id = UUID(int=index + 1)
+    return AcquisitionManifest(
+        id=acquisition_id,
+        instrument=f"exaspim-{index % 3}",
+        origin=AcquisitionOrigin(host="controller-1", operator="bench"),
+        status=AcquisitionStatus.COMPLETED,
+        created_at=_EPOCH + dt.timedelta(seconds=index // 2),  # pairs share a timestamp
+        storage=StorageSpec(path=PurePosixPath(f"runs/{acquisition_id}")),
+        state_snapshot=snapshot,
+        hardware_snapshot={},
+        volumes=[AcquisitionVolume(task=f"tile-{t}", profile=p) for t in range(4) for p in ("488", "561")],
+    )
+
+
+def _seed(root: Path, *, rows: int, snapshot_kb: int) -> SQLiteRecords:
+    legacy = root / "legacy"
+    snapshot: dict[str, JsonValue] = {f"device_{k}": "x" * 1024 for k in range(snapshot_kb)}
+    for index in range(rows):
+        manifest = _manifest(index, snapshot)
+        directory = legacy / str(manifest.id)
+        directory.mkdir(parents=True)
+        (directory / "manifest.json").write_text(manifest.model_dump_json(), encoding="utf-8")
+    records = SQLiteRecords(root / "records.sqlite3", resolve_root=lambda spec: root / "data" / spec.path.as_posix())
+    asyncio.run(records.acquisitions.import_legacy_file_catalog(legacy))
+    return records
+
+
+async def _list(records: SQLiteRecords, mode: Mode, limit: int) -> tuple[int, int]:
+    if mode == "manifests":
+        manifests = await records.acquisitions.list_manifests()
+        return len(manifests), len(_MANIFESTS.dump_json(manifests))
+    page = await records.acquisitions.list_summaries(limit=limit)
+    items, size = len(page.items), len(page.model_dump_json())
+    while mode == "all_pages" and page.next_cursor is not None:
+        page = await records.acquisitions.list_summaries(cursor=page.next_cursor, limit=limit)
+        items, size = items + len(page.items), size + len(page.model_dump_json())
+    return items, size
+
+
+def _measure(records: SQLiteRecords, mode: Mode, *, limit: int, repeats: int) -> tuple[int, int, list[float]]:
+    samples: list[float] = []
+    items = size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items, size = asyncio.run(_list(records, mode, limit))
+        samples.append(round(time.perf_counter() - start, 6))
+    return items, size, samples
+
+
+def run(*, rows: int, limit: int, snapshot_kb: int, repeats: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]acquisition_listing bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("rows", "mode", "items", "KiB/listing", "ms best", "ms median"):
+        table.add_column(col, justify="right")
+
+    with tempfile.TemporaryDirectory(prefix="bench-records-") as tmp:
+        seed_start = time.perf_counter()
+        records = _seed(Path(tmp), rows=rows, snapshot_kb=snapshot_kb)
+        console.print(f"[dim]seeded {rows} acquisitions in {time.perf_counter() - seed_start:.1f}s[/]")
+        modes: tuple[Mode, ...] = ("manifests", "first_page", "all_pages")
+        for mode in modes:
+            items, size, samples = _measure(records, mode, limit=limit, repeats=repeats)
+            results.append(
+                AcquisitionListingRun(mode=mode, rows=rows, limit=limit, snapshot_kb=snapshot_kb, repeats=repeats),
+                AcquisitionListingResult(items=items, response_bytes=size, wall_s=samples),
+            )
+            ordered = sorted(samples)
+            table.add_row(
+                str(rows),
+                mode,
+                str(items),
+                f"{size / 1024:.0f}",
+                f"{ordered[0] * 1e3:.1f}",
+                f"{ordered[len(ordered) // 2] * 1e3:.1f}",
+            )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(modes)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="acquisition listing: full manifests vs paginated summaries")
+    p.add_argument("--rows", type=int, default=10_000, help="acquisitions seeded into the catalog")
+    p.add_argument("--limit", type=int, default=100, help="summary page size")
+    p.add_argument("--snapshot-kb", type=int, default=8, help="state snapshot size per manifest, KiB")
+    p.add_argument("--repeats", type=int, default=5, help="timed listings per mode")
+    a = p.parse_args()
+    return {"rows": a.rows, "limit": a.limit, "snapshot_kb": a.snapshot_kb, "repeats": a.repeats}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
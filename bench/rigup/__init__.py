@@ -0,0 +1,2 @@
+"""rigup RPC benchmarks (a category): `profile_apply` (N-device property fan-out, one call per device vs same-tick
+BATCH envelopes). Run e.g. `uv run -m bench.rigup.profile_apply`."""
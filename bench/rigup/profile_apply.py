@@ -0,0 +1,255 @@
+"""Measure applying a profile across N devices on one node: one RPC per device vs same-tick BATCH envelopes.
+
+Hosts a :class:`~rigup.node.NodeDaemon` on its own thread and event loop over localhost TCP, builds ``N``
+in-memory axes on it, and then times ``--applies`` profile applications from the orchestrator side. One
+application writes ``--props`` properties to every device with ``asyncio.gather``, the way ``Instrument``
+applies a profile. ``per_call`` sends each device's write as its own request (a batcher that never
+coalesces); ``batched`` lets :class:`~rigup.protocol.CallBatcher` fold the whole fan-out into one ``BATCH``.
+
+    uv run -m bench.rigup.profile_apply [--devices 4,16,64] [--props 4] [--applies 200] [--warmup 20]
+
+Records one row per (devices, mode) to results/profile_apply/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from typing import Literal, Self
+
+import zmq.asyncio
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.node import NodeDaemon
+from rigup.protocol import Action, BuildDevicesRequest, BuildDevicesResponse, CallBatcher, SetPropsRequest, call
+from rigup.transport import TCPAddress, ZMQTransportClient, ZMQTransportServer
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from rigup import Device, DeviceConfig, PropResults, describe
+
+console = Console()
+
+BENCH = "profile_apply"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "pyzmq", "pydantic")  # versions recorded per run
+AXIS_TARGET = "bench.rigup.profile_apply.BenchAxis"
+PROP_NAMES = ("speed", "acceleration", "backlash", "settle_ms")
+
+type Mode = Literal["per_call", "batched"]
+
+
+class BenchAxis(Device):
+    """An axis whose properties are plain attributes, so the timing is the RPC path alone."""
+
+    __DEVICE_TYPE__ = "bench_axis"
+
+    def __init__(self, uid: str) -> None:
+        super().__init__(uid)
+        self._values: dict[str, float] = dict.fromkeys(PROP_NAMES, 0.0)
+
+    def _get(self, name: str) -> float:
+        return self._values[name]
+
+    def _set(self, name: str, value: float) -> None:
+        self._values[name] = value
+
+    @property
+    @describe(label="Speed", units="mm/s")
+    def speed(self) -> float:
+        return self._get("speed")
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        self._set("speed", value)
+
+    @property
+    @describe(label="Acceleration", units="mm/s^2")
+    def acceleration(self) -> float:
+        return self._get("acceleration")
+
+    @acceleration.setter
+    def acceleration(self, value: float) -> None:
+        self._set("acceleration", value)
+
+    @property
+    @describe(label="Backlash", units="um")
+    def backlash(self) -> float:
+        return self._get("backlash")
+
+    @backlash.setter
+    def backlash(self, value: float) -> None:
+        self._set("backlash", value)
+
+    @property
+    @describe(label="Settle", units="ms")
+    def settle_ms(self) -> float:
+        return self._get("settle_ms")
+
+    @settle_ms.setter
+    def settle_ms(self, value: float) -> None:
+        self._set("settle_ms", value)
+
+
+class ProfileApplyRun(BaseModel):
+    mode: Mode
+    devices: int
+    props: int  # properties written per device per application
+    applies: int
+    warmup: int
+
+
+class ProfileApplyResult(BaseModel):
+    requests: int  # reliable-channel requests per application
+    apply_us: list[float]  # one sample per timed application
+
+
+def _free_address() -> TCPAddress:
+    ports = []
+    for _ in range(2):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            ports.append(sock.getsockname()[1])
+    return TCPAddress(host="127.0.0.1", rpc_port=ports[0], pub_port=ports[1])
+
+
+class _NodeThread:
+    """A NodeDaemon on its own thread and loop, so node-side work doesn't share the caller's loop."""
+
+    def __init__(self, address: TCPAddress) -> None:
+        self._address = address
+        self._ready = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._daemon: NodeDaemon | None = None
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), name="profile-apply-node")
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._daemon = NodeDaemon(node_id="bench", transport=ZMQTransportServer(zmq.asyncio.Context()))
+        await self._daemon.start(self._address)
+        self._ready.set()
+        await self._daemon.serve_until_shutdown()
+        await self._daemon.stop()
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise TimeoutError("node daemon did not start")
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        if self._loop is not None and self._daemon is not None:
+            self._loop.call_soon_threadsafe(self._daemon.request_shutdown)
+        self._thread.join(timeout=10)
+
+
+class _CountingClient(ZMQTransportClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = 0
+
+    async def request(self, action: str, payload: bytes, *, timeout_s: float | None = None) -> bytes:
+        self.requests += 1
+        return await super().request(action, payload, timeout_s=timeout_s)
+
+
+async def _measure(
+    client: _CountingClient, uids: list[str], mode: Mode, props: int, applies: int, warmup: int
+) -> tuple[int, list[float]]:
+    batcher = CallBatcher(client, max_entries=1 if mode == "per_call" else 1024)
+    names = PROP_NAMES[:props]
+
+    async def apply(i: int) -> None:
+        values: dict[str, object] = {name: float(i % 97) for name in names}
+        await asyncio.gather(
+            *(
+                batcher.call(Action.SET_PROPS, SetPropsRequest(uid=uid, props=values), PropResults, device=uid)
+                for uid in uids
+            )
+        )
+
+    for i in range(warmup):
+        await apply(i)
+    client.requests = 0
+    samples: list[float] = []
+    for i in range(applies):
+        start = time.perf_counter()
+        await apply(i)
+        samples.append(round((time.perf_counter() - start) * 1e6, 1))
+    return client.requests // applies, samples
+
+
+async def _run_devices(address: TCPAddress, n_devices: int, props: int, applies: int, warmup: int) -> dict:
+    client = _CountingClient()
+    await client.connect(address)
+    try:
+        uids = [f"axis_{i}" for i in range(n_devices)]
+        built = await call(
+            client,
+            Action.BUILD_DEVICES,
+            BuildDevicesRequest(devices={uid: DeviceConfig(target=AXIS_TARGET) for uid in uids}),
+            BuildDevicesResponse,
+            timeout_s=60.0,
+        )
+        if built.errors:
+            raise RuntimeError(f"build failed: {dict(built.errors)}")
+        modes: tuple[Mode, ...] = ("per_call", "batched")
+        return {mode: await _measure(client, uids, mode, props, applies, warmup) for mode in modes}
+    finally:
+        await client.close()
+
+
+def run(*, devices: tuple[int, ...], props: int, applies: int, warmup: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]profile_apply bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("devices", "mode", "requests", "p50 us", "p99 us", "speedup"):
+        table.add_column(col, justify="right")
+
+    address = _free_address()
+    with _NodeThread(address):
+        for n_devices in devices:
+            measured = asyncio.run(_run_devices(address, n_devices, props, applies, warmup))
+            baseline = statistics.median(measured["per_call"][1])
+            for mode, (requests, samples) in measured.items():
+                results.append(
+                    ProfileApplyRun(mode=mode, devices=n_devices, props=props, applies=applies, warmup=warmup),
+                    ProfileApplyResult(requests=requests, apply_us=samples),
+                )
+                ordered = sorted(samples)
+                p50 = statistics.median(ordered)
+                table.add_row(
+                    str(n_devices),
+                    mode,
+                    str(requests),
+                    f"{p50:.0f}",
+                    f"{ordered[int(len(ordered) * 0.99)]:.0f}",
+                    f"{baseline / p50:.2f}x",
+                )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(devices) * 2} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="N-device profile apply: one RPC per device vs BATCH envelopes")
+    p.add_argument("--devices", default="4,16,64", help="comma list of device counts on the node")
+    p.add_argument("--props", type=int, default=4, choices=range(1, len(PROP_NAMES) + 1), help="props per device")
+    p.add_argument("--applies", type=int, default=200, help="timed profile applications per (devices, mode)")
+    p.add_argument("--warmup", type=int, default=20, help="untimed applications before each measurement")
+    a = p.parse_args()
+    return {
+        "devices": tuple(int(n) for n in a.devices.split(",")),
+        "props": a.props,
+        "applies": a.applies,
+        "warmup": a.warmup,
+    }
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
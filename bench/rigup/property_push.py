@@ -0,0 +1,197 @@
+"""Measure property update latency and idle CPU: controller stream polling vs driver ``report_property`` pushes.
+
+A simulated sensor changes its reading on a driver thread; the latency sample is the time from the change
+to the controller's ``props.update`` publish. ``poll`` modes declare the reading ``stream=True`` and rely on
+the controller's poll loop at ``--intervals``; ``push`` declares it ``push=True`` and the driver calls
+``report_property``. Changes are spaced by a random delay so they land uniformly across the poll period. Idle
+CPU is the process time spent while ``--idle-devices`` controllers stream a reading that never changes.
+
+    uv run -m bench.rigup.property_push [--intervals 0.5,0.1] [--samples 40] [--idle-devices 64] [--idle-s 5]
+
+Records one row per mode to results/property_push/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from typing import Literal
+
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.device import DeviceController, PropResults
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from rigup import Device, describe
+
+console = Console()
+
+BENCH = "property_push"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "pydantic")  # versions recorded per run
+
+type Mode = Literal["poll", "push"]
+
+
+class PolledSensor(Device):
+    """A sensor whose reading the controller polls."""
+
+    __DEVICE_TYPE__ = "bench_sensor"
+
+    def __init__(self, uid: str) -> None:
+        super().__init__(uid)
+        self._reading = 0.0
+
+    @property
+    @describe(label="Reading", stream=True)
+    def reading(self) -> float:
+        return self._reading
+
+    def change(self, value: float) -> None:
+        self._reading = value
+
+
+class PushedSensor(PolledSensor):
+    """The same sensor, reporting each change itself."""
+
+    @property
+    @describe(label="Reading", push=True)
+    def reading(self) -> float:
+        return self._reading
+
+    def change(self, value: float) -> None:
+        self._reading = value
+        self.report_property("reading", value)
+
+
+class PropertyPushRun(BaseModel):
+    mode: Mode
+    stream_interval: float | None  # poll period; None for push
+    samples: int
+    idle_devices: int
+    idle_s: float
+
+
+class PropertyPushResult(BaseModel):
+    latency_us: list[float]  # change on the driver thread -> props.update publish
+    idle_cpu_s: float  # process time while idle_devices streamed an unchanging reading
+    idle_wall_s: float
+
+
+def _controller(mode: Mode, uid: str, interval: float) -> DeviceController:
+    device = PushedSensor(uid) if mode == "push" else PolledSensor(uid)
+    return DeviceController(device, stream_interval=interval)
+
+
+async def _latency(mode: Mode, interval: float, samples: int) -> list[float]:
+    controller = _controller(mode, "sensor", interval)
+    device = controller.device
+    assert isinstance(device, PolledSensor)
+    loop = asyncio.get_running_loop()
+    arrived: dict[float, asyncio.Future[float]] = {}
+
+    async def publish(_topic: str, body: BaseModel) -> None:
+        assert isinstance(body, PropResults)
+        now = time.perf_counter()
+        if (reading := body.ok.get("reading")) is not None and (fut := arrived.get(reading.value)) is not None:
+            fut.set_result(now)
+
+    controller.set_typed_publisher(publish)
+    controller.start_streaming()
+    latencies: list[float] = []
+    try:
+        for i in range(1, samples + 1):
+            await asyncio.sleep(random.uniform(0, interval))
+            value = float(i)
+            arrived[value] = loop.create_future()
+            started: list[float] = []
+
+            def change(value: float = value, started: list[float] = started) -> None:
+                started.append(time.perf_counter())
+                device.change(value)
+
+            thread = threading.Thread(target=change)
+            thread.start()
+            done = await asyncio.wait_for(arrived[value], timeout=interval * 4 + 1.0)
+            thread.join()
+            latencies.append(round((done - started[0]) * 1e6, 1))
+    finally:
+        await controller.close()
+    return latencies
+
+
+async def _idle_cpu(mode: Mode, interval: float, devices: int, idle_s: float) -> tuple[float, float]:
+    async def publish(_topic: str, _body: BaseModel) -> None:
+        return
+
+    controllers = [_controller(mode, f"sensor_{i}", interval) for i in range(devices)]
+    for controller in controllers:
+        controller.set_typed_publisher(publish)
+        controller.start_streaming()
+    try:
+        await asyncio.sleep(min(idle_s, 1.0))  # baselines published, pools warmed
+        cpu, wall = time.process_time(), time.perf_counter()
+        await asyncio.sleep(idle_s)
+        return time.process_time() - cpu, time.perf_counter() - wall
+    finally:
+        for controller in controllers:
+            await controller.close()
+
+
+def run(*, intervals: tuple[float, ...], samples: int, idle_devices: int, idle_s: float) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]property_push bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("mode", "interval s", "p50 ms", "p99 ms", "max ms", "idle cpu %"):
+        table.add_column(col, justify="right")
+
+    # push ignores the poll period; its controller runs no poll loop at all
+    cases: list[tuple[Mode, float | None]] = [("poll", interval) for interval in intervals]
+    cases.append(("push", None))
+    for mode, interval in cases:
+        period = interval if interval is not None else max(intervals)
+        latencies = asyncio.run(_latency(mode, period, samples))
+        idle_cpu_s, idle_wall_s = asyncio.run(_idle_cpu(mode, period, idle_devices, idle_s))
+        results.append(
+            PropertyPushRun(
+                mode=mode, stream_interval=interval, samples=samples, idle_devices=idle_devices, idle_s=idle_s
+            ),
+            PropertyPushResult(latency_us=latencies, idle_cpu_s=idle_cpu_s, idle_wall_s=idle_wall_s),
+        )
+        ordered = sorted(latencies)
+        table.add_row(
+            mode,
+            "-" if interval is None else f"{interval:g}",
+            f"{statistics.median(ordered) / 1e3:.2f}",
+            f"{ordered[int(len(ordered) * 0.99)] / 1e3:.2f}",
+            f"{ordered[-1] / 1e3:.2f}",
+            f"{idle_cpu_s / idle_wall_s * 100:.2f}",
+        )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(cases)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="Property update latency and idle CPU: stream polling vs driver pushes")
+    p.add_argument("--intervals", default="0.5,0.1", help="comma list of poll periods (s) to compare against push")
+    p.add_argument("--samples", type=int, default=40, help="timed property changes per mode")
+    p.add_argument("--idle-devices", type=int, default=64, help="controllers streaming an unchanging reading")
+    p.add_argument("--idle-s", type=float, default=5.0, help="seconds of idle streaming measured per mode")
+    a = p.parse_args()
+    return {
+        "intervals": tuple(float(s) for s in a.intervals.split(",")),
+        "samples": a.samples,
+        "idle_devices": a.idle_devices,
+        "idle_s": a.idle_s,
+    }
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
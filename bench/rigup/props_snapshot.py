@@ -0,0 +1,157 @@
+"""Measure reading a device's property cache: a deep copy per read vs copy-on-write versioned snapshots.
+
+Builds one in-memory device with ``--props`` streamed properties behind a local handle, then alternates
+``--updates`` rounds of ``props.set`` (``--changed`` properties each) with ``--reads`` cache reads, the
+ratio a 10 kHz reader sees against a ~``10000 / reads`` Hz update rate. ``deepcopy`` reproduces the
+previous cache read (``model_copy(deep=True)`` of every model); ``snapshot`` reads ``props.cache`` as it
+is now, and also times ``snapshot.changed_since`` for a reader catching up one round.
+
+    uv run -m bench.rigup.props_snapshot [--props 200] [--changed 4] [--reads 1000] [--updates 20]
+
+Records one row per mode to results/props_snapshot/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Literal
+
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.device import DeviceController, DeviceHandle, DeviceProperties, DeviceProps
+from rigup.node import LocalAdapter
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from rigup import Device, describe
+
+console = Console()
+
+BENCH = "props_snapshot"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "pydantic")  # versions recorded per run
+READ_HZ = 10_000
+
+type Mode = Literal["deepcopy", "snapshot"]
+
+
+def _wide_device(n_props: int) -> type[Device]:
+    """A device class with ``n_props`` read-write float properties ``p0 .. p{n-1}``."""
+
+    def prop(name: str) -> property:
+        def fget(self: Any) -> float:
+            return self.values[name]
+
+        def fset(self: Any, value: float) -> None:
+            self.values[name] = value
+
+        fget.__name__ = name
+        fget.__annotations__["return"] = float
+        return property(describe(label=name, stream=True)(fget), fset)
+
+    def init(self: Any, uid: str) -> None:
+        Device.__init__(self, uid)
+        self.values = {f"p{i}": 0.0 for i in range(n_props)}
+
+    attrs: dict[str, Any] = {f"p{i}": prop(f"p{i}") for i in range(n_props)}
+    return type("WideDevice", (Device,), {"__DEVICE_TYPE__": "wide", "__init__": init, **attrs})
+
+
+class _DeepCopyProperties(DeviceProperties):
+    """The cache read before snapshots: a deep copy of every cached model on each read."""
+
+    @property
+    def cache(self) -> DeviceProps:
+        return MappingProxyType({name: model.model_copy(deep=True) for name, model in self.snapshot.props.items()})
+
+
+class PropsSnapshotRun(BaseModel):
+    mode: Mode
+    props: int
+    changed: int  # properties changed per update round
+    reads: int  # cache reads per round
+    updates: int
+
+
+class PropsSnapshotResult(BaseModel):
+    read_ns: list[float]  # mean ns per cache read, one sample per round
+    changed_since_ns: list[float] | None  # snapshot mode: one changed_since(previous version) per round
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter_ns() - start) / repeat
+
+
+async def _measure(mode: Mode, n_props: int, changed: int, reads: int, updates: int) -> PropsSnapshotResult:
+    controller = DeviceController(_wide_device(n_props)("wide"))
+    adapter = LocalAdapter(controller)
+    props = _DeepCopyProperties(adapter) if mode == "deepcopy" else DeviceHandle(adapter).props
+    await props.refresh()
+    read_ns: list[float] = []
+    changed_since_ns: list[float] = []
+    try:
+        for round_ in range(updates):
+            seen = props.version
+            await props.set(**{f"p{(round_ * changed + i) % n_props}": float(round_ + 1) for i in range(changed)})
+            read_ns.append(round(_timed(lambda: props.cache, reads), 1))
+            if mode == "snapshot":
+                changed_since_ns.append(round(_timed(partial(props.snapshot.changed_since, seen), 100), 1))
+    finally:
+        props.close()
+        await controller.close()
+    return PropsSnapshotResult(read_ns=read_ns, changed_since_ns=changed_since_ns or None)
+
+
+def run(*, props: int, changed: int, reads: int, updates: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]props_snapshot bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("mode", "props", "read ns p50", f"cpu % @ {READ_HZ // 1000} kHz", "changed_since ns", "speedup"):
+        table.add_column(col, justify="right")
+
+    modes: tuple[Mode, ...] = ("deepcopy", "snapshot")
+    measured: list[tuple[Mode, PropsSnapshotResult]] = [
+        (mode, asyncio.run(_measure(mode, props, changed, reads, updates))) for mode in modes
+    ]
+    baseline = statistics.median(measured[0][1].read_ns)
+    for mode, result in measured:
+        results.append(
+            PropsSnapshotRun(mode=mode, props=props, changed=changed, reads=reads, updates=updates),
+            result,
+        )
+        p50 = statistics.median(result.read_ns)
+        table.add_row(
+            mode,
+            str(props),
+            f"{p50:,.0f}",
+            f"{p50 * READ_HZ / 1e7:.3f}",
+            "-" if result.changed_since_ns is None else f"{statistics.median(result.changed_since_ns):,.0f}",
+            f"{baseline / p50:,.0f}x",
+        )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(modes)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="Property cache reads: deep copy per read vs copy-on-write snapshots")
+    p.add_argument("--props", type=int, default=200, help="properties on the device")
+    p.add_argument("--changed", type=int, default=4, help="properties changed per update round")
+    p.add_argument("--reads", type=int, default=1000, help="cache reads per update round")
+    p.add_argument("--updates", type=int, default=20, help="update rounds")
+    a = p.parse_args()
+    return {"props": a.props, "changed": a.changed, "reads": a.reads, "updates": a.updates}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
@@ -0,0 +1,157 @@
+"""Measure moving large arrays from a subprocess node to the orchestrator: inline ZMQ frames vs shared memory.
+
+Spawns a :class:`~rigup.node.SubprocessNode` over ipc:// hosting one waveform source, then times
+``--transfers`` arrays of ``--size-mb`` MB each. A sample runs from issuing the ``send`` command to the
+array being rebuilt (``np.frombuffer``) in the orchestrator's stream callback, one transfer at a time.
+``inline`` disables the shared-memory channel (``shm_threshold=None``), so the payload is copied through
+the ZMQ PUB/SUB socket pair; ``shm`` negotiates it at connect time, so the node writes each array into
+its slot ring and only a descriptor crosses ZMQ. CPU is process time on the orchestrator side.
+
+    uv run -m bench.rigup.shm_transfer [--size-mb 100] [--transfers 20] [--warmup 2]
+
+Records one row per mode to results/shm_transfer/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.config import DeviceConfig, NodeConfig
+from rigup.device import DeviceController, DeviceHandle
+from rigup.node import SubprocessNode
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from rigup import Device, describe
+
+console = Console()
+
+BENCH = "shm_transfer"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "pyzmq", "numpy")  # versions recorded per run
+SOURCE_TARGET = "bench.rigup.shm_transfer.WaveformSource"
+SHM_THRESHOLD = 1 << 20
+
+type Mode = Literal["inline", "shm"]
+
+
+class WaveformController(DeviceController["WaveformSource"]):
+    """Publishes one preallocated float32 array on the ``waveform`` stream per ``send``."""
+
+    @describe(label="Send", desc="Publish the waveform once")
+    async def send(self) -> int:
+        data = self.device.waveform.tobytes()
+        await self.publish("waveform", data)
+        return len(data)
+
+
+class WaveformSource(Device):
+    __DEVICE_TYPE__ = "bench_waveform"
+    __CONTROLLER_TYPE__ = WaveformController
+
+    def __init__(self, uid: str, size_mb: int = 100) -> None:
+        super().__init__(uid)
+        self.waveform = np.random.default_rng(0).random(size_mb * (1 << 20) // 4, dtype=np.float32)
+
+
+class ShmTransferRun(BaseModel):
+    mode: Mode
+    size_mb: int
+    transfers: int
+    warmup: int
+
+
+class ShmTransferResult(BaseModel):
+    transfer_ms: list[float]  # send command -> array rebuilt in the stream callback, one per transfer
+    cpu_s: float  # orchestrator process time over the timed transfers
+    wall_s: float
+
+
+async def _measure(mode: Mode, size_mb: int, transfers: int, warmup: int) -> ShmTransferResult:
+    node = SubprocessNode(
+        f"bench-{mode}", NodeConfig(kind="subprocess"), shm_threshold=SHM_THRESHOLD if mode == "shm" else None
+    )
+    await node.open()
+    try:
+        handles, errors = await node.build_devices(
+            {"source": DeviceConfig(target=SOURCE_TARGET, init={"size_mb": size_mb})}
+        )
+        if errors:
+            raise RuntimeError(f"build failed: {dict(errors)}")
+        source: DeviceHandle = handles["source"]
+        arrived: asyncio.Queue[float] = asyncio.Queue()
+
+        async def on_waveform(data: bytes) -> None:
+            array = np.frombuffer(data, dtype=np.float32)
+            assert array.nbytes == size_mb * (1 << 20)
+            arrived.put_nowait(time.perf_counter())
+
+        unsub = source.subscribe("waveform", on_waveform)
+        await asyncio.sleep(0.5)  # SUB subscription and shm interest reach the node
+        samples: list[float] = []
+        try:
+            for _ in range(warmup):
+                await source.run_command("send")
+                await asyncio.wait_for(arrived.get(), timeout=30.0)
+            cpu, wall = time.process_time(), time.perf_counter()
+            for _ in range(transfers):
+                start = time.perf_counter()
+                await source.run_command("send")
+                done = await asyncio.wait_for(arrived.get(), timeout=30.0)
+                samples.append(round((done - start) * 1e3, 2))
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+        finally:
+            unsub()
+    finally:
+        await node.close()
+    return ShmTransferResult(transfer_ms=samples, cpu_s=cpu, wall_s=wall)
+
+
+def run(*, size_mb: int, transfers: int, warmup: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]shm_transfer bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("mode", "size MB", "p50 ms", "max ms", "MB/s", "cpu %", "speedup"):
+        table.add_column(col, justify="right")
+
+    modes: tuple[Mode, ...] = ("inline", "shm")
+    measured: list[tuple[Mode, ShmTransferResult]] = [
+        (mode, asyncio.run(_measure(mode, size_mb, transfers, warmup))) for mode in modes
+    ]
+    baseline = statistics.median(measured[0][1].transfer_ms)
+    for mode, result in measured:
+        results.append(ShmTransferRun(mode=mode, size_mb=size_mb, transfers=transfers, warmup=warmup), result)
+        p50 = statistics.median(result.transfer_ms)
+        table.add_row(
+            mode,
+            str(size_mb),
+            f"{p50:.1f}",
+            f"{max(result.transfer_ms):.1f}",
+            f"{size_mb / (p50 / 1e3):,.0f}",
+            f"{result.cpu_s / result.wall_s * 100:.0f}",
+            f"{baseline / p50:.2f}x",
+        )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(modes)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="Large arrays from a subprocess node: inline ZMQ vs shared memory")
+    p.add_argument("--size-mb", type=int, default=100, help="array size per transfer (MB)")
+    p.add_argument("--transfers", type=int, default=20, help="timed transfers per mode")
+    p.add_argument("--warmup", type=int, default=2, help="untimed transfers before each measurement")
+    a = p.parse_args()
+    return {"size_mb": a.size_mb, "transfers": a.transfers, "warmup": a.warmup}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
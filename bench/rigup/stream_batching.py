@@ -0,0 +1,197 @@
+"""Measure PUB/SUB property-update streaming at 10k updates/s: one frame per update vs batched, compressed frames.
+
+A child process binds a :class:`~rigup.transport.ZMQTransportServer` on ipc:// and publishes property
+updates (a packed ``PropResults`` stamped with its send time) round-robin over ``--topics`` topics; the
+orchestrator side subscribes to every topic and validates each update against its schema, as a
+``TopicDispatcher`` does. ``paced`` publishes ``--rate`` updates/s for ``--seconds`` and records the
+send -> callback latency of each update; ``burst`` publishes ``--burst`` updates as fast as possible and
+records how long the subscriber takes to take them all in. Latency compares ``CLOCK_MONOTONIC`` readings
+across the two processes, which share a host.
+
+    uv run -m bench.rigup.stream_batching [--rate 10000] [--seconds 3] [--burst 100000] [--topics 64]
+
+Records one row per (mode, load) to results/stream_batching/<host>.jsonl.
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import statistics
+import tempfile
+import time
+from contextlib import suppress
+from multiprocessing.synchronize import Event
+from typing import Literal
+
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.device import PropertyModel, PropResults, Result
+from rigup.transport import IPCAddress, ZMQTransportClient, ZMQTransportServer
+from rigup.wire import pack, unpack
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+
+console = Console()
+
+BENCH = "stream_batching"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "pyzmq", "msgpack", "pydantic")  # versions recorded per run
+TICK_S = 0.001
+
+type Mode = Literal["single", "batched", "zlib"]
+type Load = Literal["paced", "burst"]
+
+
+class StreamUpdate(BaseModel):
+    sent_ns: int
+    seq: int
+    props: PropResults
+
+
+class StreamBatchingRun(BaseModel):
+    mode: Mode
+    load: Load
+    updates: int
+    rate: int | None  # updates/s for paced; None for burst
+    topics: int
+
+
+class StreamBatchingResult(BaseModel):
+    received: int
+    latency_us: list[float] | None  # paced: send -> callback, one per received update
+    elapsed_s: float  # first send -> last callback
+    cpu_s: float  # subscriber process time from the go signal until every update arrived (or the wait timed out)
+    wall_s: float
+
+
+def _server(mode: Mode) -> ZMQTransportServer:
+    if mode == "single":
+        return ZMQTransportServer(batch_bytes=0)
+    if mode == "zlib":
+        return ZMQTransportServer(compress="zlib")
+    return ZMQTransportServer()
+
+
+def _update(seq: int) -> bytes:
+    props = PropResults(results={"position": Result.ok(PropertyModel.from_value(seq * 0.001))})
+    return pack(StreamUpdate(sent_ns=time.perf_counter_ns(), seq=seq, props=props))
+
+
+async def _publish(address: IPCAddress, mode: Mode, load: Load, updates: int, rate: int, topics: int, go: Event):
+    server = _server(mode)
+    await server.bind(address)
+    await asyncio.to_thread(go.wait)
+    names = [f"dev{i}.props.update" for i in range(topics)]
+    start = time.perf_counter()
+    for seq in range(updates):
+        if load == "paced" and seq % max(1, int(rate * TICK_S)) == 0:
+            # sleep off whatever of the schedule is still ahead, one tick's worth of updates at a time
+            if (ahead := start + seq / rate - time.perf_counter()) > 0:
+                await asyncio.sleep(ahead)
+            else:
+                await asyncio.sleep(0)
+        await server.publish(names[seq % topics], _update(seq))
+    await asyncio.sleep(2.0)  # let the sender drain before the socket closes
+    await server.close()
+
+
+def _publisher(address: IPCAddress, mode: Mode, load: Load, updates: int, rate: int, topics: int, go: Event) -> None:
+    asyncio.run(_publish(address, mode, load, updates, rate, topics, go))
+
+
+async def _subscribe(
+    address: IPCAddress, mode: Mode, load: Load, updates: int, rate: int, topics: int
+) -> StreamBatchingResult:
+    go = mp.get_context("spawn").Event()
+    child = mp.get_context("spawn").Process(
+        target=_publisher, args=(address, mode, load, updates, rate, topics, go), daemon=True
+    )
+    child.start()
+    client = ZMQTransportClient()
+    await client.connect(address)
+    latencies: list[float] = []
+    first_sent: list[int] = []
+    last_received = 0
+    done = asyncio.Event()
+
+    async def on_update(data: bytes) -> None:
+        nonlocal last_received
+        update = StreamUpdate.model_validate(unpack(data))
+        now = last_received = time.perf_counter_ns()
+        latencies.append((now - update.sent_ns) / 1e3)
+        if not first_sent or update.sent_ns < first_sent[0]:
+            first_sent[:] = [update.sent_ns]
+        if len(latencies) == updates:
+            done.set()
+
+    for i in range(topics):
+        client.subscribe(f"dev{i}.props.update", on_update)
+    await asyncio.sleep(1.0)  # child bound, subscriptions propagated
+    cpu, wall = time.process_time(), time.perf_counter()
+    go.set()
+    with suppress(TimeoutError):  # PUB/SUB is lossy under overload: record what arrived
+        await asyncio.wait_for(done.wait(), timeout=updates / rate + 30.0)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    await client.close()
+    child.join(timeout=10)
+    return StreamBatchingResult(
+        received=len(latencies),
+        latency_us=[round(v, 1) for v in latencies] if load == "paced" else None,
+        elapsed_s=(last_received - first_sent[0]) / 1e9 if first_sent else 0.0,
+        cpu_s=cpu,
+        wall_s=wall,
+    )
+
+
+def run(*, rate: int, seconds: float, burst: int, topics: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]stream_batching bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("mode", "load", "updates", "received", "updates/s", "p50 us", "p99 us", "cpu %"):
+        table.add_column(col, justify="right")
+
+    modes: tuple[Mode, ...] = ("single", "batched", "zlib")
+    loads: list[tuple[Load, int]] = [("paced", int(rate * seconds)), ("burst", burst)]
+    with tempfile.TemporaryDirectory() as d:
+        for load, updates in loads:
+            for i, mode in enumerate(modes):
+                address = IPCAddress(path=f"{d}/{load}-{i}")
+                result = asyncio.run(_subscribe(address, mode, load, updates, rate, topics))
+                results.append(
+                    StreamBatchingRun(
+                        mode=mode, load=load, updates=updates, rate=rate if load == "paced" else None, topics=topics
+                    ),
+                    result,
+                )
+                ordered = sorted(result.latency_us or [0.0])
+                table.add_row(
+                    mode,
+                    load,
+                    f"{updates:,}",
+                    f"{result.received:,}",
+                    f"{result.received / result.elapsed_s:,.0f}" if result.elapsed_s else "-",
+                    f"{statistics.median(ordered):,.0f}" if result.latency_us else "-",
+                    f"{ordered[int(len(ordered) * 0.99)]:,.0f}" if result.latency_us else "-",
+                    f"{result.cpu_s / result.wall_s * 100:.0f}",
+                )
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(modes) * len(loads)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="Property-update streaming: one frame per update vs batched frames")
+    p.add_argument("--rate", type=int, default=10_000, help="paced load: updates per second")
+    p.add_argument("--seconds", type=float, default=3.0, help="paced load: duration")
+    p.add_argument("--burst", type=int, default=100_000, help="burst load: updates published back to back")
+    p.add_argument("--topics", type=int, default=64, help="topics the updates are spread over")
+    a = p.parse_args()
+    return {"rate": a.rate, "seconds": a.seconds, "burst": a.burst, "topics": a.topics}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
@@ -0,0 +1,145 @@
+"""Measure pub/sub body serialization: ``model_dump`` / ``model_validate`` vs rigup's per-model wire codecs.
+
+Times, per representative property payload, the three steps a stream update pays for: packing the body
+(``model_dump(mode="json")`` + msgpack vs :func:`rigup.wire.pack`), decoding a msgpack body
+(``model_validate(unpack(...))`` vs :func:`rigup.wire.decode`), and decoding a JSON body (``json.loads`` +
+``model_validate`` vs validating the bytes directly). Payloads are built the way drivers build them, with
+``Result.ok`` / ``Result.err`` lacking the type parameter, which makes ``model_dump`` compute serializer
+warnings that the codec skips.
+
+    uv run -m bench.rigup.wire_codec [--repeat 2000] [--rounds 7]
+
+Records one row per (payload, op, mode) to results/wire_codec/<host>.jsonl.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import warnings
+from collections.abc import Callable
+from typing import Literal
+
+import msgpack
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.device import PropertyModel, PropResults, Result
+from rigup.wire import decode, pack, unpack
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+
+console = Console()
+
+BENCH = "wire_codec"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("rigup", "msgpack", "pydantic", "pydantic-core")  # versions recorded per run
+
+type Mode = Literal["pydantic", "codec"]
+type Op = Literal["pack", "decode_msgpack", "decode_json"]
+
+
+def _props(values: dict[str, object]) -> PropResults:
+    return PropResults(results={name: Result.ok(PropertyModel.from_value(v)) for name, v in values.items()})
+
+
+def _payloads() -> dict[str, PropResults]:
+    mixed = _props({"power": 12.5, "enabled": True, "count": 3, "mode": "continuous"})
+    mixed.results["mode"] = Result.ok(PropertyModel(value="continuous", options=["single", "continuous"]))
+    mixed.results["temperature"] = Result.err("sensor not ready")
+    return {
+        "position": _props({"position": 1.25}),
+        "8 floats": _props({f"axis{i}": i * 0.5 for i in range(8)}),
+        "mixed": mixed,
+        "roi": _props({"roi": {"x": 0, "y": 0, "w": 4000, "h": 2048}}),
+        "waveform 1k": _props({"waveform": [i * 1e-3 for i in range(1000)]}),
+        "200 floats": _props({f"p{i}": float(i) for i in range(200)}),
+    }
+
+
+class WireCodecRun(BaseModel):
+    payload: str
+    op: Op
+    mode: Mode
+    bytes: int  # msgpack body size (json for decode_json)
+    repeat: int
+
+
+class WireCodecResult(BaseModel):
+    us: list[float]  # mean µs per call, one sample per round
+
+
+def _steps(body: PropResults) -> dict[tuple[Op, Mode], tuple[Callable[[], object], int]]:
+    packed = pack(body)
+    as_json = pack(body, fmt="json")
+    schema = type(body)
+    return {
+        ("pack", "pydantic"): (lambda: msgpack.packb(body.model_dump(mode="json")), len(packed)),
+        ("pack", "codec"): (lambda: pack(body), len(packed)),
+        ("decode_msgpack", "pydantic"): (lambda: schema.model_validate(unpack(packed)), len(packed)),
+        ("decode_msgpack", "codec"): (lambda: decode(packed, schema), len(packed)),
+        ("decode_json", "pydantic"): (lambda: schema.model_validate(json.loads(as_json)), len(as_json)),
+        ("decode_json", "codec"): (lambda: decode(as_json, schema), len(as_json)),
+    }
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter_ns() - start) / repeat / 1e3
+
+
+def run(*, repeat: int, rounds: int) -> None:
+    # model_dump still builds its warnings for the unparametrized Results; only their display is filtered
+    warnings.filterwarnings("ignore", "Pydantic serializer warnings")
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]wire_codec bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("payload", "op", "bytes", "pydantic us", "codec us", "speedup"):
+        table.add_column(col, justify="right")
+
+    rows = 0
+    for name, body in _payloads().items():
+        steps = _steps(body)
+        ops: tuple[Op, ...] = ("pack", "decode_msgpack", "decode_json")
+        for op in ops:
+            p50: dict[Mode, float] = {}
+            for mode in ("pydantic", "codec"):
+                fn, size = steps[op, mode]
+                n = max(1, repeat // max(1, size // 1000))  # fewer calls for the big payloads
+                fn()  # build the codec / warm up
+                samples = [round(_timed(fn, n), 2) for _ in range(rounds)]
+                results.append(
+                    WireCodecRun(payload=name, op=op, mode=mode, bytes=size, repeat=n), WireCodecResult(us=samples)
+                )
+                p50[mode] = statistics.median(samples)
+                rows += 1
+            table.add_row(
+                name,
+                op,
+                f"{steps[op, 'codec'][1]:,}",
+                f"{p50['pydantic']:,.1f}",
+                f"{p50['codec']:,.1f}",
+                f"{p50['pydantic'] / p50['codec']:.2f}x",
+            )
+
+    console.print(table)
+    console.print(f"[dim]recorded {rows} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(
+        description="Pub/sub body serialization: model_dump/model_validate vs per-model wire codecs"
+    )
+    p.add_argument("--repeat", type=int, default=2000, help="calls per timing sample (scaled down for big payloads)")
+    p.add_argument("--rounds", type=int, default=7, help="timing samples per (payload, op, mode)")
+    a = p.parse_args()
+    return {"repeat": a.repeat, "rounds": a.rounds}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
@@ -0,0 +1,2 @@
+"""Station delivery benchmarks (a category): `feed_patch` (full views vs RFC 6902 patches per state update)
+and `control_roundtrip` (instrument REST calls, JSON vs MessagePack). Run e.g. `uv run -m bench.station.feed_patch`."""
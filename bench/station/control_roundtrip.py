@@ -0,0 +1,175 @@
+"""Measure instrument-control round-trip latency over REST: JSON vs MessagePack bodies.
+
+Serves the real ``instrument`` routes with uvicorn on localhost, backed by an in-memory instrument that
+accepts every call immediately, so the timing is the HTTP, parsing and validation path alone. A
+:class:`~vxl.web.client.InstrumentClient` per format then drives ``--calls`` calls of each kind over its
+one persistent connection: ``profile`` patches (empty 204 response) and device ``properties`` patches of
+``--props`` values (the PropResults envelope comes back).
+
+    uv run -m bench.station.control_roundtrip [--calls 2000] [--props 1,16,64] [--warmup 200]
+
+Records one row per (route, props, fmt) to results/control_roundtrip/<host>.jsonl.
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Literal, cast
+from uuid import UUID, uuid4
+
+import msgpack
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from rigup.wire import WireFormat
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from rigup import PropertyModel, PropResults, Result
+from vxl.instrument.config import ProfilePatch
+from vxl.web.client import InstrumentClient
+from vxl.web.router import _get_instrument, api_router
+
+console = Console()
+
+BENCH = "control_roundtrip"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("vxl", "fastapi", "uvicorn", "msgpack", "pydantic")  # versions recorded per run
+
+type Route = Literal["profile", "properties"]
+
+
+class ControlRoundtripRun(BaseModel):
+    fmt: WireFormat
+    route: Route
+    props: int  # property values per call (0 for profile patches)
+    calls: int
+    warmup: int
+
+
+class ControlRoundtripResult(BaseModel):
+    request_bytes: int  # body bytes of one request
+    response_bytes: int  # body bytes of one response
+    rtt_us: list[float]  # one sample per timed call
+
+
+class _AcceptingInstrument:
+    """Accepts every control call without touching hardware."""
+
+    async def update_profile(self, patch: ProfilePatch) -> None:
+        del patch
+
+    async def set_device_properties(self, device_id: str, properties: dict[str, Any]) -> PropResults:
+        del device_id
+        return PropResults(results={name: Result.ok(PropertyModel(value=value)) for name, value in properties.items()})
+
+
+def _serve() -> tuple[uvicorn.Server, threading.Thread, str]:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    instrument = _AcceptingInstrument()
+
+    async def accepting_instrument() -> AsyncIterator[_AcceptingInstrument]:
+        yield instrument
+
+    app.dependency_overrides[_get_instrument] = accepting_instrument
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="control-roundtrip-server", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def _call(route: Route, props: int) -> Callable[[InstrumentClient, int], Any]:
+    if route == "profile":
+        return lambda client, i: client.patch("/profile", {"label": f"bench-{i}", "z_step": 1.0 + i % 7})
+    names = [f"prop_{p}" for p in range(props)]
+    return lambda client, i: client.patch(
+        "/devices/stage-x/properties", {"properties": dict.fromkeys(names, i * 0.001)}
+    )
+
+
+def _encoded_size(fmt: WireFormat, value: Any) -> int:
+    if value is None:
+        return 0
+    return len(cast("bytes", msgpack.packb(value))) if fmt == "msgpack" else len(json.dumps(value))
+
+
+def _sizes(client: InstrumentClient, route: Route, props: int) -> tuple[int, int]:
+    body = (
+        {"label": "bench-0", "z_step": 1.0}
+        if route == "profile"
+        else {"properties": {f"prop_{p}": 0.0 for p in range(props)}}
+    )
+    response = client.request("PATCH", "/profile" if route == "profile" else "/devices/stage-x/properties", body)
+    return _encoded_size(client.fmt, body), _encoded_size(client.fmt, response)
+
+
+def run(*, calls: int, props: tuple[int, ...], warmup: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]control_roundtrip bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("route", "props", "fmt", "req B", "resp B", "p50 us", "p99 us"):
+        table.add_column(col, justify="right")
+
+    server, thread, url = _serve()
+    cases: list[tuple[Route, int]] = [("profile", 0), *(("properties", n) for n in props)]
+    formats: tuple[WireFormat, ...] = ("json", "msgpack")
+    try:
+        for route, n_props in cases:
+            call = _call(route, n_props)
+            for fmt in formats:
+                with InstrumentClient(url, UUID(int=0), uuid4(), fmt=fmt) as client:
+                    for i in range(warmup):
+                        call(client, i)
+                    samples: list[float] = []
+                    for i in range(calls):
+                        start = time.perf_counter()
+                        call(client, i)
+                        samples.append(round((time.perf_counter() - start) * 1e6, 1))
+                    request_bytes, response_bytes = _sizes(client, route, n_props)
+                results.append(
+                    ControlRoundtripRun(fmt=fmt, route=route, props=n_props, calls=calls, warmup=warmup),
+                    ControlRoundtripResult(request_bytes=request_bytes, response_bytes=response_bytes, rtt_us=samples),
+                )
+                ordered = sorted(samples)
+                table.add_row(
+                    route,
+                    str(n_props),
+                    fmt,
+                    str(request_bytes),
+                    str(response_bytes),
+                    f"{statistics.median(ordered):.0f}",
+                    f"{ordered[int(len(ordered) * 0.99)]:.0f}",
+                )
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    console.print(table)
+    console.print(f"[dim]recorded {len(cases) * len(formats)} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="instrument control round-trip latency: JSON vs MessagePack")
+    p.add_argument("--calls", type=int, default=2000, help="timed calls per (route, props, format)")
+    p.add_argument("--props", default="1,16,64", help="comma list of property counts per properties patch")
+    p.add_argument("--warmup", type=int, default=200, help="untimed calls before each measurement")
+    a = p.parse_args()
+    return {"calls": a.calls, "props": tuple(int(n) for n in a.props.split(",")), "warmup": a.warmup}
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
@@ -0,0 +1,156 @@
+"""Measure bytes and CPU per station-state update for full views vs keyframe + RFC 6902 patch delivery.
+
+Builds a synthetic StationFeedView wire map (``--devices`` devices x ``--props`` properties each), then
+applies ``--updates`` revisions that each change ``--changed`` property values plus the cursor. For every
+revision it times what the state WebSocket does per connection in each mode: ``full`` packs the whole map;
+``patch`` diffs against the previous map (once per revision, shared by all connections) and packs the ops.
+
+    uv run -m bench.station.feed_patch [--devices 8,32,128] [--props 24] [--changed 1,4,16] [--updates 500]
+
+Records one row per (devices, changed, mode) to results/feed_patch/<host>.jsonl.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Literal, cast
+
+import msgpack
+from pydantic import BaseModel
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from bench.config import HOST, RESULTS_DIR
+from bench.harness import Results, new_run_id
+from vxl.station.patch import diff
+
+console = Console()
+
+BENCH = "feed_patch"
+RESULTS_PATH = RESULTS_DIR / BENCH / f"{HOST}.jsonl"
+PACKAGES = ("vxl", "msgpack")  # versions recorded per run
+
+
+class FeedPatchRun(BaseModel):
+    mode: Literal["full", "patch"]
+    devices: int
+    props: int  # properties per device
+    changed: int  # property values changed per revision
+    updates: int
+
+
+class FeedPatchResult(BaseModel):
+    total_bytes: int  # bytes sent over all updates (one connection)
+    cpu_s: float  # process CPU time spent encoding all updates
+    wall_s: float
+
+
+def _view(devices: int, props: int) -> dict[str, Any]:
+    return {
+        "cursor": {"stream_id": "0f0e0d0c-0b0a-0908-0706-050403020100", "seq": 0},
+        "observed_at_unix_us": 0,
+        "station": {"id": "12345678-1234-5678-1234-567812345678", "name": "bench"},
+        "status": "active",
+        "session": {
+            "devices": {
+                f"device_{d}": {
+                    "kind": "stage_axis",
+                    "connected": True,
+                    "props": {
+                        f"prop_{p}": {"value": float(p), "units": "mm", "min": 0.0, "max": 100.0, "access": "rw"}
+                        for p in range(props)
+                    },
+                }
+                for d in range(devices)
+            },
+        },
+    }
+
+
+def _revisions(base: dict[str, Any], *, changed: int, updates: int) -> list[dict[str, Any]]:
+    """Successive wire maps, each sharing unchanged subtrees with its predecessor like real revisions do."""
+    rng = random.Random(0)
+    names = [(d, p) for d, device in base["session"]["devices"].items() for p in device["props"]]
+    views, current = [], base
+    for seq in range(1, updates + 1):
+        devices = dict(current["session"]["devices"])
+        for d, p in rng.sample(names, changed):
+            device = dict(devices[d])
+            device["props"] = {**device["props"], p: {**device["props"][p], "value": rng.random() * 100}}
+            devices[d] = device
+        current = {
+            **current,
+            "cursor": {**current["cursor"], "seq": seq},
+            "observed_at_unix_us": seq * 1000,
+            "session": {**current["session"], "devices": devices},
+        }
+        views.append(current)
+    return views
+
+
+def _encode(mode: str, base: dict[str, Any], views: list[dict[str, Any]]) -> tuple[int, float, float]:
+    total = 0
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    previous = base
+    for view in views:
+        if mode == "full":
+            total += len(cast("bytes", msgpack.packb(view)))
+        else:
+            packet = {
+                "kind": "patch",
+                "stream_id": view["cursor"]["stream_id"],
+                "base_seq": previous["cursor"]["seq"],
+                "seq": view["cursor"]["seq"],
+                "ops": diff(previous, view),
+            }
+            total += len(cast("bytes", msgpack.packb(packet)))
+        previous = view
+    return total, time.process_time() - cpu0, time.perf_counter() - wall0
+
+
+def run(*, devices: tuple[int, ...], props: int, changed: tuple[int, ...], updates: int) -> None:
+    run_id = new_run_id()
+    results = Results(RESULTS_PATH, bench=BENCH, run_id=run_id, packages=PACKAGES)
+    console.rule(f"[bold]feed_patch bench[/]  run_id={run_id}")
+    table = Table(box=box.SIMPLE)
+    for col in ("devices", "changed", "mode", "B/update", "us CPU/update"):
+        table.add_column(col, justify="right")
+
+    rows = 0
+    for n_devices in devices:
+        base = _view(n_devices, props)
+        for n_changed in changed:
+            views = _revisions(base, changed=n_changed, updates=updates)
+            for mode in ("full", "patch"):
+                total, cpu_s, wall_s = _encode(mode, base, views)
+                results.append(
+                    FeedPatchRun(mode=mode, devices=n_devices, props=props, changed=n_changed, updates=updates),
+                    FeedPatchResult(total_bytes=total, cpu_s=round(cpu_s, 6), wall_s=round(wall_s, 6)),
+                )
+                rows += 1
+                table.add_row(
+                    str(n_devices), str(n_changed), mode, f"{total / updates:.0f}", f"{cpu_s / updates * 1e6:.1f}"
+                )
+
+    console.print(table)
+    console.print(f"[dim]recorded {rows} rows -> {RESULTS_PATH}[/]")
+
+
+def _parse_args() -> dict:
+    p = argparse.ArgumentParser(description="bytes and CPU per state update: full views vs patches")
+    p.add_argument("--devices", default="8,32,128", help="comma list of device counts")
+    p.add_argument("--props", type=int, default=24, help="properties per device")
+    p.add_argument("--changed", default="1,4,16", help="comma list of property changes per revision")
+    p.add_argument("--updates", type=int, default=500, help="revisions encoded per combination")
+    a = p.parse_args()
+    return {
+        "devices": tuple(int(d) for d in a.devices.split(",")),
+        "props": a.props,
+        "changed": tuple(int(c) for c in a.changed.split(",")),
+        "updates": a.updates,
+    }
+
+
+if __name__ == "__main__":
+    run(**_parse_args())
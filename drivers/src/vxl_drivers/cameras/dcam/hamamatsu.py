@@ -1,6 +1,7 @@
 """Hamamatsu camera driver using DCAM SDK."""
 
 import time
+from typing import ClassVar
 
 import numpy as np
 from rigup.device.props import enumerated, enumerated_int, numeric
@@ -81,6 +82,8 @@ class HamamatsuCamera(Camera):
     Supports Hamamatsu sCMOS cameras like ORCA-Flash and ORCA-Fusion.
     """
 
+    grab_returns_latest: ClassVar[bool] = True  # grab_frame reads buf_getlastframedata
+
     def __init__(
         self,
         uid: str,
@@ -20,6 +20,8 @@ from .models import (
     AcquisitionManifest,
     AcquisitionOrigin,
     AcquisitionStatus,
+    AcquisitionSummary,
+    AcquisitionSummaryPage,
     AcquisitionVolume,
     Dataset,
     DatasetFormat,
@@ -45,6 +47,8 @@ __all__ = [
     "AcquisitionManifest",
     "AcquisitionOrigin",
     "AcquisitionStatus",
+    "AcquisitionSummary",
+    "AcquisitionSummaryPage",
     "AcquisitionVolume",
     "DatabaseIdentityError",
     "DatabaseVersionError",
@@ -0,0 +1,48 @@
+ALTER TABLE acquisitions ADD COLUMN instrument TEXT NOT NULL DEFAULT '';
+ALTER TABLE acquisitions ADD COLUMN started_at_us INTEGER;
+ALTER TABLE acquisitions ADD COLUMN ended_at_us INTEGER;
+ALTER TABLE acquisitions ADD COLUMN tile_count INTEGER NOT NULL DEFAULT 0 CHECK (tile_count >= 0);
+ALTER TABLE acquisitions ADD COLUMN volume_count INTEGER NOT NULL DEFAULT 0 CHECK (volume_count >= 0);
+ALTER TABLE acquisitions ADD COLUMN completed_volume_count INTEGER NOT NULL DEFAULT 0
+    CHECK (completed_volume_count >= 0);
+ALTER TABLE acquisitions ADD COLUMN dataset_count INTEGER NOT NULL DEFAULT 0 CHECK (dataset_count >= 0);
+ALTER TABLE acquisitions ADD COLUMN manifest_bytes INTEGER NOT NULL DEFAULT 0 CHECK (manifest_bytes >= 0);
+
+-- Existing rows are backfilled from their manifests once; writers keep the columns current afterwards.
+-- Backfilled start and end times are rounded to the millisecond.
+UPDATE acquisitions SET
+    instrument = json_extract(manifest_json, '$.instrument'),
+    started_at_us = CAST(round((julianday(json_extract(manifest_json, '$.started_at')) - 2440587.5) * 86400000.0)
+        AS INTEGER) * 1000,
+    ended_at_us = CAST(round((julianday(json_extract(manifest_json, '$.ended_at')) - 2440587.5) * 86400000.0)
+        AS INTEGER) * 1000,
+    tile_count = (
+        SELECT count(DISTINCT json_extract(volume.value, '$.task'))
+        FROM json_each(manifest_json, '$.volumes') AS volume
+    ),
+    volume_count = json_array_length(manifest_json, '$.volumes'),
+    completed_volume_count = (
+        SELECT count(*)
+        FROM json_each(manifest_json, '$.volumes') AS volume
+        WHERE json_extract(volume.value, '$.status') = 'completed'
+    ),
+    dataset_count = (
+        SELECT count(*)
+        FROM json_each(manifest_json, '$.volumes') AS volume, json_each(volume.value, '$.datasets')
+    ),
+    manifest_bytes = length(CAST(manifest_json AS BLOB));
+
+DROP INDEX acquisitions_active_created;
+DROP INDEX acquisitions_status_created;
+
+CREATE INDEX acquisitions_active_created
+    ON acquisitions(created_at_us DESC, id)
+    WHERE archived_at_us IS NULL;
+
+CREATE INDEX acquisitions_status_created
+    ON acquisitions(status, created_at_us DESC, id)
+    WHERE archived_at_us IS NULL;
+
+CREATE INDEX acquisitions_instrument_created
+    ON acquisitions(instrument, created_at_us DESC, id)
+    WHERE archived_at_us IS NULL;
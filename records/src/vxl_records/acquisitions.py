@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import binascii
 import datetime
 import os
 import sqlite3
@@ -27,6 +29,8 @@ from .models import (
     AcquisitionFailure,
     AcquisitionManifest,
     AcquisitionStatus,
+    AcquisitionSummary,
+    AcquisitionSummaryPage,
     AcquisitionVolume,
     Dataset,
     DatasetLocation,
@@ -138,6 +142,50 @@ def _datetime_to_unix_us(value: datetime.datetime) -> int:
     return int(value.timestamp() * 1_000_000)
 
 
+def _unix_us_to_datetime(value: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(0, tz=datetime.UTC) + datetime.timedelta(microseconds=value)
+
+
+_DEFAULT_SUMMARY_LIMIT = 100
+_MAX_SUMMARY_LIMIT = 1_000
+_SUMMARY_COLUMNS = (
+    "instrument",
+    "started_at_us",
+    "ended_at_us",
+    "tile_count",
+    "volume_count",
+    "completed_volume_count",
+    "dataset_count",
+    "manifest_bytes",
+)
+
+
+def _summary_values(manifest: AcquisitionManifest, manifest_json: str) -> tuple[object, ...]:
+    """Values for :data:`_SUMMARY_COLUMNS`, in order."""
+    return (
+        manifest.instrument,
+        _datetime_to_unix_us(manifest.started_at) if manifest.started_at is not None else None,
+        _datetime_to_unix_us(manifest.ended_at) if manifest.ended_at is not None else None,
+        len({volume.task for volume in manifest.volumes}),
+        len(manifest.volumes),
+        sum(volume.status is VolumeStatus.COMPLETED for volume in manifest.volumes),
+        sum(len(volume.datasets) for volume in manifest.volumes),
+        len(manifest_json.encode()),
+    )
+
+
+def _encode_cursor(created_at_us: int, acquisition_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at_us}:{acquisition_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        created_at_us, acquisition_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        return int(created_at_us), str(UUID(acquisition_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise ValueError(f"invalid acquisition cursor: {cursor!r}") from error
+
+
 class AcquisitionCatalog:
     """Own acquisition lifecycle invariants and durable SQLite records."""
 
@@ -164,6 +212,24 @@ class AcquisitionCatalog:
         """Return unarchived acquisition manifests, newest first."""
         return await asyncio.to_thread(self._list_manifests)
 
+    async def list_summaries(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = _DEFAULT_SUMMARY_LIMIT,
+        status: AcquisitionStatus | None = None,
+        instrument: str | None = None,
+    ) -> AcquisitionSummaryPage:
+        """Return one newest-first page of unarchived acquisition summaries without parsing manifests.
+
+        ``cursor`` is the ``next_cursor`` of the previous page. Pages are keyed on creation time and
+        ID, so acquisitions created while paging never shift or repeat later pages.
+        """
+        if not 1 <= limit <= _MAX_SUMMARY_LIMIT:
+            raise ValueError(f"limit must be between 1 and {_MAX_SUMMARY_LIMIT}")
+        after = _decode_cursor(cursor) if cursor is not None else None
+        return await asyncio.to_thread(self._list_summaries, after, limit, status, instrument)
+
     async def start_acquisition(self, acquisition_id: UUID) -> AcquisitionManifest:
         """Mark a prepared acquisition as running."""
         at = _utc_now()
@@ -394,6 +460,41 @@ class AcquisitionCatalog:
         finally:
             connection.close()
 
+    def _list_summaries(
+        self,
+        after: tuple[int, str] | None,
+        limit: int,
+        status: AcquisitionStatus | None,
+        instrument: str | None,
+    ) -> AcquisitionSummaryPage:
+        clauses = ["archived_at_us IS NULL"]
+        parameters: list[object] = []
+        if status is not None:
+            clauses.append("status = ?")
+            parameters.append(status.value)
+        if instrument is not None:
+            clauses.append("instrument = ?")
+            parameters.append(instrument)
+        if after is not None:
+            clauses.append("(created_at_us < ? OR (created_at_us = ? AND id > ?))")
+            parameters.extend((after[0], after[0], after[1]))
+        connection = self._database.connect()
+        try:
+            rows = connection.execute(
+                f"SELECT id, revision, status, created_at_us, {', '.join(_SUMMARY_COLUMNS)} "  # noqa: S608
+                f"FROM acquisitions WHERE {' AND '.join(clauses)} "
+                "ORDER BY created_at_us DESC, id LIMIT ?",
+                (*parameters, limit + 1),
+            ).fetchall()
+        finally:
+            connection.close()
+        items = [self._summary_from_row(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last["created_at_us"], last["id"])
+        return AcquisitionSummaryPage(items=items, next_cursor=next_cursor)
+
     def _update_record(self, acquisition_id: UUID, transform: ManifestTransform) -> AcquisitionManifest:
         with self._database.transaction() as connection:
             row = self._select_manifest(connection, acquisition_id, include_archived=False)
@@ -405,15 +506,18 @@ class AcquisitionCatalog:
                 return current
 
             updated = AcquisitionManifest.model_validate({**updated.model_dump(), "revision": current.revision + 1})
+            manifest_json = updated.model_dump_json()
             cursor = connection.execute(
-                "UPDATE acquisitions "
-                "SET revision = ?, status = ?, created_at_us = ?, manifest_json = ? "
+                "UPDATE acquisitions "  # noqa: S608
+                "SET revision = ?, status = ?, created_at_us = ?, manifest_json = ?, "
+                f"{', '.join(f'{column} = ?' for column in _SUMMARY_COLUMNS)} "
                 "WHERE id = ? AND revision = ? AND archived_at_us IS NULL",
                 (
                     updated.revision,
                     updated.status.value,
                     _datetime_to_unix_us(updated.created_at),
-                    updated.model_dump_json(),
+                    manifest_json,
+                    *_summary_values(updated, manifest_json),
                     str(updated.id),
                     current.revision,
                 ),
@@ -477,17 +581,19 @@ class AcquisitionCatalog:
         *,
         archived_at_us: int | None,
     ) -> None:
+        manifest_json = manifest.model_dump_json()
         connection.execute(
-            "INSERT INTO acquisitions "
-            "(id, revision, status, created_at_us, archived_at_us, manifest_json) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
+            "INSERT INTO acquisitions "  # noqa: S608
+            f"(id, revision, status, created_at_us, archived_at_us, manifest_json, {', '.join(_SUMMARY_COLUMNS)}) "
+            f"VALUES (?, ?, ?, ?, ?, ?{', ?' * len(_SUMMARY_COLUMNS)})",
             (
                 str(manifest.id),
                 manifest.revision,
                 manifest.status.value,
                 _datetime_to_unix_us(manifest.created_at),
                 archived_at_us,
-                manifest.model_dump_json(),
+                manifest_json,
+                *_summary_values(manifest, manifest_json),
             ),
         )
 
@@ -502,6 +608,23 @@ class AcquisitionCatalog:
     def _manifest_from_row(row: Row) -> AcquisitionManifest:
         return AcquisitionManifest.model_validate_json(row["manifest_json"])
 
+    @staticmethod
+    def _summary_from_row(row: Row) -> AcquisitionSummary:
+        return AcquisitionSummary(
+            id=UUID(row["id"]),
+            revision=row["revision"],
+            instrument=row["instrument"],
+            status=AcquisitionStatus(row["status"]),
+            created_at=_unix_us_to_datetime(row["created_at_us"]),
+            started_at=_unix_us_to_datetime(row["started_at_us"]) if row["started_at_us"] is not None else None,
+            ended_at=_unix_us_to_datetime(row["ended_at_us"]) if row["ended_at_us"] is not None else None,
+            tile_count=row["tile_count"],
+            volume_count=row["volume_count"],
+            completed_volume_count=row["completed_volume_count"],
+            dataset_count=row["dataset_count"],
+            manifest_bytes=row["manifest_bytes"],
+        )
+
     async def _update(self, acquisition_id: UUID, transform: ManifestTransform) -> AcquisitionManifest:
         updated = await asyncio.to_thread(self._update_record, acquisition_id, transform)
         await self._write_manifest(updated)
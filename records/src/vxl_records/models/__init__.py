@@ -5,6 +5,8 @@ from .acquisition import (
     AcquisitionManifest,
     AcquisitionOrigin,
     AcquisitionStatus,
+    AcquisitionSummary,
+    AcquisitionSummaryPage,
     AcquisitionVolume,
     VolumeStatus,
 )
@@ -19,6 +21,8 @@ __all__ = [
     "AcquisitionManifest",
     "AcquisitionOrigin",
     "AcquisitionStatus",
+    "AcquisitionSummary",
+    "AcquisitionSummaryPage",
     "AcquisitionVolume",
     "Dataset",
     "DatasetFormat",
@@ -87,3 +87,27 @@ class AcquisitionManifest(RecordModel):
         if self.ended_at is not None and self.ended_at < (self.started_at or self.created_at):
             raise ValueError("ended_at must not precede the acquisition")
         return self
+
+
+class AcquisitionSummary(RecordModel):
+    """Listing projection of one acquisition, read from indexed columns without parsing its manifest."""
+
+    id: UUID
+    revision: int = Field(ge=1)
+    instrument: str
+    status: AcquisitionStatus
+    created_at: AwareDatetime
+    started_at: AwareDatetime | None = None
+    ended_at: AwareDatetime | None = None
+    tile_count: int = Field(ge=0, description="Distinct tasks planned by the acquisition.")
+    volume_count: int = Field(ge=0)
+    completed_volume_count: int = Field(ge=0)
+    dataset_count: int = Field(ge=0)
+    manifest_bytes: int = Field(ge=0, description="Size of the stored manifest JSON.")
+
+
+class AcquisitionSummaryPage(RecordModel):
+    """One newest-first page of acquisition summaries."""
+
+    items: list[AcquisitionSummary]
+    next_cursor: str | None = Field(default=None, description="Pass back as ``cursor`` for the next page.")
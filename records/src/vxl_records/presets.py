@@ -21,10 +21,17 @@ class PresetCatalog:
 
     def __init__(self, database: SQLiteDatabase) -> None:
         self._database = database
+        self._revision = 0
+
+    @property
+    def revision(self) -> int:
+        """Counter bumped by every preset created or deleted through this catalog."""
+        return self._revision
 
     async def create(self, preset: PresetRecord) -> PresetRecord:
         """Create a preset, rejecting duplicate IDs or names within its instrument."""
         await asyncio.to_thread(self._create, preset)
+        self._revision += 1
         return preset
 
     async def get(self, preset_id: UUID) -> PresetRecord:
@@ -43,6 +50,7 @@ class PresetCatalog:
         deleted = await asyncio.to_thread(self._delete, preset_id)
         if not deleted:
             raise PresetNotFoundError(f"preset not found: {preset_id}")
+        self._revision += 1
 
     def _create(self, preset: PresetRecord) -> None:
         with self._database.transaction() as connection:
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import sqlite3
 from pathlib import Path, PurePosixPath
 from uuid import UUID
 
@@ -14,6 +15,8 @@ from vxl_records import (
     SQLiteRecords,
     StorageSpec,
 )
+from vxl_records._sqlite import SQLiteDatabase
+from vxl_records._sqlite import database as database_module
 
 CREATED_AT = datetime.datetime(2025, 8, 12, 12, tzinfo=datetime.UTC)
 ACQUISITION_ID = UUID("aaaaaaaa-aaaa-4aaa-8aaa-aaaaaaaaaaaa")
@@ -89,6 +92,83 @@ async def test_legacy_import_is_idempotent_and_rolls_back_on_conflict(tmp_path:
     assert existing_path.is_file()
 
 
+async def test_acquisition_summaries_track_transitions_and_page_by_cursor(tmp_path: Path) -> None:
+    records = _records(tmp_path)
+    # Ten acquisitions sharing five creation times, so pages must break ties on ID.
+    manifests = [
+        _manifest(UUID(int=index + 1), instrument="mesospim" if index % 2 else "exaspim-1").model_copy(
+            update={
+                "created_at": CREATED_AT + datetime.timedelta(minutes=index // 2),
+                "volumes": [
+                    AcquisitionVolume(task="task-a", profile="488"),
+                    AcquisitionVolume(task="task-a", profile="561"),
+                    AcquisitionVolume(task="task-b", profile="488"),
+                ],
+            }
+        )
+        for index in range(10)
+    ]
+    for manifest in manifests:
+        await records.acquisitions.create(manifest)
+    running = await records.acquisitions.start_acquisition(manifests[0].id)
+    await records.acquisitions.start_volume(manifests[0].id, task="task-a", profile="488")
+    await records.acquisitions.complete_volume(manifests[0].id, task="task-a", profile="488")
+
+    pages = [await records.acquisitions.list_summaries(limit=4)]
+    while (cursor := pages[-1].next_cursor) is not None:
+        pages.append(await records.acquisitions.list_summaries(cursor=cursor, limit=4))
+    listed = [summary for page in pages for summary in page.items]
+    manifest_order = [manifest.id for manifest in await records.acquisitions.list_manifests()]
+
+    assert [len(page.items) for page in pages] == [4, 4, 2]
+    assert [summary.id for summary in listed] == manifest_order
+    first = next(summary for summary in listed if summary.id == manifests[0].id)
+    assert first.status is AcquisitionStatus.RUNNING
+    assert first.revision == 4
+    assert first.started_at == running.started_at
+    assert (first.tile_count, first.volume_count, first.completed_volume_count) == (2, 3, 1)
+    assert first.manifest_bytes == len((await records.acquisitions.get(first.id)).model_dump_json().encode())
+
+    running_only = await records.acquisitions.list_summaries(status=AcquisitionStatus.RUNNING)
+    mesospim = await records.acquisitions.list_summaries(instrument="mesospim")
+    assert [summary.id for summary in running_only.items] == [manifests[0].id]
+    assert len(mesospim.items) == 5
+    assert mesospim.next_cursor is None
+    with pytest.raises(ValueError, match="invalid acquisition cursor"):
+        await records.acquisitions.list_summaries(cursor="not-a-cursor")
+
+
+async def test_schema_migration_backfills_acquisition_summaries(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    started = _manifest().model_copy(
+        update={
+            "revision": 2,
+            "status": AcquisitionStatus.RUNNING,
+            "started_at": CREATED_AT + datetime.timedelta(seconds=1),
+        }
+    )
+    with monkeypatch.context() as patch:
+        patch.setattr(database_module, "_LATEST_SCHEMA_VERSION", 2)
+        SQLiteDatabase(tmp_path / "records.sqlite3")
+    with sqlite3.connect(tmp_path / "records.sqlite3") as connection:
+        connection.execute(
+            "INSERT INTO acquisitions (id, revision, status, created_at_us, manifest_json) VALUES (?, ?, ?, ?, ?)",
+            (str(started.id), 2, "running", int(CREATED_AT.timestamp() * 1_000_000), started.model_dump_json()),
+        )
+    connection.close()
+
+    [summary] = (await _records(tmp_path).acquisitions.list_summaries()).items
+
+    assert summary.instrument == "exaspim-1"
+    assert summary.status is AcquisitionStatus.RUNNING
+    assert started.started_at is not None
+    assert summary.started_at is not None
+    assert abs(summary.started_at - started.started_at) < datetime.timedelta(milliseconds=1)
+    assert (summary.tile_count, summary.volume_count, summary.dataset_count) == (1, 1, 0)
+    assert summary.manifest_bytes == len(started.model_dump_json().encode())
+
+
 async def test_log_journal_orders_entries_and_bounds_an_acquisition_window(tmp_path: Path) -> None:
     records = _records(tmp_path)
     acquisition = await records.acquisitions.create(_manifest())
@@ -11,6 +11,7 @@ from .device import (
     DeviceProps,
     PropertyModel,
     PropResults,
+    PropsSnapshot,
     Result,
     Results,
     StreamCallback,
@@ -38,6 +39,7 @@ __all__ = [
     "NodeConfig",
     "PropResults",
     "PropertyModel",
+    "PropsSnapshot",
     "Result",
     "Results",
     "Rig",
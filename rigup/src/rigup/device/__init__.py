@@ -1,6 +1,7 @@
 from .driver import Device, DeviceController, PublishBytesFn, PublishTypedFn, StreamCallback
-from .handle import Adapter, DeviceHandle, DeviceProperties, DeviceProperty, DeviceProps
+from .handle import Adapter, DeviceHandle, DeviceProperties, DeviceProperty, DeviceProps, PropsSnapshot
 from .props import PropertyModel, enumerated, enumerated_int, numeric, numeric_int
+from .scheduler import Priority
 from .schema import CommandRequest, DeviceInterface, PropResults, Result, Results, describe
 
 __all__ = [
@@ -13,8 +14,10 @@ __all__ = [
     "DeviceProperties",
     "DeviceProperty",
     "DeviceProps",
+    "Priority",
     "PropResults",
     "PropertyModel",
+    "PropsSnapshot",
     "PublishBytesFn",
     "PublishTypedFn",
     "Result",
@@ -2,8 +2,8 @@
 
 import asyncio
 import logging
-from collections.abc import Awaitable, Callable
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from contextlib import suppress
 from enum import StrEnum
 from typing import Any, ClassVar
@@ -11,6 +11,7 @@ from typing import Any, ClassVar
 from pydantic import BaseModel
 
 from .props import PropertyModel
+from .scheduler import DeviceScheduler, Priority
 from .schema import (
     Command,
     CommandRequest,
@@ -40,16 +41,28 @@ class DeviceController[D: "Device"]:
     Subclass to add device-specific behavior (e.g., CameraController for preview).
     """
 
-    def __init__(self, device: D, stream_interval: float = 0.5):
+    def __init__(
+        self,
+        device: D,
+        stream_interval: float = 0.5,
+        concurrent_workers: int = 2,
+        push_interval: float = 0.01,
+        resource_workers: int = 4,
+    ):
         self._device = device
         self._publish_typed_fn: PublishTypedFn | None = None
         self._publish_bytes_fn: PublishBytesFn | None = None
         self._stream_interval = stream_interval
-        # Per-device single-worker pool: sync calls into a given device are serialized
+        self._push_interval = push_interval
+        # Per-device scheduler: sync calls into a given device are serialized by priority
         # (most hardware SDKs aren't thread-safe and many rely on single-instance state),
-        # while devices remain isolated from each other — one slow or blocked device
-        # doesn't hold up commands or streaming on any other.
-        self._thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"Ctrl-{device.uid}")
+        # except those marked ``concurrent``, which share a small pool, and commands naming the
+        # resources they touch, which only exclude each other per resource and never run alongside a
+        # serialized call. Devices remain isolated from each other — one slow or blocked device
+        # doesn't hold up any other.
+        self._scheduler = DeviceScheduler(
+            device.uid, concurrent_workers=concurrent_workers, resource_workers=resource_workers
+        )
         self.log = logging.getLogger(f"{device.uid}.{self.__class__.__name__}")
 
         # Collect @describe-decorated commands and properties from both device and controller.
@@ -60,6 +73,7 @@ class DeviceController[D: "Device"]:
         self._ctrl_props = collect_properties(self)
         self._commands: dict[str, Command] = {**device_commands, **ctrl_commands}
         all_properties = {**self._device_props, **self._ctrl_props}
+        self._concurrent_props = {name for name, info in all_properties.items() if info.concurrent}
 
         # Build interface
         self._interface = DeviceInterface(
@@ -69,9 +83,21 @@ class DeviceController[D: "Device"]:
             properties=all_properties,
         )
 
-        # Property streaming state
+        # Property streaming state. ``push`` properties are reported by the driver through
+        # ``Device.report_property``; the rest of the ``stream`` properties are polled every
+        # ``stream_interval``.
         self._stream_props: set[str] = {name for name, info in all_properties.items() if info.stream}
+        self._push_props: set[str] = {name for name in self._stream_props if all_properties[name].push}
+        self._poll_props: set[str] = self._stream_props - self._push_props
         self._stream_task: asyncio.Task | None = None
+        self._push_task: asyncio.Task | None = None
+        self._published: dict[str, PropertyModel] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pushed = asyncio.Event()
+        self._pending: dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+        self._wake_pending = False
+        device.set_notifier(self.notify)
 
     @property
     def device(self) -> D:
@@ -98,9 +124,17 @@ class DeviceController[D: "Device"]:
         self._publish_bytes_fn = fn
 
     async def _run_sync[R](self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
-        """Run a sync function in the thread pool."""
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self._thread_pool, lambda: fn(*args, **kwargs))
+        """Run a sync function on the device's serialized lane at control priority."""
+        return await self._scheduler.run_serial(lambda: fn(*args, **kwargs))
+
+    async def _invoke(self, cmd: Command, args: Sequence[Any], kwargs: Mapping[str, Any]) -> Any:
+        if cmd.is_async:
+            return await cmd(*args, **kwargs)
+        if (resources := cmd.resources(*args, **kwargs)) is not None:
+            return await self._scheduler.run_exclusive(lambda: cmd(*args, **kwargs), resources)
+        if cmd.info.concurrent:
+            return await self._scheduler.run_concurrent(lambda: cmd(*args, **kwargs))
+        return await self._run_sync(cmd, *args, **kwargs)
 
     async def execute_command(self, command: str, *args: Any, **kwargs: Any) -> Result:
         if command not in self._commands:
@@ -109,11 +143,7 @@ class DeviceController[D: "Device"]:
         cmd = self._commands[command]
         self.log.debug("", extra={"action": "cmd.execute", "target": command})
         try:
-            if cmd.is_async:
-                result = await cmd(*args, **kwargs)
-            else:
-                result = await self._run_sync(cmd, *args, **kwargs)
-            return Result.ok(result)
+            return Result.ok(await self._invoke(cmd, args, kwargs))
         except Exception as e:
             self.log.exception("", extra={"action": "cmd.fail", "target": command})
             return Result.err(str(e))
@@ -121,46 +151,93 @@ class DeviceController[D: "Device"]:
     async def execute_commands(self, commands: list[CommandRequest]) -> Results:
         """Execute multiple commands and collect results.
 
+        Commands run in request order, except that a command naming the resources it touches
+        (``@describe(resources=...)``) only waits for the earlier commands it conflicts with: those
+        sharing one of its resources, and those using the whole device. Commands on disjoint
+        resources run side by side.
+
         Args:
             commands: List of CommandRequest objects, each specifying a command name,
                       optional positional args, and optional keyword args.
 
         Returns:
-            Results with per-command Result entries keyed as "{index}:{command_name}".
+            Results with per-command Result entries keyed as "{index}:{command_name}", in request order.
         """
-        results: dict[str, Result] = {}
-        for i, cmd_req in enumerate(commands):
-            key = f"{i}:{cmd_req.attr}"
-            if cmd_req.attr not in self._commands:
-                results[key] = Result.err(f"Unknown command: {cmd_req.attr}")
-                continue
-            cmd = self._commands[cmd_req.attr]
-            self.log.debug("", extra={"action": "cmd.execute", "target": cmd_req.attr})
-            try:
-                if cmd.is_async:
-                    result = await cmd(*cmd_req.args, **cmd_req.kwargs)
-                else:
-                    result = await self._run_sync(cmd, *cmd_req.args, **cmd_req.kwargs)
-                results[key] = Result.ok(result)
-            except Exception as e:
-                self.log.exception("", extra={"action": "cmd.fail", "target": cmd_req.attr})
-                results[key] = Result.err(str(e))
-        return Results(results=results)
-
-    async def get_props(self, *props: str) -> PropResults:
+        claims = [self._claim(req) for req in commands]
+        if all(claim is None for claim in claims):
+            results = [await self._execute(req) for req in commands]
+        else:
+            results = await asyncio.gather(*self._schedule(commands, claims))
+        keyed = zip(commands, results, strict=True)
+        return Results(results={f"{i}:{req.attr}": result for i, (req, result) in enumerate(keyed)})
+
+    def _claim(self, req: CommandRequest) -> frozenset[str] | None:
+        """Resources ``req`` touches: None for the whole device; none at all for an unknown command."""
+        cmd = self._commands.get(req.attr)
+        return cmd.resources(*req.args, **req.kwargs) if cmd is not None else frozenset()
+
+    def _schedule(
+        self, commands: list[CommandRequest], claims: list[frozenset[str] | None]
+    ) -> list[asyncio.Task[Result]]:
+        """Start one task per command, each waiting on the earlier commands it conflicts with.
+
+        A whole-device command is a barrier: it waits for everything since the previous barrier, and
+        everything after it waits for it, so each command only needs edges back to the last barrier.
+        """
+        tasks: list[asyncio.Task[Result]] = []
+        barrier: asyncio.Task[Result] | None = None
+        since: list[tuple[asyncio.Task[Result], frozenset[str]]] = []
+        for req, claim in zip(commands, claims, strict=True):
+            after = [task for task, held in since if claim is None or held & claim]
+            if barrier is not None:
+                after.append(barrier)
+            task = asyncio.create_task(self._execute(req, after))
+            tasks.append(task)
+            if claim is None:
+                barrier, since = task, []
+            else:
+                since.append((task, claim))
+        return tasks
+
+    async def _execute(self, req: CommandRequest, after: Sequence[asyncio.Task[Result]] = ()) -> Result:
+        if after:
+            await asyncio.wait(after)
+        cmd = self._commands.get(req.attr)
+        if cmd is None:
+            return Result.err(f"Unknown command: {req.attr}")
+        self.log.debug("", extra={"action": "cmd.execute", "target": req.attr})
+        try:
+            return Result.ok(await self._invoke(cmd, req.args, req.kwargs))
+        except Exception as e:
+            self.log.exception("", extra={"action": "cmd.fail", "target": req.attr})
+            return Result.err(str(e))
+
+    async def get_props(self, *props: str, priority: Priority = Priority.QUERY) -> PropResults:
+        """Read properties. Concurrent-safe getters run on the shared pool, the rest on the serialized
+        lane at ``priority``; results keep the requested order."""
         props_to_get = list(props) if props else list(self._interface.properties.keys())
 
-        def _get() -> PropResults:
+        def _get(names: list[str]) -> dict[str, Result]:
             results: dict[str, Result] = {}
-            for name in props_to_get:
+            for name in names:
                 try:
                     target = self._device if name in self._device_props else self
                     results[name] = Result.ok(PropertyModel.from_value(getattr(target, name)))
                 except Exception as e:
                     results[name] = Result.err(str(e))
-            return PropResults(results=results)
-
-        return await self._run_sync(_get)
+            return results
+
+        concurrent = [name for name in props_to_get if name in self._concurrent_props]
+        serial = [name for name in props_to_get if name not in self._concurrent_props]
+        reads = []
+        if concurrent:
+            reads.append(self._scheduler.run_concurrent(lambda: _get(concurrent)))
+        if serial:
+            reads.append(self._scheduler.run_serial(lambda: _get(serial), priority))
+        merged: dict[str, Result] = {}
+        for part in await asyncio.gather(*reads):
+            merged.update(part)
+        return PropResults(results={name: merged[name] for name in props_to_get})
 
     async def set_props(self, **props: Any) -> PropResults:
         summary = ", ".join(f"{k}={v}" for k, v in props.items())
@@ -190,39 +267,68 @@ class DeviceController[D: "Device"]:
 
     # ==================== Property Streaming ====================
 
+    def notify(self, name: str, value: Any) -> None:
+        """Report a new value of a streamed property. Safe to call from any thread.
+
+        Values reported within ``push_interval`` of the previous publish are coalesced: subscribers
+        see the latest value of each property once the interval has passed.
+        """
+        if name not in self._stream_props:
+            self.log.warning("Ignoring notification for %s: not a stream property", name)
+            return
+        loop = self._loop
+        if loop is None:
+            return  # not streaming; readers fetch the current value themselves
+        with self._pending_lock:
+            self._pending[name] = value
+            if self._wake_pending:
+                return
+            self._wake_pending = True
+        with suppress(RuntimeError):  # the loop closed while a driver thread was still reporting
+            loop.call_soon_threadsafe(self._pushed.set)
+
     def start_streaming(self) -> None:
         """Start streaming properties marked with stream=True."""
-        if self._stream_task is None and self._stream_props:
-            self._stream_task = asyncio.create_task(self._stream_loop())
+        if self._loop is None and self._stream_props:
+            self._loop = asyncio.get_running_loop()
+            self._push_task = asyncio.create_task(self._push_loop())
+            if self._poll_props:
+                self._stream_task = asyncio.create_task(self._stream_loop())
 
     async def stop_streaming(self) -> None:
-        """Cancel the stream task and await its completion.
+        """Cancel the poll and push tasks and await their completion.
 
         Awaiting ensures the cancellation actually propagates and the task exits cleanly
         before we drop its reference; otherwise the GC can log "Task was destroyed but
         it is pending!" and any pending publish calls inside the loop can race teardown.
         """
-        if self._stream_task is not None:
-            self._stream_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._stream_task
-            self._stream_task = None
+        self._loop = None
+        for task in (self._stream_task, self._push_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._stream_task = self._push_task = None
+        self._published.clear()
+        self._pushed.clear()
+        with self._pending_lock:
+            self._pending.clear()
+            self._wake_pending = False
+
+    async def _publish_changes(self, current: Mapping[str, PropertyModel]) -> None:
+        changed = {name: value for name, value in current.items() if self._published.get(name) != value}
+        if not changed:
+            return
+        self._published.update(changed)
+        if self._publish_typed_fn is not None:
+            results = {name: Result.ok(value) for name, value in changed.items()}
+            await self._publish_typed_fn("props.update", PropResults(results=results))
 
     async def _stream_loop(self) -> None:
-        last_state: PropResults | None = None
         while True:
             try:
-                current = await self.get_props(*self._stream_props)
-                changed: dict[str, Result] = {}
-                for name, value in current.ok.items():
-                    last = last_state.ok.get(name) if last_state else None
-                    if last is None or value != last:
-                        changed[name] = current[name]
-
-                if changed and self._publish_typed_fn is not None:
-                    await self._publish_typed_fn("props.update", PropResults(results=changed))
-
-                last_state = current
+                current = await self.get_props(*self._poll_props, priority=Priority.BACKGROUND)
+                await self._publish_changes(current.ok)
                 await asyncio.sleep(self._stream_interval)
             except asyncio.CancelledError:
                 break
@@ -230,9 +336,29 @@ class DeviceController[D: "Device"]:
                 self.log.exception("Stream loop error")
                 await asyncio.sleep(self._stream_interval)
 
+    async def _push_loop(self) -> None:
+        # The baseline is read once; after that push properties only reach subscribers through notify.
+        if self._push_props:
+            try:
+                baseline = await self.get_props(*self._push_props, priority=Priority.BACKGROUND)
+                await self._publish_changes(baseline.ok)
+            except Exception:
+                self.log.exception("Push baseline error")
+        while True:
+            await self._pushed.wait()
+            self._pushed.clear()
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                self._wake_pending = False
+            try:
+                await self._publish_changes({name: PropertyModel.from_value(v) for name, v in pending.items()})
+            except Exception:
+                self.log.exception("Push publish error")
+            await asyncio.sleep(self._push_interval)  # notifications meanwhile are coalesced into the next publish
+
     async def close(self) -> None:
         await self.stop_streaming()
-        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        self._scheduler.shutdown()
         self._device.close()
 
 
@@ -243,6 +369,20 @@ class Device[T: StrEnum]:
     def __init__(self, uid: str):
         self.uid = uid
         self.log = logging.getLogger(self.uid)
+        self._notify_fn: Callable[[str, Any], None] | None = None
+
+    def set_notifier(self, fn: Callable[[str, Any], None]) -> None:
+        """Wire ``report_property`` to the controller (done by ``DeviceController`` on construction)."""
+        self._notify_fn = fn
+
+    def report_property(self, name: str, value: Any) -> None:
+        """Report a new value of a stream property as it happens, e.g. from an SDK callback thread.
+
+        Properties declared ``push=True`` are only published through ``report_property``; ``stream``
+        properties that are still polled may report too, to reach subscribers before the next poll.
+        """
+        if self._notify_fn is not None:
+            self._notify_fn(name, value)
 
     def close(self) -> None:
         pass
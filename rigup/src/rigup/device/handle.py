@@ -3,6 +3,7 @@
 import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
 from types import MappingProxyType
 from typing import Any, Literal, Self, cast, overload
 
@@ -19,6 +20,29 @@ type PropertyParser[T] = Callable[[object], T]
 type PropertyAccess = Literal["ro", "rw", "all"]
 type DeviceProps = Mapping[str, PropertyModel]
 
+_EMPTY: DeviceProps = MappingProxyType({})
+_NEVER_CHANGED: Mapping[str, int] = MappingProxyType({})
+
+
+@dataclass(slots=True, frozen=True)
+class PropsSnapshot:
+    """An immutable view of a :class:`DeviceProperties` cache at one version.
+
+    Every adoption that changes the cache publishes a new snapshot with a higher ``version``; a
+    snapshot itself never changes, so it may be held and read from any thread.
+    """
+
+    version: int
+    props: DeviceProps
+    changed_at: Mapping[str, int]
+    """Version at which each cached property last changed."""
+
+    def changed_since(self, version: int) -> frozenset[str]:
+        """Names of the properties that changed after ``version``."""
+        if version >= self.version:
+            return frozenset()
+        return frozenset(name for name, at in self.changed_at.items() if at > version)
+
 
 class Adapter[D: Device](ABC):
     """Abstract base for device communication. Used by DeviceHandle.
@@ -136,12 +160,15 @@ class DeviceProperties(Subscribable[DeviceProps]):
 
     Operation methods still return their operation-specific :class:`PropResults`,
     including errors. Only successful observations enter :attr:`cache`.
+
+    The cache is copy-on-write: each change swaps in a new :class:`PropsSnapshot`, so reading
+    :attr:`cache` or :attr:`snapshot` is O(1) and takes no lock.
     """
 
     def __init__(self, adapter: Adapter[Any]) -> None:
         super().__init__()
         self._adapter = adapter
-        self._cache: dict[str, PropertyModel] = {}
+        self._snapshot = PropsSnapshot(version=0, props=_EMPTY, changed_at=_NEVER_CHANGED)
         self._properties: dict[str, DeviceProperty[Any]] = {}
         self._lock = asyncio.Lock()
         self._closed = False
@@ -154,7 +181,17 @@ class DeviceProperties(Subscribable[DeviceProps]):
     @property
     def cache(self) -> DeviceProps:
         """Complete latest-successful observations for this handle lifetime."""
-        return self._cache_snapshot()
+        return self._snapshot.props
+
+    @property
+    def snapshot(self) -> PropsSnapshot:
+        """The current cache with its version, for readers that track what changed since they last looked."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Incremented every time the cache changes."""
+        return self._snapshot.version
 
     def close(self) -> None:
         """Release the shared upstream subscription and discard cached observations."""
@@ -162,7 +199,7 @@ class DeviceProperties(Subscribable[DeviceProps]):
         if self._unsub is not None:
             self._unsub()
             self._unsub = None
-        self._cache = {}
+        self._snapshot = PropsSnapshot(version=self._snapshot.version + 1, props=_EMPTY, changed_at=_NEVER_CHANGED)
 
     def property[T](self, name: str, parser: PropertyParser[T]) -> DeviceProperty[T]:
         """Return a typed wrapper for one property, creating it on first use."""
@@ -216,23 +253,26 @@ class DeviceProperties(Subscribable[DeviceProps]):
         if self._closed:
             return
         interface = await self._adapter.cached_interface()
+        snapshot = self._snapshot
         changed: dict[str, tuple[PropertyModel | None, PropertyModel]] = {}
         for name, model in results.ok.items():
-            if name not in interface.properties or self._cache.get(name) == model:
+            if name not in interface.properties or snapshot.props.get(name) == model:
                 continue
-            current = model.model_copy(deep=True)
-            changed[name] = (self._cache.get(name), current)
-            self._cache[name] = current
+            # Models are frozen; the one copy here detaches nested values from the caller's results.
+            changed[name] = (snapshot.props.get(name), model.model_copy(deep=True))
         if not changed:
             return
 
+        version = snapshot.version + 1
+        self._snapshot = PropsSnapshot(
+            version=version,
+            props=MappingProxyType({**snapshot.props, **{name: current for name, (_, current) in changed.items()}}),
+            changed_at=MappingProxyType({**snapshot.changed_at, **dict.fromkeys(changed, version)}),
+        )
         for name, (previous, current) in changed.items():
             if (prop := self._properties.get(name)) is not None:
                 await prop.notify_change(previous, current)
-        await self._notify(self._cache_snapshot())
-
-    def _cache_snapshot(self) -> DeviceProps:
-        return MappingProxyType({name: model.model_copy(deep=True) for name, model in self._cache.items()})
+        await self._notify(self._snapshot.props)
 
 
 class DeviceHandle[D: Device]:
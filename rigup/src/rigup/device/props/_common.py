@@ -20,7 +20,7 @@ class PropertyModelProtocol(Protocol):
     def to_property_model(self) -> "PropertyModel": ...
 
 
-class PropertyModel[T: str | int | float | bool](BaseModel):
+class PropertyModel[T: str | int | float | bool](BaseModel, frozen=True):
     kind: PropertyKind = "generic"
     value: Any
     minimum: float | None = None
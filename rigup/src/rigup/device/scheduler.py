@@ -0,0 +1,219 @@
+"""Per-device call scheduling — one serialized lane ordered by priority, plus small pools for concurrent-safe calls.
+
+Most hardware SDKs aren't thread-safe, so synchronous calls into a device run one at a time on a
+dedicated worker thread. Waiting calls don't queue first-come-first-served: a command or property
+write overtakes queued reads, and reads requested by a caller overtake the controller's own stream
+polling. A call already running on the device is never interrupted.
+
+Calls whose ``@describe`` marks them ``concurrent=True`` (e.g. a slow but thread-safe sensor read)
+skip the lane and run on a small separate pool, so they never delay — nor wait behind — serialized
+traffic to the same device. Commands that name the resources they touch (``@describe(resources=...)``,
+e.g. one axis of a multi-axis stage) run on a resource pool of their own: calls sharing a resource
+take turns in arrival order, calls on disjoint resources overlap. A serialized call uses the whole
+device, so resource calls share the device among themselves but never with it: a serialized call
+waits for the resource calls running, and the ones arriving after it wait for it. Cancelling a caller
+whose call already runs doesn't free the device early: what it holds stays held until the call returns.
+
+A call made while a traced request is handled (see :mod:`rigup.tracing`) reports to the request's span
+how long it waited for the device's thread and how long it ran there.
+"""
+
+import asyncio
+import heapq
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from enum import IntEnum
+from itertools import count
+
+from rigup.tracing import Span, current_span
+
+
+class Priority(IntEnum):
+    """Order in which waiting calls reach a device's serialized lane. Lower values go first."""
+
+    CONTROL = 0
+    """Commands and property writes."""
+
+    QUERY = 1
+    """Property reads requested by a caller."""
+
+    BACKGROUND = 2
+    """The controller's own stream polling."""
+
+
+class _DeviceGate:
+    """Reader/writer gate on the whole device: resource calls hold it shared, serialized calls own it.
+
+    Waiters are let in in arrival order, so resource calls arriving behind a waiting owner wait too and
+    a steady flow of them cannot starve the serialized lane.
+    """
+
+    def __init__(self) -> None:
+        self._sharers = 0
+        self._owned = False
+        self._waiting: deque[tuple[bool, asyncio.Future[None]]] = deque()
+
+    @asynccontextmanager
+    async def hold(self, *, exclusive: bool) -> AsyncIterator[None]:
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting.append((exclusive, turn))
+        self._admit()
+        try:
+            await turn
+        except asyncio.CancelledError:
+            if turn.done() and not turn.cancelled():
+                self._leave(exclusive=exclusive)  # admitted just as the caller gave up
+            else:
+                self._admit()  # a waiter behind this one may be able to go now
+            raise
+        try:
+            yield
+        finally:
+            self._leave(exclusive=exclusive)
+
+    def _leave(self, *, exclusive: bool) -> None:
+        if exclusive:
+            self._owned = False
+        else:
+            self._sharers -= 1
+        self._admit()
+
+    def _admit(self) -> None:
+        while self._waiting:
+            exclusive, turn = self._waiting[0]
+            if turn.done():
+                self._waiting.popleft()
+                continue
+            if self._owned or (exclusive and self._sharers):
+                return
+            self._waiting.popleft()
+            if exclusive:
+                self._owned = True
+                turn.set_result(None)
+                return
+            self._sharers += 1
+            turn.set_result(None)
+
+
+class DeviceScheduler:
+    """Runs synchronous device calls: serialized by priority, concurrently when marked safe, or
+    exclusively per resource."""
+
+    def __init__(self, uid: str, *, concurrent_workers: int = 2, resource_workers: int = 4) -> None:
+        if concurrent_workers < 0:
+            raise ValueError("concurrent_workers must be non-negative")
+        if resource_workers < 0:
+            raise ValueError("resource_workers must be non-negative")
+        self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"Ctrl-{uid}")
+        self._concurrent = (
+            ThreadPoolExecutor(max_workers=concurrent_workers, thread_name_prefix=f"Ctrl-{uid}-concurrent")
+            if concurrent_workers
+            else None
+        )
+        self._resource_pool = (
+            ThreadPoolExecutor(max_workers=resource_workers, thread_name_prefix=f"Ctrl-{uid}-resource")
+            if resource_workers
+            else None
+        )
+        self._resource_locks: dict[str, asyncio.Lock] = {}
+        self._gate = _DeviceGate()
+        self._busy = False
+        self._waiting: list[tuple[Priority, int, asyncio.Future[None]]] = []
+        self._arrival = count()
+
+    async def run_serial[R](self, fn: Callable[[], R], priority: Priority = Priority.CONTROL) -> R:
+        """Run ``fn`` on the device's worker thread once every higher-priority and earlier call has run,
+        and no resource call is running."""
+        span = current_span()
+        queued = time.perf_counter_ns()
+        await self._acquire(priority)
+        try:
+            async with self._gate.hold(exclusive=True):
+                return await _run_to_completion(self._serial, fn if span is None else _timed(fn, span, queued))
+        finally:
+            self._release()
+
+    async def run_concurrent[R](self, fn: Callable[[], R]) -> R:
+        """Run a concurrent-safe ``fn`` alongside the serialized lane (on it, if no pool was configured)."""
+        if self._concurrent is None:
+            return await self.run_serial(fn, Priority.QUERY)
+        span = current_span()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._concurrent, fn if span is None else _timed(fn, span, time.perf_counter_ns())
+        )
+
+    async def run_exclusive[R](self, fn: Callable[[], R], resources: Collection[str]) -> R:
+        """Run ``fn`` on the resource pool once no other call holds any of ``resources`` and no serialized
+        call holds the device (on the serialized lane, if no pool was configured)."""
+        if self._resource_pool is None:
+            return await self.run_serial(fn)
+        span = current_span()
+        queued = time.perf_counter_ns()
+        async with AsyncExitStack() as held:
+            for name in sorted(resources):  # one global order, so two calls can't each hold what the other needs
+                await held.enter_async_context(self._resource_locks.setdefault(name, asyncio.Lock()))
+            await held.enter_async_context(self._gate.hold(exclusive=False))
+            return await _run_to_completion(self._resource_pool, fn if span is None else _timed(fn, span, queued))
+
+    def shutdown(self) -> None:
+        """Stop accepting calls and drop queued work; a call already running on the device finishes."""
+        self._serial.shutdown(wait=False, cancel_futures=True)
+        for pool in (self._concurrent, self._resource_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _acquire(self, priority: Priority) -> None:
+        if not self._busy and not self._waiting:
+            self._busy = True
+            return
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrival), turn))
+        try:
+            await turn
+        except asyncio.CancelledError:
+            if turn.done() and not turn.cancelled():
+                self._release()  # the lane was handed over just as the caller gave up; pass it on
+            raise
+
+    def _release(self) -> None:
+        # Hand the lane straight to the next live waiter so no new arrival can slip in ahead of it.
+        while self._waiting:
+            _, _, turn = heapq.heappop(self._waiting)
+            if not turn.done():
+                turn.set_result(None)
+                return
+        self._busy = False
+
+
+async def _run_to_completion[R](pool: ThreadPoolExecutor, fn: Callable[[], R]) -> R:
+    """Run ``fn`` on ``pool``. A cancelled caller still waits for the call to finish before the cancellation
+    propagates, so the lane, gate and resources it holds are not released while the device is still busy."""
+    future = asyncio.get_running_loop().run_in_executor(pool, fn)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            with suppress(asyncio.CancelledError):
+                await asyncio.wait({future})
+        if not future.cancelled():
+            future.exception()  # mark it retrieved; the caller is gone and won't see the outcome
+        raise
+
+
+def _timed[R](fn: Callable[[], R], span: Span, queued_ns: int) -> Callable[[], R]:
+    """Wrap ``fn`` to report its wait since ``queued_ns`` and its run time on the worker thread to ``span``."""
+
+    def run() -> R:
+        started = time.perf_counter_ns()
+        try:
+            return fn()
+        finally:
+            span.device_call(queued_ns, started, time.perf_counter_ns())
+
+    return run
+
+
+__all__ = ["DeviceScheduler", "Priority"]
@@ -1,6 +1,8 @@
+import hashlib
 import inspect
+import json
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from contextlib import suppress
 from enum import Enum
 from functools import wraps
@@ -15,11 +17,22 @@ LABEL_ATTR = "__attr_label__"
 DESC_ATTR = "__attr_desc__"
 UNITS_ATTR = "__attr_units__"
 STREAM_ATTR = "__attr_stream__"
+PUSH_ATTR = "__attr_push__"
+CONCURRENT_ATTR = "__attr_concurrent__"
+RESOURCES_ATTR = "__attr_resources__"
 
 logger = logging.getLogger("rigup")
 
 
-def describe(label: str, desc: str | None = None, units: str | None = None, stream: bool = False) -> Callable:
+def describe(
+    label: str,
+    desc: str | None = None,
+    units: str | None = None,
+    stream: bool = False,
+    push: bool = False,
+    concurrent: bool = False,
+    resources: Sequence[str] = (),
+) -> Callable:
     """A decorator factory to add metadata to a function.
 
     Args:
@@ -27,6 +40,15 @@ def describe(label: str, desc: str | None = None, units: str | None = None, stre
         desc: Optional description
         units: Optional units string
         stream: If True, property changes will be published to subscribers (default: False)
+        push: If True, the driver reports changes itself with ``Device.report_property``, so the controller
+            streams the property without polling it. Implies ``stream`` (default: False)
+        concurrent: If True, the getter or command is thread-safe and may run while other calls are
+            in progress on the same device, instead of waiting its turn (default: False)
+        resources: Commands only. The parts of the device the command touches, e.g. ``("axis:{axis}",)``;
+            ``{param}`` is filled in from the call's arguments. Such a command runs on the device's resource
+            pool, never alongside another call sharing one of its resources or a call using the whole device,
+            and within a batch only waits for the earlier commands it conflicts with (default: none — the
+            command uses the whole device)
     """
 
     def attach_metadata(wrapper: Callable) -> Callable:
@@ -35,7 +57,10 @@ def describe(label: str, desc: str | None = None, units: str | None = None, stre
             setattr(wrapper, DESC_ATTR, desc)
         if units is not None:
             setattr(wrapper, UNITS_ATTR, units)
-        setattr(wrapper, STREAM_ATTR, stream)
+        setattr(wrapper, STREAM_ATTR, stream or push)
+        setattr(wrapper, PUSH_ATTR, push)
+        setattr(wrapper, CONCURRENT_ATTR, concurrent)
+        setattr(wrapper, RESOURCES_ATTR, tuple(resources))
         return wrapper
 
     def decorator(func: Callable) -> Callable:
@@ -107,6 +132,8 @@ class PropertyInfo(AttributeInfo):
     access: Literal["ro", "rw"]
     units: str = ""
     stream: bool = False
+    push: bool = False
+    concurrent: bool = False
 
     @classmethod
     def from_attr(cls, attr: property) -> Self:
@@ -121,6 +148,8 @@ class PropertyInfo(AttributeInfo):
             access="rw" if attr.fset else "ro",
             units=str(getattr(attr.fget, UNITS_ATTR)) if hasattr(attr.fget, UNITS_ATTR) else "",
             stream=bool(getattr(attr.fget, STREAM_ATTR, False)),
+            push=bool(getattr(attr.fget, PUSH_ATTR, False)),
+            concurrent=bool(getattr(attr.fget, CONCURRENT_ATTR, False)),
         )
 
 
@@ -141,6 +170,8 @@ class ParamInfo(BaseModel):
 
 class CommandInfo(AttributeInfo):
     params: dict[str, ParamInfo] = Field(default_factory=dict)
+    concurrent: bool = False
+    resources: list[str] = Field(default_factory=list)
 
     @classmethod
     def from_func(cls, func: Callable) -> Self:
@@ -180,7 +211,14 @@ class CommandInfo(AttributeInfo):
                 options=options,
             )
 
-        return cls(name=name, label=label, desc=desc, params=kwargs)
+        return cls(
+            name=name,
+            label=label,
+            desc=desc,
+            params=kwargs,
+            concurrent=bool(getattr(func, CONCURRENT_ATTR, False)),
+            resources=list(getattr(func, RESOURCES_ATTR, ())),
+        )
 
 
 class DeviceInterface(BaseModel):
@@ -189,6 +227,11 @@ class DeviceInterface(BaseModel):
     commands: dict[str, CommandInfo]
     properties: dict[str, PropertyInfo]
 
+    def content_hash(self) -> str:
+        """Digest of the interface's canonical JSON: equal hashes mean interchangeable interfaces."""
+        canonical = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
 
 class CommandParamsError(Exception):
     """Raised when command parameters are invalid."""
@@ -222,6 +265,20 @@ class Command[R]:
         """Convert command to dictionary for JSON serialization."""
         return self.info.model_dump(mode="json")
 
+    def resources(self, *args: Any, **kwargs: Any) -> frozenset[str] | None:
+        """The resources a call with these arguments touches; None when it uses the whole device.
+
+        Also None when the arguments don't fill the templates — the call is left to fail validation.
+        """
+        if not self._info.resources:
+            return None
+        try:
+            bound = inspect.signature(self._func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            return frozenset(template.format_map(bound.arguments) for template in self._info.resources)
+        except (TypeError, KeyError, IndexError, ValueError):
+            return None
+
     def _create_param_model(self, func: Callable) -> type[BaseModel]:
         """Generate Pydantic model from function signature for validation."""
         sig = inspect.signature(func)
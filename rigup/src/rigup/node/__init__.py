@@ -3,9 +3,15 @@
 import argparse
 import asyncio
 import logging
+import sys
 from collections.abc import Sequence
 
+from rigup.protocol import Action, RpcStatsRequest, RpcStatsResponse, call
+from rigup.tracing import format_report
+from rigup.transport import ZMQTransportClient
+
 from ._base import DevicesBuildResult, DevicesConfig, Node
+from ._cache import InterfaceCache
 from ._daemon import NodeDaemon
 from ._local import LocalAdapter, LocalNode
 from ._remote import RemoteNode, _parse_address
@@ -43,9 +49,44 @@ def run_node(argv: Sequence[str] | None = None) -> None:
     serve_node(args.node_id, args.address, debug=args.debug)
 
 
+async def fetch_rpc_stats(address: str, *, enable: bool | None = None, reset: bool = False) -> RpcStatsResponse:
+    """Connect to a running node as an observer and read its RPC latency histograms."""
+    transport = ZMQTransportClient()
+    await transport.connect(_parse_address(address))
+    try:
+        return await call(
+            transport, Action.RPC_STATS, RpcStatsRequest(enable=enable, reset=reset), RpcStatsResponse, timeout_s=5.0
+        )
+    finally:
+        await transport.close()
+
+
+def run_rpc_stats(argv: Sequence[str] | None = None) -> None:
+    """Public entry point printing a running node's per-device, per-action RPC latency report.
+
+    Tracing is off until someone enables it; the node then times every request it serves.
+
+    Usage::
+
+        rigup-rpc-stats tcp://stage-pc:5555 --enable     # start tracing
+        rigup-rpc-stats tcp://stage-pc:5555              # report what was recorded since
+        rigup-rpc-stats tcp://stage-pc:5555 --reset --disable
+    """
+    parser = argparse.ArgumentParser(description="Report a rigup node's RPC latency histograms.")
+    parser.add_argument("address", help="Node address (e.g. tcp://host:5555 or ipc:///tmp/node)")
+    toggle = parser.add_mutually_exclusive_group()
+    toggle.add_argument("--enable", dest="enable", action="store_const", const=True, help="Start tracing requests")
+    toggle.add_argument("--disable", dest="enable", action="store_const", const=False, help="Stop tracing requests")
+    parser.add_argument("--reset", action="store_true", help="Clear the histograms once reported")
+    args = parser.parse_args(argv)
+    response = asyncio.run(fetch_rpc_stats(args.address, enable=args.enable, reset=args.reset))
+    sys.stdout.write(f"{format_report(response.stats)}\ntracing {'on' if response.enabled else 'off'}\n")
+
+
 __all__ = [
     "DevicesBuildResult",
     "DevicesConfig",
+    "InterfaceCache",
     "LocalAdapter",
     "LocalNode",
     "Node",
@@ -54,7 +95,9 @@ __all__ = [
     "SubprocessNode",
     "TransportAdapter",
     "TransportNode",
+    "fetch_rpc_stats",
     "run",
     "run_node",
+    "run_rpc_stats",
     "serve_node",
 ]
@@ -0,0 +1,121 @@
+"""On-disk cache of device interfaces, so reconnecting to a node skips re-sending them.
+
+Interfaces are stored once per :meth:`~rigup.device.DeviceInterface.content_hash`, as
+``<hash>.json``; ``index.json`` maps each ``(node, uid)`` the cache has seen to the hash of its
+last interface. On build, a :class:`~rigup.node.TransportNode` offers the node those hashes
+(``BuildDevicesRequest.known``) and the node leaves out every interface whose hash still matches.
+
+The cache is advisory: an unreadable, corrupt or stale entry is simply a miss, and a write that
+fails is logged and otherwise ignored. Writes go through a temporary file and ``Path.replace`` so a
+concurrent reader never sees half a file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Self
+
+from pydantic import ValidationError
+
+from rigup.device import DeviceInterface
+
+CACHE_DIR_ENV = "RIGUP_CACHE_DIR"
+"""Overrides the cache directory; set to an empty string to disable the cache."""
+
+_INDEX = "index.json"
+
+log = logging.getLogger("rigup.node.cache")
+
+
+class InterfaceCache:
+    """Device interfaces by content hash under ``root``, indexed by node id and uid."""
+
+    def __init__(self, root: Path | str) -> None:
+        self._root = Path(root)
+        self._loaded: dict[str, DeviceInterface] = {}  # hash -> interface, parsed at most once per process
+
+    @classmethod
+    def default(cls) -> Self | None:
+        """The per-user cache: ``$RIGUP_CACHE_DIR``, else ``$XDG_CACHE_HOME/rigup/interfaces``
+        (``~/.cache`` when unset). None when ``RIGUP_CACHE_DIR`` is set but empty."""
+        configured = os.environ.get(CACHE_DIR_ENV)
+        if configured is not None:
+            return cls(configured) if configured else None
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return cls(Path(base) / "rigup" / "interfaces")
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def load(self, node_id: str, uids: Iterable[str]) -> dict[str, DeviceInterface]:
+        """The cached interfaces of those ``uids`` on ``node_id`` that are present and intact."""
+        index = self._read_index()
+        found: dict[str, DeviceInterface] = {}
+        for uid in uids:
+            digest = index.get(_key(node_id, uid))
+            if digest is not None and (interface := self._load_blob(digest)) is not None:
+                found[uid] = interface
+        return found
+
+    def store(self, node_id: str, interfaces: Mapping[str, DeviceInterface]) -> None:
+        """Record ``interfaces`` (uid -> interface) as the current ones of ``node_id``."""
+        if not interfaces:
+            return
+        try:
+            self._root.mkdir(parents=True, exist_ok=True)
+            index = self._read_index()
+            for uid, interface in interfaces.items():
+                digest = interface.content_hash()
+                if digest not in self._loaded and not (self._root / f"{digest}.json").exists():
+                    self._write(f"{digest}.json", interface.model_dump_json())
+                self._loaded[digest] = interface
+                index[_key(node_id, uid)] = digest
+            self._write(_INDEX, json.dumps(index, sort_keys=True))
+        except OSError as e:
+            log.debug("Could not write interface cache %s: %s", self._root, e)
+
+    def clear(self) -> None:
+        """Remove every cached interface."""
+        self._loaded.clear()
+        for path in self._root.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _load_blob(self, digest: str) -> DeviceInterface | None:
+        if (interface := self._loaded.get(digest)) is not None:
+            return interface
+        try:
+            interface = DeviceInterface.model_validate_json((self._root / f"{digest}.json").read_bytes())
+        except (OSError, ValidationError) as e:
+            log.debug("Interface cache miss for %s: %s", digest, e)
+            return None
+        if interface.content_hash() != digest:  # written by an incompatible version, or tampered with
+            log.debug("Interface cache entry %s does not match its hash", digest)
+            return None
+        self._loaded[digest] = interface
+        return interface
+
+    def _read_index(self) -> dict[str, str]:
+        try:
+            index = json.loads((self._root / _INDEX).read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def _write(self, name: str, text: str) -> None:
+        fd, name_tmp = tempfile.mkstemp(dir=self._root, prefix=f".{name}.")
+        tmp = Path(name_tmp)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            tmp.replace(self._root / name)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def _key(node_id: str, uid: str) -> str:
+    return f"{node_id}/{uid}"
@@ -4,6 +4,22 @@ Runs inside a subprocess or remote node process. Binds a
 :class:`TransportServer`, registers protocol handlers, builds/closes
 devices on command from the orchestrator, and publishes device streams.
 
+Several clients may be connected at once. Authority is per peer: once an
+orchestrator claims the node, only the peer it claimed from may build devices,
+run commands or write properties. Every other peer is a read-only observer —
+its property reads are answered from the daemon's cache of the latest observed
+values rather than by calling into the device, and it may not shut the node
+down. Authority is released when its peer disconnects (falls silent past the
+transport's heartbeat timeout).
+
+A client on the same host may open a shared-memory channel (``OPEN_SHM``, see
+:mod:`rigup.node._shm`): stream payloads above its threshold are then written to
+a ring of shared-memory slots and only a descriptor is published over ZMQ.
+
+Any peer may read the per-phase latency histograms with ``RPC_STATS`` (see
+:mod:`rigup.tracing`); switching tracing on or off, or resetting it, needs
+authority like any other change. Tracing starts off.
+
 Lifecycle::
 
     daemon = NodeDaemon(config, transport)
@@ -22,12 +38,16 @@ from rigup.device import (
     Device,
     DeviceController,
     DeviceInterface,
+    Priority,
+    PropertyModel,
     PropResults,
     PublishBytesFn,
     PublishTypedFn,
+    Result,
     Results,
 )
 from rigup.node._logs import NodeLogHandler
+from rigup.node._shm import SHM_TOPIC_SUFFIX, ShmRing, check_probe
 from rigup.protocol import (
     Action,
     BuildDevicesRequest,
@@ -39,17 +59,26 @@ from rigup.protocol import (
     Empty,
     GetInterfaceRequest,
     GetPropsRequest,
+    ListDevicesRequest,
     ListDevicesResponse,
     Notify,
     PingPayload,
     ReleaseRequest,
     ReleaseResponse,
+    RpcStatsRequest,
+    RpcStatsResponse,
     RunCommandsRequest,
     SetPropsRequest,
+    ShmDescriptor,
+    ShmOpenRequest,
+    ShmOpenResponse,
+    ShmReleasePayload,
+    ShmSubscribePayload,
     ShutdownPayload,
     bind,
 )
-from rigup.transport import NodeAddress, TransportServer
+from rigup.tracing import SpanRecorder
+from rigup.transport import NodeAddress, TransportServer, current_peer
 from rigup.wire import pack
 
 
@@ -68,12 +97,23 @@ class NodeDaemon:
 
         self._controllers: dict[str, DeviceController] = {}
         self._authority_owner: str | None = None
+        self._authority_peer: str | None = None
+        # Latest successful observation of each property, fed by streams and by the owner's reads
+        # and writes; observers are served from here so they never queue behind the owner's calls.
+        # The owner's commands drop the entries no stream keeps current (see _forget_unstreamed).
+        self._prop_cache: dict[str, dict[str, PropertyModel]] = {}
+        self._interface_hashes: dict[str, str] = {}
+        self._shm: ShmRing | None = None
+        self._shm_peers: dict[str, int] = {}  # peer -> payload size from which it reads through shm
+        self._shm_readers: dict[str, set[str]] = {}  # full topic -> peers reading it through shm
+        self._spans = SpanRecorder()
         self._shutdown_event = asyncio.Event()
         self._log_handler: NodeLogHandler | None = None
 
         self._dispatcher = Dispatcher()
         self._register_handlers()
         bind(self._dispatcher, self._transport)
+        self._transport.on_peer_lost(self._on_peer_lost)
 
     async def start(self, address: NodeAddress) -> None:
         """Bind the transport and begin accepting requests."""
@@ -95,6 +135,9 @@ class NodeDaemon:
         self._log.info("Daemon %s stopping", self._node_id)  # last forwarded line, before the sink goes away
         await self._remove_log_forwarding()
         await self._transport.close()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
 
     def _install_log_forwarding(self) -> None:
         """Publish this process's log records to the orchestrator over the transport (see
@@ -121,7 +164,7 @@ class NodeDaemon:
         d.on_request(Action.CLAIM, ClaimRequest, ClaimResponse, self._handle_claim)
         d.on_request(Action.RELEASE, ReleaseRequest, ReleaseResponse, self._handle_release)
 
-        d.on_request(Action.LIST_DEVICES, Empty, ListDevicesResponse, self._handle_list_devices)
+        d.on_request(Action.LIST_DEVICES, ListDevicesRequest, ListDevicesResponse, self._handle_list_devices)
         d.on_request(Action.BUILD_DEVICES, BuildDevicesRequest, BuildDevicesResponse, self._handle_build)
         d.on_request(Action.CLOSE_DEVICE, CloseDeviceRequest, Empty, self._handle_close_device)
         d.on_request(Action.CLOSE_ALL_DEVICES, Empty, Empty, self._handle_close_all)
@@ -131,7 +174,12 @@ class NodeDaemon:
         d.on_request(Action.GET_PROPS, GetPropsRequest, PropResults, self._handle_get_props)
         d.on_request(Action.SET_PROPS, SetPropsRequest, PropResults, self._handle_set_props)
 
+        d.on_request(Action.OPEN_SHM, ShmOpenRequest, ShmOpenResponse, self._handle_open_shm)
+        d.on_notify(Notify.SHM_SUBSCRIBE, ShmSubscribePayload, self._handle_shm_subscribe)
+        d.on_notify(Notify.SHM_RELEASE, ShmReleasePayload, self._handle_shm_release)
+
         d.on_request(Action.PING, PingPayload, PingPayload, self._handle_ping)
+        d.on_request(Action.RPC_STATS, RpcStatsRequest, RpcStatsResponse, self._handle_rpc_stats)
         d.on_notify(Notify.SHUTDOWN, ShutdownPayload, self._handle_shutdown)
 
     # ==================== Authority ====================
@@ -140,28 +188,60 @@ class NodeDaemon:
         if self._authority_owner is not None and self._authority_owner != req.orchestrator_id:
             return ClaimResponse(accepted=False, current_owner=self._authority_owner)
         self._authority_owner = req.orchestrator_id
+        self._authority_peer = current_peer()  # a reconnecting orchestrator moves authority to its new peer
         self._log.info("Authority claimed by %s", req.orchestrator_id)
         return ClaimResponse(accepted=True)
 
     async def _handle_release(self, req: ReleaseRequest) -> ReleaseResponse:
         if self._authority_owner == req.orchestrator_id:
             self._authority_owner = None
+            self._authority_peer = None
             self._log.info("Authority released by %s", req.orchestrator_id)
             return ReleaseResponse(released=True)
         return ReleaseResponse(released=False)
 
+    def _on_peer_lost(self, peer: str) -> None:
+        self._shm_peers.pop(peer, None)
+        for readers in self._shm_readers.values():
+            readers.discard(peer)
+        if peer == self._authority_peer:
+            self._log.warning("Authority of %s released: its connection was lost", self._authority_owner)
+            self._authority_owner = None
+            self._authority_peer = None
+
+    def _is_observer(self) -> bool:
+        """Whether the request being handled comes from a peer other than the one holding authority."""
+        peer = current_peer()
+        return self._authority_peer is not None and peer is not None and peer != self._authority_peer
+
+    def _require_authority(self, action: str) -> None:
+        if self._is_observer():
+            raise PermissionError(
+                f"{action} refused: node is claimed by {self._authority_owner}; this peer is read-only"
+            )
+
     # ==================== Introspection ====================
 
-    async def _handle_list_devices(self, _req: Empty) -> ListDevicesResponse:
-        return ListDevicesResponse(devices={uid: ctrl.interface for uid, ctrl in self._controllers.items()})
+    async def _handle_list_devices(self, req: ListDevicesRequest) -> ListDevicesResponse:
+        return ListDevicesResponse(
+            devices={uid: ctrl.interface for uid, ctrl in self._controllers.items()} if req.interfaces else {},
+            hashes={uid: self._interface_hash(uid) for uid in self._controllers},
+        )
+
+    def _interface_hash(self, uid: str) -> str:
+        if (digest := self._interface_hashes.get(uid)) is None:
+            digest = self._interface_hashes[uid] = self._controllers[uid].interface.content_hash()
+        return digest
 
     # ==================== Device lifecycle ====================
 
     async def _handle_build(self, req: BuildDevicesRequest) -> BuildDevicesResponse:
+        self._require_authority(Action.BUILD_DEVICES)
         await self._close_all_controllers()
         built_devices, errors = await build_objects_async(req.devices, Device)
 
         built_interfaces: dict[str, DeviceInterface] = {}
+        hashes: dict[str, str] = {}
         for uid, device in built_devices.items():
             controller_cls = type(device).__CONTROLLER_TYPE__
             controller: DeviceController = controller_cls(device)
@@ -169,19 +249,23 @@ class NodeDaemon:
             controller.set_bytes_publisher(self._make_bytes_publisher(uid))
             controller.start_streaming()
             self._controllers[uid] = controller
-            built_interfaces[uid] = controller.interface
+            hashes[uid] = self._interface_hash(uid)
+            if req.known.get(uid) != hashes[uid]:
+                built_interfaces[uid] = controller.interface
             self._log.info("Built device %s (%s)", uid, device.__class__.__name__)
 
         for uid, err in errors.items():
             self._log.error("Failed to build %s: %s", uid, err.message)
 
-        return BuildDevicesResponse(built=built_interfaces, errors=errors)
+        return BuildDevicesResponse(built=built_interfaces, hashes=hashes, errors=errors)
 
     def _make_typed_publisher(self, device_uid: str) -> PublishTypedFn:
         """Pack typed events into wire bytes and publish on ZMQ topic ``{uid}.{topic}``."""
 
         async def publish(topic: str, body: BaseModel) -> None:
-            await self._transport.publish(f"{device_uid}.{topic}", pack(body))
+            if isinstance(body, PropResults):
+                self._observe(device_uid, body)
+            await self._publish(f"{device_uid}.{topic}", pack(body))
 
         return publish
 
@@ -189,11 +273,33 @@ class NodeDaemon:
         """Pass-through raw byte streams (e.g. frames) to ZMQ topic ``{uid}.{topic}``."""
 
         async def publish(topic: str, data: bytes) -> None:
-            await self._transport.publish(f"{device_uid}.{topic}", data)
+            await self._publish(f"{device_uid}.{topic}", data)
 
         return publish
 
+    async def _publish(self, full_topic: str, data: bytes) -> None:
+        if (descriptor := self._to_shm(full_topic, data)) is not None:
+            await self._transport.publish(f"{full_topic}{SHM_TOPIC_SUFFIX}", pack(descriptor))
+        else:
+            await self._transport.publish(full_topic, data)
+
+    def _to_shm(self, full_topic: str, data: bytes) -> ShmDescriptor | None:
+        """Place ``data`` in shared memory if every subscriber of ``full_topic`` can read it from there.
+
+        Payloads stay inline while any connected peer lacks a shm channel (it may be subscribed inline),
+        when the payload is below a reader's threshold, or when the ring has no free slot.
+        """
+        readers = self._shm_readers.get(full_topic)
+        if self._shm is None or not readers or len(data) < max(self._shm_peers[peer] for peer in readers):
+            return None
+        if not self._shm_peers.keys() >= set(self._transport.peers):
+            return None
+        return self._shm.put(data, readers=len(readers))
+
     async def _handle_close_device(self, req: CloseDeviceRequest) -> Empty:
+        self._require_authority(Action.CLOSE_DEVICE)
+        self._prop_cache.pop(req.uid, None)
+        self._interface_hashes.pop(req.uid, None)
         controller = self._controllers.pop(req.uid, None)
         if controller is not None:
             await controller.close()
@@ -201,6 +307,7 @@ class NodeDaemon:
         return Empty()
 
     async def _handle_close_all(self, _req: Empty) -> Empty:
+        self._require_authority(Action.CLOSE_ALL_DEVICES)
         await self._close_all_controllers()
         return Empty()
 
@@ -209,6 +316,8 @@ class NodeDaemon:
             await controller.close()
             self._log.debug("Closed device %s", uid)
         self._controllers.clear()
+        self._prop_cache.clear()
+        self._interface_hashes.clear()
 
     # ==================== Device RPC ====================
 
@@ -222,21 +331,105 @@ class NodeDaemon:
         return self._get_controller(req.uid).interface
 
     async def _handle_run_commands(self, req: RunCommandsRequest) -> Results:
-        return await self._get_controller(req.uid).execute_commands(req.commands)
+        self._require_authority(Action.RUN_COMMANDS)
+        results = await self._get_controller(req.uid).execute_commands(req.commands)
+        self._forget_unstreamed(req.uid)
+        return results
 
     async def _handle_get_props(self, req: GetPropsRequest) -> PropResults:
-        return await self._get_controller(req.uid).get_props(*req.props)
+        controller = self._get_controller(req.uid)
+        if self._is_observer():
+            return await self._cached_props(controller, req.props)
+        return self._observe(req.uid, await controller.get_props(*req.props))
 
     async def _handle_set_props(self, req: SetPropsRequest) -> PropResults:
-        return await self._get_controller(req.uid).set_props(**req.props)
+        self._require_authority(Action.SET_PROPS)
+        return self._observe(req.uid, await self._get_controller(req.uid).set_props(**req.props))
+
+    def _observe(self, uid: str, results: PropResults) -> PropResults:
+        if uid in self._controllers:
+            self._prop_cache.setdefault(uid, {}).update(results.ok)
+        return results
+
+    def _forget_unstreamed(self, uid: str) -> None:
+        """Drop cached values a command may have changed behind the cache's back.
+
+        Streamed and pushed properties stay: their next observation replaces them. Any other property is
+        read again, in the background, by the next observer that asks for it.
+        """
+        cached = self._prop_cache.get(uid)
+        if cached is None or (controller := self._controllers.get(uid)) is None:
+            return
+        props = controller.interface.properties
+        for name in [name for name in cached if not (name in props and (props[name].stream or props[name].push))]:
+            del cached[name]
+
+    async def _cached_props(self, controller: DeviceController, names: list[str]) -> PropResults:
+        """Answer an observer's read from the cache; a property never observed yet is read once, behind
+        every call the owner has queued on the device."""
+        names = names or list(controller.interface.properties)
+        cached = self._prop_cache.get(controller.uid, {})
+        results: dict[str, Result] = {name: Result.ok(cached[name]) for name in names if name in cached}
+        if missing := [name for name in names if name not in cached]:
+            read = self._observe(controller.uid, await controller.get_props(*missing, priority=Priority.BACKGROUND))
+            results.update(read.results)
+        return PropResults(results={name: results[name] for name in names})
+
+    # ==================== Shared memory ====================
+
+    async def _handle_open_shm(self, req: ShmOpenRequest) -> ShmOpenResponse:
+        peer = current_peer()
+        if peer is None:
+            return ShmOpenResponse(accepted=False, reason="transport does not identify peers")
+        if (reason := check_probe(req.probe, req.token)) is not None:
+            self._log.info("Shared memory refused for peer %s: %s", peer, reason)
+            return ShmOpenResponse(accepted=False, reason=reason)
+        if self._shm is None:
+            self._shm = ShmRing()
+        self._shm_peers[peer] = req.threshold
+        self._log.info("Shared memory opened for peer %s (payloads >= %d bytes)", peer, req.threshold)
+        return ShmOpenResponse(accepted=True)
+
+    async def _handle_shm_subscribe(self, payload: ShmSubscribePayload) -> None:
+        peer = current_peer()
+        if peer is None or peer not in self._shm_peers:
+            return
+        readers = self._shm_readers.setdefault(payload.topic, set())
+        if payload.subscribed:
+            readers.add(peer)
+        else:
+            readers.discard(peer)
+            if not readers:
+                del self._shm_readers[payload.topic]
+
+    async def _handle_shm_release(self, payload: ShmReleasePayload) -> None:
+        if self._shm is not None:
+            for slot, generation in payload.slots:
+                self._shm.release(slot, generation)
 
     # ==================== Liveness ====================
 
     async def _handle_ping(self, req: PingPayload) -> PingPayload:
         return PingPayload(timestamp=req.timestamp)
 
+    async def _handle_rpc_stats(self, req: RpcStatsRequest) -> RpcStatsResponse:
+        if req.enable is not None or req.reset:
+            self._require_authority(Action.RPC_STATS)
+        if req.enable is not None and req.enable != (self._transport.tracer is not None):
+            self._transport.trace(self._spans if req.enable else None)
+            self._log.info("RPC tracing %s", "enabled" if req.enable else "disabled")
+        response = RpcStatsResponse(enabled=self._transport.tracer is not None, stats=self._spans.stats())
+        if req.reset:
+            self._spans.reset()
+        return response
+
     # ==================== Shutdown ====================
 
     async def _handle_shutdown(self, payload: ShutdownPayload) -> None:
+        if self._is_observer():
+            self._log.warning(
+                "Shutdown refused: node is claimed by %s; the requesting peer is read-only", self._authority_owner
+            )
+            return
         self._log.info("Shutdown requested: %s", payload.reason or "(no reason)")
         self._shutdown_event.set()
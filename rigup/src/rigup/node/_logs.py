@@ -1,22 +1,31 @@
 """Node log forwarding over the transport's broadcast channel.
 
-A daemon publishes every log record it emits on the reserved :data:`LOG_TOPIC`, riding the same
-PUB socket used for device streams. The orchestrator subscribes per node and re-emits those records
-into its own logging system, so whatever consumes the local root logger (console, the web log feed)
-sees node logs as if they were local. A subprocess node writes nothing to its own console (see
+A daemon publishes its log records on the reserved :data:`LOG_TOPIC`, riding the same PUB socket
+used for device streams. The orchestrator subscribes per node and re-emits those records into its
+own logging system, so whatever consumes the local root logger (console, the web log feed) sees node
+logs as if they were local. A subprocess node writes nothing to its own console (see
 ``rigup.node.__main__``); forwarding is its only log sink.
+
+Records travel in :class:`NodeLogBatch` frames, flushed every ``flush_interval_s`` or as soon as
+``max_entries`` are pending. Each logger draws from a token bucket, so one chatty driver cannot
+flood the transport or the orchestrator's log journal. Its records at WARNING and above draw from a
+bucket of their own, so a flood of debug output cannot silence an error. Records over their rate are
+counted rather than sent, and the logger reports "N messages from <logger> suppressed" at most once
+per ``summary_interval_s``.
 """
 
 import asyncio
 import logging
 import sys
+import time
+from collections import deque
 from contextlib import suppress
 
 from pydantic import BaseModel
 from vxlib.lifecycle import Teardown
 
 from rigup.transport import TransportClient, TransportServer
-from rigup.wire import pack, unpack
+from rigup.wire import decode, pack
 
 LOG_TOPIC = "__log__"
 """Reserved broadcast topic for forwarded records. Device streams use ``{uid}.{topic}``, so it
@@ -36,63 +45,161 @@ class NodeLogEvent(BaseModel):
     created: float
 
 
-class NodeLogHandler(logging.Handler):
-    """Root-logger handler on a daemon that publishes each record over the transport.
+class NodeLogBatch(BaseModel):
+    """One frame of forwarded records, in the order they were logged."""
+
+    events: list[NodeLogEvent]
+
+
+class _TokenBucket:
+    """Admits ``rate`` records per second on average and up to ``burst`` at once; counts the rest."""
+
+    __slots__ = ("_burst", "_rate", "_stamp", "_tokens", "max_level", "suppressed")
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._stamp = now
+        self.suppressed = 0
+        self.max_level = logging.NOTSET  # highest level among the suppressed records
+
+    def admit(self, now: float, levelno: int) -> bool:
+        self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.suppressed += 1
+        self.max_level = max(self.max_level, levelno)
+        return False
 
-    ``emit`` runs on whatever thread logged, so it only captures fields and hands off to the event
-    loop; a drain task owns the async ``publish``. The queue is bounded and drops oldest on overflow,
-    so a log storm can never back-pressure device work.
+
+class NodeLogHandler(logging.Handler):
+    """Root-logger handler on a daemon that publishes records over the transport in batches.
+
+    ``emit`` runs on whatever thread logged, under the handler's lock. It rate-limits the record,
+    captures its fields into the pending batch and returns; it only wakes the event loop when a
+    batch fills up. A drain task owns the async ``publish``. The pending batch is bounded and drops
+    oldest on overflow (reported like suppressed records), so a log storm can never back-pressure
+    device work. ``rate_per_s`` and ``burst`` apply to each logger's records below WARNING and,
+    separately, to those at WARNING and above. ``rate_per_s=None`` turns rate limiting off.
     """
 
-    def __init__(self, transport: TransportServer, node_id: str, loop: asyncio.AbstractEventLoop) -> None:
+    def __init__(
+        self,
+        transport: TransportServer,
+        node_id: str,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        flush_interval_s: float = 0.05,
+        max_entries: int = 256,
+        rate_per_s: float | None = 200.0,
+        burst: int = 400,
+        summary_interval_s: float = 1.0,
+    ) -> None:
         super().__init__()
         self._transport = transport
         self._node_id = node_id
         self._loop = loop
-        self._queue: asyncio.Queue[NodeLogEvent] = asyncio.Queue(maxsize=_QUEUE_MAX)
+        self._flush_interval_s = flush_interval_s
+        self._max_entries = max_entries
+        self._rate_per_s = rate_per_s
+        self._burst = burst
+        self._summary_interval_s = summary_interval_s
+        self._pending: deque[NodeLogEvent] = deque(maxlen=_QUEUE_MAX)
+        self._dropped = 0  # pushed out of a full _pending since the last summary
+        # (logger name, WARNING or above) -> its rate limit
+        self._buckets: dict[tuple[str, bool], _TokenBucket] = {}
+        self._last_summary = time.monotonic()
+        self._full = asyncio.Event()
         self._drain: asyncio.Task[None] | None = None
 
     def start(self) -> None:
-        """Start the drain task that publishes queued records."""
+        """Start the drain task that publishes pending records."""
         if self._drain is None:
             self._drain = self._loop.create_task(self._drain_loop(), name=f"node-log-drain-{self._node_id}")
 
     async def aclose(self) -> None:
-        """Cancel the drain task; queued-but-unpublished records are dropped."""
+        """Stop the drain task, then publish what is still pending along with the final summaries."""
         if self._drain is not None:
             self._drain.cancel()
             with suppress(asyncio.CancelledError):
                 await self._drain
             self._drain = None
+            await self._publish(self._take(summarize=True))
 
     def emit(self, record: logging.LogRecord) -> None:
+        if self._rate_per_s is not None:
+            key = (record.name, record.levelno >= logging.WARNING)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(self._rate_per_s, self._burst, time.monotonic())
+            if not bucket.admit(time.monotonic(), record.levelno):
+                return
         try:
-            event = NodeLogEvent(
-                node_id=self._node_id,
-                name=record.name,
-                levelno=record.levelno,
-                levelname=record.levelname,
-                message=record.getMessage(),
-                created=record.created,
-            )
+            event = self._event(record.name, record.levelno, record.getMessage(), record.created)
         except Exception:
             self.handleError(record)
             return
-        with suppress(RuntimeError):  # loop closed during shutdown
-            self._loop.call_soon_threadsafe(self._enqueue, event)
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        self._pending.append(event)
+        if len(self._pending) == self._max_entries:
+            with suppress(RuntimeError):  # loop closed during shutdown
+                self._loop.call_soon_threadsafe(self._full.set)
+
+    def _event(self, name: str, levelno: int, message: str, created: float) -> NodeLogEvent:
+        return NodeLogEvent(
+            node_id=self._node_id,
+            name=name,
+            levelno=levelno,
+            levelname=logging.getLevelName(levelno),
+            message=message,
+            created=created,
+        )
 
-    def _enqueue(self, event: NodeLogEvent) -> None:
-        """On the loop: enqueue, dropping the oldest if full (logging must never block device work)."""
-        if self._queue.full():
-            with suppress(asyncio.QueueEmpty):
-                self._queue.get_nowait()
-        self._queue.put_nowait(event)
+    def _take(self, *, summarize: bool = False) -> list[NodeLogEvent]:
+        """Everything pending, plus the suppression summaries once per ``summary_interval_s``."""
+        self.acquire()  # emit runs under the handler lock, on any thread
+        try:
+            events = list(self._pending)
+            self._pending.clear()
+            now = time.monotonic()
+            if summarize or now - self._last_summary >= self._summary_interval_s:
+                self._last_summary = now
+                events.extend(self._summaries())
+        finally:
+            self.release()
+        return events
+
+    def _summaries(self) -> list[NodeLogEvent]:
+        created = time.time()
+        summaries = []
+        for (name, _), bucket in self._buckets.items():
+            if bucket.suppressed:
+                message = f"{bucket.suppressed} messages from {name} suppressed"
+                summaries.append(self._event(name, bucket.max_level, message, created))
+                bucket.suppressed, bucket.max_level = 0, logging.NOTSET
+        if self._dropped:
+            message = f"{self._dropped} log messages dropped: forwarding fell behind"
+            summaries.append(self._event(__name__, logging.WARNING, message, created))
+            self._dropped = 0
+        return summaries
 
     async def _drain_loop(self) -> None:
         while True:
-            event = await self._queue.get()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), self._flush_interval_s)
+            self._full.clear()
+            await self._publish(self._take())
+
+    async def _publish(self, events: list[NodeLogEvent]) -> None:
+        for start in range(0, len(events), self._max_entries):
             try:
-                await self._transport.publish(LOG_TOPIC, pack(event))
+                await self._transport.publish(
+                    LOG_TOPIC, pack(NodeLogBatch(events=events[start : start + self._max_entries]))
+                )
             except asyncio.CancelledError:
                 raise
             except Exception as e:
@@ -110,20 +217,21 @@ def relay_logs(transport: TransportClient) -> Teardown:
 
     async def on_wire(data: bytes) -> None:
         try:
-            event = NodeLogEvent.model_validate(unpack(data))
+            batch = decode(data, NodeLogBatch)
         except Exception:
             return
-        record = logging.LogRecord(
-            name=event.name,
-            level=event.levelno,
-            pathname="",
-            lineno=0,
-            msg=event.message,
-            args=(),
-            exc_info=None,
-        )
-        record.created = event.created
-        record.node_id = event.node_id  # VxlRichHandler renders this inline
-        logging.getLogger(event.name).handle(record)
+        for event in batch.events:
+            record = logging.LogRecord(
+                name=event.name,
+                level=event.levelno,
+                pathname="",
+                lineno=0,
+                msg=event.message,
+                args=(),
+                exc_info=None,
+            )
+            record.created = event.created
+            record.node_id = event.node_id  # VxlRichHandler renders this inline
+            logging.getLogger(event.name).handle(record)
 
     return transport.subscribe(LOG_TOPIC, on_wire)
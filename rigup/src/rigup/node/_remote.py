@@ -13,6 +13,8 @@ from rigup.protocol import (
 )
 from rigup.transport import IPCAddress, NodeAddress, TCPAddress, ZMQTransportClient
 
+from ._cache import InterfaceCache
+from ._shm import SHM_THRESHOLD
 from ._transport import TransportNode
 
 
@@ -41,13 +43,22 @@ class RemoteNode(TransportNode):
     """Node backed by an externally supervised process (systemd/launchd/etc.).
 
     ``open`` connects via ZMQ and claims authority. ``close`` releases
-    authority and disconnects — does NOT terminate the process.
+    authority and disconnects — does NOT terminate the process. A node that
+    happens to run on this host is offered shared memory like a subprocess node.
     """
 
-    def __init__(self, node_id: str, config: NodeConfig, orchestrator_id: str = "") -> None:
+    def __init__(
+        self,
+        node_id: str,
+        config: NodeConfig,
+        orchestrator_id: str = "",
+        *,
+        shm_threshold: int | None = SHM_THRESHOLD,
+        interface_cache: InterfaceCache | None = None,
+    ) -> None:
         self._config = config
         self._orchestrator_id = orchestrator_id or f"rig-{id(self):x}"
-        super().__init__(node_id, ZMQTransportClient())
+        super().__init__(node_id, ZMQTransportClient(), shm_threshold=shm_threshold, interface_cache=interface_cache)
 
     async def open(self) -> None:
         if self._config.address is None:
@@ -66,6 +77,7 @@ class RemoteNode(TransportNode):
             raise RuntimeError(
                 f"Authority claim rejected for node {self.node_id} (current owner: {response.current_owner})"
             )
+        await self._open_shm()
 
     async def close(self) -> None:
         await self.close_all_devices()
@@ -80,3 +92,4 @@ class RemoteNode(TransportNode):
 
         self._stop_log_relay()
         await self._transport.close()
+        self._close_shm()
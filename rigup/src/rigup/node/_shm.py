@@ -0,0 +1,178 @@
+"""Shared-memory side channel for large stream payloads between processes on one host.
+
+The node copies a payload into one slot of a :class:`ShmRing` and publishes a small
+:class:`~rigup.protocol.ShmDescriptor` on ``{topic}@shm`` in its place; the client's
+:class:`ShmReader` copies the payload back out and returns the slot with a ``SHM_RELEASE``
+notify. A slot is reused once every reader counted at publish time released it, or once its
+lease expires — PUB/SUB is lossy, so a descriptor may never reach a reader at all.
+
+Each slot is its own segment, recreated under a new name when a larger payload arrives. A
+segment starts with the generation of the payload it holds; the writer zeroes it while it
+copies, and the reader checks it before and after copying, so a reader that lost the race
+against a reclaimed slot drops the payload instead of returning torn data.
+"""
+
+import itertools
+import logging
+import secrets
+import struct
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+from rigup.protocol import ShmDescriptor
+
+SHM_THRESHOLD = 1 << 20
+"""Default payload size (bytes) from which a stream travels through shared memory."""
+
+SHM_TOPIC_SUFFIX = "@shm"
+"""Appended to a stream topic for the descriptors published in place of its payloads."""
+
+_HEADER = struct.Struct("!Q")
+_SEGMENT_ALIGN = 1 << 20
+
+log = logging.getLogger("rigup.node.shm")
+
+
+def create_probe() -> tuple[SharedMemory, str]:
+    """Create a small segment holding a random token, for :func:`check_probe` on the other end.
+
+    The caller closes and unlinks the segment once the node answered.
+    """
+    token = secrets.token_hex(16)
+    probe = SharedMemory(create=True, size=len(token))
+    _buf(probe)[: len(token)] = token.encode()
+    return probe, token
+
+
+def check_probe(name: str, token: str) -> str | None:
+    """Attach to a client's probe segment; return why shared memory can't be used, or None if it can."""
+    try:
+        probe = SharedMemory(name=name, track=False)
+    except OSError as e:
+        return f"probe segment not visible from the node: {e}"
+    try:
+        if bytes(_buf(probe)[: len(token)]) != token.encode():
+            return "probe segment holds a different token"
+        return None
+    finally:
+        probe.close()
+
+
+@dataclass(slots=True)
+class _Slot:
+    segment: SharedMemory | None = None
+    generation: int = 0
+    readers: int = 0
+    leased_at: float = 0.0
+
+
+class ShmRing:
+    """Node-side ring of shared-memory slots that large payloads are written into.
+
+    ``put`` is called from the event loop only; it never blocks on readers and returns None
+    when every slot is still held, so the caller falls back to publishing the payload inline.
+    """
+
+    def __init__(self, *, slots: int = 8, lease_s: float = 2.0) -> None:
+        self._slots = [_Slot() for _ in range(slots)]
+        self._lease_s = lease_s
+        self._generations = itertools.count(1)
+
+    @property
+    def in_use(self) -> int:
+        """Slots still held by at least one reader."""
+        return sum(1 for slot in self._slots if slot.readers > 0)
+
+    def put(self, data: bytes, *, readers: int) -> ShmDescriptor | None:
+        """Copy ``data`` into a free slot held for ``readers`` releases."""
+        index = self._claim()
+        if index is None:
+            return None
+        slot = self._slots[index]
+        needed = _HEADER.size + len(data)
+        if slot.segment is None or slot.segment.size < needed:
+            _destroy(slot.segment)
+            slot.segment = SharedMemory(create=True, size=-(-needed // _SEGMENT_ALIGN) * _SEGMENT_ALIGN)
+        buf = _buf(slot.segment)
+        slot.generation = next(self._generations)
+        _HEADER.pack_into(buf, 0, 0)
+        buf[_HEADER.size : needed] = data
+        _HEADER.pack_into(buf, 0, slot.generation)
+        slot.readers = readers
+        slot.leased_at = time.monotonic()
+        return ShmDescriptor(segment=slot.segment.name, slot=index, generation=slot.generation, size=len(data))
+
+    def release(self, slot: int, generation: int) -> None:
+        """One reader is done with ``(slot, generation)``; stale or unknown releases are ignored."""
+        if not 0 <= slot < len(self._slots):
+            return
+        held = self._slots[slot]
+        if held.generation == generation and held.readers > 0:
+            held.readers -= 1
+
+    def close(self) -> None:
+        """Unlink every segment. Readers that still map one keep it until they close."""
+        for slot in self._slots:
+            _destroy(slot.segment)
+            slot.segment = None
+            slot.readers = 0
+
+    def _claim(self) -> int | None:
+        """The lowest free slot, so a steady stream keeps reusing the same warm, already-mapped pages."""
+        now = time.monotonic()
+        for index, slot in enumerate(self._slots):
+            if slot.readers > 0 and now - slot.leased_at < self._lease_s:
+                continue
+            if slot.readers > 0:
+                log.debug("reclaiming shm slot %d: %d release(s) never arrived", index, slot.readers)
+            return index
+        return None
+
+
+class ShmReader:
+    """Client-side view of a node's ring: attaches to each slot's segment once and copies payloads out."""
+
+    def __init__(self) -> None:
+        self._segments: dict[int, SharedMemory] = {}
+
+    def read(self, descriptor: ShmDescriptor) -> bytes | None:
+        """Copy the payload ``descriptor`` points at, or None if its slot was reused meanwhile."""
+        buf = _buf(self._attach(descriptor))
+        if _HEADER.unpack_from(buf, 0)[0] != descriptor.generation:
+            return None
+        data = bytes(buf[_HEADER.size : _HEADER.size + descriptor.size])
+        if _HEADER.unpack_from(buf, 0)[0] != descriptor.generation:
+            return None
+        return data
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            with suppress(BufferError):
+                segment.close()
+        self._segments.clear()
+
+    def _attach(self, descriptor: ShmDescriptor) -> SharedMemory:
+        segment = self._segments.get(descriptor.slot)
+        if segment is None or segment.name != descriptor.segment:
+            if segment is not None:
+                segment.close()  # the node grew this slot into a new segment
+            segment = SharedMemory(name=descriptor.segment, track=False)
+            self._segments[descriptor.slot] = segment
+        return segment
+
+
+def _buf(segment: SharedMemory) -> memoryview:
+    if segment.buf is None:
+        raise ValueError(f"shared-memory segment {segment.name} is closed")
+    return segment.buf
+
+
+def _destroy(segment: SharedMemory | None) -> None:
+    if segment is None:
+        return
+    with suppress(BufferError):
+        segment.close()
+    with suppress(FileNotFoundError):
+        segment.unlink()
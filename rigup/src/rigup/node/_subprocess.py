@@ -11,7 +11,9 @@ from rigup.config import NodeConfig
 from rigup.protocol import Action, Notify, PingPayload, ShutdownPayload, call, send_notify
 from rigup.transport import IPCAddress, TCPAddress, ZMQTransportClient
 
+from ._cache import InterfaceCache
 from ._remote import _parse_address
+from ._shm import SHM_THRESHOLD
 from ._transport import TransportNode
 
 
@@ -24,12 +26,20 @@ class SubprocessNode(TransportNode):
 
     When no address is configured, defaults to IPC (Unix domain sockets) —
     faster than TCP loopback, no port allocation, no conflicts between
-    concurrent rigs.
+    concurrent rigs. Streams at or above ``shm_threshold`` bytes travel through
+    shared memory (None keeps them on ZMQ).
     """
 
-    def __init__(self, node_id: str, config: NodeConfig) -> None:
+    def __init__(
+        self,
+        node_id: str,
+        config: NodeConfig,
+        *,
+        shm_threshold: int | None = SHM_THRESHOLD,
+        interface_cache: InterfaceCache | None = None,
+    ) -> None:
         self._config = config
-        super().__init__(node_id, ZMQTransportClient())
+        super().__init__(node_id, ZMQTransportClient(), shm_threshold=shm_threshold, interface_cache=interface_cache)
         self._process: asyncio.subprocess.Process | None = None
         self._ipc_dir: str | None = None
 
@@ -59,6 +69,7 @@ class SubprocessNode(TransportNode):
         # be delivered once the daemon's ROUTER is up. Generous timeout
         # covers cold Python startup + import time.
         await call(self._transport, Action.PING, PingPayload(), PingPayload, timeout_s=30.0)
+        await self._open_shm()
         self._log.info("SubprocessNode %s ready at %s (pid=%d)", self.node_id, address, self._process.pid)
 
     async def close(self) -> None:
@@ -73,6 +84,7 @@ class SubprocessNode(TransportNode):
 
         self._stop_log_relay()
         await self._transport.close()
+        self._close_shm()
 
         if self._process is not None:
             if self._process.returncode is None:
@@ -6,9 +6,23 @@ close, RPC) via the protocol layer. Subclasses provide :meth:`open` and
 
 Also contains :class:`TransportAdapter`, which implements :class:`Adapter`
 by routing device calls through the shared transport.
+
+When the node runs on the same host, :meth:`TransportNode._open_shm` negotiates
+a shared-memory side channel at connect time: large stream payloads are then
+read out of the node's shared-memory ring and only descriptors cross ZMQ (see
+:mod:`rigup.node._shm`).
+
+:meth:`TransportNode.rpc_stats` switches request tracing on both ends and reads
+back per-phase latency histograms from both (see :mod:`rigup.tracing`).
+
+With an :class:`~rigup.node._cache.InterfaceCache`, :meth:`TransportNode.build_devices`
+tells the node which interfaces it already holds; the node sends only those that changed,
+and each adapter starts out knowing its interface instead of fetching it.
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from contextlib import suppress
 from typing import Any, overload
 
@@ -30,19 +44,79 @@ from rigup.protocol import (
     Action,
     BuildDevicesRequest,
     BuildDevicesResponse,
+    CallBatcher,
     CloseDeviceRequest,
     Empty,
     GetInterfaceRequest,
     GetPropsRequest,
+    Notify,
+    RpcStatsRequest,
+    RpcStatsResponse,
     RunCommandsRequest,
     SetPropsRequest,
+    ShmDescriptor,
+    ShmOpenRequest,
+    ShmOpenResponse,
+    ShmReleasePayload,
+    ShmSubscribePayload,
     call,
+    send_notify,
 )
-from rigup.transport import TransportClient
-from rigup.wire import TopicDispatcher
+from rigup.tracing import SpanRecorder
+from rigup.transport import TransportClient, TransportError
+from rigup.wire import TopicDispatcher, decode
 
 from ._base import DevicesBuildResult, DevicesConfig, Node
+from ._cache import InterfaceCache
 from ._logs import relay_logs
+from ._shm import SHM_THRESHOLD, SHM_TOPIC_SUFFIX, ShmReader, create_probe
+
+
+class _ShmChannel:
+    """Client end of a negotiated shared-memory channel, shared by all adapters of a node.
+
+    Subscribes to the descriptor topic next to the inline one — the node publishes a payload on
+    exactly one of them — tells the node which topics it reads, and releases each slot as soon as
+    the payload is copied out.
+    """
+
+    def __init__(self, transport: TransportClient) -> None:
+        self._transport = transport
+        self._reader = ShmReader()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._log = logging.getLogger("rigup.node.shm")
+
+    def subscribe(self, full_topic: str, on_payload: Callable[[bytes], Awaitable[None]]) -> Teardown:
+        async def on_descriptor(data: bytes) -> None:
+            descriptor = decode(data, ShmDescriptor)
+            payload = self._reader.read(descriptor)
+            await send_notify(
+                self._transport,
+                Notify.SHM_RELEASE,
+                ShmReleasePayload(slots=[(descriptor.slot, descriptor.generation)]),
+            )
+            if payload is None:
+                self._log.warning("dropped a %s payload: its shm slot was reclaimed before it was read", full_topic)
+                return
+            await on_payload(payload)
+
+        unsub = self._transport.subscribe(f"{full_topic}{SHM_TOPIC_SUFFIX}", on_descriptor)
+        self._announce(full_topic, subscribed=True)
+
+        def teardown() -> None:
+            unsub()
+            self._announce(full_topic, subscribed=False)
+
+        return teardown
+
+    def _announce(self, full_topic: str, *, subscribed: bool) -> None:
+        payload = ShmSubscribePayload(topic=full_topic, subscribed=subscribed)
+        task = asyncio.get_running_loop().create_task(send_notify(self._transport, Notify.SHM_SUBSCRIBE, payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def close(self) -> None:
+        self._reader.close()
 
 
 class TransportAdapter[D: Device](Adapter[D]):
@@ -53,12 +127,28 @@ class TransportAdapter[D: Device](Adapter[D]):
     on first app-level subscribe for a topic; both go away when the last
     subscriber leaves. Decode happens once per wire message regardless of
     subscriber count; bytes pass through verbatim for byte subs.
+
+    Device RPC goes through a :class:`CallBatcher` — shared by all adapters of
+    a node — so calls to many devices issued together travel as one ``BATCH``.
+
+    ``interface``, when the node already sent it at build time, seeds
+    :meth:`cached_interface` so it needs no round trip.
     """
 
-    def __init__(self, uid: str, transport: TransportClient) -> None:
+    def __init__(
+        self,
+        uid: str,
+        transport: TransportClient,
+        batcher: CallBatcher | None = None,
+        shm: _ShmChannel | None = None,
+        interface: DeviceInterface | None = None,
+    ) -> None:
         super().__init__()
+        self._interface_cache = interface
         self._uid = uid
         self._transport = transport
+        self._batcher = batcher or CallBatcher(transport)
+        self._shm = shm
         self._log = logging.getLogger(f"{uid}.TransportAdapter")
         self._signals: dict[str, TopicDispatcher] = {}
         self._zmq_unsubs: dict[str, Teardown] = {}
@@ -75,7 +165,9 @@ class TransportAdapter[D: Device](Adapter[D]):
         return None
 
     async def interface(self) -> DeviceInterface:
-        return await call(self._transport, Action.GET_INTERFACE, GetInterfaceRequest(uid=self._uid), DeviceInterface)
+        return await self._batcher.call(
+            Action.GET_INTERFACE, GetInterfaceRequest(uid=self._uid), DeviceInterface, device=self._uid
+        )
 
     async def run_command(self, command: str, *args: Any, **kwargs: Any) -> Result:
         results = await self.run_commands([CommandRequest(attr=command, args=list(args), kwargs=kwargs)])
@@ -85,23 +177,25 @@ class TransportAdapter[D: Device](Adapter[D]):
         return Result.model_validate(results[f"0:{command}"].model_dump())
 
     async def run_commands(self, commands: list[CommandRequest]) -> Results:
-        return await call(
-            self._transport,
+        return await self._batcher.call(
             Action.RUN_COMMANDS,
             RunCommandsRequest(uid=self._uid, commands=commands),
             Results,
+            device=self._uid,
         )
 
     async def get_props(self, *props: str) -> PropResults:
-        return await call(
-            self._transport,
+        return await self._batcher.call(
             Action.GET_PROPS,
             GetPropsRequest(uid=self._uid, props=list(props)),
             PropResults,
+            device=self._uid,
         )
 
     async def set_props(self, **props: Any) -> PropResults:
-        return await call(self._transport, Action.SET_PROPS, SetPropsRequest(uid=self._uid, props=props), PropResults)
+        return await self._batcher.call(
+            Action.SET_PROPS, SetPropsRequest(uid=self._uid, props=props), PropResults, device=self._uid
+        )
 
     @overload
     def subscribe(self, topic: str, cb: StreamCallback[bytes]) -> Teardown: ...
@@ -136,7 +230,15 @@ class TransportAdapter[D: Device](Adapter[D]):
         async def on_wire(data: bytes) -> None:
             await sig.emit_bytes(data)
 
-        self._zmq_unsubs[full_topic] = self._transport.subscribe(full_topic, on_wire)
+        unsub = self._transport.subscribe(full_topic, on_wire)
+        if self._shm is not None:
+            unsub_inline, unsub_shm = unsub, self._shm.subscribe(full_topic, on_wire)
+
+            def unsub() -> None:
+                unsub_inline()
+                unsub_shm()
+
+        self._zmq_unsubs[full_topic] = unsub
         return sig
 
     def _maybe_release(self, full_topic: str) -> None:
@@ -162,15 +264,34 @@ class TransportNode(Node):
 
     Implements device build/close via protocol calls. Subclasses provide
     ``open`` and ``close`` for their specific lifecycle.
+
+    ``shm_threshold`` is the payload size from which streams should travel
+    through shared memory when the node turns out to share this host; None
+    keeps every payload inline.
+
+    ``interface_cache`` keeps device interfaces across connections, so a
+    rebuild only transfers the interfaces that changed; None disables it.
     """
 
-    def __init__(self, node_id: str, transport: TransportClient) -> None:
+    def __init__(
+        self,
+        node_id: str,
+        transport: TransportClient,
+        *,
+        shm_threshold: int | None = SHM_THRESHOLD,
+        interface_cache: InterfaceCache | None = None,
+    ) -> None:
         self._node_id = node_id
         self._transport = transport
         self._log = logging.getLogger(f"rigup.node.{node_id}")
+        self._batcher = CallBatcher(transport)
+        self._shm_threshold = shm_threshold
+        self._shm: _ShmChannel | None = None
+        self._interface_cache = interface_cache
         self._adapters: dict[str, TransportAdapter] = {}
         self._handles: dict[str, DeviceHandle] = {}
         self._log_relay: Teardown | None = None
+        self._spans = SpanRecorder()
 
     def _start_log_relay(self) -> None:
         """Relay this node's forwarded logs into the local logging system. Call once, after the
@@ -184,6 +305,55 @@ class TransportNode(Node):
             self._log_relay()
             self._log_relay = None
 
+    async def _open_shm(self) -> None:
+        """Offer the node a shared-memory channel. Call once, after the transport connects.
+
+        The node accepts only if it can attach to a probe segment created here — i.e. it runs on
+        this host and in the same shared-memory namespace. Otherwise payloads stay inline.
+        """
+        if self._shm_threshold is None or self._shm is not None:
+            return
+        probe, token = create_probe()
+        try:
+            response = await call(
+                self._transport,
+                Action.OPEN_SHM,
+                ShmOpenRequest(probe=probe.name, token=token, threshold=self._shm_threshold),
+                ShmOpenResponse,
+            )
+        except TransportError as e:
+            self._log.debug("Shared memory unavailable on node %s: %s", self._node_id, e)
+            return
+        finally:
+            probe.close()
+            probe.unlink()
+        if not response.accepted:
+            self._log.debug("Shared memory refused by node %s: %s", self._node_id, response.reason)
+            return
+        self._shm = _ShmChannel(self._transport)
+        self._log.info("Shared memory open to node %s (payloads >= %d bytes)", self._node_id, self._shm_threshold)
+
+    def _close_shm(self) -> None:
+        """Detach from the node's shared memory. Call after the devices' adapters are closed."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    async def rpc_stats(self, *, enable: bool | None = None, reset: bool = False) -> RpcStatsResponse:
+        """The node's RPC latency histograms followed by this client's.
+
+        ``enable`` first switches tracing on or off at both ends; ``reset`` clears both once read.
+        """
+        if enable is not None:
+            self._transport.trace(self._spans if enable else None)
+        response = await call(
+            self._transport, Action.RPC_STATS, RpcStatsRequest(enable=enable, reset=reset), RpcStatsResponse
+        )
+        response.stats.extend(self._spans.stats())
+        if reset:
+            self._spans.reset()
+        return response
+
     @property
     def node_id(self) -> str:
         return self._node_id
@@ -193,10 +363,13 @@ class TransportNode(Node):
         return self._transport
 
     async def build_devices(self, configs: DevicesConfig) -> DevicesBuildResult:
+        cached = self._interface_cache.load(self._node_id, configs) if self._interface_cache else {}
         response = await call(
             self._transport,
             Action.BUILD_DEVICES,
-            BuildDevicesRequest(devices=dict(configs)),
+            BuildDevicesRequest(
+                devices=dict(configs), known={uid: interface.content_hash() for uid, interface in cached.items()}
+            ),
             BuildDevicesResponse,
             timeout_s=120.0,
         )
@@ -204,9 +377,12 @@ class TransportNode(Node):
         for uid, err in response.errors.items():
             self._log.error("Remote build failed for %s: %s", uid, err.message)
 
+        if self._interface_cache is not None:
+            self._interface_cache.store(self._node_id, response.built)
         handles: dict[str, DeviceHandle] = {}
-        for uid in response.built:
-            adapter: TransportAdapter = TransportAdapter(uid, self._transport)
+        for uid in response.hashes or response.built:  # a node predating interface hashes only sends `built`
+            interface = response.built.get(uid) or cached.get(uid)
+            adapter: TransportAdapter = TransportAdapter(uid, self._transport, self._batcher, self._shm, interface)
             await adapter.start()
             handle = DeviceHandle(adapter)
             self._adapters[uid] = adapter
@@ -9,16 +9,22 @@ Higher layers (``Rig``, ``Node``, ``DeviceController``) speak this protocol;
 they never touch the transport's raw bytes directly.
 """
 
+import asyncio
+import logging
 from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
 from enum import StrEnum
+from typing import Any
 
 from pydantic import BaseModel, Field
 
 from .build import BuildError
 from .config import DeviceConfig
-from .device import CommandRequest, DeviceInterface, PropResults, Results
-from .transport import TransportClient, TransportServer
+from .device import CommandRequest, DeviceInterface, PropResults, Result, Results
+from .tracing import Span, SpanStats, _current_span, current_span
+from .transport import TransportClient, TransportError, TransportServer
+
+log = logging.getLogger("rigup.protocol")
 
 # ==================== Vocabulary ====================
 
@@ -46,6 +52,15 @@ class Action(StrEnum):
     # Liveness
     PING = "ping"
 
+    # Per-phase RPC latency histograms — see ``RpcStatsRequest``
+    RPC_STATS = "rpc_stats"
+
+    # Same-host shared-memory side channel for large stream payloads — see ``ShmOpenRequest``
+    OPEN_SHM = "open_shm"
+
+    # Several requests in one round trip — see ``BatchRequest``
+    BATCH = "batch"
+
 
 class Notify(StrEnum):
     """One-way notifications — no response expected."""
@@ -53,6 +68,8 @@ class Notify(StrEnum):
     HEARTBEAT = "heartbeat"
     DEVICE_ERROR = "device_error"
     SHUTDOWN = "shutdown"
+    SHM_SUBSCRIBE = "shm_subscribe"
+    SHM_RELEASE = "shm_release"
 
 
 # ==================== Payload models ====================
@@ -91,18 +108,29 @@ class GetConfigResponse(BaseModel):
     devices: Mapping[str, DeviceConfig]
 
 
+class ListDevicesRequest(BaseModel):
+    interfaces: bool = Field(default=True, description="Include full interfaces; False lists only their hashes.")
+
+
 class ListDevicesResponse(BaseModel):
-    """Currently-built devices on the node, keyed by uid."""
+    """Currently-built devices on the node, keyed by uid, with each interface's ``content_hash``."""
 
-    devices: Mapping[str, DeviceInterface]
+    devices: Mapping[str, DeviceInterface] = Field(default_factory=dict)
+    hashes: Mapping[str, str] = Field(default_factory=dict)
 
 
 class BuildDevicesRequest(BaseModel):
     devices: Mapping[str, DeviceConfig]
+    known: Mapping[str, str] = Field(
+        default_factory=dict, description="uid -> hash of the interface the client already holds for it."
+    )
 
 
 class BuildDevicesResponse(BaseModel):
+    """``hashes`` names every built device; ``built`` carries the interfaces the client did not already know."""
+
     built: Mapping[str, DeviceInterface] = Field(default_factory=dict)
+    hashes: Mapping[str, str] = Field(default_factory=dict)
     errors: Mapping[str, BuildError] = Field(default_factory=dict)
 
 
@@ -147,6 +175,92 @@ class PingPayload(BaseModel):
     timestamp: float | None = None
 
 
+# --- RPC statistics ---
+
+
+class RpcStatsRequest(BaseModel):
+    """Read the node's RPC latency histograms (see :mod:`rigup.tracing`), optionally switching tracing first."""
+
+    enable: bool | None = Field(default=None, description="Start (True) or stop (False) tracing; None leaves it.")
+    reset: bool = Field(default=False, description="Clear the histograms once answered, starting a new window.")
+
+
+class RpcStatsResponse(BaseModel):
+    enabled: bool
+    stats: list[SpanStats] = Field(default_factory=list)
+
+
+# --- Shared memory ---
+
+
+class ShmOpenRequest(BaseModel):
+    """Ask the node to publish large stream payloads through shared memory.
+
+    ``probe`` names a shared-memory segment the client created holding ``token``; the node only
+    accepts if it can attach to it and read the token back, i.e. both ends share a host and
+    shared-memory namespace.
+    """
+
+    probe: str
+    token: str
+    threshold: int = Field(ge=0, description="Payloads of at least this many bytes travel through shared memory.")
+
+
+class ShmOpenResponse(BaseModel):
+    accepted: bool
+    reason: str = ""
+
+
+class ShmDescriptor(BaseModel):
+    """Where one published payload lives: published on ``{topic}@shm`` in place of the payload."""
+
+    segment: str
+    slot: int
+    generation: int
+    size: int
+
+
+class ShmSubscribePayload(BaseModel):
+    """The client starts (or stops) reading ``topic`` through shared memory.
+
+    The node holds each shared-memory payload until every subscribed reader released it.
+    """
+
+    topic: str
+    subscribed: bool = True
+
+
+class ShmReleasePayload(BaseModel):
+    """The client has copied these payloads out; their slots may be reused."""
+
+    slots: list[tuple[int, int]] = Field(description="(slot, generation) pairs.")
+
+
+# --- Batching ---
+
+
+class BatchEntry(BaseModel):
+    """One request inside a ``BATCH``: an action and its request model dumped to JSON-compatible data.
+
+    ``device`` is the ordering key — entries naming the same device run one after another in list
+    order, while entries for different devices run concurrently. ``None`` groups node-level entries.
+    """
+
+    device: str | None = None
+    action: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    entries: list[BatchEntry]
+
+
+class BatchResponse(BaseModel):
+    """One result per entry, in request order: the dumped response model, or the handler's error."""
+
+    results: list[Result[Any]]
+
+
 # --- Notifies ---
 
 
@@ -205,6 +319,7 @@ class Dispatcher:
     def __init__(self) -> None:
         self._requests: dict[str, _RequestEntry] = {}
         self._notifies: dict[str, _NotifyEntry] = {}
+        self.on_request(Action.BATCH, BatchRequest, BatchResponse, self._handle_batch)
 
     def on_request[Req: BaseModel, Resp: BaseModel](
         self,
@@ -231,8 +346,15 @@ class Dispatcher:
         if entry is None:
             raise ValueError(f"no request handler for action {action!r}")
         req = entry.req_model.model_validate_json(payload) if payload else entry.req_model()
+        if (span := current_span()) is None:
+            return (await entry.handler(req)).model_dump_json().encode()
+        span.device = getattr(req, "uid", None)  # device RPC requests name their device
+        span.mark("dispatched")
         resp = await entry.handler(req)
-        return resp.model_dump_json().encode()
+        span.mark("handled")
+        data = resp.model_dump_json().encode()
+        span.mark("serialized")
+        return data
 
     async def handle_notify(self, action: str, payload: bytes) -> None:
         """Transport-facing notify handler. Unknown actions are silently dropped."""
@@ -242,6 +364,51 @@ class Dispatcher:
         msg = entry.payload_model.model_validate_json(payload) if payload else entry.payload_model()
         await entry.handler(msg)
 
+    async def _handle_batch(self, batch: BatchRequest) -> BatchResponse:
+        """Run every entry, serially per device and concurrently across devices."""
+        results: list[Result[Any]] = [Result.err("not run")] * len(batch.entries)
+        lanes: dict[str | None, list[int]] = {}
+        for index, entry in enumerate(batch.entries):
+            lanes.setdefault(entry.device, []).append(index)
+
+        async def run_lane(indices: list[int]) -> None:
+            for index in indices:
+                results[index] = await self._run_batch_entry(batch.entries[index])
+
+        await asyncio.gather(*(run_lane(indices) for indices in lanes.values()))
+        return BatchResponse(results=results)
+
+    async def _run_batch_entry(self, batch_entry: BatchEntry) -> Result[Any]:
+        if (parent := current_span()) is None:
+            return await self._run_entry(batch_entry)
+        span = Span("node", batch_entry.action, batch_entry.device)
+        parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            return await self._run_entry(batch_entry)
+        finally:
+            span.mark("serialized")
+            _current_span.reset(token)
+
+    async def _run_entry(self, batch_entry: BatchEntry) -> Result[Any]:
+        span = current_span()
+        if batch_entry.action == Action.BATCH:
+            return Result.err("batches cannot be nested")
+        entry = self._requests.get(batch_entry.action)
+        if entry is None:
+            return Result.err(f"no request handler for action {batch_entry.action!r}")
+        try:
+            req = entry.req_model.model_validate(batch_entry.payload)
+            if span is not None:
+                span.mark("dispatched")
+            resp = await entry.handler(req)
+        except Exception as e:
+            log.exception("batched request handler raised (action=%s)", batch_entry.action)
+            return Result.err(f"{e}")
+        if span is not None:
+            span.mark("handled")
+        return Result.ok(resp.model_dump(mode="json"))
+
 
 def bind(dispatcher: Dispatcher, peer: TransportClient | TransportServer) -> None:
     """Wire ``dispatcher`` into a transport's request/notify handlers.
@@ -273,16 +440,180 @@ async def call[Resp: BaseModel](
     pushing a request to the connected client (via ``push_request``).
     Raises :class:`rigup.transport.TransportError` if the remote handler
     raised or is missing; :class:`asyncio.TimeoutError` on deadline.
+
+    A client whose transport traces records a span of the call (see :mod:`rigup.tracing`).
     """
     key = action.value if isinstance(action, Action) else action
+    span: Span | None = None
+    if isinstance(transport, TransportClient) and transport.tracer is not None:
+        span = Span("client", key, getattr(request, "uid", None))
+        span.mark("enqueued")
+    return await _call(transport, key, request, response_model, timeout_s, span)
+
+
+async def _call[Resp: BaseModel](
+    transport: TransportClient | TransportServer,
+    key: str,
+    request: BaseModel,
+    response_model: type[Resp],
+    timeout_s: float,
+    span: Span | None,
+) -> Resp:
     # fallback=str: values with no JSON form in an `Any`-typed position (e.g. a PurePath command
     # arg) serialize as their string; the receiver coerces them back per the command's signature.
     payload = request.model_dump_json(fallback=str).encode()
     if isinstance(transport, TransportServer):
         response_bytes = await transport.push_request(key, payload, timeout_s=timeout_s)
-    else:
+        return response_model.model_validate_json(response_bytes)
+    if span is None:
+        return response_model.model_validate_json(await transport.request(key, payload, timeout_s=timeout_s))
+    token = _current_span.set(span)  # the transport reports the node's time on it
+    try:
+        span.mark("sent")
         response_bytes = await transport.request(key, payload, timeout_s=timeout_s)
-    return response_model.model_validate_json(response_bytes)
+        span.mark("replied")
+    finally:
+        _current_span.reset(token)
+    response = response_model.model_validate_json(response_bytes)
+    span.mark("decoded")
+    if transport.tracer is not None:
+        transport.tracer.record(span)
+    return response
+
+
+@dataclass(slots=True)
+class _QueuedCall:
+    device: str | None
+    action: str
+    request: BaseModel
+    response_model: type[BaseModel]
+    timeout_s: float
+    future: asyncio.Future[Any]
+    span: Span | None
+
+
+class CallBatcher:
+    """Client-side :func:`call` that coalesces calls issued in the same event-loop tick into one ``BATCH``.
+
+    Callers that fan out with ``asyncio.gather`` — applying a profile, reading every device on a
+    route — then share one round trip instead of one each. A lone call is sent as a plain request,
+    so sequential callers pay nothing extra. Each caller gets its own response or exception, as
+    with :func:`call`; the batch waits for the longest ``timeout_s`` among its entries.
+
+    When the transport traces, each call's span starts when it is queued, so its ``queue`` phase
+    includes the wait for the flush; the calls of a batch share its send and reply marks.
+    """
+
+    def __init__(self, transport: TransportClient, *, max_entries: int = 256) -> None:
+        self._transport = transport
+        self._max_entries = max_entries
+        self._queued: list[_QueuedCall] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def call[Resp: BaseModel](
+        self,
+        action: str | Action,
+        request: BaseModel,
+        response_model: type[Resp],
+        *,
+        device: str | None = None,
+        timeout_s: float = _RPC_TIMEOUT_S,
+    ) -> Resp:
+        """Queue a typed request for the next flush and await its response."""
+        loop = asyncio.get_running_loop()
+        key = action.value if isinstance(action, Action) else action
+        future: asyncio.Future[Any] = loop.create_future()
+        span: Span | None = None
+        if self._transport.tracer is not None:
+            span = Span("client", key, device)
+            span.mark("enqueued")
+        self._queued.append(_QueuedCall(device, key, request, response_model, timeout_s, future, span))
+        if len(self._queued) >= self._max_entries:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queued, self._queued = self._queued, []
+        if not queued:
+            return
+        task = asyncio.create_task(self._send(queued), name="rigup-call-batch")
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, queued: list[_QueuedCall]) -> None:
+        if len(queued) == 1:
+            (single,) = queued
+            try:
+                response = await _call(
+                    self._transport, single.action, single.request, single.response_model, single.timeout_s, single.span
+                )
+            except Exception as e:
+                _settle(single.future, error=e)
+            else:
+                _settle(single.future, value=response)
+            return
+
+        batch = BatchRequest(
+            entries=[
+                BatchEntry(device=q.device, action=q.action, payload=q.request.model_dump(mode="json", fallback=str))
+                for q in queued
+            ]
+        )
+        span: Span | None = None
+        if self._transport.tracer is not None:
+            span = Span("client", Action.BATCH.value)
+            span.mark("enqueued")
+        try:
+            response = await _call(
+                self._transport, Action.BATCH, batch, BatchResponse, max(q.timeout_s for q in queued), span
+            )
+        except Exception as e:
+            for q in queued:
+                _settle(q.future, error=e)
+            return
+        if len(response.results) != len(queued):
+            mismatch = TransportError(f"batch of {len(queued)} answered with {len(response.results)} results")
+            for q in queued:
+                _settle(q.future, error=mismatch)
+            return
+        for q, result in zip(queued, response.results, strict=True):
+            try:
+                value = result.unwrap()
+            except RuntimeError as e:  # the remote handler failed; surface it as call() would
+                _settle(q.future, error=TransportError(str(e)))
+                continue
+            try:
+                _settle(q.future, value=q.response_model.model_validate(value))
+            except Exception as e:
+                _settle(q.future, error=e)
+                continue
+            if q.span is not None and span is not None:
+                self._record_entry(q.span, span)
+
+    def _record_entry(self, entry: Span, batch: Span) -> None:
+        """Record a batched call's span: sent and answered with ``batch``, decoded just now."""
+        for mark in ("sent", "replied"):
+            if mark in batch.marks:
+                entry.marks.setdefault(mark, batch.marks[mark])
+        entry.node_ns = batch.node_ns
+        entry.mark("decoded")
+        if self._transport.tracer is not None:
+            self._transport.tracer.record(entry)
+
+
+def _settle(future: asyncio.Future[Any], *, value: Any = None, error: BaseException | None = None) -> None:
+    if future.done():  # the caller gave up (cancelled or timed out) — nothing to deliver
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
 
 
 async def send_notify(transport: TransportClient | TransportServer, action: str | Notify, payload: BaseModel) -> None:
@@ -299,8 +630,12 @@ async def send_notify(transport: TransportClient | TransportServer, action: str
 # so call sites can import all protocol types from one place.
 __all__ = [
     "Action",
+    "BatchEntry",
+    "BatchRequest",
+    "BatchResponse",
     "BuildDevicesRequest",
     "BuildDevicesResponse",
+    "CallBatcher",
     "ClaimRequest",
     "ClaimResponse",
     "CloseDeviceRequest",
@@ -312,6 +647,7 @@ __all__ = [
     "GetInterfaceRequest",
     "GetPropsRequest",
     "HeartbeatPayload",
+    "ListDevicesRequest",
     "ListDevicesResponse",
     "Notify",
     "NotifyHandlerFn",
@@ -321,8 +657,15 @@ __all__ = [
     "ReleaseResponse",
     "RequestHandlerFn",
     "Results",
+    "RpcStatsRequest",
+    "RpcStatsResponse",
     "RunCommandsRequest",
     "SetPropsRequest",
+    "ShmDescriptor",
+    "ShmOpenRequest",
+    "ShmOpenResponse",
+    "ShmReleasePayload",
+    "ShmSubscribePayload",
     "ShutdownPayload",
     "bind",
     "call",
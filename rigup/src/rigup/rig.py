@@ -14,7 +14,7 @@ import logging
 from rigup.build import BuildError
 from rigup.config import NodeConfig, RigConfig
 from rigup.device import DeviceHandle
-from rigup.node import LocalNode, Node, RemoteNode, SubprocessNode
+from rigup.node import InterfaceCache, LocalNode, Node, RemoteNode, SubprocessNode
 
 
 class Rig:
@@ -23,11 +23,16 @@ class Rig:
     ``open`` creates nodes from config, connects/spawns them, and builds
     all declared devices. ``close`` tears everything down. No partial
     operations — the rig is either fully open or fully closed.
+
+    Interfaces of subprocess and remote devices are kept in ``interface_cache``
+    (the per-user :meth:`InterfaceCache.default` unless given), so reopening a
+    rig only transfers the interfaces that changed.
     """
 
-    def __init__(self, config: RigConfig, name: str = "Rig") -> None:
+    def __init__(self, config: RigConfig, name: str = "Rig", *, interface_cache: InterfaceCache | None = None) -> None:
         self._name = name
         self._config = config
+        self._interface_cache = interface_cache if interface_cache is not None else InterfaceCache.default()
         self._log = logging.getLogger(f"rigup.rig.{name}")
         self._nodes: dict[str, Node] = {}
         self._build_errors: dict[str, BuildError] = {}
@@ -98,9 +103,9 @@ class Rig:
     def _create_transport_node(self, node_id: str, config: NodeConfig) -> Node:
         match config.kind:
             case "subprocess":
-                return SubprocessNode(node_id, config)
+                return SubprocessNode(node_id, config, interface_cache=self._interface_cache)
             case "remote":
-                return RemoteNode(node_id, config)
+                return RemoteNode(node_id, config, interface_cache=self._interface_cache)
 
     async def _build_all_devices(self) -> None:
         if self._config.devices:
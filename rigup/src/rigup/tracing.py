@@ -0,0 +1,261 @@
+"""Optional span timing for rigup RPC, aggregated into per-device, per-action latency histograms.
+
+While a transport has a :class:`SpanRecorder` (see ``TransportClient.trace`` / ``TransportServer.trace``),
+each request carries a :class:`Span` in a context variable from the moment it is issued or received to
+the moment its reply is decoded or sent. The layers it passes through mark it:
+
+- client — ``enqueued`` (call issued), ``sent`` (request serialized and handed to the transport),
+  ``replied`` (reply bytes back), ``decoded`` (reply validated);
+- node — ``received`` (frames read off the socket), ``dispatched`` (request decoded, handler starts),
+  ``handled`` (handler returned), ``serialized`` (reply encoded), ``replied`` (reply frames sent).
+
+Device calls add their queue wait on the device thread and their execution time, summed over every
+call the request made. Each entry of a ``BATCH`` gets a child span of its own, recorded with the
+batch. When the node traces too, it returns its own ``received -> serialized`` time with the reply,
+so the client can tell the network from the node. Phases (the gaps between marks) are recorded into
+:class:`LatencyHistogram` s: log-linear buckets, HDR-style, within ~3% of the true value.
+
+This module is leaf-level: transports, the dispatcher and the device scheduler all import it.
+"""
+
+import time
+from collections import deque
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+type Side = Literal["client", "node"]
+
+CLIENT_MARKS = ("enqueued", "sent", "replied", "decoded")
+NODE_MARKS = ("received", "dispatched", "handled", "serialized", "replied")
+
+_SUB_BITS = 5  # 32 linear sub-buckets per power of two
+_SUB_COUNT = 1 << _SUB_BITS
+
+_current_span: ContextVar["Span | None"] = ContextVar("rigup_current_span", default=None)
+
+
+def current_span() -> "Span | None":
+    """The span of the request being issued or handled in this context, if it is traced."""
+    return _current_span.get()
+
+
+def _bucket(ns: int) -> int:
+    if ns < _SUB_COUNT:
+        return max(ns, 0)
+    shift = ns.bit_length() - 1 - _SUB_BITS
+    return (shift + 1) * _SUB_COUNT + (ns >> shift) - _SUB_COUNT
+
+
+def _bucket_bounds(index: int) -> tuple[int, int]:
+    """``[low, high)`` of the values that land in bucket ``index``."""
+    if index < _SUB_COUNT:
+        return index, index + 1
+    shift = index // _SUB_COUNT - 1
+    low = (index % _SUB_COUNT + _SUB_COUNT) << shift
+    return low, low + (1 << shift)
+
+
+class HistogramSnapshot(BaseModel):
+    """Immutable copy of a :class:`LatencyHistogram`, as sent over the wire."""
+
+    count: int
+    sum_ns: int
+    min_ns: int
+    max_ns: int
+    buckets: list[tuple[int, int]] = Field(description="(bucket index, count) for every non-empty bucket.")
+
+    @property
+    def mean_ns(self) -> float:
+        return self.sum_ns / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Value (ns) at quantile ``q`` in [0, 1]: the midpoint of the bucket holding it, clamped to min/max."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, n in self.buckets:
+            seen += n
+            if seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min(max((low + high - 1) / 2, self.min_ns), self.max_ns)
+        return float(self.max_ns)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations. Recording is O(1); histograms merge by adding counts."""
+
+    __slots__ = ("_counts", "count", "max_ns", "min_ns", "sum_ns")
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.sum_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        index = _bucket(ns)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.min_ns = ns if not self.count else min(self.min_ns, ns)
+        self.max_ns = max(self.max_ns, ns)
+        self.count += 1
+        self.sum_ns += ns
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            count=self.count,
+            sum_ns=self.sum_ns,
+            min_ns=self.min_ns,
+            max_ns=self.max_ns,
+            buckets=sorted(self._counts.items()),
+        )
+
+
+@dataclass(slots=True)
+class Span:
+    """Timestamps (``perf_counter_ns``) of one request on one side. Each mark keeps its first occurrence."""
+
+    side: Side
+    action: str
+    device: str | None = None
+    marks: dict[str, int] = field(default_factory=dict)
+    device_wait_ns: int = 0
+    execute_ns: int = 0
+    device_calls: int = 0
+    node_ns: int | None = None
+    """Client side: the node's ``received -> serialized`` time for this request, if the node traces."""
+    children: list["Span"] = field(default_factory=list)
+
+    def mark(self, name: str) -> None:
+        self.marks.setdefault(name, time.perf_counter_ns())
+
+    def device_call(self, queued_ns: int, started_ns: int, finished_ns: int) -> None:
+        """Account one call into the device: waited ``queued -> started``, ran ``started -> finished``."""
+        self.device_wait_ns += started_ns - queued_ns
+        self.execute_ns += finished_ns - started_ns
+        self.device_calls += 1
+
+    def phases(self) -> dict[str, int]:
+        """Durations (ns) of this span's phases, for the marks it reached."""
+        m = self.marks
+        phases: dict[str, int] = {}
+
+        def gap(name: str, start: str, end: str) -> None:
+            if start in m and end in m:
+                phases[name] = m[end] - m[start]
+
+        if self.side == "client":
+            gap("queue", "enqueued", "sent")
+            gap("round_trip", "sent", "replied")
+            gap("decode", "replied", "decoded")
+            if self.node_ns is not None and "round_trip" in phases:
+                phases["network"] = max(phases["round_trip"] - self.node_ns, 0)
+            gap("total", "enqueued", "decoded")
+            return phases
+
+        gap("receive", "received", "dispatched")
+        if self.device_calls:
+            phases["device_wait"] = self.device_wait_ns
+            phases["execute"] = self.execute_ns
+        if "dispatched" in m and "handled" in m:
+            phases["handler"] = max(m["handled"] - m["dispatched"] - self.device_wait_ns - self.execute_ns, 0)
+        gap("serialize", "handled", "serialized")
+        gap("reply", "serialized", "replied")
+        gap("total", "received", "replied")
+        return phases
+
+
+class SpanStats(BaseModel):
+    """Phase histograms of every span recorded for one (side, device, action)."""
+
+    side: Side
+    device: str | None
+    action: str
+    phases: dict[str, HistogramSnapshot]
+
+
+class SpanRecorder:
+    """Aggregates finished spans into histograms keyed by (side, device, action, phase).
+
+    Also keeps the ``keep`` most recent spans for inspection.
+    """
+
+    def __init__(self, *, keep: int = 256) -> None:
+        self._histograms: dict[tuple[Side, str | None, str], dict[str, LatencyHistogram]] = {}
+        self.recent: deque[Span] = deque(maxlen=keep)
+
+    def record(self, span: Span) -> None:
+        """Add ``span``'s phases (and its children's) to the histograms."""
+        for child in span.children:
+            self.record(child)
+        phases = self._histograms.setdefault((span.side, span.device, span.action), {})
+        for name, ns in span.phases().items():
+            histogram = phases.get(name)
+            if histogram is None:
+                histogram = phases[name] = LatencyHistogram()
+            histogram.record(ns)
+        self.recent.append(span)
+
+    def stats(self) -> list[SpanStats]:
+        return [
+            SpanStats(
+                side=side,
+                device=device,
+                action=action,
+                phases={name: histogram.snapshot() for name, histogram in phases.items()},
+            )
+            for (side, device, action), phases in sorted(
+                self._histograms.items(), key=lambda item: (item[0][0], item[0][1] or "", item[0][2])
+            )
+        ]
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self.recent.clear()
+
+
+def format_report(stats: Iterable[SpanStats]) -> str:
+    """Plain-text table of phase percentiles (µs), one row per (side, device, action, phase)."""
+    header = ("side", "device", "action", "phase", "count", "p50 us", "p90 us", "p99 us", "max us")
+    rows: list[tuple[str, ...]] = []
+    for entry in stats:
+        for phase, histogram in entry.phases.items():
+            rows.append(
+                (
+                    entry.side,
+                    entry.device or "-",
+                    entry.action,
+                    phase,
+                    str(histogram.count),
+                    *(f"{histogram.percentile(q) / 1e3:.1f}" for q in (0.5, 0.9, 0.99)),
+                    f"{histogram.max_ns / 1e3:.1f}",
+                )
+            )
+    if not rows:
+        return "no spans recorded"
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+
+    def line(row: tuple[str, ...]) -> str:  # names left-aligned, numbers right-aligned
+        cells = (cell.ljust(w) if i < 4 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths, strict=True)))
+        return "  ".join(cells).rstrip()
+
+    return "\n".join(line(row) for row in (header, *rows))
+
+
+__all__ = [
+    "CLIENT_MARKS",
+    "NODE_MARKS",
+    "HistogramSnapshot",
+    "LatencyHistogram",
+    "Side",
+    "Span",
+    "SpanRecorder",
+    "SpanStats",
+    "current_span",
+    "format_report",
+]
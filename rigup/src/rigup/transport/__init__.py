@@ -11,12 +11,14 @@ from ._base import (
     MessageKind,
     NodeAddress,
     NotifyHandler,
+    PeerLostHandler,
     RequestHandler,
     TCPAddress,
     TopicCallback,
     TransportClient,
     TransportError,
     TransportServer,
+    current_peer,
 )
 from ._zmq import ZMQTransportClient, ZMQTransportServer
 
@@ -26,6 +28,7 @@ __all__ = [
     "MessageKind",
     "NodeAddress",
     "NotifyHandler",
+    "PeerLostHandler",
     "RequestHandler",
     "TCPAddress",
     "TopicCallback",
@@ -34,4 +37,5 @@ __all__ = [
     "TransportServer",
     "ZMQTransportClient",
     "ZMQTransportServer",
+    "current_peer",
 ]
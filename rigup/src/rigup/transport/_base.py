@@ -12,19 +12,30 @@ others):
   property changes) does not back-pressure the reliable channel.
 
 Every reliable message is one of three kinds — ``request``, ``response``,
-``notify`` — encoded in a leading byte of the payload frames. Transport owns
+``notify`` — encoded in a leading byte of the payload frames, plus a bare
+``heartbeat`` a client sends while otherwise idle. Transport owns
 request-ID correlation; higher layers just await ``request`` and get response
 bytes back (or a :class:`TransportError`).
+
+A server may be connected to several clients at once. Each is a *peer* with
+an opaque id; handlers learn which peer sent the message they are handling
+from :func:`current_peer`.
+
+Either side can be given a :class:`~rigup.tracing.SpanRecorder` with ``trace``;
+requests then carry a :class:`~rigup.tracing.Span` (see :mod:`rigup.tracing`).
 """
 
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
 from enum import IntEnum
 from typing import Self
 
 from pydantic import BaseModel, Field
 from vxlib.lifecycle import Teardown
 
+from rigup.tracing import SpanRecorder
+
 
 class MessageKind(IntEnum):
     """First-byte discriminator for reliable-channel frames."""
@@ -32,6 +43,7 @@ class MessageKind(IntEnum):
     REQUEST = 0
     RESPONSE = 1
     NOTIFY = 2
+    HEARTBEAT = 3
 
 
 type RequestHandler = Callable[[str, bytes], Awaitable[bytes]]
@@ -46,6 +58,16 @@ type NotifyHandler = Callable[[str, bytes], Awaitable[None]]
 type TopicCallback = Callable[[bytes], Awaitable[None]]
 """Callback for pub/sub topic messages. Receives raw bytes."""
 
+type PeerLostHandler = Callable[[str], None]
+"""Called with a peer's id once the server stops hearing from it."""
+
+_current_peer: ContextVar[str | None] = ContextVar("rigup_transport_peer", default=None)
+
+
+def current_peer() -> str | None:
+    """Id of the peer whose request or notify is being handled; ``None`` outside a server handler."""
+    return _current_peer.get()
+
 
 class TransportError(RuntimeError):
     """Raised when a remote handler raised, is missing, or reports an error."""
@@ -164,13 +186,27 @@ class TransportClient(ABC):
     def subscribe(self, topic: str, cb: TopicCallback) -> Teardown:
         """Subscribe to a pub/sub topic. Returns a ``Teardown`` to remove the callback."""
 
+    @abstractmethod
+    def trace(self, recorder: SpanRecorder | None) -> None:
+        """Record a span for every request sent from now on into ``recorder`` (``None`` stops tracing).
+
+        The span is created by :func:`rigup.protocol.call`; the transport adds the node's own time
+        when the reply carries it.
+        """
+
+    @property
+    @abstractmethod
+    def tracer(self) -> SpanRecorder | None:
+        """The recorder set by :meth:`trace`, if tracing."""
+
 
 class TransportServer(ABC):
-    """Server side of a transport — binds one address pair for one peer.
+    """Server side of a transport — binds one address pair, serves any number of peers.
 
-    Single-orchestrator model: server tracks a single connected client's
-    identity (updated on any received frame). ``push_request`` / ``push_notify``
-    target that peer; they raise if no client has been seen yet.
+    The server keeps a session per connected client, refreshed by every frame it
+    receives (including heartbeats), and forgets a peer once it falls silent.
+    ``push_request`` / ``push_notify`` target a given peer, or the most recently
+    active one; they raise if no client has been seen yet.
     """
 
     @abstractmethod
@@ -188,13 +224,37 @@ class TransportServer(ABC):
         """Register the handler for client-initiated notifies (one at a time)."""
 
     @abstractmethod
-    async def push_request(self, action: str, payload: bytes, *, timeout_s: float | None = None) -> bytes:
-        """Send a request *to* the connected client, await the response."""
+    def on_peer_lost(self, handler: PeerLostHandler) -> None:
+        """Register the handler called when a peer stops sending (one at a time)."""
+
+    @property
+    @abstractmethod
+    def peers(self) -> list[str]:
+        """Ids of the peers currently connected."""
 
     @abstractmethod
-    async def push_notify(self, action: str, payload: bytes) -> None:
-        """Send a notify *to* the connected client. Fire-and-forget."""
+    async def push_request(
+        self, action: str, payload: bytes, *, timeout_s: float | None = None, peer: str | None = None
+    ) -> bytes:
+        """Send a request *to* ``peer`` (default: the most recently active client), await the response."""
+
+    @abstractmethod
+    async def push_notify(self, action: str, payload: bytes, *, peer: str | None = None) -> None:
+        """Send a notify *to* ``peer`` (default: the most recently active client). Fire-and-forget."""
 
     @abstractmethod
     async def publish(self, topic: str, data: bytes) -> None:
         """Broadcast ``data`` on ``topic`` over the stream channel (PUB)."""
+
+    @abstractmethod
+    def trace(self, recorder: SpanRecorder | None) -> None:
+        """Record a span for every request received from now on into ``recorder`` (``None`` stops tracing).
+
+        The span is current (:func:`rigup.tracing.current_span`) while the request handler runs, and is
+        recorded once the reply is sent; the reply then tells the client how long the node took.
+        """
+
+    @property
+    @abstractmethod
+    def tracer(self) -> SpanRecorder | None:
+        """The recorder set by :meth:`trace`, if tracing."""
@@ -6,40 +6,78 @@ Request/response correlation via 32-bit request IDs carried in the envelope.
 Wire format on the reliable channel (frame counts):
 
 - ``REQUEST``   → ``[kind=0, req_id, action, payload]``          (4 frames)
-- ``RESPONSE``  → ``[kind=1, req_id, status, payload]``          (4 frames)
+- ``RESPONSE``  → ``[kind=1, req_id, status, payload(, node_ns)]`` (4 or 5 frames)
 - ``NOTIFY``    → ``[kind=2, action, payload]``                  (3 frames)
+- ``HEARTBEAT`` → ``[kind=3]``                                   (1 frame, client → server only)
 
 ``status`` is ``b"ok"`` (payload is the handler's return value) or ``b"err"``
-(payload is a UTF-8 error message). When received over ROUTER, identity is
-auto-prepended; when sent from ROUTER, identity must be the first frame.
+(payload is a UTF-8 error message). A server that traces requests (see
+:mod:`rigup.tracing`) appends ``node_ns``: the nanoseconds from receiving the
+request to having its reply serialized, as a big-endian u64. When received over
+ROUTER, identity is auto-prepended; when sent from ROUTER, identity must be the
+first frame.
+
+Streams go out on PUB as ``[topic, payload]``. Payloads queued while the PUB
+socket was busy are coalesced into one multi-topic frame on a reserved topic
+every client subscribes to: ``[BATCH, codec, body]``, where ``body`` is a msgpack
+list ``[topic, payload, topic, payload, ...]``, compressed with ``codec`` (zlib,
+or zstd when installed) once it reaches the server's ``compress_threshold``.
+The client unpacks a batch and runs each topic's callbacks in order, topics
+concurrently with each other.
+
+The ROUTER keeps one session per client identity. A client that has sent nothing
+for ``heartbeat_s`` sends a heartbeat, so a server that hears nothing from a peer
+for ``peer_timeout_s`` can drop its session, fail the requests it pushed to it,
+and tell its owner (see :meth:`ZMQTransportServer.on_peer_lost`).
 """
 
 import asyncio
+import contextvars
 import logging
 import struct
-from collections import defaultdict
-from collections.abc import Awaitable, Callable
+import time
+import zlib
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Coroutine
 from contextlib import suppress
+from dataclasses import dataclass, field
 from itertools import count
+from typing import Any, Literal, cast
 
+import msgpack
 import zmq
 import zmq.asyncio
 from vxlib.lifecycle import Teardown
 
+from rigup.tracing import Span, SpanRecorder, _current_span, current_span
+
 from ._base import (
     MessageKind,
     NodeAddress,
     NotifyHandler,
+    PeerLostHandler,
     RequestHandler,
     TCPAddress,
     TopicCallback,
     TransportClient,
     TransportError,
     TransportServer,
+    _current_peer,
 )
 
+try:
+    import zstandard  # pyright: ignore[reportMissingImports]
+except ImportError:
+    zstandard = None
+
 _STATUS_OK = b"ok"
 _STATUS_ERR = b"err"
+_NODE_NS = struct.Struct("!Q")
+
+_BATCH_TOPIC = b"\x00batch"
+"""PUB topic of multi-topic frames; no str topic encodes to a leading NUL."""
+
+type Compression = Literal["zstd", "zlib"]
 
 type _SendResponse = Callable[[bytes, bytes, bytes], Awaitable[None]]
 """``(req_id_bytes, status, payload) -> None`` — how a receiver replies to a request."""
@@ -62,6 +100,28 @@ def _unpack_req_id(data: bytes) -> int:
     return struct.unpack("!I", data)[0]
 
 
+def _pack_batch(messages: list[tuple[bytes, bytes]], compress: Compression | None, threshold: int) -> list[bytes]:
+    body = cast("bytes", msgpack.packb([part for message in messages for part in message]))
+    if compress is None or len(body) < threshold:
+        return [_BATCH_TOPIC, b"", body]
+    if compress == "zstd" and zstandard is not None:  # availability is checked when the server is configured
+        return [_BATCH_TOPIC, b"zstd", zstandard.ZstdCompressor(level=3).compress(body)]
+    return [_BATCH_TOPIC, b"zlib", zlib.compress(body, 1)]
+
+
+def _unpack_batch(codec: bytes, body: bytes) -> list[tuple[bytes, bytes]]:
+    if codec == b"zstd":
+        if zstandard is None:
+            raise RuntimeError("stream batch is zstd-compressed but the zstandard package is not installed")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == b"zlib":
+        body = zlib.decompress(body)
+    elif codec:
+        raise RuntimeError(f"unknown stream batch codec {codec!r}")
+    parts = msgpack.unpackb(body)
+    return list(zip(parts[::2], parts[1::2], strict=True))
+
+
 def _encode_kind(kind: MessageKind) -> bytes:
     return bytes([int(kind)])
 
@@ -84,6 +144,14 @@ class _Reliable:
         self._next_id = count(1)
         self._request_handler: RequestHandler | None = None
         self._notify_handler: NotifyHandler | None = None
+        self._tracer: SpanRecorder | None = None
+
+    def trace(self, recorder: SpanRecorder | None) -> None:
+        self._tracer = recorder
+
+    @property
+    def tracer(self) -> SpanRecorder | None:
+        return self._tracer
 
     def _new_request_id(self) -> int:
         return next(self._next_id) & 0xFFFFFFFF
@@ -145,9 +213,13 @@ class _Reliable:
 
 
 class ZMQTransportClient(_Reliable, TransportClient):
-    """DEALER + SUB client. One peer, bidirectional on the DEALER/ROUTER channel."""
+    """DEALER + SUB client. One peer, bidirectional on the DEALER/ROUTER channel.
+
+    Sends a heartbeat whenever the DEALER has been quiet for ``heartbeat_s`` (``None`` disables them),
+    so the server keeps this client's session alive between requests.
+    """
 
-    def __init__(self, ctx: zmq.asyncio.Context | None = None) -> None:
+    def __init__(self, ctx: zmq.asyncio.Context | None = None, *, heartbeat_s: float | None = 1.0) -> None:
         _Reliable.__init__(self)
         self._ctx = ctx or zmq.asyncio.Context.instance()
         self._log = logging.getLogger("rigup.transport.zmq.client")
@@ -156,12 +228,16 @@ class ZMQTransportClient(_Reliable, TransportClient):
         self._subs: dict[str, list[TopicCallback]] = defaultdict(list)
         self._recv_task: asyncio.Task | None = None
         self._sub_task: asyncio.Task | None = None
+        self._heartbeat_s = heartbeat_s
+        self._heartbeat_task: asyncio.Task | None = None
+        self._last_send = 0.0
         # Tracks fire-and-forget dispatch tasks (server-initiated requests/notifies we
         # handle locally). Holding references prevents GC from reaping them mid-flight.
         self._inflight: set[asyncio.Task] = set()
         # send_multipart can yield between frames on async sockets; guard with a lock
         # so concurrent callers' multipart sends don't interleave frames on the wire.
         self._send_lock = asyncio.Lock()
+        self._node_ns: dict[int, int] = {}  # req id -> node time the reply reported, until its caller takes it
 
     async def connect(self, address: NodeAddress) -> None:
         if self._dealer is not None:
@@ -173,19 +249,25 @@ class ZMQTransportClient(_Reliable, TransportClient):
             _apply_tcp_keepalive(sub)
         dealer.connect(address.rpc_addr)
         sub.connect(address.pub_addr)
+        sub.setsockopt(zmq.SUBSCRIBE, _BATCH_TOPIC)
         self._dealer = dealer
         self._sub = sub
         self._recv_task = asyncio.create_task(self._recv_loop(), name="zmq-client-recv")
         self._sub_task = asyncio.create_task(self._sub_loop(), name="zmq-client-sub")
+        if self._heartbeat_s is not None:
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat_loop(self._heartbeat_s), name="zmq-client-heartbeat"
+            )
 
     async def close(self) -> None:
-        for task in (self._recv_task, self._sub_task):
+        for task in (self._recv_task, self._sub_task, self._heartbeat_task):
             if task is not None:
                 task.cancel()
                 with suppress(asyncio.CancelledError):
                     await task
         self._recv_task = None
         self._sub_task = None
+        self._heartbeat_task = None
         for task in list(self._inflight):
             task.cancel()
         if self._inflight:
@@ -209,16 +291,18 @@ class ZMQTransportClient(_Reliable, TransportClient):
             action.encode(),
             payload,
         ]
-        async with self._send_lock:
-            await self._dealer.send_multipart(frames)
-        return await self._await_reply(req_id, timeout_s)
+        await self._send(self._dealer, frames)
+        try:
+            return await self._await_reply(req_id, timeout_s)
+        finally:
+            node_ns = self._node_ns.pop(req_id, None)
+            if node_ns is not None and (span := current_span()) is not None:
+                span.node_ns = node_ns
 
     async def notify(self, action: str, payload: bytes) -> None:
         if self._dealer is None:
             raise RuntimeError("not connected")
-        frames = [_encode_kind(MessageKind.NOTIFY), action.encode(), payload]
-        async with self._send_lock:
-            await self._dealer.send_multipart(frames)
+        await self._send(self._dealer, [_encode_kind(MessageKind.NOTIFY), action.encode(), payload])
 
     def on_request(self, handler: RequestHandler) -> None:
         self._request_handler = handler
@@ -271,11 +355,14 @@ class ZMQTransportClient(_Reliable, TransportClient):
             return
         kind = _decode_kind(frames[0])
         if kind == MessageKind.RESPONSE:
-            if len(frames) != 4:
+            if len(frames) not in (4, 5):
                 self._log.warning("malformed RESPONSE frames: %d", len(frames))
                 return
-            _, req_id_bytes, status, payload = frames
-            self._resolve_reply(_unpack_req_id(req_id_bytes), status, payload)
+            _, req_id_bytes, status, payload, *node_ns = frames
+            req_id = _unpack_req_id(req_id_bytes)
+            if node_ns and req_id in self._pending:
+                self._node_ns[req_id] = _NODE_NS.unpack(node_ns[0])[0]
+            self._resolve_reply(req_id, status, payload)
         elif kind == MessageKind.REQUEST:
             if len(frames) != 4:
                 self._log.warning("malformed REQUEST frames: %d", len(frames))
@@ -311,9 +398,23 @@ class ZMQTransportClient(_Reliable, TransportClient):
     async def _send_response(self, req_id_bytes: bytes, status: bytes, payload: bytes) -> None:
         if self._dealer is None:
             return
-        frames = [_encode_kind(MessageKind.RESPONSE), req_id_bytes, status, payload]
+        await self._send(self._dealer, [_encode_kind(MessageKind.RESPONSE), req_id_bytes, status, payload])
+
+    async def _send(self, dealer: zmq.asyncio.Socket, frames: list[bytes]) -> None:
         async with self._send_lock:
-            await self._dealer.send_multipart(frames)
+            await dealer.send_multipart(frames)
+        self._last_send = time.monotonic()
+
+    async def _heartbeat_loop(self, interval: float) -> None:
+        while True:
+            idle = time.monotonic() - self._last_send
+            if idle >= interval and self._dealer is not None:
+                try:
+                    await self._send(self._dealer, [_encode_kind(MessageKind.HEARTBEAT)])
+                except Exception:
+                    self._log.exception("heartbeat send failed")
+                idle = 0.0
+            await asyncio.sleep(interval - idle)
 
     async def _sub_loop(self) -> None:
         sock = self._sub
@@ -321,13 +422,39 @@ class ZMQTransportClient(_Reliable, TransportClient):
             return
         while True:
             try:
-                topic_bytes, payload = await sock.recv_multipart()
+                frames = await sock.recv_multipart()
             except asyncio.CancelledError:
                 break
             except Exception:
                 self._log.exception("sub loop error")
                 continue
+            try:
+                if frames[0] == _BATCH_TOPIC:
+                    _, codec, body = frames
+                    messages = _unpack_batch(codec, body)
+                else:
+                    topic_bytes, payload = frames
+                    messages = [(topic_bytes, payload)]
+            except Exception:
+                self._log.exception("dropping malformed stream frame (%d frames)", len(frames))
+                continue
+            await self._dispatch_stream(messages)
+
+    async def _dispatch_stream(self, messages: list[tuple[bytes, bytes]]) -> None:
+        """Deliver one frame's messages: each topic's payloads in order, the topics concurrently."""
+        lanes: dict[str, list[bytes]] = {}
+        for topic_bytes, payload in messages:
             topic = topic_bytes.decode(errors="replace")
+            if topic in self._subs:
+                lanes.setdefault(topic, []).append(payload)
+        if len(lanes) == 1:
+            ((topic, payloads),) = lanes.items()
+            await self._deliver(topic, payloads)
+        elif lanes:
+            await asyncio.gather(*(self._deliver(topic, payloads) for topic, payloads in lanes.items()))
+
+    async def _deliver(self, topic: str, payloads: list[bytes]) -> None:
+        for payload in payloads:
             for cb in list(self._subs.get(topic, [])):
                 try:
                     await cb(payload)
@@ -335,19 +462,60 @@ class ZMQTransportClient(_Reliable, TransportClient):
                     self._log.exception("subscriber failed for topic %r", topic)
 
 
+@dataclass(slots=True)
+class _PeerSession:
+    """One client connected to the ROUTER."""
+
+    identity: bytes
+    last_seen: float
+    pushes: set[int] = field(default_factory=set)
+    """Ids of requests pushed to this peer that still await its reply."""
+
+
 class ZMQTransportServer(_Reliable, TransportServer):
-    """ROUTER + PUB server. Tracks a single connected peer (single-orchestrator model)."""
+    """ROUTER + PUB server. Keeps a session per connected peer.
 
-    def __init__(self, ctx: zmq.asyncio.Context | None = None) -> None:
+    Every frame from a peer (heartbeats included) refreshes its session; a peer silent for
+    ``peer_timeout_s`` is dropped and reported to the :meth:`on_peer_lost` handler. Requests
+    pushed to a peer are routed by request id, so only that peer's reply resolves them.
+
+    :meth:`publish` queues; one sender drains the queue in order, packing runs of payloads
+    smaller than ``batch_bytes`` into multi-topic frames of up to ``batch_bytes`` each
+    (``batch_bytes=0`` sends every payload as its own frame). A frame body of at least
+    ``compress_threshold`` bytes is compressed with ``compress``, if set.
+    """
+
+    def __init__(
+        self,
+        ctx: zmq.asyncio.Context | None = None,
+        *,
+        peer_timeout_s: float = 5.0,
+        batch_bytes: int = 64 * 1024,
+        compress: Compression | None = None,
+        compress_threshold: int = 4096,
+    ) -> None:
+        if compress == "zstd" and zstandard is None:
+            raise ImportError("compress='zstd' needs the zstandard package (install rigup[zstd])")
         _Reliable.__init__(self)
         self._ctx = ctx or zmq.asyncio.Context.instance()
         self._log = logging.getLogger("rigup.transport.zmq.server")
         self._router: zmq.asyncio.Socket | None = None
         self._pub: zmq.asyncio.Socket | None = None
-        self._peer_identity: bytes | None = None
+        self._peer_timeout_s = peer_timeout_s
+        self._peers: dict[str, _PeerSession] = {}
+        self._push_routes: dict[int, str] = {}
+        self._last_peer: str | None = None
+        self._peer_lost_handler: PeerLostHandler | None = None
         self._accept_task: asyncio.Task | None = None
+        self._sweep_task: asyncio.Task | None = None
         self._inflight: set[asyncio.Task] = set()
         self._send_lock = asyncio.Lock()
+        self._batch_bytes = batch_bytes
+        self._compress: Compression | None = compress
+        self._compress_threshold = compress_threshold
+        self._outbox: deque[tuple[bytes, bytes]] = deque()
+        self._outbox_ready = asyncio.Event()
+        self._pub_task: asyncio.Task | None = None
 
     async def bind(self, address: NodeAddress) -> None:
         if self._router is not None:
@@ -362,19 +530,31 @@ class ZMQTransportServer(_Reliable, TransportServer):
         self._router = router
         self._pub = pub
         self._accept_task = asyncio.create_task(self._accept_loop(), name="zmq-server-accept")
+        self._sweep_task = asyncio.create_task(self._sweep_loop(), name="zmq-server-sweep")
+        self._pub_task = asyncio.create_task(self._pub_loop(), name="zmq-server-pub")
 
     async def close(self) -> None:
-        if self._accept_task is not None:
-            self._accept_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._accept_task
-            self._accept_task = None
+        for task in (self._accept_task, self._sweep_task, self._pub_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._accept_task = None
+        self._sweep_task = None
+        self._pub_task = None
+        if self._pub is not None:
+            with suppress(Exception):
+                await self._flush_outbox(self._pub)  # what was published before close still goes out
+        self._outbox.clear()
         for task in list(self._inflight):
             task.cancel()
         if self._inflight:
             await asyncio.gather(*self._inflight, return_exceptions=True)
         self._inflight.clear()
         self._fail_pending(ConnectionError("transport closed"))
+        self._peers.clear()
+        self._push_routes.clear()
+        self._last_peer = None
         if self._pub is not None:
             self._pub.close(linger=0)
             self._pub = None
@@ -388,41 +568,139 @@ class ZMQTransportServer(_Reliable, TransportServer):
     def on_notify(self, handler: NotifyHandler) -> None:
         self._notify_handler = handler
 
-    async def push_request(self, action: str, payload: bytes, *, timeout_s: float | None = None) -> bytes:
-        if self._router is None:
-            raise RuntimeError("not bound")
-        if self._peer_identity is None:
-            raise RuntimeError("no connected client — cannot push request")
+    def on_peer_lost(self, handler: PeerLostHandler) -> None:
+        self._peer_lost_handler = handler
+
+    @property
+    def peers(self) -> list[str]:
+        return list(self._peers)
+
+    async def push_request(
+        self, action: str, payload: bytes, *, timeout_s: float | None = None, peer: str | None = None
+    ) -> bytes:
+        router = self._require_router()
+        peer_id, session = self._target(peer, "push request")
         req_id = self._new_request_id()
         frames = [
-            self._peer_identity,
+            session.identity,
             _encode_kind(MessageKind.REQUEST),
             _pack_req_id(req_id),
             action.encode(),
             payload,
         ]
-        async with self._send_lock:
-            await self._router.send_multipart(frames)
-        return await self._await_reply(req_id, timeout_s)
+        self._push_routes[req_id] = peer_id
+        session.pushes.add(req_id)
+        try:
+            async with self._send_lock:
+                await router.send_multipart(frames)
+            return await self._await_reply(req_id, timeout_s)
+        finally:
+            self._push_routes.pop(req_id, None)
+            session.pushes.discard(req_id)
 
-    async def push_notify(self, action: str, payload: bytes) -> None:
-        if self._router is None:
-            raise RuntimeError("not bound")
-        if self._peer_identity is None:
-            raise RuntimeError("no connected client — cannot push notify")
+    async def push_notify(self, action: str, payload: bytes, *, peer: str | None = None) -> None:
+        router = self._require_router()
+        _, session = self._target(peer, "push notify")
         frames = [
-            self._peer_identity,
+            session.identity,
             _encode_kind(MessageKind.NOTIFY),
             action.encode(),
             payload,
         ]
         async with self._send_lock:
-            await self._router.send_multipart(frames)
+            await router.send_multipart(frames)
 
     async def publish(self, topic: str, data: bytes) -> None:
         if self._pub is None:
             raise RuntimeError("not bound")
-        await self._pub.send_multipart([topic.encode(), data])
+        self._outbox.append((topic.encode(), data))
+        self._outbox_ready.set()
+
+    async def _pub_loop(self) -> None:
+        pub = self._pub
+        if pub is None:
+            return
+        while True:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            try:
+                await self._flush_outbox(pub)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._log.exception("pub loop error")
+
+    async def _flush_outbox(self, pub: zmq.asyncio.Socket) -> None:
+        """Send everything queued, in order. Payloads published while a send is in flight join the next frame."""
+        batch: list[tuple[bytes, bytes]] = []
+        size = 0
+        while self._outbox:
+            topic, data = self._outbox.popleft()
+            if len(data) >= self._batch_bytes:
+                await self._send_batch(pub, batch)
+                batch, size = [], 0
+                await pub.send_multipart([topic, data])
+                continue
+            batch.append((topic, data))
+            size += len(data)
+            if size >= self._batch_bytes:
+                await self._send_batch(pub, batch)
+                batch, size = [], 0
+        await self._send_batch(pub, batch)
+
+    async def _send_batch(self, pub: zmq.asyncio.Socket, batch: list[tuple[bytes, bytes]]) -> None:
+        if len(batch) == 1:
+            await pub.send_multipart(list(batch[0]))  # a lone message keeps its topic, so SUB filters it
+        elif batch:
+            await pub.send_multipart(_pack_batch(batch, self._compress, self._compress_threshold))
+
+    def _require_router(self) -> zmq.asyncio.Socket:
+        if self._router is None:
+            raise RuntimeError("not bound")
+        return self._router
+
+    def _target(self, peer: str | None, what: str) -> tuple[str, _PeerSession]:
+        peer_id = peer if peer is not None else self._last_peer
+        if peer_id is None:
+            raise RuntimeError(f"no connected client — cannot {what}")
+        session = self._peers.get(peer_id)
+        if session is None:
+            raise RuntimeError(f"peer {peer_id} is not connected — cannot {what}")
+        return peer_id, session
+
+    def _touch(self, identity: bytes) -> str:
+        peer_id = identity.hex()
+        session = self._peers.get(peer_id)
+        if session is None:
+            self._peers[peer_id] = _PeerSession(identity, time.monotonic())
+            self._log.debug("peer %s connected", peer_id)
+        else:
+            session.last_seen = time.monotonic()
+        self._last_peer = peer_id
+        return peer_id
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._peer_timeout_s / 2)
+            deadline = time.monotonic() - self._peer_timeout_s
+            for peer_id in [peer_id for peer_id, session in self._peers.items() if session.last_seen < deadline]:
+                self._drop_peer(peer_id)
+
+    def _drop_peer(self, peer_id: str) -> None:
+        session = self._peers.pop(peer_id)
+        self._log.info("peer %s lost (silent for %.1f s)", peer_id, time.monotonic() - session.last_seen)
+        for req_id in session.pushes:
+            future = self._pending.pop(req_id, None)
+            if future is not None and not future.done():
+                future.set_exception(ConnectionError(f"peer {peer_id} lost"))
+        if self._last_peer == peer_id:
+            recent = max(self._peers.items(), key=lambda item: item[1].last_seen, default=None)
+            self._last_peer = recent[0] if recent is not None else None
+        if self._peer_lost_handler is not None:
+            try:
+                self._peer_lost_handler(peer_id)
+            except Exception:
+                self._log.exception("peer-lost handler raised (peer=%s)", peer_id)
 
     async def _accept_loop(self) -> None:
         sock = self._router
@@ -439,58 +717,82 @@ class ZMQTransportServer(_Reliable, TransportServer):
             if not frames:
                 continue
             identity, payload_frames = frames[0], frames[1:]
-            self._peer_identity = identity  # remember latest active peer
+            peer_id = self._touch(identity)
             try:
-                await self._handle_frames(identity, payload_frames)
+                await self._handle_frames(peer_id, identity, payload_frames)
             except Exception:
                 self._log.exception("error handling incoming frames")
 
-    async def _handle_frames(self, identity: bytes, frames: list[bytes]) -> None:
+    def _spawn(self, coro: Coroutine[Any, Any, None], name: str, peer_id: str, span: Span | None = None) -> None:
+        """Run a handler as its own task, with :func:`~rigup.transport.current_peer` reporting ``peer_id``
+        and :func:`~rigup.tracing.current_span` reporting ``span``."""
+        context = contextvars.copy_context()
+        context.run(_current_peer.set, peer_id)
+        if span is not None:
+            context.run(_current_span.set, span)
+        task = asyncio.create_task(coro, name=name, context=context)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    def _handle_request(self, peer_id: str, identity: bytes, req_id: int, action_bytes: bytes, payload: bytes) -> None:
+        action = action_bytes.decode(errors="replace")
+        tracer = self._tracer
+        span: Span | None = None
+        if tracer is not None:
+            span = Span("node", action)
+            span.mark("received")
+
+        async def send_response(rid_bytes: bytes, status: bytes, resp_payload: bytes) -> None:
+            if self._router is None:
+                return
+            out = [identity, _encode_kind(MessageKind.RESPONSE), rid_bytes, status, resp_payload]
+            if span is not None:
+                span.mark("serialized")  # already marked unless the handler failed
+                out.append(_NODE_NS.pack(span.marks["serialized"] - span.marks["received"]))
+            async with self._send_lock:
+                await self._router.send_multipart(out)
+            if span is not None and tracer is not None:
+                span.mark("replied")
+                tracer.record(span)
+
+        self._spawn(
+            self._dispatch_request(req_id, action, payload, send_response, self._log),
+            f"zmq-server-handle-{req_id}",
+            peer_id,
+            span,
+        )
+
+    async def _handle_frames(self, peer_id: str, identity: bytes, frames: list[bytes]) -> None:
         if not frames:
             return
         kind = _decode_kind(frames[0])
+        if kind == MessageKind.HEARTBEAT:
+            return  # the session was refreshed on receipt
         if kind == MessageKind.REQUEST:
             if len(frames) != 4:
                 self._log.warning("malformed REQUEST frames: %d", len(frames))
                 return
             _, req_id_bytes, action_bytes, payload = frames
-            req_id = _unpack_req_id(req_id_bytes)
-
-            async def send_response(rid_bytes: bytes, status: bytes, resp_payload: bytes) -> None:
-                if self._router is None:
-                    return
-                out = [identity, _encode_kind(MessageKind.RESPONSE), rid_bytes, status, resp_payload]
-                async with self._send_lock:
-                    await self._router.send_multipart(out)
-
-            task = asyncio.create_task(
-                self._dispatch_request(
-                    req_id,
-                    action_bytes.decode(errors="replace"),
-                    payload,
-                    send_response,
-                    self._log,
-                ),
-                name=f"zmq-server-handle-{req_id}",
-            )
-            self._inflight.add(task)
-            task.add_done_callback(self._inflight.discard)
+            self._handle_request(peer_id, identity, _unpack_req_id(req_id_bytes), action_bytes, payload)
         elif kind == MessageKind.RESPONSE:
             if len(frames) != 4:
                 self._log.warning("malformed RESPONSE frames: %d", len(frames))
                 return
             _, req_id_bytes, status, payload = frames
-            self._resolve_reply(_unpack_req_id(req_id_bytes), status, payload)
+            req_id = _unpack_req_id(req_id_bytes)
+            if self._push_routes.get(req_id) != peer_id:
+                self._log.warning("dropping reply %d from peer %s: not routed to it", req_id, peer_id)
+                return
+            self._resolve_reply(req_id, status, payload)
         elif kind == MessageKind.NOTIFY:
             if len(frames) != 3:
                 self._log.warning("malformed NOTIFY frames: %d", len(frames))
                 return
             _, action_bytes, payload = frames
-            task = asyncio.create_task(
+            self._spawn(
                 self._dispatch_notify(action_bytes.decode(errors="replace"), payload, self._log),
-                name="zmq-server-notify",
+                "zmq-server-notify",
+                peer_id,
             )
-            self._inflight.add(task)
-            task.add_done_callback(self._inflight.discard)
         else:
             self._log.warning("unknown message kind: %s", kind)
@@ -8,10 +8,19 @@ one place. Adapters wire one of these per topic and delegate.
 Lives separately from :mod:`rigup.protocol` (which holds the RPC vocabulary)
 to avoid a circular import: ``protocol`` depends on ``device`` for its RPC
 payload types, while ``wire`` is leaf-level and importable from anywhere.
+
+Bodies are packed and validated through a :class:`Codec` per model class, which binds the class's
+pydantic-core serializer and validator once, when the class is first packed, decoded or subscribed
+to. JSON bodies are validated straight from the bytes. Packing skips pydantic's serializer warnings
+(drivers routinely put an unparametrized ``Result`` where ``Result[PropertyModel]`` is declared) and
+the bytes are the same as ``model_dump`` + msgpack. :func:`set_validation` (or
+``RIGUP_WIRE_VALIDATE=1``) turns the warnings back on and also validates every body as it is packed,
+so a body the receiving side would reject fails where it is published.
 """
 
 import json
 import logging
+import os
 from collections.abc import Awaitable, Callable
 from typing import Any, Literal, cast, overload
 
@@ -24,6 +33,70 @@ log = logging.getLogger("rigup.wire")
 
 type WireFormat = Literal["json", "msgpack"]
 
+_settings = {"validate": os.environ.get("RIGUP_WIRE_VALIDATE", "") not in ("", "0")}
+
+
+def set_validation(enabled: bool) -> None:
+    """Debug mode: warn on body values of undeclared types and validate every body before it is packed."""
+    _settings["validate"] = enabled
+
+
+class Codec[M: BaseModel]:
+    """The pydantic-core serializer and validator of one model class, bound once.
+
+    Calling them directly skips the per-call work of ``model_dump`` / ``model_validate``, and packs
+    without pydantic's serializer warnings unless validation is on (see :func:`set_validation`).
+    """
+
+    __slots__ = ("_to_json", "_to_python", "_validate_json", "_validate_python", "model")
+
+    def __init__(self, model: type[M]) -> None:
+        if not model.__pydantic_complete__:  # defer_build, or a forward reference resolved since
+            model.model_rebuild()
+        self.model = model
+        self._to_python = model.__pydantic_serializer__.to_python
+        self._to_json = model.__pydantic_serializer__.to_json
+        self._validate_python = model.__pydantic_validator__.validate_python
+        self._validate_json = model.__pydantic_validator__.validate_json
+
+    def encode(self, body: M, include: set[str] | None = None) -> Any:
+        """What ``body.model_dump(mode="json", include=include)`` returns."""
+        debug = _settings["validate"]
+        dumped = self._to_python(body, mode="json", include=include, warnings=debug)
+        if debug:
+            self._validate_python(dumped)
+        return dumped
+
+    def encode_json(self, body: M, include: set[str] | None = None) -> bytes:
+        """What ``body.model_dump_json(include=include).encode()`` returns."""
+        debug = _settings["validate"]
+        data = self._to_json(body, include=include, warnings=debug)
+        if debug:
+            self._validate_json(data)
+        return data
+
+    def validate(self, unpacked: Any) -> M:
+        """What ``model_validate(unpacked)`` returns."""
+        return self._validate_python(unpacked)
+
+    def decode(self, data: bytes) -> M:
+        """Validate body bytes; JSON is validated from the bytes without an intermediate dict."""
+        if data[:1] == b"{":
+            return self._validate_json(data)
+        return self._validate_python(msgpack.unpackb(data))
+
+
+_codecs: dict[type[BaseModel], Codec[Any]] = {}
+
+
+def codec[M: BaseModel](model: type[M]) -> Codec[M]:
+    """The codec of ``model``, built the first time a class is packed, decoded or subscribed to."""
+    try:
+        return _codecs[model]
+    except KeyError:
+        compiled = _codecs[model] = Codec(model)
+        return compiled
+
 
 def pack(body: BaseModel, *, fmt: WireFormat = "msgpack", exclude_unset: bool = False) -> bytes:
     """Serialize a typed event body for the broadcast channel.
@@ -37,10 +110,11 @@ def pack(body: BaseModel, *, fmt: WireFormat = "msgpack", exclude_unset: bool =
     discriminators and defaults.
     """
     include = body.model_fields_set if exclude_unset else None
+    compiled = codec(type(body))
     if fmt == "msgpack":
         # msgpack stubs declare `bytes | None`; for valid input it always returns bytes.
-        return cast("bytes", msgpack.packb(body.model_dump(mode="json", include=include)))
-    return body.model_dump_json(include=include).encode()
+        return cast("bytes", msgpack.packb(compiled.encode(body, include)))
+    return compiled.encode_json(body, include)
 
 
 def unpack(data: bytes) -> dict[str, Any]:
@@ -55,6 +129,11 @@ def unpack(data: bytes) -> dict[str, Any]:
     return msgpack.unpackb(data)
 
 
+def decode[M: BaseModel](data: bytes, schema: type[M]) -> M:
+    """Unpack and validate body bytes as ``schema``. Raises ``ValidationError`` if they don't fit."""
+    return codec(schema).decode(data)
+
+
 class TopicDispatcher:
     """Per-topic dispatcher: typed subscribers (each with own schema) + bytes subscribers.
 
@@ -85,6 +164,7 @@ class TopicDispatcher:
     def subscribe(self, cb: Any, *, schema: type[BaseModel] | None = None) -> Teardown:
         """Register a subscriber. Without ``schema`` → bytes; with ``schema`` → typed."""
         if schema is not None:
+            codec(schema)  # build it while subscribing rather than on the first message
             sig = self._schemas.setdefault(schema, Emitter())
             return sig.subscribe(cb)
         return self._bytes.subscribe(cb)
@@ -98,16 +178,18 @@ class TopicDispatcher:
             await self._bytes.emit(pack(body))
 
     async def emit_bytes(self, data: bytes) -> None:
-        """Wire origin: unpack once, validate per registered schema; bytes subs get the wire bytes verbatim."""
+        """Wire origin: validate per registered schema; bytes subs get the wire bytes verbatim."""
         if self._schemas:
+            is_json = data[:1] == b"{"  # each schema validates JSON from the bytes; msgpack is unpacked once
             try:
-                unpacked = unpack(data)
+                unpacked = None if is_json else msgpack.unpackb(data)
             except Exception:
                 log.exception("decode failed")
                 return
             for schema, sig in self._schemas.items():
                 try:
-                    obj = schema.model_validate(unpacked)
+                    compiled = codec(schema)
+                    obj = compiled.decode(data) if is_json else compiled.validate(unpacked)
                 except Exception as e:
                     # not necessarily an error — schema may be deliberately partial/incompatible
                     log.debug("schema %s did not match wire data: %s", schema.__name__, e)
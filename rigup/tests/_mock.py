@@ -1,8 +1,12 @@
 """Shared mock device for rigup tests."""
 
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import StrEnum
 
-from rigup.device import Device, describe
+from rigup.device import Device, DeviceController, describe
 
 
 class MockState(StrEnum):
@@ -52,3 +56,172 @@ class MockDevice(Device[MockState]):
     @describe(label="Fail", desc="Always raises")
     def fail(self) -> None:
         raise RuntimeError("intentional failure")
+
+
+class SlowDevice(Device[MockState]):
+    """Hardware with a slow but thread-safe sensor read beside ordinary, serialized access.
+
+    ``calls`` records the order in which the device served calls; ``max_serial_overlap`` counts how
+    many serialized calls were ever inside the device at once (it must stay 1).
+    """
+
+    __DEVICE_TYPE__ = "slow"
+
+    def __init__(self, uid: str, read_delay_s: float = 0.3, settle_s: float = 0.2):
+        super().__init__(uid)
+        self._read_delay_s = read_delay_s
+        self._settle_s = settle_s
+        self._position = 0.0
+        self._lock = threading.Lock()
+        self._serial_active = 0
+        self.max_serial_overlap = 0
+        self.calls: list[str] = []
+
+    @contextmanager
+    def _serial(self, name: str) -> Iterator[None]:
+        with self._lock:
+            self._serial_active += 1
+            self.max_serial_overlap = max(self.max_serial_overlap, self._serial_active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._serial_active -= 1
+                self.calls.append(name)
+
+    @property
+    @describe(label="Temperature", units="C", concurrent=True)
+    def temperature(self) -> float:
+        time.sleep(self._read_delay_s)
+        self.calls.append("temperature")
+        return 21.5
+
+    @property
+    @describe(label="Position", units="mm")
+    def position(self) -> float:
+        with self._serial("position"):
+            return self._position
+
+    @position.setter
+    def position(self, value: float) -> None:
+        with self._serial("position="):
+            self._position = value
+
+    @describe(label="Settle", desc="Block until the stage settles")
+    def settle(self) -> None:
+        with self._serial("settle"):
+            time.sleep(self._settle_s)
+
+
+class MultiAxisStage(Device[MockState]):
+    """Stage whose axes move independently, so moves of different axes may overlap.
+
+    ``log`` records ``(event, axis)`` as moves start and finish; ``max_overlap`` counts the most moves
+    ever in progress at once, ``max_axis_overlap`` the most on any single axis (it must stay 1).
+    """
+
+    __DEVICE_TYPE__ = "multi_axis"
+
+    def __init__(self, uid: str, axes: str = "xyz", move_s: float = 0.2):
+        super().__init__(uid)
+        self._move_s = move_s
+        self._positions = dict.fromkeys(axes, 0.0)
+        self._moving: dict[str, int] = dict.fromkeys(axes, 0)
+        self._lock = threading.Lock()
+        self.max_overlap = 0
+        self.max_axis_overlap = 0
+        self.log: list[tuple[str, str]] = []
+
+    @contextmanager
+    def _moving_axis(self, axis: str) -> Iterator[None]:
+        with self._lock:
+            self._moving[axis] += 1
+            self.max_overlap = max(self.max_overlap, sum(self._moving.values()))
+            self.max_axis_overlap = max(self.max_axis_overlap, self._moving[axis])
+            self.log.append(("start", axis))
+        try:
+            time.sleep(self._move_s)
+            yield
+        finally:
+            with self._lock:
+                self._moving[axis] -= 1
+                self.log.append(("end", axis))
+
+    @describe(label="Move", desc="Move one axis to an absolute position", resources=("axis:{axis}",))
+    def move(self, axis: str, position: float) -> float:
+        with self._moving_axis(axis):
+            self._positions[axis] = position
+        return position
+
+    @describe(label="Home All", desc="Move every axis to zero")
+    def home_all(self) -> None:
+        for axis in self._positions:
+            with self._moving_axis(axis):
+                self._positions[axis] = 0.0
+
+    @property
+    @describe(label="Positions")
+    def positions(self) -> dict[str, float]:
+        return dict(self._positions)
+
+
+class PushDevice(Device[MockState]):
+    """Hardware that reports position changes from its own thread, beside a polled temperature.
+
+    ``position_reads`` and ``temperature_reads`` count getter calls, so tests can tell pushed
+    updates from polled ones; ``position_reads`` is also a property, so remote tests can ask.
+    """
+
+    __DEVICE_TYPE__ = "push"
+
+    def __init__(self, uid: str):
+        super().__init__(uid)
+        self._position = 0.0
+        self._temperature = 20.0
+        self._position_reads = 0
+        self.temperature_reads = 0
+
+    @property
+    @describe(label="Position", units="mm", push=True)
+    def position(self) -> float:
+        self._position_reads += 1
+        return self._position
+
+    @property
+    @describe(label="Position Reads")
+    def position_reads(self) -> int:
+        return self._position_reads
+
+    @property
+    @describe(label="Temperature", units="C", stream=True)
+    def temperature(self) -> float:
+        self.temperature_reads += 1
+        return self._temperature
+
+    def move_to(self, target: float, steps: int = 1) -> threading.Thread:
+        """Step towards ``target`` on a worker thread, reporting every step as the encoder would."""
+
+        def run() -> None:
+            start = self._position
+            for i in range(1, steps + 1):
+                self._position = start + (target - start) * i / steps
+                self.report_property("position", self._position)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+
+class BlobController(DeviceController["BlobDevice"]):
+    """Publishes raw byte payloads on the ``blob`` stream on command, as a camera publishes frames."""
+
+    @describe(label="Send", desc="Publish ``count`` payloads of ``size`` bytes, each filled with its index")
+    async def send(self, size: int, count: int = 1) -> int:
+        for i in range(count):
+            await self.publish("blob", bytes([i % 256]) * size)
+        return count
+
+
+class BlobDevice(Device[MockState]):
+    __DEVICE_TYPE__ = "blob"
+    __CONTROLLER_TYPE__ = BlobController
@@ -37,3 +37,9 @@ def free_tcp_address() -> TCPAddress:
     for s in socks:
         s.close()
     return TCPAddress(host="127.0.0.1", rpc_port=ports[0], pub_port=ports[1])
+
+
+@pytest.fixture(autouse=True)
+def _isolated_interface_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep rigs built by tests out of the user's interface cache."""
+    monkeypatch.setenv("RIGUP_CACHE_DIR", str(tmp_path_factory.mktemp("interface-cache")))
@@ -9,6 +9,7 @@ from rigup.protocol import (
     Action,
     BuildDevicesRequest,
     BuildDevicesResponse,
+    CallBatcher,
     ClaimRequest,
     ClaimResponse,
     CloseDeviceRequest,
@@ -26,7 +27,7 @@ from rigup.protocol import (
     call,
     send_notify,
 )
-from rigup.transport import TCPAddress, ZMQTransportClient, ZMQTransportServer
+from rigup.transport import TCPAddress, TransportError, ZMQTransportClient, ZMQTransportServer
 
 from rigup import DeviceConfig
 
@@ -221,6 +222,24 @@ class TestDaemonDeviceRPC:
         assert iface.type == "mock"
         assert "set_value" in iface.commands
 
+    async def test_batched_calls_resolve_individually(self, built_daemon):
+        client, _ = built_daemon
+        batcher = CallBatcher(client)
+
+        written, read, missing = await asyncio.gather(
+            batcher.call(Action.SET_PROPS, SetPropsRequest(uid="dev", props={"value": 7.0}), PropResults, device="dev"),
+            batcher.call(Action.GET_PROPS, GetPropsRequest(uid="dev", props=["value"]), PropResults, device="dev"),
+            batcher.call(Action.GET_PROPS, GetPropsRequest(uid="nope"), PropResults, device="nope"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(written, PropResults)
+        assert isinstance(read, PropResults)
+        assert written["value"].unwrap().value == 7.0
+        assert read["value"].unwrap().value == 7.0  # same-device entries run in order
+        assert isinstance(missing, TransportError)
+        assert "No device with uid 'nope'" in str(missing)
+
 
 class TestDaemonShutdown:
     async def test_shutdown_notify(self, free_tcp_address: TCPAddress):
@@ -10,11 +10,12 @@ import asyncio
 from collections.abc import AsyncGenerator, Callable
 
 import pytest
-from rigup.device import DeviceController, DeviceHandle
+from pydantic import BaseModel, ValidationError
+from rigup.device import DeviceController, DeviceHandle, PropResults
 from rigup.node import LocalAdapter
 from vxlib.reactivity import ReactiveQuery
 
-from tests._mock import MockDevice
+from tests._mock import MockDevice, PushDevice
 
 
 def _as_float(value: object) -> float:
@@ -134,3 +135,106 @@ async def test_typed_handle_shares_property_cache_and_typed_views(handle: Device
 
     assert typed.value.value == 4.0
     assert observed == [4.0]
+
+
+class _Published:
+    """Typed publisher that keeps every ``props.update`` body."""
+
+    def __init__(self) -> None:
+        self.updates: list[PropResults] = []
+
+    async def __call__(self, topic: str, body: BaseModel) -> None:
+        assert topic == "props.update"
+        assert isinstance(body, PropResults)
+        self.updates.append(body)
+
+    def values(self, name: str) -> list[object]:
+        return [update.ok[name].value for update in self.updates if name in update.ok]
+
+
+@pytest.fixture
+async def push_controller() -> AsyncGenerator[tuple[PushDevice, DeviceController, _Published]]:
+    device = PushDevice("stage")
+    controller = DeviceController(device, stream_interval=0.02, push_interval=0.05)
+    published = _Published()
+    controller.set_typed_publisher(published)
+    controller.start_streaming()
+    try:
+        yield device, controller, published
+    finally:
+        await controller.close()
+
+
+async def test_push_property_is_published_without_polling(
+    push_controller: tuple[PushDevice, DeviceController, _Published],
+) -> None:
+    """A ``push`` property is read once for the baseline, then only reaches subscribers through report_property."""
+    device, controller, published = push_controller
+    assert controller.interface.properties["position"].push
+    assert controller.interface.properties["position"].stream
+
+    await _wait_for(lambda: published.values("position") == [0.0])
+    await asyncio.sleep(0.1)  # several poll ticks
+    assert device.position_reads == 1
+    assert device.temperature_reads > 1  # the non-push stream property is still polled
+
+    device.move_to(2.5).join()
+
+    await _wait_for(lambda: published.values("position") == [0.0, 2.5])
+    assert device.position_reads == 1
+
+
+async def test_push_notifications_are_coalesced(
+    push_controller: tuple[PushDevice, DeviceController, _Published],
+) -> None:
+    """A burst of reports from a driver thread collapses into a few publishes ending on the latest value."""
+    device, _, published = push_controller
+    await _wait_for(lambda: published.values("position") == [0.0])
+
+    device.move_to(10.0, steps=1000).join()
+
+    await _wait_for(lambda: published.values("position")[-1] == 10.0)
+    assert len(published.values("position")) <= 4
+    assert device.position_reads == 1
+
+
+async def test_emit_reaches_property_subscriber() -> None:
+    device = PushDevice("stage")
+    controller = DeviceController(device)
+    handle = DeviceHandle(LocalAdapter(controller))
+    controller.start_streaming()
+    try:
+        position = handle.props.property("position", _as_float)
+        await position.get()
+        seen: list[float] = []
+        position.subscribe(seen.append)
+
+        device.move_to(4.0).join()
+
+        await _wait_for(lambda: seen == [4.0])
+        assert position.value == 4.0
+    finally:
+        await controller.close()
+
+
+async def test_cache_snapshots_are_immutable_and_versioned(handle: DeviceHandle) -> None:
+    await handle.props.get("value", "enabled")
+    before = handle.props.snapshot
+    assert handle.props.cache is before.props  # no copy per read
+    assert handle.props.version == before.version > 0
+
+    await handle.props.set(value=2.0)
+    after = handle.props.snapshot
+
+    assert before.props["value"].value == 1.0  # an earlier snapshot never changes
+    assert after.props["value"].value == 2.0
+    assert after.changed_since(before.version) == {"value"}
+    assert after.changed_since(after.version) == frozenset()
+    assert after.changed_since(0) == {"value", "enabled"}
+    with pytest.raises(TypeError):
+        after.props["value"] = after.props["enabled"]  # pyright: ignore[reportIndexIssue]
+    with pytest.raises(ValidationError):
+        after.props["value"].value = 3.0  # pyright: ignore[reportAttributeAccessIssue]
+
+    await handle.props.set(value=2.0)  # unchanged: no new version
+    assert handle.props.snapshot is after
@@ -0,0 +1,124 @@
+"""Tests for interface hashes and the on-disk interface cache that lets a rebuild skip sending them."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from rigup.device import DeviceInterface
+from rigup.node import InterfaceCache, NodeDaemon, RemoteNode
+from rigup.protocol import (
+    Action,
+    BuildDevicesRequest,
+    BuildDevicesResponse,
+    ListDevicesRequest,
+    ListDevicesResponse,
+    call,
+)
+from rigup.transport import IPCAddress, ZMQTransportClient, ZMQTransportServer
+
+from rigup import DeviceConfig, NodeConfig
+
+MOCK_TARGET = "tests._mock.MockDevice"
+SLOW_TARGET = "tests._mock.SlowDevice"
+
+
+def _interface(uid: str, device_type: str = "mock") -> DeviceInterface:
+    return DeviceInterface(uid=uid, type=device_type, commands={}, properties={})
+
+
+class TestInterfaceCache:
+    def test_interfaces_survive_a_new_cache_instance(self, tmp_path: Path):
+        InterfaceCache(tmp_path).store("node", {"a": _interface("a"), "b": _interface("b", "other")})
+
+        loaded = InterfaceCache(tmp_path).load("node", ["a", "b", "missing"])
+        assert loaded == {"a": _interface("a"), "b": _interface("b", "other")}
+        assert InterfaceCache(tmp_path).load("other-node", ["a"]) == {}
+
+    def test_corrupt_or_mismatched_entries_are_misses(self, tmp_path: Path):
+        InterfaceCache(tmp_path).store("node", {"a": _interface("a"), "b": _interface("b")})
+        (tmp_path / f"{_interface('a').content_hash()}.json").write_text("{not json")
+        (tmp_path / f"{_interface('b').content_hash()}.json").write_text(_interface("b", "edited").model_dump_json())
+
+        assert InterfaceCache(tmp_path).load("node", ["a", "b"]) == {}
+
+    def test_default_follows_the_environment(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("RIGUP_CACHE_DIR", str(tmp_path))
+        cache = InterfaceCache.default()
+        assert cache is not None
+        assert cache.root == tmp_path
+
+        monkeypatch.setenv("RIGUP_CACHE_DIR", "")
+        assert InterfaceCache.default() is None
+
+        monkeypatch.delenv("RIGUP_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        cache = InterfaceCache.default()
+        assert cache is not None
+        assert cache.root == tmp_path / "rigup" / "interfaces"
+
+
+@pytest.fixture
+async def daemon_address(tmp_path: Path):
+    address = IPCAddress(path=str(tmp_path / "node"))
+    daemon = NodeDaemon(node_id="cached", transport=ZMQTransportServer())
+    await daemon.start(address)
+    yield address
+    await daemon.stop()
+
+
+@pytest.mark.slow
+class TestInterfaceHashes:
+    async def test_build_omits_interfaces_the_client_knows(self, daemon_address: IPCAddress):
+        client = ZMQTransportClient()
+        await client.connect(daemon_address)
+        try:
+            devices = {"a": DeviceConfig(target=MOCK_TARGET), "b": DeviceConfig(target=SLOW_TARGET)}
+            first = await call(client, Action.BUILD_DEVICES, BuildDevicesRequest(devices=devices), BuildDevicesResponse)
+            assert set(first.built) == set(first.hashes) == {"a", "b"}
+            assert first.hashes["a"] == first.built["a"].content_hash()
+
+            known = {"a": first.hashes["a"], "b": "stale"}
+            second = await call(
+                client, Action.BUILD_DEVICES, BuildDevicesRequest(devices=devices, known=known), BuildDevicesResponse
+            )
+            assert set(second.built) == {"b"}
+            assert second.hashes == first.hashes
+
+            listed = await call(client, Action.LIST_DEVICES, ListDevicesRequest(interfaces=False), ListDevicesResponse)
+            assert not listed.devices
+            assert listed.hashes == first.hashes
+        finally:
+            await client.close()
+
+    async def test_rebuild_serves_interfaces_from_the_cache(
+        self, daemon_address: IPCAddress, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        actions: list[str] = []
+        request = ZMQTransportClient.request
+
+        async def recording_request(self: ZMQTransportClient, action: str, payload: bytes, **kwargs: Any) -> bytes:
+            actions.append(action)
+            return await request(self, action, payload, **kwargs)
+
+        monkeypatch.setattr(ZMQTransportClient, "request", recording_request)
+        cache_dir = tmp_path / "cache"
+        devices = {"a": DeviceConfig(target=MOCK_TARGET), "b": DeviceConfig(target=SLOW_TARGET)}
+        interfaces: list[dict[str, DeviceInterface]] = []
+        for _ in range(2):
+            node = RemoteNode(
+                "cached",
+                NodeConfig(kind="remote", address=f"ipc://{daemon_address.path}"),
+                interface_cache=InterfaceCache(cache_dir),  # a fresh instance reads only what is on disk
+            )
+            await node.open()
+            try:
+                handles, errors = await node.build_devices(devices)
+                assert not errors
+                interfaces.append({uid: await handle.interface() for uid, handle in handles.items()})
+            finally:
+                await node.close()
+
+        assert interfaces[0] == interfaces[1]
+        assert Action.GET_INTERFACE not in actions
+        assert Action.BATCH not in actions
+        assert len(list(cache_dir.glob("*.json"))) == 3  # two interfaces and the index
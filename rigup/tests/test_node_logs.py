@@ -4,14 +4,21 @@ relays them into the local logging system (see rigup.node._logs)."""
 import asyncio
 import logging
 import os
+import re
 import sys
 import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from typing import cast
 
 import pytest
 from rigup.config import DeviceConfig, NodeConfig
 from rigup.node import SubprocessNode
-from rigup.node._logs import NodeLogHandler, relay_logs
-from rigup.transport import IPCAddress, ZMQTransportClient, ZMQTransportServer
+from rigup.node._logs import LOG_TOPIC, NodeLogBatch, NodeLogEvent, NodeLogHandler, relay_logs
+from rigup.transport import IPCAddress, TransportClient, TransportServer, ZMQTransportClient, ZMQTransportServer
+from rigup.wire import decode
+
+FLOOD = 100_000
 
 MOCK_TARGET = "tests._mock.MockDevice"
 
@@ -30,6 +37,131 @@ class _Capture(logging.Handler):
         return [m for _, _, m, _ in self.records]
 
 
+class _Publisher:
+    """Records what a handler publishes, in place of a transport server."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+
+    async def publish(self, topic: str, data: bytes) -> None:
+        assert topic == LOG_TOPIC
+        self.frames.append(data)
+
+    def events(self) -> list[NodeLogEvent]:
+        return [event for frame in self.frames for event in decode(frame, NodeLogBatch).events]
+
+
+def _suppressed(events: list[NodeLogEvent], name: str) -> int:
+    """Records of logger ``name`` that its summaries report as suppressed."""
+    counts = (re.fullmatch(rf"(\d+) messages from {re.escape(name)} suppressed", e.message) for e in events)
+    return sum(int(m.group(1)) for m in counts if m)
+
+
+async def _flood(handler: NodeLogHandler, name: str, count: int) -> float:
+    """Log ``count`` DEBUG records of logger ``name`` from a worker thread, the way a driver would;
+    returns how long it took."""
+
+    def run() -> None:
+        for i in range(count):
+            handler.handle(logging.LogRecord(name, logging.DEBUG, "", 0, "tick %d", (i,), None))
+
+    start = time.monotonic()
+    await asyncio.to_thread(run)
+    return time.monotonic() - start
+
+
+class TestFlood:
+    async def test_a_chatty_logger_is_rate_limited_and_summarized(self):
+        publisher = _Publisher()
+        handler = NodeLogHandler(
+            cast("TransportServer", publisher),
+            "cam",
+            asyncio.get_running_loop(),
+            flush_interval_s=0.01,
+            rate_per_s=1000.0,
+            burst=100,
+        )
+        handler.start()
+        elapsed = await _flood(handler, "driver.chatty", FLOOD)
+        handler.handle(logging.LogRecord("driver.quiet", logging.INFO, "", 0, "still here", (), None))
+        await handler.aclose()
+
+        events = publisher.events()
+        sent = [e for e in events if e.name == "driver.chatty" and e.message.startswith("tick")]
+        assert 100 <= len(sent) <= 100 + 1000 * elapsed + 1
+        assert len(sent) + _suppressed(events, "driver.chatty") == FLOOD
+        ticks = [int(e.message.split()[1]) for e in sent]
+        assert ticks == sorted(ticks)
+        summaries = [e for e in events if e.name == "driver.chatty" and not e.message.startswith("tick")]
+        assert {e.levelname for e in summaries} == {"DEBUG"}
+        assert any(e.name == "driver.quiet" and e.message == "still here" for e in events)  # a bucket per logger
+        assert all(len(decode(frame, NodeLogBatch).events) <= 256 for frame in publisher.frames)
+
+    async def test_warnings_and_errors_are_not_silenced_by_a_debug_flood(self):
+        publisher = _Publisher()
+        handler = NodeLogHandler(
+            cast("TransportServer", publisher), "laser", asyncio.get_running_loop(), rate_per_s=10.0, burst=20
+        )
+        handler.start()
+        await _flood(handler, "driver.laser", 1000)
+        handler.handle(logging.LogRecord("driver.laser", logging.ERROR, "", 0, "LASER INTERLOCK OPEN", (), None))
+        await handler.aclose()
+
+        events = publisher.events()
+        assert [e.levelname for e in events if e.message == "LASER INTERLOCK OPEN"] == ["ERROR"]
+        summaries = [e for e in events if e.message.endswith("suppressed")]
+        assert [(e.name, e.levelname) for e in summaries] == [("driver.laser", "DEBUG")]
+        assert _suppressed(events, "driver.laser") == 1000 - sum(e.message.startswith("tick") for e in events)
+
+    async def test_without_rate_limiting_records_are_batched_or_counted_as_dropped(self):
+        publisher = _Publisher()
+        handler = NodeLogHandler(
+            cast("TransportServer", publisher),
+            "cam",
+            asyncio.get_running_loop(),
+            flush_interval_s=0.01,
+            rate_per_s=None,
+        )
+        handler.start()
+        await _flood(handler, "driver.chatty", FLOOD)
+        await handler.aclose()
+
+        events = publisher.events()
+        sent = sum(e.name == "driver.chatty" for e in events)
+        dropped = [e for e in events if e.message.endswith("dropped: forwarding fell behind")]
+        assert sent + sum(int(e.message.split()[0]) for e in dropped) == FLOOD
+        assert len(publisher.frames) <= sent // 64 + len(dropped) + 8  # batched, not one frame per record
+
+    async def test_relay_re_emits_every_record_of_a_batch(self):
+        capture = _Capture()
+        root = logging.getLogger()
+        root.addHandler(capture)
+        root.setLevel(logging.INFO)
+        subscribers: list[Callable[[bytes], Awaitable[None]]] = []
+
+        class _Subscriber:
+            def subscribe(self, topic: str, cb: Callable[[bytes], Awaitable[None]]) -> Callable[[], None]:
+                assert topic == LOG_TOPIC
+                subscribers.append(cb)
+                return lambda: None
+
+        publisher = _Publisher()
+        handler = NodeLogHandler(cast("TransportServer", publisher), "cam", asyncio.get_running_loop())
+        handler.start()
+        for i in range(3):
+            handler.handle(logging.LogRecord("rigup.daemon.cam", logging.WARNING, "", 0, "line %d", (i,), None))
+        await handler.aclose()  # publishes what is pending
+        relay_logs(cast("TransportClient", _Subscriber()))
+        try:
+            for frame in publisher.frames:
+                await subscribers[0](frame)
+        finally:
+            root.removeHandler(capture)
+
+        assert len(publisher.frames) == 1
+        assert capture.messages() == ["line 0", "line 1", "line 2"]
+
+
 @pytest.mark.skipif(
     sys.platform == "win32",
     reason="ZMQ ipc:// transport needs Unix domain sockets, unsupported on Windows (libzmq raises "
@@ -0,0 +1,262 @@
+"""Tests for per-device call scheduling — priority classes, concurrent-safe reads, per-resource commands,
+pipelined RPC."""
+
+import asyncio
+import time
+from collections.abc import Awaitable
+
+import pytest
+from rigup.device import CommandRequest, DeviceController, Priority, PropResults
+from rigup.node import NodeDaemon
+from rigup.protocol import (
+    Action,
+    BuildDevicesRequest,
+    BuildDevicesResponse,
+    GetPropsRequest,
+    PingPayload,
+    SetPropsRequest,
+    call,
+)
+from rigup.transport import TCPAddress, ZMQTransportClient, ZMQTransportServer
+
+from rigup import DeviceConfig
+from tests._mock import MultiAxisStage, SlowDevice
+
+SLOW_TARGET = "tests._mock.SlowDevice"
+
+
+async def _record[T](calls: list[str], name: str, coro: Awaitable[T]) -> T:
+    result = await coro
+    calls.append(name)
+    return result
+
+
+class TestDeviceScheduling:
+    async def test_waiting_calls_reach_the_device_by_priority(self):
+        device = SlowDevice("stage")
+        controller = DeviceController(device)
+        finished: list[str] = []
+
+        settling = asyncio.create_task(controller.execute_command("settle"))
+        await asyncio.sleep(0.05)  # settle now holds the serialized lane
+        queued = [
+            asyncio.create_task(
+                _record(finished, "background", controller.get_props("position", priority=Priority.BACKGROUND))
+            ),
+            asyncio.create_task(_record(finished, "query", controller.get_props("position"))),
+            asyncio.create_task(_record(finished, "control", controller.set_props(position=3.0))),
+        ]
+        assert await settling
+        background, query, _ = await asyncio.gather(*queued)
+
+        assert finished == ["control", "query", "background"]
+        assert query.ok["position"].value == background.ok["position"].value == 3.0
+        assert device.max_serial_overlap == 1
+        await controller.close()
+
+    async def test_concurrent_read_does_not_delay_serialized_writes(self):
+        device = SlowDevice("stage", read_delay_s=0.3)
+        controller = DeviceController(device)
+
+        reading = asyncio.create_task(controller.get_props("temperature", "position"))
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        written = await controller.set_props(position=1.5)
+        write_latency = time.perf_counter() - start
+
+        assert written.ok["position"].value == 1.5
+        assert write_latency < 0.15
+        assert not reading.done()
+        read = await reading
+        assert list(read.results) == ["temperature", "position"]  # requested order survives the split
+        assert read.ok["temperature"].value == 21.5
+        await controller.close()
+
+    async def test_interface_reports_concurrency(self):
+        controller = DeviceController(SlowDevice("stage"))
+
+        assert controller.interface.properties["temperature"].concurrent
+        assert not controller.interface.properties["position"].concurrent
+        assert not controller.interface.commands["settle"].concurrent
+        await controller.close()
+
+
+def _move(axis: str, position: float) -> CommandRequest:
+    return CommandRequest(attr="move", kwargs={"axis": axis, "position": position})
+
+
+def _axis_log(stage: MultiAxisStage, axis: str) -> list[str]:
+    return [event for event, moved in stage.log if moved == axis]
+
+
+class TestResourceScheduling:
+    async def test_moves_on_different_axes_overlap(self):
+        stage = MultiAxisStage("stage", move_s=0.2)
+        controller = DeviceController(stage)
+
+        start = time.perf_counter()
+        results = await controller.execute_commands([_move("x", 1.0), _move("y", 2.0), _move("z", 3.0)])
+        elapsed = time.perf_counter() - start
+
+        assert list(results.results) == ["0:move", "1:move", "2:move"]
+        assert results.unwrap() == {"0:move": 1.0, "1:move": 2.0, "2:move": 3.0}
+        assert stage.max_overlap == 3
+        assert elapsed < 0.4  # three 0.2 s moves, not 0.6 s back to back
+        await controller.close()
+
+    async def test_moves_sharing_an_axis_keep_request_order(self):
+        stage = MultiAxisStage("stage", move_s=0.1)
+        controller = DeviceController(stage)
+
+        results = await controller.execute_commands([_move("x", 1.0), _move("y", 5.0), _move("x", 2.0)])
+
+        assert results.is_ok
+        assert stage.max_axis_overlap == 1
+        assert stage.max_overlap == 2  # y moves beside the first x move
+        assert _axis_log(stage, "x") == ["start", "end", "start", "end"]
+        assert stage.positions == {"x": 2.0, "y": 5.0, "z": 0.0}
+        await controller.close()
+
+    async def test_whole_device_command_waits_for_and_holds_back_the_rest(self):
+        stage = MultiAxisStage("stage", axes="xy", move_s=0.05)
+        controller = DeviceController(stage)
+
+        commands = [_move("x", 1.0), CommandRequest(attr="home_all"), _move("y", 3.0), CommandRequest(attr="nope")]
+        results = await controller.execute_commands(commands)
+
+        assert list(results.results) == ["0:move", "1:home_all", "2:move", "3:nope"]
+        assert not results["3:nope"].is_ok
+        assert stage.log == [
+            ("start", "x"),
+            ("end", "x"),
+            ("start", "x"),  # home_all, one axis after the other
+            ("end", "x"),
+            ("start", "y"),
+            ("end", "y"),
+            ("start", "y"),  # the move queued behind home_all
+            ("end", "y"),
+        ]
+        assert stage.positions == {"x": 0.0, "y": 3.0}
+        await controller.close()
+
+    async def test_separate_requests_take_turns_on_a_shared_axis(self):
+        stage = MultiAxisStage("stage", move_s=0.1)
+        controller = DeviceController(stage)
+
+        await asyncio.gather(
+            controller.execute_commands([_move("x", 1.0), _move("y", 1.0)]),
+            controller.execute_commands([_move("x", 2.0), _move("z", 2.0)]),
+            controller.execute_command("move", "x", 3.0),
+        )
+
+        assert stage.max_axis_overlap == 1
+        assert stage.max_overlap == 3
+        assert _axis_log(stage, "x") == ["start", "end"] * 3
+        await controller.close()
+
+    async def test_whole_device_calls_exclude_resource_calls_across_requests(self):
+        stage = MultiAxisStage("stage", axes="xy", move_s=0.1)
+        controller = DeviceController(stage)
+
+        homing = asyncio.create_task(controller.execute_command("home_all"))
+        await asyncio.sleep(0.02)
+        move, props = await asyncio.gather(
+            controller.execute_command("move", "x", 1.0), controller.get_props("positions")
+        )
+        await homing
+
+        assert move.unwrap() == 1.0
+        assert props.ok["positions"].value == {"x": 1.0, "y": 0.0}  # read after the move that arrived first
+        assert stage.max_axis_overlap == 1
+        assert stage.max_overlap == 1
+        assert stage.log == [("start", "x"), ("end", "x"), ("start", "y"), ("end", "y"), ("start", "x"), ("end", "x")]
+
+        moving = asyncio.create_task(controller.execute_command("move", "y", 2.0))
+        await asyncio.sleep(0.02)
+        await controller.execute_command("home_all")  # waits for the move already running
+        await moving
+
+        assert stage.max_axis_overlap == 1
+        assert stage.positions == {"x": 0.0, "y": 0.0}
+        await controller.close()
+
+    async def test_cancelled_whole_device_call_holds_the_device_until_it_returns(self):
+        stage = MultiAxisStage("stage", axes="xy", move_s=0.1)
+        controller = DeviceController(stage)
+
+        homing = asyncio.create_task(controller.execute_command("home_all"))
+        await asyncio.sleep(0.05)  # home_all is moving x
+        homing.cancel()
+        await asyncio.sleep(0)
+        moved = await controller.execute_command("move", "y", 1.0)
+
+        assert moved.unwrap() == 1.0
+        assert homing.cancelled()
+        assert stage.max_overlap == 1
+        assert stage.max_axis_overlap == 1
+        assert stage.log == [("start", "x"), ("end", "x"), ("start", "y"), ("end", "y"), ("start", "y"), ("end", "y")]
+        await controller.close()
+
+    async def test_interface_reports_resources(self):
+        controller = DeviceController(MultiAxisStage("stage"))
+
+        assert controller.interface.commands["move"].resources == ["axis:{axis}"]
+        assert controller.interface.commands["home_all"].resources == []
+        assert controller.commands["move"].resources("x", 1.0) == {"axis:x"}
+        assert controller.commands["move"].resources(position=1.0) is None  # left to fail validation
+        await controller.close()
+
+
+@pytest.fixture
+async def slow_node(free_tcp_address: TCPAddress):
+    server_transport = ZMQTransportServer()
+    daemon = NodeDaemon(node_id="slow-node", transport=server_transport)
+    await daemon.start(free_tcp_address)
+    client = ZMQTransportClient()
+    await client.connect(free_tcp_address)
+    await call(
+        client,
+        Action.BUILD_DEVICES,
+        BuildDevicesRequest(devices={"stage": DeviceConfig(target=SLOW_TARGET, init={"read_delay_s": 0.4})}),
+        BuildDevicesResponse,
+        timeout_s=10.0,
+    )
+
+    yield client
+
+    await client.close()
+    await daemon.stop()
+
+
+@pytest.mark.slow
+class TestPipelinedRpc:
+    async def test_fast_calls_overtake_a_slow_read_on_the_same_device(self, slow_node: ZMQTransportClient):
+        finished: list[str] = []
+        reading = asyncio.create_task(
+            _record(
+                finished,
+                "get_props",
+                call(slow_node, Action.GET_PROPS, GetPropsRequest(uid="stage", props=["temperature"]), PropResults),
+            )
+        )
+        await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        pong = await _record(finished, "ping", call(slow_node, Action.PING, PingPayload(timestamp=7.0), PingPayload))
+        ping_latency = time.perf_counter() - start
+        start = time.perf_counter()
+        written = await _record(
+            finished,
+            "set_props",
+            call(slow_node, Action.SET_PROPS, SetPropsRequest(uid="stage", props={"position": 2.0}), PropResults),
+        )
+        write_latency = time.perf_counter() - start
+        read = await reading
+
+        # Replies arrived out of request order and were matched to their callers by req_id.
+        assert finished == ["ping", "set_props", "get_props"]
+        assert pong.timestamp == 7.0
+        assert written.ok["position"].value == 2.0
+        assert read.ok["temperature"].value == 21.5
+        assert ping_latency < 0.1
+        assert write_latency < 0.1
@@ -1,8 +1,21 @@
 """Tests for rigup.protocol — Dispatcher registration, dispatch, serialization."""
 
+import asyncio
+from typing import cast
+
 import pytest
 from pydantic import BaseModel
-from rigup.protocol import Action, Dispatcher, Empty, Notify
+from rigup.protocol import (
+    Action,
+    BatchEntry,
+    BatchRequest,
+    BatchResponse,
+    CallBatcher,
+    Dispatcher,
+    Empty,
+    Notify,
+)
+from rigup.transport import TransportClient, TransportError
 
 
 class EchoRequest(BaseModel):
@@ -90,3 +103,132 @@ class TestDispatcher:
         d.on_request("bad", Empty, Empty, bad_handler)
         with pytest.raises(RuntimeError, match="boom"):
             await d.handle_request("bad", b"")
+
+
+class StepRequest(BaseModel):
+    device: str
+    step: int
+    delay_s: float = 0.0
+
+
+def _stepping_dispatcher(events: list[tuple[str, str, int]]) -> Dispatcher:
+    async def handle_step(req: StepRequest) -> CountPayload:
+        events.append(("start", req.device, req.step))
+        await asyncio.sleep(req.delay_s)
+        if req.step < 0:
+            raise ValueError(f"bad step {req.step}")
+        events.append(("end", req.device, req.step))
+        return CountPayload(count=req.step)
+
+    d = Dispatcher()
+    d.on_request("step", StepRequest, CountPayload, handle_step)
+    return d
+
+
+def _step(device: str, step: int, delay_s: float = 0.0) -> BatchEntry:
+    payload = StepRequest(device=device, step=step, delay_s=delay_s).model_dump()
+    return BatchEntry(device=device, action="step", payload=payload)
+
+
+async def _run_batch(d: Dispatcher, batch: BatchRequest) -> BatchResponse:
+    return BatchResponse.model_validate_json(await d.handle_request(Action.BATCH, batch.model_dump_json().encode()))
+
+
+class TestBatchDispatch:
+    async def test_entries_keep_order_per_device_and_overlap_across_devices(self):
+        events: list[tuple[str, str, int]] = []
+        d = _stepping_dispatcher(events)
+        batch = BatchRequest(entries=[_step("a", 1, 0.02), _step("b", 1, 0.01), _step("a", 2), _step("b", 2)])
+
+        response = BatchResponse.model_validate_json(
+            await d.handle_request(Action.BATCH, batch.model_dump_json().encode())
+        )
+
+        assert [r.unwrap()["count"] for r in response.results] == [1, 1, 2, 2]
+        for device in ("a", "b"):
+            assert [e for e in events if e[1] == device] == [
+                ("start", device, 1),
+                ("end", device, 1),
+                ("start", device, 2),
+                ("end", device, 2),
+            ]
+        assert events.index(("start", "b", 1)) < events.index(("end", "a", 1))  # devices ran side by side
+
+    async def test_failed_entries_report_errors_without_failing_the_batch(self):
+        d = _stepping_dispatcher([])
+        batch = BatchRequest(
+            entries=[
+                _step("a", -1),
+                _step("a", 3),
+                BatchEntry(device="a", action="missing"),
+                BatchEntry(action=Action.BATCH, payload={"entries": []}),
+            ]
+        )
+
+        response = BatchResponse.model_validate_json(
+            await d.handle_request(Action.BATCH, batch.model_dump_json().encode())
+        )
+
+        assert [r.is_ok for r in response.results] == [False, True, False, False]
+        with pytest.raises(RuntimeError, match="bad step -1"):
+            response.results[0].unwrap()
+        with pytest.raises(RuntimeError, match="no request handler"):
+            response.results[2].unwrap()
+        with pytest.raises(RuntimeError, match="cannot be nested"):
+            response.results[3].unwrap()
+
+
+class _LoopbackClient:
+    """Hands requests straight to a dispatcher, recording each round trip like a transport would."""
+
+    def __init__(self, dispatcher: Dispatcher) -> None:
+        self._dispatcher = dispatcher
+        self.actions: list[str] = []
+        self.tracer = None
+
+    async def request(self, action: str, payload: bytes, *, timeout_s: float | None = None) -> bytes:
+        del timeout_s
+        self.actions.append(action)
+        try:
+            return await self._dispatcher.handle_request(action, payload)
+        except Exception as e:
+            raise TransportError(f"{e}") from e
+
+
+class TestCallBatcher:
+    async def test_calls_in_one_tick_share_one_round_trip(self):
+        client = _LoopbackClient(_stepping_dispatcher([]))
+        batcher = CallBatcher(cast("TransportClient", client))
+
+        results = await asyncio.gather(
+            *(
+                batcher.call("step", StepRequest(device=f"dev{i}", step=i), CountPayload, device=f"dev{i}")
+                for i in range(5)
+            ),
+            batcher.call("step", StepRequest(device="d0", step=-1), CountPayload, device="d0"),
+            return_exceptions=True,
+        )
+
+        assert client.actions == ["batch"]
+        assert results[:5] == [CountPayload(count=i) for i in range(5)]
+        assert isinstance(results[5], TransportError)
+        assert "bad step -1" in str(results[5])
+
+    async def test_lone_and_sequential_calls_are_sent_unbatched(self):
+        client = _LoopbackClient(_stepping_dispatcher([]))
+        batcher = CallBatcher(cast("TransportClient", client))
+
+        for step in range(3):
+            assert await batcher.call("step", StepRequest(device="a", step=step), CountPayload) == CountPayload(
+                count=step
+            )
+
+        assert client.actions == ["step", "step", "step"]
+
+    async def test_full_batches_flush_without_waiting_for_the_tick(self):
+        client = _LoopbackClient(_stepping_dispatcher([]))
+        batcher = CallBatcher(cast("TransportClient", client), max_entries=2)
+
+        await asyncio.gather(*(batcher.call("step", StepRequest(device="a", step=i), CountPayload) for i in range(5)))
+
+        assert client.actions == ["batch", "batch", "step"]
@@ -0,0 +1,225 @@
+"""Tests for multi-peer sessions — one owner and read-only observers sharing a node over ipc://."""
+
+import asyncio
+import sys
+import tempfile
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+import pytest
+from rigup.device import CommandRequest, PropResults, Results
+from rigup.node import NodeDaemon
+from rigup.protocol import (
+    Action,
+    BuildDevicesRequest,
+    BuildDevicesResponse,
+    ClaimRequest,
+    ClaimResponse,
+    Empty,
+    GetPropsRequest,
+    ListDevicesResponse,
+    Notify,
+    PingPayload,
+    RpcStatsRequest,
+    RpcStatsResponse,
+    RunCommandsRequest,
+    SetPropsRequest,
+    ShutdownPayload,
+    call,
+    send_notify,
+)
+from rigup.transport import IPCAddress, TransportError, ZMQTransportClient, ZMQTransportServer
+
+from rigup import DeviceConfig
+from tests.conftest import MOCK_TARGET
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(sys.platform == "win32", reason="ZMQ ipc:// transport needs Unix domain sockets"),
+]
+
+PEER_TIMEOUT_S = 0.5
+
+
+@dataclass
+class SharedNode:
+    daemon: NodeDaemon
+    server: ZMQTransportServer
+    owner: ZMQTransportClient
+    observers: tuple[ZMQTransportClient, ZMQTransportClient]
+
+
+async def _get(client: ZMQTransportClient, uid: str, *props: str) -> PropResults:
+    return await call(client, Action.GET_PROPS, GetPropsRequest(uid=uid, props=list(props)), PropResults)
+
+
+async def _set(client: ZMQTransportClient, uid: str, **props: object) -> PropResults:
+    return await call(client, Action.SET_PROPS, SetPropsRequest(uid=uid, props=props), PropResults)
+
+
+async def _claim(client: ZMQTransportClient, orchestrator_id: str) -> ClaimResponse:
+    return await call(client, Action.CLAIM, ClaimRequest(orchestrator_id=orchestrator_id), ClaimResponse)
+
+
+@pytest.fixture
+async def shared_node() -> AsyncGenerator[SharedNode]:
+    """A node claimed by ``owner`` (holding a push stage and a mock probe) with two observers connected."""
+    with tempfile.TemporaryDirectory() as d:
+        address = IPCAddress(path=f"{d}/node")
+        server = ZMQTransportServer(peer_timeout_s=PEER_TIMEOUT_S)
+        daemon = NodeDaemon(node_id="shared", transport=server)
+        await daemon.start(address)
+        clients = [ZMQTransportClient(heartbeat_s=PEER_TIMEOUT_S / 5) for _ in range(3)]
+        for client in clients:
+            await client.connect(address)
+        owner, *observers = clients
+
+        assert (await _claim(owner, "rig-main")).accepted
+        built = await call(
+            owner,
+            Action.BUILD_DEVICES,
+            BuildDevicesRequest(
+                devices={
+                    "stage": DeviceConfig(target="tests._mock.PushDevice"),
+                    "probe": DeviceConfig(target=MOCK_TARGET, init={"initial_value": 1.0}),
+                }
+            ),
+            BuildDevicesResponse,
+        )
+        assert set(built.built) == {"stage", "probe"}
+
+        yield SharedNode(daemon, server, owner, (observers[0], observers[1]))
+
+        for client in clients:
+            await client.close()
+        await daemon.stop()
+
+
+class TestSharedNode:
+    async def test_observers_read_while_the_owner_controls(self, shared_node: SharedNode):
+        owner = shared_node.owner
+
+        async def observe(client: ZMQTransportClient) -> None:
+            for _ in range(10):
+                listed = await call(client, Action.LIST_DEVICES, Empty(), ListDevicesResponse)
+                assert set(listed.devices) == {"stage", "probe"}
+                assert (await _get(client, "probe", "value")).ok["value"].value in (1.0, 3.0)
+                await call(client, Action.PING, PingPayload(timestamp=1.0), PingPayload)
+
+        async def control() -> None:
+            written = await _set(owner, "probe", value=3.0)
+            assert written.ok["value"].value == 3.0
+
+        await asyncio.gather(*(observe(client) for client in shared_node.observers), control())
+        assert len(shared_node.server.peers) == 3
+
+    async def test_observers_cannot_claim_or_mutate(self, shared_node: SharedNode):
+        observer = shared_node.observers[0]
+
+        rejected = await _claim(observer, "monitor")
+        assert not rejected.accepted
+        assert rejected.current_owner == "rig-main"
+        with pytest.raises(TransportError, match="read-only"):
+            await _set(observer, "probe", value=9.0)
+        with pytest.raises(TransportError, match="read-only"):
+            await call(
+                observer,
+                Action.RUN_COMMANDS,
+                RunCommandsRequest(uid="probe", commands=[CommandRequest(attr="enable")]),
+                PropResults,
+            )
+        with pytest.raises(TransportError, match="read-only"):
+            await call(observer, Action.CLOSE_ALL_DEVICES, Empty(), Empty)
+
+        assert (await _get(shared_node.owner, "probe", "value")).ok["value"].value == 1.0
+
+    async def test_observers_cannot_shut_down_or_switch_tracing(self, shared_node: SharedNode):
+        observer = shared_node.observers[0]
+
+        await send_notify(observer, Notify.SHUTDOWN, ShutdownPayload(reason="monitor"))
+        for request in (RpcStatsRequest(enable=True), RpcStatsRequest(reset=True)):
+            with pytest.raises(TransportError, match="read-only"):
+                await call(observer, Action.RPC_STATS, request, RpcStatsResponse)
+        stats = await call(observer, Action.RPC_STATS, RpcStatsRequest(), RpcStatsResponse)
+
+        assert not stats.enabled
+        assert not shared_node.daemon._shutdown_event.is_set()
+        await send_notify(shared_node.owner, Notify.SHUTDOWN, ShutdownPayload(reason="owner"))
+        await asyncio.wait_for(shared_node.daemon.serve_until_shutdown(), timeout=5.0)
+
+    async def test_observer_reads_are_served_from_the_cache(self, shared_node: SharedNode):
+        owner = shared_node.owner
+        await _get(owner, "stage", "position")
+        reads_before = (await _get(owner, "stage", "position_reads")).ok["position_reads"].value
+        await _set(owner, "probe", value=5.0)
+
+        reads = await asyncio.gather(
+            *(_get(client, "stage", "position") for client in shared_node.observers for _ in range(20))
+        )
+        probe = await _get(shared_node.observers[1], "probe", "value")
+
+        assert all(read.ok["position"].value == 0.0 for read in reads)
+        assert (await _get(owner, "stage", "position_reads")).ok["position_reads"].value == reads_before
+        assert probe.ok["value"].value == 5.0  # the owner's write, as cached
+
+    async def test_commands_invalidate_cached_values_no_stream_refreshes(self, shared_node: SharedNode):
+        owner, observer = shared_node.owner, shared_node.observers[0]
+        assert (await _get(owner, "probe", "enabled", "value")).ok["enabled"].value is False
+        assert (await _get(observer, "probe", "enabled")).ok["enabled"].value is False
+
+        await call(
+            owner,
+            Action.RUN_COMMANDS,
+            RunCommandsRequest(uid="probe", commands=[CommandRequest(attr="enable")]),
+            Results,
+        )
+
+        assert (await _get(observer, "probe", "enabled")).ok["enabled"].value is True
+        assert "value" in shared_node.daemon._prop_cache["probe"]  # streamed: kept, its next poll refreshes it
+
+    async def test_heartbeats_keep_an_idle_owner_in_charge(self, shared_node: SharedNode):
+        await asyncio.sleep(PEER_TIMEOUT_S * 3)
+
+        assert len(shared_node.server.peers) == 3
+        assert not (await _claim(shared_node.observers[0], "monitor")).accepted
+        assert (await _set(shared_node.owner, "probe", value=2.0)).ok["value"].value == 2.0
+
+    async def test_authority_is_released_when_the_owner_goes_silent(self, shared_node: SharedNode):
+        await shared_node.owner.close()  # no RELEASE: the process just vanished
+        await asyncio.sleep(PEER_TIMEOUT_S * 2)
+
+        taker, other = shared_node.observers
+        assert len(shared_node.server.peers) == 2
+        assert (await _claim(taker, "monitor")).accepted
+        assert (await _set(taker, "probe", value=7.0)).ok["value"].value == 7.0
+        with pytest.raises(TransportError, match="read-only"):
+            await _set(other, "probe", value=8.0)
+
+
+class TestPeerRouting:
+    async def test_push_requests_reach_the_named_peer(self, shared_node: SharedNode):
+        server = shared_node.server
+        clients = (shared_node.owner, *shared_node.observers)
+        for i, client in enumerate(clients):
+
+            async def answer(_action: str, payload: bytes, i: int = i) -> bytes:
+                return f"client-{i}:{payload.decode()}".encode()
+
+            client.on_request(answer)
+
+        replies = await asyncio.gather(
+            *(server.push_request("whoami", peer.encode(), timeout_s=5.0, peer=peer) for peer in server.peers)
+        )
+
+        assert sorted(reply.split(b":")[0] for reply in replies) == [b"client-0", b"client-1", b"client-2"]
+        assert all(reply.endswith(peer.encode()) for reply, peer in zip(replies, server.peers, strict=True))
+
+    async def test_push_to_a_lost_peer_fails(self, shared_node: SharedNode):
+        server = shared_node.server
+        known = set(server.peers)
+        await shared_node.owner.close()
+        await asyncio.sleep(PEER_TIMEOUT_S * 2)
+
+        (lost,) = known - set(server.peers)
+        with pytest.raises(RuntimeError, match="not connected"):
+            await server.push_notify("hello", b"", peer=lost)
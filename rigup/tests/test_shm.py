@@ -0,0 +1,139 @@
+"""Tests for the shared-memory data plane — the slot ring, and large streams from a subprocess node."""
+
+import asyncio
+import sys
+import time
+
+import pytest
+from rigup.config import DeviceConfig, NodeConfig
+from rigup.device import DeviceHandle
+from rigup.node import SubprocessNode
+from rigup.node._shm import SHM_TOPIC_SUFFIX, ShmReader, ShmRing, check_probe, create_probe
+
+BLOB_TARGET = "tests._mock.BlobDevice"
+THRESHOLD = 64 * 1024
+
+
+class TestShmRing:
+    def test_payloads_round_trip_through_a_slot(self):
+        ring, reader = ShmRing(), ShmReader()
+        try:
+            small = ring.put(b"\x01" * 10, readers=1)
+            large = ring.put(b"\x02" * 3_000_000, readers=1)
+            assert small is not None
+            assert large is not None
+            assert reader.read(small) == b"\x01" * 10
+            assert reader.read(large) == b"\x02" * 3_000_000
+        finally:
+            reader.close()
+            ring.close()
+
+    def test_a_slot_is_held_until_every_reader_released_it(self):
+        ring = ShmRing(slots=1)
+        try:
+            first = ring.put(b"a", readers=2)
+            assert first is not None
+            ring.release(first.slot, first.generation)
+            assert ring.put(b"b", readers=1) is None  # one reader still holds it; caller publishes inline
+            ring.release(first.slot, first.generation - 1)  # stale generation: ignored
+            assert ring.in_use == 1
+            ring.release(first.slot, first.generation)
+            assert ring.in_use == 0
+            assert ring.put(b"b", readers=1) is not None
+        finally:
+            ring.close()
+
+    def test_an_expired_lease_is_reclaimed_and_the_late_reader_notices(self):
+        ring, reader = ShmRing(slots=1, lease_s=0.05), ShmReader()
+        try:
+            lost = ring.put(b"x" * 100, readers=1)  # its descriptor never reaches the reader
+            assert lost is not None
+            assert ring.put(b"y" * 100, readers=1) is None
+            time.sleep(0.1)
+            reused = ring.put(b"y" * 100, readers=1)
+
+            assert reused is not None
+            assert reused.slot == lost.slot
+            assert reader.read(lost) is None
+            assert reader.read(reused) == b"y" * 100
+        finally:
+            reader.close()
+            ring.close()
+
+    def test_a_grown_slot_is_reattached(self):
+        ring, reader = ShmRing(slots=1), ShmReader()
+        try:
+            small = ring.put(b"s", readers=0)
+            assert small is not None
+            assert reader.read(small) == b"s"
+            large = ring.put(b"L" * 5_000_000, readers=0)
+            assert large is not None
+            assert large.segment != small.segment
+            assert reader.read(large) == b"L" * 5_000_000
+        finally:
+            reader.close()
+            ring.close()
+
+
+class TestProbe:
+    def test_probe_is_accepted_only_with_its_token(self):
+        probe, token = create_probe()
+        try:
+            assert check_probe(probe.name, token) is None
+            assert check_probe(probe.name, "0" * len(token)) == "probe segment holds a different token"
+        finally:
+            probe.close()
+            probe.unlink()
+
+        reason = check_probe(probe.name, token)
+        assert reason is not None
+        assert "not visible" in reason
+
+
+async def _collect(handle: DeviceHandle, node: SubprocessNode, sizes: list[int]) -> tuple[list[bytes], int]:
+    """Send one payload per size, each after the previous arrived; return them and how many came as descriptors."""
+    received: list[bytes] = []
+    arrived = asyncio.Event()
+    descriptors = 0
+
+    async def on_blob(data: bytes) -> None:
+        received.append(data)
+        arrived.set()
+
+    async def on_descriptor(_data: bytes) -> None:
+        nonlocal descriptors
+        descriptors += 1
+
+    unsub = handle.subscribe("blob", on_blob)
+    unsub_descriptors = node.transport.subscribe(f"blob.blob{SHM_TOPIC_SUFFIX}", on_descriptor)
+    await asyncio.sleep(0.3)  # let the SUB subscriptions and the shm interest reach the node
+    try:
+        for size in sizes:
+            arrived.clear()
+            assert (await handle.run_command("send", size)).is_ok
+            await asyncio.wait_for(arrived.wait(), timeout=10.0)
+    finally:
+        unsub()
+        unsub_descriptors()
+    return received, descriptors
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(sys.platform == "win32", reason="ZMQ ipc:// transport needs Unix domain sockets")
+class TestSharedMemoryNode:
+    @pytest.mark.parametrize("shm_threshold", [THRESHOLD, None])
+    async def test_large_payloads_arrive_intact(self, shm_threshold: int | None):
+        node = SubprocessNode("blobs", NodeConfig(kind="subprocess"), shm_threshold=shm_threshold)
+        try:
+            await node.open()
+            handles, errors = await node.build_devices({"blob": DeviceConfig(target=BLOB_TARGET)})
+            assert not errors, errors
+            # more large payloads than the ring has slots: each one's release frees its slot again
+            sizes = [100, *[2 * THRESHOLD] * 12, THRESHOLD - 1]
+            received, descriptors = await _collect(handles["blob"], node, sizes)
+        finally:
+            await node.close()
+
+        assert [len(data) for data in received] == sizes
+        assert all(data == bytes([0]) * len(data) for data in received)
+        assert descriptors == (12 if shm_threshold is not None else 0)
@@ -0,0 +1,206 @@
+"""Tests for RPC span tracing — the latency histogram, span ordering across client and node, RPC_STATS."""
+
+import asyncio
+import random
+
+import pytest
+from rigup.node import NodeDaemon
+from rigup.protocol import (
+    Action,
+    BuildDevicesRequest,
+    BuildDevicesResponse,
+    CallBatcher,
+    GetPropsRequest,
+    PingPayload,
+    PropResults,
+    Results,
+    RpcStatsRequest,
+    RpcStatsResponse,
+    RunCommandsRequest,
+    SetPropsRequest,
+    call,
+)
+from rigup.tracing import (  # pyright: ignore[reportPrivateUsage]
+    CLIENT_MARKS,
+    NODE_MARKS,
+    LatencyHistogram,
+    Span,
+    SpanRecorder,
+    _bucket,
+    _bucket_bounds,
+    format_report,
+)
+from rigup.transport import TCPAddress, ZMQTransportClient, ZMQTransportServer
+
+from rigup import CommandRequest, DeviceConfig
+
+SLOW_TARGET = "tests._mock.SlowDevice"
+
+
+class TestLatencyHistogram:
+    def test_buckets_tile_the_value_range(self):
+        previous_high = 0
+        for index in range(_bucket(10**10) + 1):
+            low, high = _bucket_bounds(index)
+            assert low == previous_high
+            assert _bucket(low) == _bucket(high - 1) == index
+            previous_high = high
+
+    def test_percentiles_are_within_the_bucket_resolution(self):
+        rng = random.Random(0)
+        values = sorted(int(rng.lognormvariate(11, 1.5)) for _ in range(10_000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+
+        assert snapshot.count == len(values)
+        assert snapshot.min_ns == values[0]
+        assert snapshot.max_ns == values[-1]
+        for q in (0.5, 0.9, 0.99):
+            exact = values[round(q * len(values)) - 1]
+            assert snapshot.percentile(q) == pytest.approx(exact, rel=1 / 32)
+
+
+class TestSpanPhases:
+    def test_device_time_is_carved_out_of_the_handler(self):
+        span = Span("node", "set_props", "stage")
+        span.marks.update(received=0, dispatched=10, handled=1_000, serialized=1_050, replied=1_100)
+        span.device_call(queued_ns=20, started_ns=300, finished_ns=900)
+
+        assert span.phases() == {
+            "receive": 10,
+            "device_wait": 280,
+            "execute": 600,
+            "handler": 110,
+            "serialize": 50,
+            "reply": 50,
+            "total": 1_100,
+        }
+
+    def test_network_is_what_the_node_did_not_account_for(self):
+        span = Span("client", "ping", node_ns=700)
+        span.marks.update(enqueued=0, sent=100, replied=1_100, decoded=1_150)
+
+        phases = span.phases()
+        assert phases["round_trip"] == 1_000
+        assert phases["network"] == 300
+        assert phases["total"] == 1_150
+
+    def test_children_are_recorded_with_their_parent(self):
+        recorder = SpanRecorder()
+        parent = Span("node", "batch")
+        parent.children.append(Span("node", "get_props", "stage"))
+        recorder.record(parent)
+
+        assert [(s.action, s.device) for s in recorder.stats()] == [("batch", None), ("get_props", "stage")]
+
+
+def _assert_ordered(span: Span, order: tuple[str, ...]) -> None:
+    stamps = [span.marks[mark] for mark in order]
+    assert stamps == sorted(stamps), f"{span.side} {span.action} marks out of order: {span.marks}"
+
+
+@pytest.fixture
+async def traced_node(free_tcp_address: TCPAddress):
+    server_transport = ZMQTransportServer()
+    daemon = NodeDaemon(node_id="traced", transport=server_transport)
+    await daemon.start(free_tcp_address)
+    client = ZMQTransportClient()
+    await client.connect(free_tcp_address)
+    await call(
+        client,
+        Action.BUILD_DEVICES,
+        BuildDevicesRequest(
+            devices={"stage": DeviceConfig(target=SLOW_TARGET, init={"read_delay_s": 0.05, "settle_s": 0.2})}
+        ),
+        BuildDevicesResponse,
+        timeout_s=10.0,
+    )
+    enabled = await call(client, Action.RPC_STATS, RpcStatsRequest(enable=True, reset=True), RpcStatsResponse)
+    assert enabled.enabled
+    client.trace(SpanRecorder())
+
+    yield client, server_transport
+
+    await client.close()
+    await daemon.stop()
+
+
+@pytest.mark.slow
+class TestTracedRpc:
+    async def test_spans_are_ordered_within_and_across_processes(
+        self, traced_node: tuple[ZMQTransportClient, ZMQTransportServer]
+    ):
+        client, server = traced_node
+        settle = RunCommandsRequest(uid="stage", commands=[CommandRequest(attr="settle")])
+        settling = asyncio.create_task(call(client, Action.RUN_COMMANDS, settle, Results))
+        await asyncio.sleep(0.05)  # settle holds the device's serialized lane
+        await call(client, Action.SET_PROPS, SetPropsRequest(uid="stage", props={"position": 1.0}), PropResults)
+        await settling
+        await call(client, Action.PING, PingPayload(), PingPayload)
+
+        assert client.tracer is not None
+        assert server.tracer is not None
+        client_spans = {span.action: span for span in client.tracer.recent}
+        node_spans = {span.action: span for span in server.tracer.recent}
+        for action in ("run_commands", "set_props", "ping"):
+            sent, received = client_spans[action], node_spans[action]
+            _assert_ordered(sent, CLIENT_MARKS)
+            _assert_ordered(received, NODE_MARKS)
+            # one process here, so both sides' perf_counter readings share a clock
+            assert sent.marks["sent"] <= received.marks["received"]
+            assert received.marks["replied"] <= sent.marks["replied"]
+            assert sent.node_ns is not None
+            assert sent.node_ns <= sent.marks["replied"] - sent.marks["sent"]
+            device_ns = received.device_wait_ns + received.execute_ns
+            assert device_ns <= received.marks["handled"] - received.marks["dispatched"]
+
+        write = node_spans["set_props"]
+        assert write.device == "stage"
+        assert write.device_calls == 1
+        assert write.device_wait_ns > 50_000_000  # queued behind the running settle
+        assert node_spans["run_commands"].execute_ns >= 200_000_000
+        assert node_spans["ping"].device_calls == 0
+
+    async def test_batched_calls_get_spans_of_their_own(
+        self, traced_node: tuple[ZMQTransportClient, ZMQTransportServer]
+    ):
+        client, server = traced_node
+        batcher = CallBatcher(client)
+        await asyncio.gather(
+            *(
+                batcher.call(Action.GET_PROPS, GetPropsRequest(uid="stage", props=[name]), PropResults, device="stage")
+                for name in ("position", "temperature")
+            )
+        )
+
+        assert server.tracer is not None
+        (batch,) = [span for span in server.tracer.recent if span.action == Action.BATCH]
+        assert [(child.action, child.device) for child in batch.children] == [("get_props", "stage")] * 2
+        first, second = batch.children
+        assert first.marks["serialized"] <= second.marks["dispatched"]  # one device: entries run in order
+        assert all(child.device_calls == 1 for child in batch.children)
+        assert client.tracer is not None
+        entries = [span for span in client.tracer.recent if span.action == "get_props"]
+        assert len(entries) == 2
+        for entry in entries:
+            _assert_ordered(entry, CLIENT_MARKS)
+
+    async def test_rpc_stats_reports_histograms_per_device_and_action(
+        self, traced_node: tuple[ZMQTransportClient, ZMQTransportServer]
+    ):
+        client, _ = traced_node
+        for position in range(5):
+            write = SetPropsRequest(uid="stage", props={"position": position})
+            await call(client, Action.SET_PROPS, write, PropResults)
+
+        response = await call(client, Action.RPC_STATS, RpcStatsRequest(reset=True), RpcStatsResponse)
+        (writes,) = [s for s in response.stats if (s.side, s.device, s.action) == ("node", "stage", "set_props")]
+        assert set(writes.phases) == {"receive", "device_wait", "execute", "handler", "serialize", "reply", "total"}
+        assert all(histogram.count == 5 for histogram in writes.phases.values())
+        assert "set_props" in format_report(response.stats)
+
+        after = await call(client, Action.RPC_STATS, RpcStatsRequest(enable=False), RpcStatsResponse)
+        assert not after.enabled
+        assert [s.action for s in after.stats] == ["rpc_stats"]  # only the reset request itself
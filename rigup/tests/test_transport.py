@@ -1,8 +1,11 @@
 """Tests for ZMQ transport — DEALER/ROUTER request/response, notify, PUB/SUB."""
 
 import asyncio
+import time
 
 import pytest
+import zmq
+import zmq.asyncio
 from rigup.transport import (
     TCPAddress,
     TransportError,
@@ -174,6 +177,111 @@ class TestPubSub:
         # "after" may or may not arrive depending on timing; unsub is best-effort for PUB/SUB
 
 
+async def _pair(address: TCPAddress, server: ZMQTransportServer) -> ZMQTransportClient:
+    client = ZMQTransportClient()
+    await server.bind(address)
+    await client.connect(address)
+    return client
+
+
+class _Inbox:
+    """A subscriber callback that collects payloads and lets a test wait for a count of them."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.items: list[bytes] = []
+        self.times: list[float] = []
+        self._delay_s = delay_s
+        self._changed = asyncio.Event()
+
+    async def __call__(self, data: bytes) -> None:
+        if self._delay_s:
+            await asyncio.sleep(self._delay_s)
+        self.items.append(data)
+        self.times.append(time.perf_counter())
+        self._changed.set()
+
+    async def wait_for(self, count: int, timeout_s: float = 5.0) -> list[bytes]:
+        async with asyncio.timeout(timeout_s):
+            while len(self.items) < count:
+                self._changed.clear()
+                await self._changed.wait()
+        return self.items
+
+
+class TestStreamBatching:
+    async def test_a_burst_is_coalesced_and_each_topic_keeps_its_order(self, free_tcp_address: TCPAddress):
+        server = ZMQTransportServer()
+        client = await _pair(free_tcp_address, server)
+        wire = zmq.asyncio.Context.instance().socket(zmq.SUB)
+        wire.connect(free_tcp_address.pub_addr)
+        wire.setsockopt(zmq.SUBSCRIBE, b"")
+        inboxes = {topic: _Inbox() for topic in ("a", "b", "c")}
+        for topic, inbox in inboxes.items():
+            client.subscribe(topic, inbox)
+        await asyncio.sleep(0.2)
+
+        sent = [(topic, f"{topic}{i}".encode()) for i in range(1000) for topic in inboxes]
+        for topic, data in sent:
+            await server.publish(topic, data)
+        for topic, inbox in inboxes.items():
+            assert await inbox.wait_for(1000) == [data for t, data in sent if t == topic]
+        frames = 0
+        while await wire.poll(100):
+            await wire.recv_multipart()
+            frames += 1
+
+        assert 0 < frames < len(sent) / 10
+        wire.close(linger=0)
+        await client.close()
+        await server.close()
+
+    @pytest.mark.parametrize("compress", ["zlib", "zstd"])
+    async def test_compressed_batches_arrive_intact(self, free_tcp_address: TCPAddress, compress):
+        if compress == "zstd":
+            pytest.importorskip("zstandard")
+        server = ZMQTransportServer(compress=compress, compress_threshold=1024)
+        client = await _pair(free_tcp_address, server)
+        inbox = _Inbox()
+        client.subscribe("frames", inbox)
+        await asyncio.sleep(0.2)
+
+        sent = [bytes([i]) * 2000 for i in range(50)]
+        for data in sent:
+            await server.publish("frames", data)
+
+        assert await inbox.wait_for(len(sent)) == sent
+        await client.close()
+        await server.close()
+
+    async def test_large_payloads_keep_their_place_among_batched_ones(self, transport_pair):
+        client, server = transport_pair
+        inbox = _Inbox()
+        client.subscribe("t", inbox)
+        await asyncio.sleep(0.2)
+
+        sent = [b"small-1", b"small-2", b"L" * 200_000, b"small-3", b"L" * 300_000, b"small-4"]
+        for data in sent:
+            await server.publish("t", data)
+
+        assert await inbox.wait_for(len(sent)) == sent
+
+    async def test_a_slow_topic_does_not_hold_back_the_others(self, transport_pair):
+        client, server = transport_pair
+        slow, fast = _Inbox(delay_s=0.05), _Inbox()
+        client.subscribe("slow", slow)
+        client.subscribe("fast", fast)
+        await asyncio.sleep(0.2)
+
+        start = time.perf_counter()
+        for i in range(5):
+            await server.publish("slow", str(i).encode())
+            await server.publish("fast", str(i).encode())
+
+        assert await slow.wait_for(5) == [b"0", b"1", b"2", b"3", b"4"]
+        assert len(fast.items) == 5
+        assert max(fast.times) - start < 0.1  # well before the slow topic's 0.25 s
+
+
 class TestCloseSemantics:
     async def test_close_fails_pending_requests(self, free_tcp_address: TCPAddress):
         server = ZMQTransportServer()
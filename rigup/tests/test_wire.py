@@ -0,0 +1,204 @@
+"""Wire compatibility of the per-model codecs with ``model_dump`` / ``model_validate``, and schema dispatch.
+
+Every body ``pack`` produces must be byte-for-byte what ``model_dump`` + msgpack produces, so nodes and
+clients on either side of a change interoperate.
+"""
+
+import math
+import warnings
+from collections.abc import Iterator
+from enum import StrEnum
+
+import msgpack
+import pytest
+from pydantic import BaseModel, Field, ValidationError, computed_field, field_serializer
+from rigup.device import PropertyModel, PropResults, Result
+from rigup.node._logs import NodeLogEvent
+from rigup.protocol import ShmDescriptor
+from rigup.wire import TopicDispatcher, codec, decode, pack, set_validation, unpack
+
+# drivers build Result.ok/err without the type parameter, which model_dump warns about
+pytestmark = pytest.mark.filterwarnings("ignore:Pydantic serializer warnings")
+
+
+class Mode(StrEnum):
+    FAST = "fast"
+    SLOW = "slow"
+
+
+class Channel(BaseModel):
+    name: str
+    mode: Mode = Mode.FAST
+    gain: float | None = None
+    taps: list[float] = Field(default_factory=list)
+
+
+class Rack(BaseModel):
+    channels: dict[str, Channel]
+    primary: Channel | None = None
+    tags: list[str | int] = Field(default_factory=list)
+
+
+class Scaled(BaseModel):
+    value: float
+
+    @field_serializer("value")
+    def _scale(self, value: float) -> float:
+        return value * 2
+
+
+class Derived(BaseModel):
+    value: float
+
+    @computed_field
+    @property
+    def double(self) -> float:
+        return self.value * 2
+
+
+class Partial(BaseModel):
+    """Reads only the ``results`` keys of a PropResults body."""
+
+    results: dict[str, object]
+
+
+def _props(**values: object) -> PropResults:
+    return PropResults(results={name: Result.ok(PropertyModel.from_value(v)) for name, v in values.items()})
+
+
+def _payloads() -> list[BaseModel]:
+    props = _props(power=12.5, enabled=True, count=3, label="laser")
+    props.results["broken"] = Result.err("device not ready")
+    return [
+        props,
+        _props(low=-math.inf, high=math.inf, missing=math.nan),
+        _props(samples=[0.5, 1, None, "x", {"nested": [math.nan, 2.0]}], roi={"x": 0, "y": 0, "w": 4000, "h": 2048}),
+        PropResults(results={"mode": Result.ok(PropertyModel(value="on", options=["off", "on"]))}),
+        PropResults(),
+        NodeLogEvent(node_id="n", name="rigup.x", levelno=20, levelname="INFO", message="hello", created=1.5),
+        ShmDescriptor(segment="rigup-1", slot=3, generation=7, size=1 << 20),
+        Rack(
+            channels={"a": Channel(name="a", gain=0.5, taps=[1.0, math.inf]), "b": Channel(name="b", mode=Mode.SLOW)},
+            primary=Channel(name="a"),
+            tags=["x", 1],
+        ),
+    ]
+
+
+@pytest.fixture
+def validating() -> Iterator[None]:
+    set_validation(True)
+    yield
+    set_validation(False)
+
+
+def _reference(body: BaseModel, *, exclude_unset: bool = False) -> bytes:
+    include = body.model_fields_set if exclude_unset else None
+    return msgpack.packb(body.model_dump(mode="json", include=include))  # pyright: ignore[reportReturnType]
+
+
+class TestPack:
+    @pytest.mark.parametrize("body", _payloads(), ids=lambda body: type(body).__name__)
+    def test_packs_the_same_bytes_as_model_dump(self, body: BaseModel):
+        expected, expected_json = _reference(body), body.model_dump_json().encode()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # and without pydantic's serializer warnings
+            assert pack(body) == expected
+            assert pack(body, fmt="json") == expected_json
+
+    @pytest.mark.parametrize("body", _payloads(), ids=lambda body: type(body).__name__)
+    def test_round_trips_through_decode(self, body: BaseModel):
+        data = pack(body)
+        assert decode(data, type(body)) == type(body).model_validate(unpack(data))
+
+    def test_exclude_unset_applies_to_top_level_fields(self):
+        rack = Rack(channels={"a": Channel(name="a")})
+        assert pack(rack, exclude_unset=True) == _reference(rack, exclude_unset=True)
+        assert unpack(pack(rack, exclude_unset=True)) == {"channels": {"a": Channel(name="a").model_dump(mode="json")}}
+
+    @pytest.mark.parametrize("model", [Scaled, Derived])
+    def test_custom_serializers_apply(self, model: type[BaseModel]):
+        body = model(value=1.5)
+        assert pack(body) == _reference(body)
+
+    def test_codecs_are_built_once_per_class(self):
+        assert codec(Rack) is codec(Rack)
+        assert codec(Rack).model is Rack
+
+
+@pytest.mark.usefixtures("validating")
+class TestValidationMode:
+    @pytest.mark.parametrize("fmt", ["msgpack", "json"])
+    def test_a_body_the_receiver_would_reject_fails_to_pack(self, fmt: str):
+        broken = Channel.model_construct(name="a", taps=["not a number"])
+        with pytest.raises(ValidationError):
+            pack(broken, fmt=fmt)  # pyright: ignore[reportArgumentType]
+        set_validation(False)
+        assert unpack(pack(broken)) == {"name": "a", "mode": "fast", "gain": None, "taps": ["not a number"]}
+
+    def test_serializer_warnings_are_shown(self):
+        with pytest.warns(UserWarning, match="serialized value may not be as expected"):
+            pack(_payloads()[0])
+
+    def test_valid_bodies_pack_unchanged(self):
+        for body in _payloads():
+            assert pack(body) == _reference(body)
+
+
+class TestDecode:
+    def test_json_bodies_validate_from_the_bytes(self):
+        body = _payloads()[0]
+        assert decode(pack(body, fmt="json"), PropResults) == decode(pack(body), PropResults)
+
+    @pytest.mark.parametrize("fmt", ["msgpack", "json"])
+    def test_data_that_does_not_fit_raises(self, fmt: str):
+        data = pack(ShmDescriptor(segment="s", slot=0, generation=0, size=1), fmt=fmt)  # pyright: ignore[reportArgumentType]
+        with pytest.raises(ValidationError):
+            decode(data, NodeLogEvent)
+
+
+class TestTopicDispatcher:
+    @pytest.mark.parametrize("fmt", ["msgpack", "json"])
+    async def test_each_schema_validates_the_wire_bytes(self, fmt: str):
+        dispatcher = TopicDispatcher()
+        full: list[PropResults] = []
+        partial: list[Partial] = []
+        logs: list[NodeLogEvent] = []
+        raw: list[bytes] = []
+
+        async def on_full(body: PropResults) -> None:
+            full.append(body)
+
+        async def on_partial(body: Partial) -> None:
+            partial.append(body)
+
+        async def on_log(body: NodeLogEvent) -> None:
+            logs.append(body)
+
+        async def on_bytes(data: bytes) -> None:
+            raw.append(data)
+
+        dispatcher.subscribe(on_full, schema=PropResults)
+        dispatcher.subscribe(on_partial, schema=Partial)
+        dispatcher.subscribe(on_log, schema=NodeLogEvent)
+        dispatcher.subscribe(on_bytes)
+        body = _props(power=1.0)
+        data = pack(body, fmt=fmt)  # pyright: ignore[reportArgumentType]
+        await dispatcher.emit_bytes(data)
+
+        assert full == [PropResults.model_validate(unpack(data))]
+        assert [set(p.results) for p in partial] == [{"power"}]
+        assert logs == []  # the schema doesn't match, so its subscriber doesn't fire
+        assert raw == [data]
+
+    async def test_local_emit_packs_for_bytes_subscribers(self):
+        dispatcher = TopicDispatcher()
+        raw: list[bytes] = []
+
+        async def on_bytes(data: bytes) -> None:
+            raw.append(data)
+
+        dispatcher.subscribe(on_bytes)
+        body = _props(power=2.0)
+        await dispatcher.emit(body)
+        assert raw == [_reference(body)]
@@ -6,7 +6,7 @@ from abc import abstractmethod
 from contextlib import suppress
 from enum import StrEnum
 from pathlib import Path, PurePosixPath
-from typing import Literal, cast
+from typing import ClassVar, Literal, cast
 
 import numpy as np
 from ome_zarr_writer import (
@@ -161,6 +161,7 @@ class CameraController(DeviceController["Camera"]):
         self._task: asyncio.Task[None] | None = None
         self._task_kind: Literal["batch", "close"] | None = None
         self._publish_tasks: dict[PreviewLayer, asyncio.Task[None]] = {}
+        self._pending_viewport: PreviewFrame | None = None
         # Preview-publish counters (best-effort publish is skip-if-busy); reported per stack.
         System.Ram.reserve(self.device.uid, weight=1.0)
 
@@ -170,6 +171,7 @@ class CameraController(DeviceController["Camera"]):
         for task in self._publish_tasks.values():
             task.cancel()
         self._publish_tasks.clear()
+        self._pending_viewport = None
         if self._writer is not None:  # free the reusable ring (its slots' workers + shared memory)
             await self._run_sync(self._writer.close)
             self._writer = None
@@ -195,6 +197,13 @@ class CameraController(DeviceController["Camera"]):
     def _on_preview_frame(self, frame: PreviewFrame) -> None:
         task = self._publish_tasks.get(frame.header.layer)
         if task is not None and not task.done():
+            if frame.header.layer is PreviewLayer.VIEWPORT:
+                # A refinement often lands while its coarse pass is still publishing; hold the latest one
+                # instead of dropping it, or an idle camera would be left showing the coarse pass.
+                if self._pending_viewport is not None:
+                    self._previewer.health.record_publish_drop()
+                self._pending_viewport = frame
+                return
             self._previewer.health.record_publish_drop()  # Gate 2 drop: prior publish still in flight
             return
         self._previewer.health.record_publish()
@@ -204,6 +213,10 @@ class CameraController(DeviceController["Camera"]):
         topic = "preview" if frame.header.layer is PreviewLayer.OVERVIEW else "preview_viewport"
         with suppress(RuntimeError):
             await self.publish(topic, frame.pack())
+        if frame.header.layer is PreviewLayer.VIEWPORT and (pending := self._pending_viewport) is not None:
+            self._pending_viewport = None
+            self._previewer.health.record_publish()
+            self._publish_tasks[PreviewLayer.VIEWPORT] = asyncio.create_task(self._publish_preview(pending))
 
     @describe(label="Update Preview Viewport")
     async def update_preview_viewport(self, viewport: PreviewViewport):
@@ -241,14 +254,27 @@ class CameraController(DeviceController["Camera"]):
         return "preview"
 
     async def _preview_loop(self):
+        """Feed the previewer at the rate it can consume, not the camera's frame rate.
+
+        Cameras whose grab returns the newest frame are not grabbed until the previewer is ready.
+        Others must keep draining their queue, but frames the previewer would drop are discarded
+        without being handed over.
+        """
         try:
             while self._mode == CameraMode.PREVIEW:
+                if self.device.grab_returns_latest:
+                    await self._previewer.ready()
+                    if self._mode != CameraMode.PREVIEW:
+                        break
                 frame = await self._run_sync(self.device.grab_frame)
-                self._previewer.submit_frame(
-                    frame,
-                    idx=self._frame_idx,
-                    valid_bits=PIXEL_FMT_TO_VALID_BITS[cast("PixelFormat", str(self.device.pixel_format))],
-                )
+                if self._previewer.accepts_frame():
+                    self._previewer.submit_frame(
+                        frame,
+                        idx=self._frame_idx,
+                        valid_bits=PIXEL_FMT_TO_VALID_BITS[cast("PixelFormat", str(self.device.pixel_format))],
+                    )
+                else:
+                    self._previewer.health.record_governor_skip()
                 self._frame_idx += 1
         except asyncio.CancelledError:
             pass
@@ -424,15 +450,19 @@ class CameraController(DeviceController["Camera"]):
         pv = self._previewer.health.snapshot()
         log.info(
             "Preview health %s: frames=%d overview_gen=%d overview_busy_drops=%d "
-            "gen_ms(avg=%.1f max=%.1f) | publish_sent=%d publish_busy_drops=%d",
+            "gen_ms(avg=%.1f max=%.1f) viewports=%d viewport_refines_superseded=%d | "
+            "publish_sent=%d publish_busy_drops=%d governor_skips=%d",
             self.device.uid,
             pv.frames,
             pv.overviews_generated,
             pv.overview_busy_drops,
             pv.generation_ms_average,
             pv.generation_ms_max,
+            pv.viewports_generated,
+            pv.viewport_refines_superseded,
             pv.publish_sent,
             pv.publish_busy_drops,
+            pv.governor_skips,
         )
 
     @describe(label="Release Writer")
@@ -526,6 +556,9 @@ class Camera(Device):
 
     trigger_mode: TriggerMode = TriggerMode.OFF
     trigger_polarity: TriggerPolarity = TriggerPolarity.RISING_EDGE
+    # True when grab_frame returns the newest frame rather than the oldest queued one, so preview may skip
+    # grabs while the previewer is busy without building a backlog in the driver's buffer.
+    grab_returns_latest: ClassVar[bool] = False
 
     _buffer_allocated = False
 
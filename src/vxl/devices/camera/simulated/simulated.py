@@ -24,6 +24,7 @@ from vxl.devices.camera.simulated.frame_source import FrameSource, FrameSourceCo
 
 @final
 class SimulatedCamera(Camera):
+    grab_returns_latest: ClassVar[bool] = True
     _min_width: ClassVar[int] = 64
     _min_height: ClassVar[int] = 64
     _roi_step_width_px: int = 16
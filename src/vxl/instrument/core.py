@@ -30,7 +30,14 @@ from vxl.devices.axes import ContinuousAxisHandle, StepMode, TTLStepperConfig
 from vxl.devices.camera import CameraHandle, CaptureState
 from vxl.devices.daq.clocked import Signals
 from vxl.hal import HAL, HardwareTopology
-from vxl.preview import PreviewLayer, PreviewSourceEmission, PreviewViewport, preview_source_header
+from vxl.preview import (
+    PreviewCompositeChannel,
+    PreviewCompositor,
+    PreviewLayer,
+    PreviewSourceEmission,
+    PreviewSourceView,
+    PreviewViewport,
+)
 from vxl.system import Remote, System, remote_store_fingerprint
 
 from .config import (
@@ -117,6 +124,7 @@ class Instrument:
         self._preview_revision = Cell(0)
         self._accept_preview = False
         self._preview_source_ids: dict[str, str] = {}
+        self._compositor: PreviewCompositor | None = None
         self._viewport = PreviewViewport()
         self._mode = Cell[AcquisitionMode](AcquisitionMode.IDLE)
         self._acquisition = Cell[ActiveAcquisitionState | None](None)
@@ -226,6 +234,29 @@ class Instrument:
         self._viewport = viewport if viewport is not None else self._viewport
         self._apply_viewport(self.active_channels)
 
+    def set_preview_composite(self, channels: Mapping[str, PreviewCompositeChannel] | None) -> None:
+        """Blend the given channels into one server-side RGB preview layer, or ``None`` to send each separately.
+
+        While compositing, the listed channels' frames are published only as part of the composite; frames of
+        other channels are still published separately. A profile change recomposes the new active channels,
+        keeping the colormap and contrast window already set for any channel that stays active.
+        """
+        if channels is None:
+            if self._compositor is not None:
+                self._compositor.close()
+                self._compositor = None
+        elif self._compositor is None:
+            self._compositor = PreviewCompositor(self._emit_composite_frame, channels)
+        else:
+            self._compositor.configure(channels)
+
+    def preview_composite_defaults(self) -> dict[str, PreviewCompositeChannel]:
+        """Composite settings for the active channels using each channel's emission colormap."""
+        return {
+            ch_id: PreviewCompositeChannel(colormap=self._channel_config(ch_id).colormap)
+            for ch_id in self.active_channels
+        }
+
     def _apply_viewport(self, channels: Mapping[str, Channel]) -> None:
         for ch_id, ch in channels.items():
             rot = self._hal.topology.detection[self._channel_config(ch_id).detection].rotation_deg
@@ -600,6 +631,7 @@ class Instrument:
         self._channels = {}
         self._remote_stores = {}
         self._preview_source_ids = {}
+        self.set_preview_composite(None)
 
     async def _refresh_device_props(self) -> None:
         """Best-effort hydration of every device's latest-successful property cache."""
@@ -730,6 +762,11 @@ class Instrument:
     async def _reset_preview(self) -> None:
         """Invalidate preview, establish every new camera source identity, then resume delivery."""
         self._accept_preview = False
+        if self._compositor is not None:
+            self._compositor.clear()
+            current = self._compositor.channels
+            defaults = self.preview_composite_defaults()
+            self._compositor.configure({ch_id: current.get(ch_id, ch) for ch_id, ch in defaults.items()})
         await self._preview_revision.set(self._preview_revision.value + 1)
         cameras = {channel.camera.uid: channel.camera for channel in self.active_channels.values()}
         source_ids = await asyncio.gather(*(camera.reset_preview_stream() for camera in cameras.values()))
@@ -1401,7 +1438,7 @@ class Instrument:
         if not self._accept_preview:
             return
         try:
-            source = preview_source_header(frame)
+            source = PreviewSourceView(frame)
         except ValueError:
             logger.warning("Dropping invalid preview source packet from %s", camera_id, exc_info=True)
             return
@@ -1409,8 +1446,14 @@ class Instrument:
             return
         if (channel_id := self._channel_for_camera(camera_id)) is None:
             return
+        if self._compositor is not None and self._compositor.submit((channel_id, layer, frame)):
+            return
         await self._preview.emit((channel_id, layer, frame))
 
+    async def _emit_composite_frame(self, emission: PreviewSourceEmission) -> None:
+        if self._accept_preview:
+            await self._preview.emit(emission)
+
     async def _apply_filters(self) -> None:
         desired: dict[str, str] = {}
         for ch_id in self.active_channels:
@@ -1,23 +1,38 @@
+from .composite import PreviewCompositeChannel, PreviewCompositor
 from .generator import PreviewGenerator
 from .protocol import (
+    COMPOSITE_CHANNEL_ID,
+    PreviewCompositeFrame,
+    PreviewCompositeHeader,
     PreviewEmission,
     PreviewFrame,
     PreviewKey,
     PreviewLayer,
     PreviewSourceEmission,
     PreviewSourceHeader,
+    PreviewSourceView,
+    PreviewTileDecoder,
+    PreviewTileDelta,
+    PreviewTileDeltaHeader,
+    PreviewTileEncoder,
     PreviewViewport,
     SourceRectPx,
     StreamCursor,
     ValidBits,
     VoxelPreviewHeader,
     VoxelPreviewPacket,
+    VoxelPreviewView,
     preview_source_header,
 )
 from .queue import LatestFrameQueue
 
 __all__ = [
+    "COMPOSITE_CHANNEL_ID",
     "LatestFrameQueue",
+    "PreviewCompositeChannel",
+    "PreviewCompositeFrame",
+    "PreviewCompositeHeader",
+    "PreviewCompositor",
     "PreviewEmission",
     "PreviewFrame",
     "PreviewGenerator",
@@ -25,11 +40,17 @@ __all__ = [
     "PreviewLayer",
     "PreviewSourceEmission",
     "PreviewSourceHeader",
+    "PreviewSourceView",
+    "PreviewTileDecoder",
+    "PreviewTileDelta",
+    "PreviewTileDeltaHeader",
+    "PreviewTileEncoder",
     "PreviewViewport",
     "SourceRectPx",
     "StreamCursor",
     "ValidBits",
     "VoxelPreviewHeader",
     "VoxelPreviewPacket",
+    "VoxelPreviewView",
     "preview_source_header",
 ]
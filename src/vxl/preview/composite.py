@@ -0,0 +1,247 @@
+"""Server-side blending of several live preview channels into one RGB layer.
+
+Each channel's latest source frame is mapped through its contrast window and colormap LUT and summed
+additively into a float accumulator, which is then saturated to RGB8 or RGB16. Channels from different
+cameras are resampled (nearest neighbour) onto the reference channel's raster inside the kernel, so no
+intermediate resized copies are made. Viewers then receive one VXPC frame per layer instead of one VXPS
+frame per channel.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+from numba import jit
+from pydantic import Field, model_validator
+from vxlib.schema import FrozenModel
+
+from vxl._utils.color import resolve_colormap
+
+from .protocol import (
+    COMPOSITE_CHANNEL_ID,
+    CompositeDepth,
+    PreviewCompositeFrame,
+    PreviewFrame,
+    PreviewLayer,
+    PreviewSourceEmission,
+    PreviewSourceHeader,
+)
+
+LUT_RESOLUTION = 256
+
+type _CompositeSink = Callable[[PreviewSourceEmission], Awaitable[None]]
+
+
+class PreviewCompositeChannel(FrozenModel):
+    """Display mapping for one channel: a colormap and a contrast window in raw sample units."""
+
+    colormap: str = "white"
+    low: int = Field(default=0, ge=0)
+    high: int | None = Field(default=None, gt=0, description="Defaults to the frame's full valid-bit range.")
+    visible: bool = True
+
+    @model_validator(mode="after")
+    def _validate_window(self) -> "PreviewCompositeChannel":
+        if self.high is not None and self.high <= self.low:
+            raise ValueError("high must be greater than low")
+        return self
+
+
+# Written once and compiled with nogil so a render on the compositor's worker thread never holds the GIL. The
+# kernels stay serial: preview rasters are small, and numba's parallel thread pool is left to the acquisition writers.
+_jit = jit(nopython=True, nogil=True, fastmath=True, cache=True)
+
+
+@_jit
+def _accumulate(frame: np.ndarray, lut: np.ndarray, low: float, scale: float, acc: np.ndarray) -> None:
+    """Add ``lut[(frame - low) * scale]`` into the ``(3, H, W)`` accumulator, resampling ``frame`` to ``H x W``."""
+    _, height, width = acc.shape
+    frame_height, frame_width = frame.shape
+    top = lut.shape[0] - 1
+    for i in range(height):
+        si = i * frame_height // height
+        for j in range(width):
+            t = (frame[si, j * frame_width // width] - low) * scale
+            t = min(max(t, 0.0), 1.0)
+            k = int(t * top + 0.5)
+            acc[0, i, j] += lut[k, 0]
+            acc[1, i, j] += lut[k, 1]
+            acc[2, i, j] += lut[k, 2]
+
+
+@_jit
+def _saturate(acc: np.ndarray, out: np.ndarray, full_scale: float) -> None:
+    """Clip the additive blend to [0, 1] and quantize it into ``out``."""
+    planes, height, width = acc.shape
+    for c in range(planes):
+        for i in range(height):
+            for j in range(width):
+                out[c, i, j] = int(min(acc[c, i, j], 1.0) * full_scale + 0.5)
+
+
+def composite_planes(
+    frames: list[tuple[np.ndarray, np.ndarray, int, int]],
+    *,
+    shape: tuple[int, int],
+    depth: CompositeDepth,
+) -> np.ndarray:
+    """Blend ``(pixels, lut, low, high)`` channels into ``(3, *shape)`` planes of the requested depth.
+
+    ``lut`` is a ``(n, 3)`` float32 table in [0, 1]; samples at or below ``low`` map to its first entry
+    and samples at or above ``high`` to its last.
+    """
+    acc = np.zeros((3, *shape), dtype=np.float32)
+    for pixels, lut, low, high in frames:
+        _accumulate(pixels, lut, float(low), 1.0 / (high - low), acc)
+    out = np.empty((3, *shape), dtype=np.uint8 if depth == 8 else np.uint16)
+    _saturate(acc, out, float((1 << depth) - 1))
+    return out
+
+
+class PreviewCompositor:
+    """Keep the latest frame of each channel per layer and publish their blend as one layer.
+
+    Each layer has one render in flight at a time. Frames arriving meanwhile only replace the stored
+    latest frame; when the render finishes, one more render picks up everything that changed. Decoded
+    pixels are cached per stored frame, so a channel that did not change is not decompressed again.
+    """
+
+    def __init__(
+        self,
+        sink: _CompositeSink,
+        channels: Mapping[str, PreviewCompositeChannel],
+        *,
+        depth: CompositeDepth = 8,
+    ) -> None:
+        self._sink = sink
+        self._depth: CompositeDepth = depth
+        self._channels: dict[str, PreviewCompositeChannel] = dict(channels)
+        self._luts: dict[str, np.ndarray] = {}
+        self._latest: dict[PreviewLayer, dict[str, bytes]] = {}
+        self._decoded: dict[tuple[str, PreviewLayer], tuple[bytes, PreviewSourceHeader, np.ndarray]] = {}
+        self._dirty: set[PreviewLayer] = set()
+        self._tasks: dict[PreviewLayer, asyncio.Task[None]] = {}
+        self._frame_idx = 0
+        self._epoch = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PreviewComposite")
+        self._log = logging.getLogger(f"{__name__}.PreviewCompositor")
+
+    @property
+    def channels(self) -> dict[str, PreviewCompositeChannel]:
+        return dict(self._channels)
+
+    def configure(self, channels: Mapping[str, PreviewCompositeChannel]) -> None:
+        """Replace the channel mapping and re-render every layer that already has frames."""
+        self._channels = dict(channels)
+        self._luts = {}
+        for layer in self._latest:
+            self._schedule(layer)
+
+    def submit(self, emission: PreviewSourceEmission) -> bool:
+        """Store one channel's packed source frame and schedule a blend of its layer.
+
+        Returns False, storing nothing, when the channel is not configured, so the caller can publish the
+        frame uncomposited instead.
+        """
+        channel_id, layer, frame = emission
+        if channel_id not in self._channels:
+            return False
+        self._latest.setdefault(layer, {})[channel_id] = frame
+        self._schedule(layer)
+        return True
+
+    def clear(self) -> None:
+        """Discard every stored frame and pending render, e.g. when preview sources are reset."""
+        self._epoch += 1
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._latest.clear()
+        self._decoded.clear()
+        self._dirty.clear()
+
+    def close(self) -> None:
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, layer: PreviewLayer) -> None:
+        self._dirty.add(layer)
+        task = self._tasks.get(layer)
+        if task is None or task.done():
+            self._tasks[layer] = asyncio.create_task(self._render_loop(layer), name=f"preview-composite-{layer}")
+
+    async def _render_loop(self, layer: PreviewLayer) -> None:
+        epoch = self._epoch
+        loop = asyncio.get_running_loop()
+        while layer in self._dirty and epoch == self._epoch:
+            self._dirty.discard(layer)
+            frames = {ch: packed for ch, packed in self._latest.get(layer, {}).items() if ch in self._channels}
+            if not frames:
+                return
+            frame_idx = self._frame_idx
+            self._frame_idx += 1
+            try:
+                packed = await loop.run_in_executor(
+                    self._executor, partial(self._render, layer, frames, dict(self._channels), frame_idx)
+                )
+            except asyncio.CancelledError:
+                return
+            except Exception:
+                self._log.exception("Failed to composite %s preview layer", layer)
+                continue
+            if epoch != self._epoch or packed is None:
+                continue
+            await self._sink((COMPOSITE_CHANNEL_ID, layer, packed))
+
+    def _render(
+        self,
+        layer: PreviewLayer,
+        frames: dict[str, bytes],
+        channels: dict[str, PreviewCompositeChannel],
+        frame_idx: int,
+    ) -> bytes | None:
+        """Decode changed channels and blend them. Runs on the compositor's worker thread."""
+        order = [ch for ch in channels if ch in frames]
+        sources = {ch: self._decode(ch, layer, frames[ch]) for ch in order}
+        visible = [ch for ch in order if channels[ch].visible]
+        if not visible:
+            return None
+        reference_id = visible[0]
+        reference = sources[reference_id][0]
+        inputs = []
+        for ch in visible:
+            header, pixels = sources[ch]
+            settings = channels[ch]
+            high = settings.high if settings.high is not None else (1 << header.valid_bits) - 1
+            inputs.append((pixels, self._lut(ch, settings), settings.low, max(high, settings.low + 1)))
+        planes = composite_planes(inputs, shape=(reference.height, reference.width), depth=self._depth)
+        return PreviewCompositeFrame.from_planes(
+            planes,
+            layer=layer,
+            frame_idx=frame_idx,
+            channels=tuple(visible),
+            reference=reference,
+            reference_channel=reference_id,
+        ).pack()
+
+    def _decode(self, channel_id: str, layer: PreviewLayer, packed: bytes) -> tuple[PreviewSourceHeader, np.ndarray]:
+        cached = self._decoded.get((channel_id, layer))
+        if cached is not None and cached[0] is packed:
+            return cached[1], cached[2]
+        frame = PreviewFrame.from_packed(packed)
+        pixels = frame.decode()
+        self._decoded[(channel_id, layer)] = (packed, frame.header, pixels)
+        return frame.header, pixels
+
+    def _lut(self, channel_id: str, settings: PreviewCompositeChannel) -> np.ndarray:
+        lut = self._luts.get(channel_id)
+        if lut is None:
+            lut = resolve_colormap(settings.colormap, LUT_RESOLUTION).astype(np.float32) / 255.0
+            self._luts[channel_id] = lut
+        return lut
+
+
+__all__ = ["PreviewCompositeChannel", "PreviewCompositor", "composite_planes"]
@@ -5,17 +5,22 @@ from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 from functools import partial
+from math import ceil, floor
 from uuid import uuid4
 
 import numpy as np
 
-from .protocol import PreviewFrame, PreviewLayer, PreviewViewport, ValidBits
+from .protocol import PreviewFrame, PreviewLayer, PreviewViewport, SourceRectPx, ValidBits, viewport_rect_px
 
 OVERVIEW_WIDTH = 2048  # overview output width (the overview is the main view)
 RENDER_CAP = 2048  # max width of a single coherent viewport-image render (rendered on demand, not per frame)
 # Fraction each axis grows beyond the viewport so small pans stay covered without a re-render. Its area cost
 # is quadratic in 1 + 2*margin, so keep it small while retaining a little coverage during interaction.
 OVERSCAN_MARGIN = 0.05
+# Width of the quick first viewport pass, so a pan shows pixels before the full-resolution refinement is ready.
+VIEWPORT_COARSE_WIDTH = 512
+# Viewport sampling steps are rounded up to 1/64 sensor pixel, so pans at one zoom level share one sampling grid.
+_STEP_QUANTUM = 64
 
 
 @dataclass(slots=True)
@@ -27,6 +32,9 @@ class PreviewHealth:
     generation_ms_max: float = 0.0
     publish_sent: int = 0
     publish_busy_drops: int = 0
+    governor_skips: int = 0
+    viewports_generated: int = 0
+    viewport_refines_superseded: int = 0
 
     @property
     def generation_ms_average(self) -> float:
@@ -49,6 +57,15 @@ class PreviewHealth:
     def record_publish_drop(self) -> None:
         self.publish_busy_drops += 1
 
+    def record_governor_skip(self) -> None:
+        self.governor_skips += 1
+
+    def record_viewport(self) -> None:
+        self.viewports_generated += 1
+
+    def record_viewport_superseded(self) -> None:
+        self.viewport_refines_superseded += 1
+
     def snapshot(self) -> "PreviewHealth":
         snapshot = replace(self)
         self.frames = 0
@@ -58,6 +75,9 @@ class PreviewHealth:
         self.generation_ms_max = 0.0
         self.publish_sent = 0
         self.publish_busy_drops = 0
+        self.governor_skips = 0
+        self.viewports_generated = 0
+        self.viewport_refines_superseded = 0
         return snapshot
 
 
@@ -65,11 +85,104 @@ type _OverviewFuture = asyncio.Future[PreviewFrame]
 type _Sink = Callable[[PreviewFrame], None]
 
 
+@dataclass(frozen=True, slots=True)
+class _ViewportRequest:
+    frame: np.ndarray
+    frame_idx: int
+    viewport: PreviewViewport
+    valid_bits: ValidBits
+    source_stream_id: str
+    work_epoch: int
+
+
+@dataclass(frozen=True, slots=True)
+class _ViewportGrid:
+    """Output pixels ``[gx0, gx1) x [gy0, gy1)`` of the global grid that samples the sensor every ``step`` pixels.
+
+    Output pixel ``g`` samples sensor pixel ``floor((g + 0.5) * step)``. The grid is anchored at the sensor
+    origin, so two renders of one frame at the same step sample identical pixels wherever they overlap.
+    """
+
+    step: float
+    gx0: int
+    gy0: int
+    gx1: int
+    gy1: int
+
+    @classmethod
+    def covering(
+        cls, rect: SourceRectPx, *, target_width: int, sensor_width: int, sensor_height: int
+    ) -> "_ViewportGrid":
+        step = max(1.0, ceil(rect.width / target_width * _STEP_QUANTUM) / _STEP_QUANTUM)
+        gx0, gy0 = floor(rect.x / step), floor(rect.y / step)
+        gx1 = min(ceil((rect.x + rect.width) / step), floor(sensor_width / step), gx0 + target_width)
+        gy1 = min(ceil((rect.y + rect.height) / step), floor(sensor_height / step))
+        return cls(step=step, gx0=gx0, gy0=gy0, gx1=max(gx1, gx0 + 1), gy1=max(gy1, gy0 + 1))
+
+    def source_rect(self, *, sensor_width: int, sensor_height: int) -> SourceRectPx:
+        x0, y0 = floor(self.gx0 * self.step), floor(self.gy0 * self.step)
+        x1 = min(ceil(self.gx1 * self.step), sensor_width)
+        y1 = min(ceil(self.gy1 * self.step), sensor_height)
+        return SourceRectPx(x=x0, y=y0, width=x1 - x0, height=y1 - y0)
+
+    def sample(self, frame: np.ndarray, gy0: int, gy1: int, gx0: int, gx1: int) -> np.ndarray:
+        """Sample grid pixels ``[gx0, gx1) x [gy0, gy1)`` from ``frame``."""
+        if self.step == 1.0:
+            return frame[gy0:gy1, gx0:gx1]
+        height, width = frame.shape
+        ys = np.minimum(((np.arange(gy0, gy1) + 0.5) * self.step).astype(np.intp), height - 1)
+        xs = np.minimum(((np.arange(gx0, gx1) + 0.5) * self.step).astype(np.intp), width - 1)
+        return frame[np.ix_(ys, xs)]
+
+
+@dataclass(frozen=True, slots=True)
+class _ViewportRender:
+    source_stream_id: str
+    frame_idx: int
+    grid: _ViewportGrid
+    pixels: np.ndarray
+
+
+def _render_grid(frame: np.ndarray, grid: _ViewportGrid, previous: _ViewportRender | None) -> np.ndarray:
+    """Sample ``grid`` from ``frame``, copying the part already sampled by ``previous`` instead of resampling it."""
+    overlap = None
+    if previous is not None and previous.grid.step == grid.step:
+        pg = previous.grid
+        ox0, ox1 = max(grid.gx0, pg.gx0), min(grid.gx1, pg.gx1)
+        oy0, oy1 = max(grid.gy0, pg.gy0), min(grid.gy1, pg.gy1)
+        if ox0 < ox1 and oy0 < oy1:
+            overlap = (ox0, ox1, oy0, oy1)
+    if overlap is None or previous is None:
+        return np.ascontiguousarray(grid.sample(frame, grid.gy0, grid.gy1, grid.gx0, grid.gx1))
+
+    ox0, ox1, oy0, oy1 = overlap
+    pg = previous.grid
+    out = np.empty((grid.gy1 - grid.gy0, grid.gx1 - grid.gx0), dtype=frame.dtype)
+    out[oy0 - grid.gy0 : oy1 - grid.gy0, ox0 - grid.gx0 : ox1 - grid.gx0] = previous.pixels[
+        oy0 - pg.gy0 : oy1 - pg.gy0, ox0 - pg.gx0 : ox1 - pg.gx0
+    ]
+    # Resample only the strips the previous render did not cover: full-width bands above and below the
+    # overlap, then the columns left and right of it.
+    for gy0, gy1, gx0, gx1 in (
+        (grid.gy0, oy0, grid.gx0, grid.gx1),
+        (oy1, grid.gy1, grid.gx0, grid.gx1),
+        (oy0, oy1, grid.gx0, ox0),
+        (oy0, oy1, ox1, grid.gx1),
+    ):
+        if gy0 < gy1 and gx0 < gx1:
+            out[gy0 - grid.gy0 : gy1 - grid.gy0, gx0 - grid.gx0 : gx1 - grid.gx0] = grid.sample(
+                frame, gy0, gy1, gx0, gx1
+            )
+    return out
+
+
 class PreviewGenerator:
     """Generates the overview frame and the zoomed viewport image from raw camera frames.
 
     The overview is always generated at `target_width`. The viewport image is one coherent crop
-    (expanded by overscan) at the display resolution, replacing the old pyramid tiles.
+    (expanded by overscan) at the display resolution, replacing the old pyramid tiles. Renders of a new
+    viewport are progressive: a coarse pass is published first and refined unless a newer request is
+    waiting. New frames at an unchanged viewport are rendered straight at full resolution.
     """
 
     def __init__(
@@ -93,6 +206,9 @@ class PreviewGenerator:
         self._current_valid_bits: ValidBits = 16
 
         self._viewport_task: asyncio.Task[None] | None = None
+        self._viewport_request: _ViewportRequest | None = None
+        self._last_viewport: _ViewportRender | None = None  # only touched on the viewport worker thread
+        self._rendered_viewport: tuple[str, PreviewViewport] | None = None  # stream and viewport last rendered
         self._overview_future: _OverviewFuture | None = None
         self._overview_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PreviewOverview")
         self._viewport_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PreviewViewport")
@@ -111,10 +227,28 @@ class PreviewGenerator:
             )
         return None
 
+    def accepts_frame(self) -> bool:
+        """Whether a frame submitted now would start any preview work.
+
+        False while the overview is still generating and the viewport lane is either idle-but-unneeded
+        or still rendering. Such a frame would be dropped at the overview gate, and a viewport render in
+        flight is never cancelled: the frame would only replace the request waiting behind it, or skip
+        the render's fine pass if it is still on the coarse one. Callers should not grab or copy one.
+        """
+        if self._overview_future is None or self._overview_future.done():
+            return True
+        return self._viewport.needs_adjustment and (self._viewport_task is None or self._viewport_task.done())
+
+    async def ready(self) -> None:
+        """Wait until :meth:`accepts_frame` is true, without polling."""
+        while not self.accepts_frame():
+            pending = {work for work in (self._overview_future, self._viewport_task) if work and not work.done()}
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
     def submit_frame(self, frame: np.ndarray, idx: int, *, valid_bits: ValidBits = 16) -> None:
         """Process a new raw frame: dispatch overview and viewport work in the background.
 
-        The viewport uses cancel-stale (latest viewport invalidates prior work). Overview
+        The viewport uses latest-wins (a newer request replaces any waiting one). Overview
         uses skip-if-busy — if the previous overview hasn't finished, drop this
         frame's preview rather than queueing. Returns immediately so callers
         (preview loop, acquisition grab loop) are not gated by preview work.
@@ -172,6 +306,7 @@ class PreviewGenerator:
     def cancel_pending(self) -> None:
         """Cancel preview work without shutting down the reusable worker executors."""
         self._work_epoch += 1
+        self._rendered_viewport = None
         self._cancel_viewport_task()
         if self._overview_future is not None and not self._overview_future.done():
             self._overview_future.cancel()
@@ -185,6 +320,7 @@ class PreviewGenerator:
 
     def _cancel_viewport_task(self) -> None:
         """Cancel the current viewport render and discard its result."""
+        self._viewport_request = None
         if self._viewport_task is not None and not self._viewport_task.done():
             self._viewport_task.cancel()
         self._viewport_task = None
@@ -198,37 +334,85 @@ class PreviewGenerator:
         valid_bits: ValidBits,
         source_stream_id: str,
     ) -> asyncio.Task[None]:
-        work_epoch = self._work_epoch
-
-        async def generate_and_send() -> None:
-            if not viewport.needs_adjustment:
-                return
-            render_viewport = viewport.expanded(OVERSCAN_MARGIN)
-            try:
-                viewport_frame = await asyncio.get_running_loop().run_in_executor(
-                    self._viewport_executor,
-                    partial(
-                        PreviewFrame.from_source,
-                        frame,
-                        camera_id=self._camera_id,
-                        source_stream_id=source_stream_id,
-                        layer=PreviewLayer.VIEWPORT,
-                        frame_idx=frame_idx,
-                        viewport=render_viewport,
-                        target_width=RENDER_CAP,
-                        valid_bits=valid_bits,
-                    ),
-                )
-            except asyncio.CancelledError:
-                return
-            if work_epoch != self._work_epoch:
-                return
-            self._sink(viewport_frame)
+        """Queue a viewport render, replacing any request still waiting, and return the lane's task.
 
-        self._cancel_viewport_task()
-        task = asyncio.create_task(generate_and_send())
-        self._viewport_task = task
-        return task
+        A pass already running is never cancelled for a newer request: it finishes and is published,
+        so continuous panning still shows pixels. Only its refinement is skipped.
+        """
+        self._viewport_request = _ViewportRequest(
+            frame=frame,
+            frame_idx=frame_idx,
+            viewport=viewport,
+            valid_bits=valid_bits,
+            source_stream_id=source_stream_id,
+            work_epoch=self._work_epoch,
+        )
+        if self._viewport_task is None or self._viewport_task.done():
+            self._viewport_task = asyncio.create_task(self._viewport_loop())
+        return self._viewport_task
+
+    async def _viewport_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (request := self._viewport_request) is not None:
+            self._viewport_request = None
+            if not request.viewport.needs_adjustment:
+                continue
+            sensor_height, sensor_width = request.frame.shape
+            rect = viewport_rect_px(
+                request.viewport.expanded(OVERSCAN_MARGIN), sensor_width=sensor_width, sensor_height=sensor_height
+            )
+            fine = _ViewportGrid.covering(
+                rect, target_width=RENDER_CAP, sensor_width=sensor_width, sensor_height=sensor_height
+            )
+            coarse = _ViewportGrid.covering(
+                rect, target_width=VIEWPORT_COARSE_WIDTH, sensor_width=sensor_width, sensor_height=sensor_height
+            )
+            # Only a viewport that changed since the last render needs the quick coarse pass; a new frame at
+            # the same viewport goes straight to full resolution, so a live stream does not flicker between them.
+            rendered = (request.source_stream_id, request.viewport)
+            moved = rendered != self._rendered_viewport
+            self._rendered_viewport = rendered
+            passes = [coarse, fine] if moved and coarse.step > fine.step else [fine]
+            for grid in passes:
+                if grid is fine and self._viewport_request is not None:
+                    self.health.record_viewport_superseded()
+                    break
+                try:
+                    viewport_frame = await loop.run_in_executor(
+                        self._viewport_executor, partial(self._render_viewport, request, grid, keep=grid is fine)
+                    )
+                except asyncio.CancelledError:
+                    return
+                except Exception:
+                    self._log.exception("Failed to generate viewport frame %d", request.frame_idx)
+                    break
+                if request.work_epoch != self._work_epoch:
+                    break
+                self.health.record_viewport()
+                self._sink(viewport_frame)
+
+    def _render_viewport(self, request: _ViewportRequest, grid: _ViewportGrid, *, keep: bool) -> PreviewFrame:
+        """Sample and encode one viewport pass. Runs on the viewport worker thread."""
+        previous = self._last_viewport
+        if previous is not None and (
+            previous.source_stream_id != request.source_stream_id or previous.frame_idx != request.frame_idx
+        ):
+            previous = None
+        pixels = _render_grid(request.frame, grid, previous)
+        if keep:
+            self._last_viewport = _ViewportRender(request.source_stream_id, request.frame_idx, grid, pixels)
+        sensor_height, sensor_width = request.frame.shape
+        return PreviewFrame.from_image(
+            pixels,
+            camera_id=self._camera_id,
+            source_stream_id=request.source_stream_id,
+            layer=PreviewLayer.VIEWPORT,
+            frame_idx=request.frame_idx,
+            source_rect_px=grid.source_rect(sensor_width=sensor_width, sensor_height=sensor_height),
+            sensor_width=sensor_width,
+            sensor_height=sensor_height,
+            valid_bits=request.valid_bits,
+        )
 
     def _on_overview_done(
         self,
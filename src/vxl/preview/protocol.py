@@ -1,8 +1,11 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import cached_property
+from itertools import pairwise
 from math import ceil
 from struct import Struct
-from typing import Literal, Self, cast
+from typing import Any, Literal, Self, cast
 
 import cv2
 import msgpack
@@ -24,6 +27,24 @@ VOXEL_PREVIEW_SCHEMA_VERSION = 1
 DELIVERY_PREFIX = Struct(">4sBI")
 MAX_DELIVERY_HEADER_BYTES = 64 * 1024
 
+# Tile-diff source frames share the VXPS prefix layout and are carried opaquely inside VXPD packets.
+TILE_DELTA_MAGIC = b"VXPT"
+TILE_DELTA_FRAMING_VERSION = 1
+TILE_DELTA_SCHEMA_VERSION = 1
+TILE_DELTA_ENCODING = "u16-zstd-byte-shuffle-tiles-v1"
+PREVIEW_TILE_SIZE = 64
+
+# Server-side multi-channel composites are RGB frames carried opaquely inside VXPD packets under one channel id.
+COMPOSITE_MAGIC = b"VXPC"
+COMPOSITE_FRAMING_VERSION = 1
+COMPOSITE_SCHEMA_VERSION = 1
+COMPOSITE_ENCODING = "rgb-zstd-planar-v1"
+COMPOSITE_CHANNEL_ID = "composite"
+
+# msgpack.packb otherwise allocates a 256 KiB scratch buffer per call; headers are a few hundred bytes and
+# the buffer still grows on demand.
+_HEADER_BUF_SIZE = 1024
+
 # Level 1 is the measured low-latency point for real preview frames. The frame checksum lets
 # consumers reject corruption before uploading pixels; it is part of the v1 encoding contract.
 _ZSTD = Zstd(level=1, checksum=True)
@@ -171,35 +192,66 @@ class PreviewSourceHeader(SparseModel):
         return self
 
 
-def _parse_preview_source(
-    packed: bytes | bytearray | memoryview,
-) -> tuple[memoryview, PreviewSourceHeader, int]:
-    packet = memoryview(packed)
-    if len(packet) < SOURCE_PREFIX.size:
-        raise ValueError("preview source packet is truncated before its prefix")
-    magic, framing_version, header_length = SOURCE_PREFIX.unpack_from(packet)
-    if magic != SOURCE_MAGIC:
-        raise ValueError("invalid preview source magic")
-    if framing_version != SOURCE_FRAMING_VERSION:
-        raise ValueError(f"unsupported preview source framing version: {framing_version}")
-    if not 0 < header_length <= MAX_SOURCE_HEADER_BYTES:
-        raise ValueError(f"invalid preview source header length: {header_length}")
-
-    payload_offset = SOURCE_PREFIX.size + header_length
-    if len(packet) <= payload_offset:
-        raise ValueError("preview source packet is truncated before its payload")
+def _unpack_header_map(packet: memoryview, start: int, end: int, *, label: str) -> dict[str, Any]:
     try:
-        unpacked = msgpack.unpackb(packet[SOURCE_PREFIX.size : payload_offset], raw=False)
+        unpacked = msgpack.unpackb(packet[start:end], raw=False)
     except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as exc:
-        raise ValueError("invalid preview source MessagePack header") from exc
+        raise ValueError(f"invalid {label} MessagePack header") from exc
     if not isinstance(unpacked, dict):
-        raise ValueError("preview source header must be a MessagePack map")
-    return packet, PreviewSourceHeader.model_validate(unpacked), payload_offset
+        raise ValueError(f"{label} header must be a MessagePack map")
+    return unpacked
+
+
+class PreviewSourceView:
+    """Routing view of a packed VXPS frame whose header is validated only on demand.
+
+    Framing is checked eagerly, but the MessagePack map is kept raw so routers that only need the
+    camera and stream identity avoid constructing the pydantic header for every frame. The packet
+    is borrowed, not copied; the caller must keep it alive and unmodified while the view is used.
+    """
+
+    def __init__(self, packed: bytes | bytearray | memoryview) -> None:
+        packet = memoryview(packed)
+        if len(packet) < SOURCE_PREFIX.size:
+            raise ValueError("preview source packet is truncated before its prefix")
+        magic, framing_version, header_length = SOURCE_PREFIX.unpack_from(packet)
+        if magic != SOURCE_MAGIC:
+            raise ValueError("invalid preview source magic")
+        if framing_version != SOURCE_FRAMING_VERSION:
+            raise ValueError(f"unsupported preview source framing version: {framing_version}")
+        if not 0 < header_length <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"invalid preview source header length: {header_length}")
+        payload_offset = SOURCE_PREFIX.size + header_length
+        if len(packet) <= payload_offset:
+            raise ValueError("preview source packet is truncated before its payload")
+        self.packet = packet
+        self.payload_offset = payload_offset
+        self._fields = _unpack_header_map(packet, SOURCE_PREFIX.size, payload_offset, label="preview source")
+
+    @property
+    def camera_id(self) -> str | None:
+        value = self._fields.get("camera_id")
+        return value if isinstance(value, str) else None
+
+    @property
+    def source_stream_id(self) -> str | None:
+        value = self._fields.get("source_stream_id")
+        return value if isinstance(value, str) else None
+
+    @property
+    def payload(self) -> memoryview:
+        """Compressed payload, borrowed from the packet."""
+        return self.packet[self.payload_offset :]
+
+    @cached_property
+    def header(self) -> PreviewSourceHeader:
+        """Fully validated source header, built on first access."""
+        return PreviewSourceHeader.model_validate(self._fields)
 
 
 def preview_source_header(packed: bytes | bytearray | memoryview) -> PreviewSourceHeader:
     """Parse and validate only the VXPS header without copying its compressed payload."""
-    return _parse_preview_source(packed)[1]
+    return PreviewSourceView(packed).header
 
 
 class StreamCursor(FrozenModel):
@@ -220,6 +272,15 @@ class VoxelPreviewHeader(FrozenModel):
     frame_byte_length: int = Field(gt=0)
 
 
+def viewport_rect_px(viewport: PreviewViewport, *, sensor_width: int, sensor_height: int) -> SourceRectPx:
+    """Smallest integer sensor rectangle covering a normalized viewport, at least one pixel in each axis."""
+    x0 = max(0, min(int(viewport.x * sensor_width), sensor_width - 1))
+    y0 = max(0, min(int(viewport.y * sensor_height), sensor_height - 1))
+    x1 = max(x0 + 1, min(ceil((viewport.x + viewport.w) * sensor_width), sensor_width))
+    y1 = max(y0 + 1, min(ceil((viewport.y + viewport.h) * sensor_height), sensor_height))
+    return SourceRectPx(x=x0, y=y0, width=x1 - x0, height=y1 - y0)
+
+
 @dataclass(frozen=True)
 class PreviewFrame:
     """Camera-owned source header plus an opaque shuffled Zstandard payload."""
@@ -250,21 +311,46 @@ class PreviewFrame:
             raise ValueError(f"target_width must be positive, got {target_width}")
 
         sensor_height, sensor_width = source.shape
-        x0 = max(0, min(int(viewport.x * sensor_width), sensor_width - 1))
-        y0 = max(0, min(int(viewport.y * sensor_height), sensor_height - 1))
-        x1 = max(x0 + 1, min(ceil((viewport.x + viewport.w) * sensor_width), sensor_width))
-        y1 = max(y0 + 1, min(ceil((viewport.y + viewport.h) * sensor_height), sensor_height))
-        source_rect_px = SourceRectPx(x=x0, y=y0, width=x1 - x0, height=y1 - y0)
-
-        crop = source[y0:y1, x0:x1]
+        source_rect_px = viewport_rect_px(viewport, sensor_width=sensor_width, sensor_height=sensor_height)
+        x0, y0 = source_rect_px.x, source_rect_px.y
+        crop = source[y0 : y0 + source_rect_px.height, x0 : x0 + source_rect_px.width]
         width = min(source_rect_px.width, target_width)
         height = max(1, round(source_rect_px.height * width / source_rect_px.width))
         if crop.shape != (height, width):
             frame = cv2.resize(crop, (width, height), interpolation=cv2.INTER_NEAREST_EXACT)
         else:
             frame = crop
+        return cls.from_image(
+            frame,
+            camera_id=camera_id,
+            source_stream_id=source_stream_id,
+            layer=layer,
+            frame_idx=frame_idx,
+            source_rect_px=source_rect_px,
+            sensor_width=sensor_width,
+            sensor_height=sensor_height,
+            valid_bits=valid_bits,
+            captured_at_unix_us=captured_at_unix_us,
+        )
 
-        shuffled = byte_shuffle_u16(frame, valid_bits=valid_bits)
+    @classmethod
+    def from_image(
+        cls,
+        image: np.ndarray,
+        *,
+        camera_id: str,
+        source_stream_id: str,
+        layer: PreviewLayer,
+        frame_idx: int,
+        source_rect_px: SourceRectPx,
+        sensor_width: int,
+        sensor_height: int,
+        valid_bits: ValidBits,
+        captured_at_unix_us: int | None = None,
+    ) -> Self:
+        """Shuffle and compress an already resampled image of ``source_rect_px``."""
+        height, width = image.shape
+        shuffled = byte_shuffle_u16(image, valid_bits=valid_bits)
         header = PreviewSourceHeader(
             camera_id=camera_id,
             source_stream_id=source_stream_id,
@@ -284,15 +370,23 @@ class PreviewFrame:
     @classmethod
     def from_packed(cls, packed: bytes | bytearray | memoryview) -> Self:
         """Parse and validate framing and source metadata without decoding pixels."""
-        packet, header, payload_offset = _parse_preview_source(packed)
-        return cls(header=header, payload=bytes(packet[payload_offset:]))
+        view = PreviewSourceView(packed)
+        return cls(header=view.header, payload=bytes(view.payload))
+
+    def segments(self) -> list[memoryview]:
+        """Return ``[prefix + header, payload]`` for scatter-gather sends without copying the payload."""
+        header = cast(
+            "bytes",
+            msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True, buf_size=_HEADER_BUF_SIZE),
+        )
+        if not 0 < len(header) <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"preview source header is too large: {len(header)} bytes")
+        prefix = SOURCE_PREFIX.pack(SOURCE_MAGIC, SOURCE_FRAMING_VERSION, len(header))
+        return [memoryview(prefix + header), memoryview(self.payload)]
 
     def pack(self) -> bytes:
         """Serialize prefix, MessagePack source header, and compressed payload."""
-        header = cast("bytes", msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True))
-        if not 0 < len(header) <= MAX_SOURCE_HEADER_BYTES:
-            raise ValueError(f"preview source header is too large: {len(header)} bytes")
-        return SOURCE_PREFIX.pack(SOURCE_MAGIC, SOURCE_FRAMING_VERSION, len(header)) + header + self.payload
+        return b"".join(self.segments())
 
     def decode(self) -> np.ndarray:
         """Decompress and unshuffle the source payload into a uint16 image."""
@@ -307,12 +401,426 @@ class PreviewFrame:
         return byte_unshuffle_u16(shuffled, width=self.header.width, height=self.header.height)
 
 
+class PreviewTileDeltaHeader(FrozenModel):
+    """Tile-diff metadata: the source frame it reconstructs and the acknowledged frame it patches.
+
+    ``source`` describes the complete reconstructed frame. ``tiles`` lists the row-major indices of
+    the ``tile_size`` squares whose pixels are carried in the payload; every other tile is taken
+    unchanged from frame ``base_frame_idx`` of the same source stream.
+    """
+
+    tile_delta_schema_version: Literal[1] = TILE_DELTA_SCHEMA_VERSION
+    source: PreviewSourceHeader
+    base_frame_idx: int = Field(ge=0)
+    tile_size: int = Field(gt=0)
+    tiles: tuple[int, ...]
+    encoding: Literal["u16-zstd-byte-shuffle-tiles-v1"] = TILE_DELTA_ENCODING
+    uncompressed_byte_length: int = Field(ge=0)
+
+    @property
+    def tile_grid(self) -> tuple[int, int]:
+        """Number of tile rows and columns covering the frame."""
+        return ceil(self.source.height / self.tile_size), ceil(self.source.width / self.tile_size)
+
+    @model_validator(mode="after")
+    def _validate_tiles(self) -> Self:
+        if self.base_frame_idx >= self.source.frame_idx:
+            raise ValueError("base_frame_idx must precede the reconstructed frame")
+        rows, cols = self.tile_grid
+        if any(b <= a for a, b in pairwise(self.tiles)):
+            raise ValueError("tiles must be strictly increasing")
+        if self.tiles and not 0 <= self.tiles[0] <= self.tiles[-1] < rows * cols:
+            raise ValueError(f"tiles must index a {rows}x{cols} tile grid")
+        expected_length = sum(h * w for h, w in (_tile_shape(self, index) for index in self.tiles)) * 2
+        if self.uncompressed_byte_length != expected_length:
+            raise ValueError(f"uncompressed_byte_length must be {expected_length} for {len(self.tiles)} tiles")
+        return self
+
+
+def _tile_window(index: int, *, tile_size: int, width: int, height: int) -> tuple[slice, slice]:
+    row, col = divmod(index, ceil(width / tile_size))
+    y0, x0 = row * tile_size, col * tile_size
+    return slice(y0, min(y0 + tile_size, height)), slice(x0, min(x0 + tile_size, width))
+
+
+def _tile_shape(header: PreviewTileDeltaHeader, index: int) -> tuple[int, int]:
+    rows, cols = _tile_window(index, tile_size=header.tile_size, width=header.source.width, height=header.source.height)
+    return rows.stop - rows.start, cols.stop - cols.start
+
+
+def changed_tiles(frame: np.ndarray, reference: np.ndarray, *, tile_size: int, tolerance: int = 0) -> np.ndarray:
+    """Return a boolean ``(rows, cols)`` map of tiles where any sample differs by more than ``tolerance``."""
+    if frame.shape != reference.shape or frame.ndim != 2:
+        raise ValueError(f"cannot compare preview frames of shape {frame.shape} and {reference.shape}")
+    diff = np.abs(frame.astype(np.int32) - reference.astype(np.int32)) > tolerance if tolerance else frame != reference
+    height, width = frame.shape
+    rows, cols = ceil(height / tile_size), ceil(width / tile_size)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+    padded[:height, :width] = diff
+    return padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+
+
+def _same_raster(a: PreviewSourceHeader, b: PreviewSourceHeader) -> bool:
+    """Whether two frames share stream, layer, and pixel geometry, so one can patch the other."""
+    return (
+        a.camera_id == b.camera_id
+        and a.source_stream_id == b.source_stream_id
+        and a.layer == b.layer
+        and (a.width, a.height, a.valid_bits) == (b.width, b.height, b.valid_bits)
+        and a.source_rect_px == b.source_rect_px
+    )
+
+
+@dataclass(frozen=True)
+class PreviewTileDelta:
+    """Changed tiles of one source frame relative to an earlier frame the client already holds."""
+
+    header: PreviewTileDeltaHeader
+    payload: bytes
+
+    @classmethod
+    def from_frames(
+        cls,
+        source: PreviewSourceHeader,
+        frame: np.ndarray,
+        *,
+        base_frame_idx: int,
+        tiles: np.ndarray,
+        tile_size: int = PREVIEW_TILE_SIZE,
+    ) -> Self:
+        """Encode the tiles of ``frame`` selected by the boolean ``(rows, cols)`` map ``tiles``."""
+        if frame.shape != (source.height, source.width):
+            raise ValueError(f"frame shape {frame.shape} does not match {source.width}x{source.height} header")
+        indices = tuple(int(index) for index in np.flatnonzero(tiles))
+        blocks = [
+            frame[_tile_window(index, tile_size=tile_size, width=source.width, height=source.height)].ravel()
+            for index in indices
+        ]
+        samples = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.uint16)
+        shuffled = byte_shuffle_u16(samples.reshape(1, -1), valid_bits=source.valid_bits)
+        header = PreviewTileDeltaHeader(
+            source=source,
+            base_frame_idx=base_frame_idx,
+            tile_size=tile_size,
+            tiles=indices,
+            uncompressed_byte_length=len(shuffled),
+        )
+        return cls(header=header, payload=bytes(_ZSTD.encode(shuffled)) if shuffled else b"")
+
+    @classmethod
+    def from_packed(cls, packed: bytes | bytearray | memoryview) -> Self:
+        """Parse and validate VXPT framing and metadata without decoding pixels."""
+        packet = memoryview(packed)
+        if len(packet) < SOURCE_PREFIX.size:
+            raise ValueError("preview tile delta is truncated before its prefix")
+        magic, framing_version, header_length = SOURCE_PREFIX.unpack_from(packet)
+        if magic != TILE_DELTA_MAGIC:
+            raise ValueError("invalid preview tile delta magic")
+        if framing_version != TILE_DELTA_FRAMING_VERSION:
+            raise ValueError(f"unsupported preview tile delta framing version: {framing_version}")
+        if not 0 < header_length <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"invalid preview tile delta header length: {header_length}")
+        payload_offset = SOURCE_PREFIX.size + header_length
+        if len(packet) < payload_offset:
+            raise ValueError("preview tile delta is truncated before its payload")
+        fields = _unpack_header_map(packet, SOURCE_PREFIX.size, payload_offset, label="preview tile delta")
+        header = PreviewTileDeltaHeader.model_validate(fields)
+        payload = bytes(packet[payload_offset:])
+        if bool(payload) != bool(header.tiles):
+            raise ValueError("preview tile delta payload does not match its tile map")
+        return cls(header=header, payload=payload)
+
+    def segments(self) -> list[memoryview]:
+        """Return ``[prefix + header, payload]`` for scatter-gather sends without copying the payload."""
+        header = cast(
+            "bytes",
+            msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True, buf_size=_HEADER_BUF_SIZE),
+        )
+        if not 0 < len(header) <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"preview tile delta header is too large: {len(header)} bytes")
+        prefix = SOURCE_PREFIX.pack(TILE_DELTA_MAGIC, TILE_DELTA_FRAMING_VERSION, len(header))
+        return [memoryview(prefix + header), memoryview(self.payload)]
+
+    def pack(self) -> bytes:
+        """Serialize prefix, MessagePack delta header, and compressed tiles."""
+        return b"".join(self.segments())
+
+    def apply(self, base: np.ndarray) -> np.ndarray:
+        """Return a new uint16 image: ``base`` with this delta's tiles replaced."""
+        source = self.header.source
+        if base.shape != (source.height, source.width):
+            raise ValueError(f"base frame shape {base.shape} does not match {source.width}x{source.height} header")
+        frame = np.array(base, dtype=np.uint16, copy=True)
+        if not self.header.tiles:
+            return frame
+        try:
+            shuffled = _ZSTD.decode(self.payload)
+        except Exception as exc:
+            raise ValueError("invalid Zstandard preview tile payload") from exc
+        samples = byte_unshuffle_u16(shuffled, width=self.header.uncompressed_byte_length // 2, height=1).ravel()
+        offset = 0
+        for index in self.header.tiles:
+            window = _tile_window(index, tile_size=self.header.tile_size, width=source.width, height=source.height)
+            height, width = frame[window].shape
+            frame[window] = samples[offset : offset + height * width].reshape(height, width)
+            offset += height * width
+        return frame
+
+
+class PreviewTileEncoder:
+    """Tile-diff one client's stream of a preview layer against the frame that client last acknowledged.
+
+    Every emitted frame is remembered, as the pixels the client will hold after decoding it, until a
+    later acknowledgement or the ``history`` bound evicts it. Without a compatible acknowledged
+    frame, or when more than ``max_changed_fraction`` of the tiles differ, the original VXPS frame is
+    forwarded unchanged as a keyframe. ``tolerance`` treats per-sample differences up to that value
+    as unchanged; errors never accumulate because tiles are compared with what the client holds.
+    """
+
+    def __init__(
+        self,
+        *,
+        tile_size: int = PREVIEW_TILE_SIZE,
+        tolerance: int = 0,
+        max_changed_fraction: float = 0.5,
+        history: int = 8,
+    ) -> None:
+        if tile_size <= 0:
+            raise ValueError(f"tile_size must be positive, got {tile_size}")
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self._tile_size = tile_size
+        self._tolerance = tolerance
+        self._max_changed_fraction = max_changed_fraction
+        self._history = history
+        self._sent: OrderedDict[int, tuple[PreviewSourceHeader, np.ndarray]] = OrderedDict()
+        self._acknowledged: tuple[PreviewSourceHeader, np.ndarray] | None = None
+
+    def encode(self, frame: PreviewFrame, pixels: np.ndarray | None = None) -> bytes:
+        """Return the packed VXPT delta or VXPS keyframe to send for ``frame``.
+
+        ``pixels`` may carry the already decoded frame to avoid decompressing it again.
+        """
+        source = frame.header
+        current = pixels if pixels is not None else frame.decode()
+        base = self._acknowledged
+        if base is not None and _same_raster(base[0], source) and base[0].frame_idx < source.frame_idx:
+            tiles = changed_tiles(current, base[1], tile_size=self._tile_size, tolerance=self._tolerance)
+            if tiles.mean() <= self._max_changed_fraction:
+                delta = PreviewTileDelta.from_frames(
+                    source, current, base_frame_idx=base[0].frame_idx, tiles=tiles, tile_size=self._tile_size
+                )
+                self._remember(source, delta.apply(base[1]) if self._tolerance else current)
+                return delta.pack()
+        self._remember(source, current)
+        return frame.pack()
+
+    def acknowledge(self, frame_idx: int) -> bool:
+        """Adopt a previously sent frame as the diff base. Returns ``False`` if it is no longer held."""
+        sent = self._sent.get(frame_idx)
+        if sent is None:
+            return False
+        self._acknowledged = sent
+        for idx in tuple(self._sent):
+            if idx < frame_idx:
+                del self._sent[idx]
+        return True
+
+    def reset(self) -> None:
+        """Forget every sent and acknowledged frame so the next frame is a keyframe."""
+        self._sent.clear()
+        self._acknowledged = None
+
+    def _remember(self, source: PreviewSourceHeader, pixels: np.ndarray) -> None:
+        self._sent[source.frame_idx] = (source, pixels)
+        while len(self._sent) > self._history:
+            self._sent.popitem(last=False)
+
+
+class PreviewTileDecoder:
+    """Client-side reconstruction of VXPS keyframes and VXPT deltas.
+
+    Recently decoded frames are retained so a delta against any of them can be applied while the
+    acknowledgement of a newer frame is still in flight. A delta whose base is no longer held
+    raises ``ValueError``; the client then needs a keyframe.
+    """
+
+    def __init__(self, *, history: int = 8) -> None:
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self._history = history
+        self._frames: OrderedDict[tuple[str, int], tuple[PreviewSourceHeader, np.ndarray]] = OrderedDict()
+
+    def decode(self, packed: bytes | bytearray | memoryview) -> tuple[PreviewSourceHeader, np.ndarray]:
+        """Decode one packed frame, returning its source header and the reconstructed pixels."""
+        packet = memoryview(packed)
+        if bytes(packet[:4]) == TILE_DELTA_MAGIC:
+            delta = PreviewTileDelta.from_packed(packet)
+            source = delta.header.source
+            base = self._frames.get((source.source_stream_id, delta.header.base_frame_idx))
+            if base is None or not _same_raster(base[0], source):
+                raise ValueError(f"preview tile delta base frame {delta.header.base_frame_idx} is not available")
+            pixels = delta.apply(base[1])
+        else:
+            frame = PreviewFrame.from_packed(packet)
+            source, pixels = frame.header, frame.decode()
+        self._frames[(source.source_stream_id, source.frame_idx)] = (source, pixels)
+        while len(self._frames) > self._history:
+            self._frames.popitem(last=False)
+        return source, pixels
+
+    def reset(self) -> None:
+        """Discard every retained frame."""
+        self._frames.clear()
+
+
+type CompositeDepth = Literal[8, 16]
+
+
+class PreviewCompositeHeader(SparseModel):
+    """Metadata of one blended RGB layer built from the latest frame of each listed channel.
+
+    Geometry is that of the reference channel's frame; every other channel is resampled onto it.
+    The payload holds the R, G and B planes in order. 16-bit planes are byte-shuffled together
+    like VXPS samples; 8-bit planes are stored as-is.
+    """
+
+    composite_schema_version: Literal[1] = COMPOSITE_SCHEMA_VERSION
+    layer: PreviewLayer
+    frame_idx: int = Field(ge=0)
+    channels: tuple[str, ...] = Field(min_length=1)
+    reference_channel: str = Field(min_length=1)
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+    sensor_width: int = Field(gt=0)
+    sensor_height: int = Field(gt=0)
+    source_rect_px: SourceRectPx
+    depth: CompositeDepth
+    encoding: Literal["rgb-zstd-planar-v1"] = COMPOSITE_ENCODING
+    uncompressed_byte_length: int = Field(gt=0)
+
+    @model_validator(mode="after")
+    def _validate_geometry(self) -> Self:
+        if self.reference_channel not in self.channels:
+            raise ValueError("reference_channel must be one of the composited channels")
+        rect = self.source_rect_px
+        if rect.x + rect.width > self.sensor_width or rect.y + rect.height > self.sensor_height:
+            raise ValueError("source_rect_px extends beyond the sensor")
+        expected_length = 3 * self.width * self.height * self.depth // 8
+        if self.uncompressed_byte_length != expected_length:
+            raise ValueError(
+                f"uncompressed_byte_length must be {expected_length} for a {self.width}x{self.height} RGB{self.depth}"
+            )
+        return self
+
+
+@dataclass(frozen=True)
+class PreviewCompositeFrame:
+    """Composite header plus a Zstandard-compressed planar RGB payload."""
+
+    header: PreviewCompositeHeader
+    payload: bytes
+
+    @classmethod
+    def from_planes(
+        cls,
+        planes: np.ndarray,
+        *,
+        layer: PreviewLayer,
+        frame_idx: int,
+        channels: tuple[str, ...],
+        reference: PreviewSourceHeader,
+        reference_channel: str,
+    ) -> Self:
+        """Compress a ``(3, height, width)`` uint8 or uint16 plane stack placed on ``reference``'s geometry."""
+        if planes.ndim != 3 or planes.shape[0] != 3:
+            raise ValueError(f"composite planes must have shape (3, height, width), got {planes.shape}")
+        if planes.shape[1:] != (reference.height, reference.width):
+            raise ValueError(f"composite planes {planes.shape[1:]} do not match the reference frame")
+        if planes.dtype == np.uint8:
+            depth: CompositeDepth = 8
+            raw = np.ascontiguousarray(planes).tobytes()
+        elif planes.dtype == np.uint16:
+            depth = 16
+            raw = byte_shuffle_u16(planes.reshape(3 * reference.height, reference.width), valid_bits=16)
+        else:
+            raise TypeError(f"composite planes must be uint8 or uint16, got {planes.dtype}")
+        header = PreviewCompositeHeader(
+            layer=layer,
+            frame_idx=frame_idx,
+            channels=channels,
+            reference_channel=reference_channel,
+            width=reference.width,
+            height=reference.height,
+            sensor_width=reference.sensor_width,
+            sensor_height=reference.sensor_height,
+            source_rect_px=reference.source_rect_px,
+            depth=depth,
+            uncompressed_byte_length=len(raw),
+        )
+        return cls(header=header, payload=bytes(_ZSTD.encode(raw)))
+
+    @classmethod
+    def from_packed(cls, packed: bytes | bytearray | memoryview) -> Self:
+        """Parse and validate VXPC framing and metadata without decoding pixels."""
+        packet = memoryview(packed)
+        if len(packet) < SOURCE_PREFIX.size:
+            raise ValueError("preview composite is truncated before its prefix")
+        magic, framing_version, header_length = SOURCE_PREFIX.unpack_from(packet)
+        if magic != COMPOSITE_MAGIC:
+            raise ValueError("invalid preview composite magic")
+        if framing_version != COMPOSITE_FRAMING_VERSION:
+            raise ValueError(f"unsupported preview composite framing version: {framing_version}")
+        if not 0 < header_length <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"invalid preview composite header length: {header_length}")
+        payload_offset = SOURCE_PREFIX.size + header_length
+        if len(packet) <= payload_offset:
+            raise ValueError("preview composite is truncated before its payload")
+        fields = _unpack_header_map(packet, SOURCE_PREFIX.size, payload_offset, label="preview composite")
+        return cls(header=PreviewCompositeHeader.model_validate(fields), payload=bytes(packet[payload_offset:]))
+
+    def segments(self) -> list[memoryview]:
+        """Return ``[prefix + header, payload]`` for scatter-gather sends without copying the payload."""
+        header = cast(
+            "bytes",
+            msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True, buf_size=_HEADER_BUF_SIZE),
+        )
+        if not 0 < len(header) <= MAX_SOURCE_HEADER_BYTES:
+            raise ValueError(f"preview composite header is too large: {len(header)} bytes")
+        prefix = SOURCE_PREFIX.pack(COMPOSITE_MAGIC, COMPOSITE_FRAMING_VERSION, len(header))
+        return [memoryview(prefix + header), memoryview(self.payload)]
+
+    def pack(self) -> bytes:
+        """Serialize prefix, MessagePack composite header, and compressed planes."""
+        return b"".join(self.segments())
+
+    def decode(self) -> np.ndarray:
+        """Decompress the payload into a ``(height, width, 3)`` RGB image of the header's depth."""
+        try:
+            raw = _ZSTD.decode(self.payload)
+        except Exception as exc:
+            raise ValueError("invalid Zstandard preview composite payload") from exc
+        if len(raw) != self.header.uncompressed_byte_length:
+            raise ValueError(f"decoded payload is {len(raw)} bytes; expected {self.header.uncompressed_byte_length}")
+        height, width = self.header.height, self.header.width
+        if self.header.depth == 8:
+            planes = np.frombuffer(raw, dtype=np.uint8).reshape(3, height, width)
+        else:
+            planes = byte_unshuffle_u16(raw, width=width, height=3 * height).reshape(3, height, width)
+        return np.ascontiguousarray(planes.transpose(1, 2, 0))
+
+
 @dataclass(frozen=True)
 class VoxelPreviewPacket:
-    """Voxel delivery header plus an opaque packed VXPS frame."""
+    """Voxel delivery header plus an opaque packed VXPS frame.
+
+    ``frame`` may borrow the caller's buffer: :meth:`wrap` and :meth:`from_packed` keep a view of
+    the packed source frame instead of copying it, so the buffer must stay unmodified while the
+    packet is alive.
+    """
 
     header: VoxelPreviewHeader
-    frame: bytes
+    frame: bytes | memoryview
 
     def __post_init__(self) -> None:
         if len(self.frame) != self.header.frame_byte_length:
@@ -328,8 +836,8 @@ class VoxelPreviewPacket:
         state_cursor: StreamCursor,
         stamped_at_unix_us: int,
     ) -> Self:
-        """Wrap an already-packed VXPS frame without parsing or copying its payload twice."""
-        packed_frame = bytes(frame)
+        """Wrap an already-packed VXPS frame without parsing or copying its payload."""
+        packed_frame = frame if isinstance(frame, bytes) else memoryview(frame).cast("B")
         return cls(
             header=VoxelPreviewHeader(
                 channel_id=channel_id,
@@ -343,7 +851,30 @@ class VoxelPreviewPacket:
 
     @classmethod
     def from_packed(cls, packed: bytes | bytearray | memoryview) -> Self:
-        """Parse Voxel delivery framing while leaving the VXPS frame opaque."""
+        """Parse Voxel delivery framing while leaving the VXPS frame opaque and uncopied."""
+        view = VoxelPreviewView(packed)
+        return cls(header=view.header, frame=view.frame)
+
+    def segments(self) -> list[memoryview]:
+        """Return ``[prefix + header, frame]`` for scatter-gather sends without copying the frame."""
+        header = cast(
+            "bytes",
+            msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True, buf_size=_HEADER_BUF_SIZE),
+        )
+        if not 0 < len(header) <= MAX_DELIVERY_HEADER_BYTES:
+            raise ValueError(f"Voxel preview header is too large: {len(header)} bytes")
+        prefix = DELIVERY_PREFIX.pack(DELIVERY_MAGIC, VOXEL_PREVIEW_FRAMING_VERSION, len(header))
+        return [memoryview(prefix + header), memoryview(self.frame)]
+
+    def pack(self) -> bytes:
+        """Serialize the Voxel delivery header and unchanged VXPS frame."""
+        return b"".join(self.segments())
+
+
+class VoxelPreviewView:
+    """Delivery-side counterpart of :class:`PreviewSourceView` for packed VXPD packets."""
+
+    def __init__(self, packed: bytes | bytearray | memoryview) -> None:
         packet = memoryview(packed)
         if len(packet) < DELIVERY_PREFIX.size:
             raise ValueError("Voxel preview packet is truncated before its prefix")
@@ -354,24 +885,33 @@ class VoxelPreviewPacket:
             raise ValueError(f"unsupported Voxel preview framing version: {framing_version}")
         if not 0 < header_length <= MAX_DELIVERY_HEADER_BYTES:
             raise ValueError(f"invalid station preview header length: {header_length}")
-
         frame_offset = DELIVERY_PREFIX.size + header_length
         if len(packet) <= frame_offset:
             raise ValueError("Voxel preview packet is truncated before its frame")
-        try:
-            unpacked = msgpack.unpackb(packet[DELIVERY_PREFIX.size : frame_offset], raw=False)
-        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as exc:
-            raise ValueError("invalid Voxel preview MessagePack header") from exc
-        if not isinstance(unpacked, dict):
-            raise ValueError("Voxel preview header must be a MessagePack map")
-        return cls(
-            header=VoxelPreviewHeader.model_validate(unpacked),
-            frame=bytes(packet[frame_offset:]),
-        )
+        self.packet = packet
+        self.frame_offset = frame_offset
+        self._fields = _unpack_header_map(packet, DELIVERY_PREFIX.size, frame_offset, label="Voxel preview")
 
-    def pack(self) -> bytes:
-        """Serialize the Voxel delivery header and unchanged VXPS frame."""
-        header = cast("bytes", msgpack.packb(self.header.model_dump(mode="json"), use_bin_type=True))
-        if not 0 < len(header) <= MAX_DELIVERY_HEADER_BYTES:
-            raise ValueError(f"Voxel preview header is too large: {len(header)} bytes")
-        return DELIVERY_PREFIX.pack(DELIVERY_MAGIC, VOXEL_PREVIEW_FRAMING_VERSION, len(header)) + header + self.frame
+    @property
+    def channel_id(self) -> str | None:
+        value = self._fields.get("channel_id")
+        return value if isinstance(value, str) else None
+
+    @property
+    def seq(self) -> int | None:
+        value = self._fields.get("seq")
+        return value if isinstance(value, int) else None
+
+    @property
+    def frame(self) -> memoryview:
+        """Packed VXPS frame, borrowed from the packet."""
+        return self.packet[self.frame_offset :]
+
+    @cached_property
+    def header(self) -> VoxelPreviewHeader:
+        """Fully validated delivery header, built on first access."""
+        return VoxelPreviewHeader.model_validate(self._fields)
+
+    def source(self) -> PreviewSourceView:
+        """Return a lazily validated view of the wrapped source frame."""
+        return PreviewSourceView(self.frame)
@@ -6,7 +6,7 @@ from collections import OrderedDict
 from .protocol import PreviewKey
 
 
-class LatestFrameQueue:
+class LatestFrameQueue[T = bytes]:
     """Async queue retaining at most one pending frame per preview key.
 
     Replacing a pending frame does not change its position, which prevents a
@@ -15,15 +15,17 @@ class LatestFrameQueue:
     """
 
     def __init__(self) -> None:
-        self._items: OrderedDict[PreviewKey, bytes] = OrderedDict()
+        self._items: OrderedDict[PreviewKey, T] = OrderedDict()
         self._ready = asyncio.Event()
 
-    def put(self, key: PreviewKey, frame: bytes) -> None:
-        """Insert or replace the pending frame for ``key`` without waiting."""
+    def put(self, key: PreviewKey, frame: T) -> bool:
+        """Insert or replace the pending frame for ``key`` without waiting; return whether one was replaced."""
+        replaced = key in self._items
         self._items[key] = frame
         self._ready.set()
+        return replaced
 
-    async def get(self) -> tuple[PreviewKey, bytes]:
+    async def get(self) -> tuple[PreviewKey, T]:
         """Wait for and remove the oldest pending key and its latest frame."""
         while not self._items:
             self._ready.clear()
@@ -1,8 +1,9 @@
 """Station-owned lifecycle and transport-neutral state feed."""
 
+from .coalesce import StateCoalescer, StateCoalescerDiagnostics, TopicDiagnostics
 from .core import Station
 from .errors import StationFeedLaggedError, StationNotConfiguredError
-from .feed import StationFeed, StationFeedConnection
+from .feed import StationFeed, StationFeedConnection, StationFeedRevision
 from .models import (
     DeviceState,
     InstrumentView,
@@ -21,13 +22,17 @@ __all__ = [
     "InstrumentView",
     "SessionInfo",
     "SessionView",
+    "StateCoalescer",
+    "StateCoalescerDiagnostics",
     "Station",
     "StationFeed",
     "StationFeedConnection",
     "StationFeedLaggedError",
+    "StationFeedRevision",
     "StationFeedView",
     "StationNotConfiguredError",
     "StationState",
     "StationStatus",
     "StreamCursor",
+    "TopicDiagnostics",
 ]
@@ -0,0 +1,206 @@
+"""Frame-based coalescing of high-rate state changes before they reach the station feed.
+
+Producers :meth:`~StateCoalescer.submit` keyed changes at any rate. Once per frame window the
+coalescer drains every pending key whose topic is not rate limited, or whose limit allows another
+publish, as one merged frame. Repeated changes to a key within a frame, or while its topic is
+rate limited, collapse to the latest value and are counted as suppressed.
+
+Topics are plain strings; the station uses ``"<device_id>/<property>"``. Rate limits map
+:mod:`fnmatch` patterns to a maximum publish rate, and the first matching pattern wins.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from fnmatch import fnmatchcase
+
+from pydantic import Field
+from vxlib.schema import FrozenModel
+
+log = logging.getLogger(__name__)
+
+DEFAULT_FRAME_S = 0.025
+DEFAULT_RATE_LIMITS: Mapping[str, float] = {
+    "*/position*": 20.0,
+    "*/temperature*": 1.0,
+}
+_RATE_WINDOW_S = 5.0  # span over which effective publish rates are measured
+
+type FrameDrain[T] = Callable[[dict[str, T]], Awaitable[None] | None]
+
+
+class TopicDiagnostics(FrozenModel):
+    """Delivery counters for one coalesced topic."""
+
+    max_hz: float | None = Field(description="Configured rate limit, or null when only the frame window applies.")
+    submitted: int
+    published: int
+    suppressed: int = Field(description="Changes replaced by a newer value before they were published.")
+    effective_hz: float = Field(description="Publishes per second over the last few seconds.")
+
+
+class StateCoalescerDiagnostics(FrozenModel):
+    """Frame and per-topic delivery counters of one :class:`StateCoalescer`."""
+
+    frame_s: float
+    frames: int
+    effective_frame_hz: float
+    topics: dict[str, TopicDiagnostics]
+
+
+class _Topic:
+    def __init__(self, max_hz: float | None) -> None:
+        self.max_hz = max_hz
+        self.min_interval_s = 1.0 / max_hz if max_hz else 0.0
+        self.submitted = 0
+        self.published = 0
+        self.suppressed = 0
+        self.last_published_at: float | None = None
+        self.recent: deque[float] = deque()
+        self.created_at = time.monotonic()
+
+    def ready(self, now: float) -> bool:
+        return self.last_published_at is None or now - self.last_published_at >= self.min_interval_s
+
+    def record_publish(self, now: float) -> None:
+        self.published += 1
+        self.last_published_at = now
+        self.recent.append(now)
+
+
+def _rate(timestamps: deque[float], now: float, since: float) -> float:
+    while timestamps and now - timestamps[0] > _RATE_WINDOW_S:
+        timestamps.popleft()
+    # A young coalescer is measured over its lifetime (at least one second) rather than the full window.
+    return len(timestamps) / min(_RATE_WINDOW_S, max(now - since, 1.0))
+
+
+class StateCoalescer[T]:
+    """Merge keyed changes into frames of ``frame_s`` seconds, honouring per-topic maximum rates.
+
+    Like :class:`vxlib.coalescer.Coalescer` this is lossy by design and lazy-starts its delivery
+    task on the first submission; the task exits once nothing is pending. :meth:`cancel` discards
+    pending changes and keeps the coalescer reusable, :meth:`close` is the permanent teardown.
+    """
+
+    def __init__(
+        self,
+        drain: FrameDrain[T],
+        *,
+        frame_s: float = DEFAULT_FRAME_S,
+        rate_limits: Mapping[str, float] = DEFAULT_RATE_LIMITS,
+    ) -> None:
+        if frame_s <= 0:
+            raise ValueError("frame_s must be positive")
+        if any(max_hz <= 0 for max_hz in rate_limits.values()):
+            raise ValueError("rate limits must be positive")
+        self._drain = drain
+        self._frame_s = frame_s
+        self._rate_limits = dict(rate_limits)
+        self._topics: dict[str, _Topic] = {}
+        self._pending: dict[str, T] = {}
+        self._frames = 0
+        self._recent_frames: deque[float] = deque()
+        self._created_at = time.monotonic()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def frame_s(self) -> float:
+        return self._frame_s
+
+    def submit(self, topic: str, value: T) -> None:
+        """Record the latest value for ``topic``. Sync, never blocks."""
+        if self._closed:
+            raise RuntimeError("StateCoalescer is closed")
+        state = self._topic(topic)
+        state.submitted += 1
+        if topic in self._pending:
+            state.suppressed += 1
+        self._pending[topic] = value
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="station-state-coalescer")
+
+    def diagnostics(self) -> StateCoalescerDiagnostics:
+        now = time.monotonic()
+        return StateCoalescerDiagnostics(
+            frame_s=self._frame_s,
+            frames=self._frames,
+            effective_frame_hz=_rate(self._recent_frames, now, self._created_at),
+            topics={
+                topic: TopicDiagnostics(
+                    max_hz=state.max_hz,
+                    submitted=state.submitted,
+                    published=state.published,
+                    suppressed=state.suppressed,
+                    effective_hz=_rate(state.recent, now, state.created_at),
+                )
+                for topic, state in sorted(self._topics.items())
+            },
+        )
+
+    def cancel(self) -> None:
+        """Discard pending changes and stop the delivery task. Counters are kept."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+        self._pending.clear()
+
+    async def close(self) -> None:
+        """Cancel and await the delivery task permanently. Idempotent."""
+        self._closed = True
+        task, self._task = self._task, None
+        self._pending.clear()
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def _topic(self, topic: str) -> _Topic:
+        state = self._topics.get(topic)
+        if state is None:
+            max_hz = next((hz for pattern, hz in self._rate_limits.items() if fnmatchcase(topic, pattern)), None)
+            state = self._topics[topic] = _Topic(max_hz)
+        return state
+
+    def _take_frame(self, now: float) -> dict[str, T]:
+        frame: dict[str, T] = {}
+        # Half a frame of slack keeps a limit that is a multiple of the frame from slipping a whole frame on jitter.
+        due = now + self._frame_s / 2
+        for topic in tuple(self._pending):
+            state = self._topics[topic]
+            if state.ready(due):
+                frame[topic] = self._pending.pop(topic)
+                state.record_publish(now)
+        return frame
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self._frame_s)
+            now = time.monotonic()
+            frame = self._take_frame(now)
+            if not frame:
+                continue
+            self._frames += 1
+            self._recent_frames.append(now)
+            try:
+                result = self._drain(frame)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                log.exception("StateCoalescer drain failed")
+
+
+__all__ = [
+    "DEFAULT_FRAME_S",
+    "DEFAULT_RATE_LIMITS",
+    "StateCoalescer",
+    "StateCoalescerDiagnostics",
+    "TopicDiagnostics",
+]
@@ -11,16 +11,19 @@ from uuid import UUID, uuid4
 from vxl_records import SQLiteRecords, VoxelRecords
 from vxlib.reactivity import Cell, Readable
 
+from rigup import PropertyModel
 from vxl.instrument import Instrument, InstrumentConfig, InstrumentInspection, InstrumentStore
 
+from .coalesce import DEFAULT_FRAME_S, DEFAULT_RATE_LIMITS, StateCoalescer, StateCoalescerDiagnostics
 from .feed import StationFeed
 from .models import DeviceState, InstrumentView, SessionInfo, SessionView, StationState, StationStatus
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Callable
+    from collections.abc import AsyncIterator, Callable, Mapping
 
     from vxlib.lifecycle import Teardown
 
+    from rigup import DeviceProps
     from vxl.system import StationConfig
 
 
@@ -37,6 +40,10 @@ class Station:
     Lifecycle methods are serialized so hardware ownership and the published
     station projection change in one deterministic order. Instrument behavior
     remains on :class:`~vxl.instrument.Instrument`.
+
+    Device property changes are merged into frames of ``state_frame_s`` seconds,
+    limited per ``"<device_id>/<property>"`` topic by ``state_rate_limits``
+    (fnmatch pattern to maximum Hz), before they are published to the feed.
     """
 
     def __init__(
@@ -46,6 +53,8 @@ class Station:
         records: VoxelRecords | None = None,
         instrument_factory: InstrumentFactory | None = None,
         lease_drain_timeout_s: float = 10.0,
+        state_frame_s: float = DEFAULT_FRAME_S,
+        state_rate_limits: Mapping[str, float] = DEFAULT_RATE_LIMITS,
     ) -> None:
         if lease_drain_timeout_s <= 0:
             raise ValueError("lease_drain_timeout_s must be positive")
@@ -66,6 +75,14 @@ class Station:
         self._instrument_leases: set[asyncio.Task[object]] = set()
         self._lease_drain_timeout_s = lease_drain_timeout_s
         self._feed = StationFeed(config.info, self._state)
+        self._instruments_revision = 0
+        self._observed_props: dict[str, dict[str, PropertyModel]] = {}
+        self._published_props: dict[str, dict[str, PropertyModel]] = {}
+        self._props_updates = StateCoalescer[PropertyModel](
+            self._publish_device_props,
+            frame_s=state_frame_s,
+            rate_limits=state_rate_limits,
+        )
 
     @property
     def config(self) -> StationConfig:
@@ -87,11 +104,34 @@ class Station:
         """The current station lifecycle projection as a read-only reactive value."""
         return self._state
 
+    def state_update_diagnostics(self) -> StateCoalescerDiagnostics:
+        """Frame rate, per-topic effective rates and suppressed counts of device property updates."""
+        return self._props_updates.diagnostics()
+
     @property
     def instruments_dir(self) -> Path:
         """Root holding the station's ``<name>.voxel`` instrument directories."""
         return self._config.dir / "instruments"
 
+    @property
+    def instruments_revision(self) -> tuple[int, tuple[tuple[str, int, int], ...]]:
+        """What :meth:`discover_instruments` reads, as a revision.
+
+        A counter bumped whenever this station may have changed it, plus the path, size and modification time
+        of every instrument file it inspects, so a config or state edited on disk also changes the revision.
+        """
+        files = [
+            path
+            for directory in sorted(self.instruments_dir.glob("*.voxel"))
+            if directory.is_dir()
+            for path in (directory / "config.yaml", directory / "state.json")
+        ]
+        root = self.instruments_dir
+        stats = ((path.relative_to(root).as_posix(), path.stat() if path.is_file() else None) for path in files)
+        return self._instruments_revision, tuple(
+            (name, stat.st_size, stat.st_mtime_ns) if stat is not None else (name, -1, -1) for name, stat in stats
+        )
+
     def discover_instruments(self) -> dict[str, InstrumentInspection]:
         """Inspect every installed instrument without opening hardware."""
         return {
@@ -106,6 +146,7 @@ class Station:
             self._ensure_file_operation_allowed()
             self._instrument_home(name)
             directory = InstrumentStore.instantiate(config, name, self.instruments_dir)
+            self._touch_instruments()
             return InstrumentStore.check(directory)
 
     async def archive_state(self, instrument_name: str) -> Path:
@@ -129,6 +170,7 @@ class Station:
                 archive = directory / f"state.bak.{index}.json"
                 index += 1
             state_path.rename(archive)
+            self._touch_instruments()
             return archive
 
     async def open_session(self, instrument_name: str) -> SessionInfo:
@@ -177,13 +219,18 @@ class Station:
                 self._session_teardowns.append(instrument.task_tiles.subscribe(self._refresh_session_view))
                 self._session_teardowns.append(instrument.acquisition.subscribe(self._refresh_session_view))
                 self._session_teardowns.append(instrument.default.subscribe(self._refresh_session_view))
-                self._session_teardowns.append(instrument.device_props_updates.subscribe(self._refresh_session_view))
+                self._session_teardowns.append(instrument.state.subscribe(self._touch_instruments))
+                self._session_teardowns.append(instrument.default.subscribe(self._touch_instruments))
+                self._observed_props = {device_id: dict(props) for device_id, props in instrument.device_props.items()}
+                self._published_props = {device_id: dict(props) for device_id, props in self._observed_props.items()}
+                self._session_teardowns.append(instrument.device_props_updates.subscribe(self._on_device_props))
                 self._session_teardowns.append(instrument.preview.subscribe(self._feed.publish_preview))
                 session_view = self._build_session_view(instrument)
             except BaseException as launch_error:
                 await self._teardown_failed_launch(instrument, launch_error)
                 raise
 
+            self._touch_instruments()
             await self._state.set(StationState(status=StationStatus.ACTIVE, session=session_view))
             return session_view.info
 
@@ -225,6 +272,7 @@ class Station:
                 return
             await self._close_session_locked()
             await self._state.set(StationState(status=StationStatus.CLOSED))
+            await self._props_updates.close()
             await self._feed.close()
 
     async def _close_session_locked(self, expected_session_id: UUID | None = None) -> None:
@@ -266,6 +314,7 @@ class Station:
         for teardown in self._session_teardowns:
             teardown()
         self._session_teardowns = []
+        self._clear_device_props()
         self._feed.clear_preview()
         self._session_info = None
         try:
@@ -282,6 +331,7 @@ class Station:
             raise
 
         self._instrument = None
+        self._touch_instruments()
         await self._state.set(StationState())
 
     async def _refresh_session_view(self, _value: object) -> None:
@@ -299,10 +349,34 @@ class Station:
             )
         )
 
+    def _touch_instruments(self, _value: object = None) -> None:
+        # Persisted instrument state and defaults feed discovery; device properties and views do not.
+        self._instruments_revision += 1
+
+    def _on_device_props(self, update: tuple[str, DeviceProps]) -> None:
+        device_id, props = update
+        observed = self._observed_props.setdefault(device_id, {})
+        for name, value in props.items():
+            if observed.get(name) != value:
+                observed[name] = value
+                self._props_updates.submit(f"{device_id}/{name}", value)
+
+    async def _publish_device_props(self, frame: dict[str, PropertyModel]) -> None:
+        for topic, value in frame.items():
+            device_id, _, name = topic.rpartition("/")
+            self._published_props.setdefault(device_id, {})[name] = value
+        await self._refresh_session_view(frame)
+
+    def _clear_device_props(self) -> None:
+        self._props_updates.cancel()
+        self._observed_props = {}
+        self._published_props = {}
+
     async def _teardown_failed_launch(self, instrument: Instrument | None, launch_error: BaseException) -> None:
         for teardown in self._session_teardowns:
             teardown()
         self._session_teardowns = []
+        self._clear_device_props()
         self._feed.clear_preview()
         self._session_info = None
 
@@ -344,7 +418,6 @@ class Station:
     def _build_session_view(self, instrument: Instrument) -> SessionView:
         if self._session_info is None:
             raise RuntimeError("station instrument has no attached session")
-        device_props = instrument.device_props
         return SessionView(
             info=self._session_info,
             instrument=InstrumentView.model_validate(
@@ -360,7 +433,7 @@ class Station:
                     "devices": {
                         device_id: DeviceState(
                             interface=interface,
-                            props=dict(device_props.get(device_id, {})),
+                            props=dict(self._published_props.get(device_id, {})),
                         )
                         for device_id, interface in instrument.device_interfaces.items()
                     },
@@ -3,6 +3,10 @@
 All feed mutation and connection setup are serialized through one asyncio lock.
 A connection's initial view therefore represents exactly the cursor immediately
 before its queued views; there is no subscribe-after-snapshot gap.
+
+Each view is published as a :class:`StationFeedRevision` shared by every connection.
+Its wire map, its patch from the previous revision and its encoded frames are computed
+at most once, no matter how many connections deliver them.
 """
 
 import asyncio
@@ -10,8 +14,10 @@ import time
 import uuid
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, cast
 
+import msgpack
 from vxlib.reactivity import Emitter
 
 from vxl.preview import LatestFrameQueue, PreviewEmission, PreviewSourceEmission, VoxelPreviewPacket
@@ -26,12 +32,72 @@ if TYPE_CHECKING:
 
 from .errors import StationFeedLaggedError
 from .models import StationFeedView, StationState, StationStatus, StreamCursor
+from .patch import PatchOperation, diff
 
 
 def _unix_time_us() -> int:
     return time.time_ns() // 1_000
 
 
+class StationFeedRevision:
+    """One published view plus its lazily computed, shared wire forms.
+
+    The encoded frames are immutable ``bytes``, so every connection and the snapshot endpoint send
+    the same object. The previous revision's wire map is held only until :attr:`ops` is first read,
+    so revisions never chain and keep earlier views alive.
+    """
+
+    def __init__(self, view: StationFeedView, previous: "StationFeedRevision | None" = None) -> None:
+        self.view = view
+        self.base_seq = previous.cursor.seq if previous is not None else None
+        self._base: dict[str, object] | None = previous.wire if previous is not None else None
+
+    @property
+    def cursor(self) -> StreamCursor:
+        return self.view.cursor
+
+    @cached_property
+    def wire(self) -> dict[str, object]:
+        """The complete view as a JSON-compatible map, computed once."""
+        return self.view.wire_dict()
+
+    @cached_property
+    def ops(self) -> list[PatchOperation] | None:
+        """RFC 6902 operations from the previous revision, or ``None`` for the first revision."""
+        base, self._base = self._base, None
+        return diff(base, self.wire) if base is not None else None
+
+    @cached_property
+    def frame(self) -> bytes:
+        """The complete view as MessagePack."""
+        return cast("bytes", msgpack.packb(self.wire))
+
+    @cached_property
+    def json(self) -> bytes:
+        """The complete view as JSON, for one-shot HTTP queries."""
+        return self.view.model_dump_json().encode()
+
+    @cached_property
+    def keyframe(self) -> bytes:
+        """The complete view wrapped as a patch-stream keyframe."""
+        return cast("bytes", msgpack.packb({"kind": "keyframe", "view": self.wire}))
+
+    @cached_property
+    def patch(self) -> bytes | None:
+        """:attr:`ops` wrapped as a patch-stream packet against ``base_seq``, if there is a base."""
+        ops = self.ops
+        if ops is None:
+            return None
+        packet = {
+            "kind": "patch",
+            "stream_id": self.cursor.stream_id,
+            "base_seq": self.base_seq,
+            "seq": self.cursor.seq,
+            "ops": ops,
+        }
+        return cast("bytes", msgpack.packb(packet))
+
+
 @dataclass(frozen=True)
 class _Termination:
     error: Exception | None = None
@@ -39,11 +105,11 @@ class _Termination:
 
 class _ConnectionState:
     def __init__(self, update_buffer_size: int) -> None:
-        self._queue: asyncio.Queue[StationFeedView | _Termination] = asyncio.Queue(maxsize=update_buffer_size)
+        self._queue: asyncio.Queue[StationFeedRevision | _Termination] = asyncio.Queue(maxsize=update_buffer_size)
         self._termination: _Termination | None = None
         self._termination_delivered = False
 
-    async def next(self) -> StationFeedView:
+    async def next(self) -> StationFeedRevision:
         if self._termination_delivered:
             raise StopAsyncIteration
 
@@ -55,9 +121,13 @@ class _ConnectionState:
             raise StopAsyncIteration
         return item
 
-    def offer(self, view: StationFeedView) -> bool:
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def offer(self, revision: StationFeedRevision) -> bool:
         try:
-            self._queue.put_nowait(view)
+            self._queue.put_nowait(revision)
         except asyncio.QueueFull:
             return False
         return True
@@ -77,12 +147,13 @@ class StationFeedConnection:
 
     def __init__(
         self,
-        initial: StationFeedView,
+        initial: StationFeedRevision,
         *,
         state: _ConnectionState,
         disconnect: "Callable[[StationFeedConnection], Awaitable[None]]",
     ) -> None:
-        self.initial = initial
+        self.initial_revision = initial
+        self.initial = initial.view
         self._state = state
         self._disconnect = disconnect
 
@@ -90,7 +161,20 @@ class StationFeedConnection:
         return self
 
     async def __anext__(self) -> StationFeedView:
-        return await self._state.next()
+        return (await self._state.next()).view
+
+    @property
+    def pending(self) -> int:
+        """Revisions buffered for this connection and not yet consumed."""
+        return self._state.pending
+
+    async def revisions(self) -> "AsyncGenerator[StationFeedRevision]":
+        """Iterate later revisions instead of bare views, to reuse their shared wire forms."""
+        while True:
+            try:
+                yield await self._state.next()
+            except StopAsyncIteration:
+                return
 
     async def close(self) -> None:
         """Unregister this connection. Safe to call more than once."""
@@ -118,9 +202,10 @@ class StationFeed:
         self._state = source.value
         self._stream_id = uuid.uuid4().hex
         self._seq = 0
+        self._revision = StationFeedRevision(self._view_unlocked())
         self._frame_seq = 0
         self._frames = Emitter[PreviewEmission]()
-        self._frame_queue = LatestFrameQueue()
+        self._frame_queue = LatestFrameQueue[VoxelPreviewPacket]()
         self._frame_task: asyncio.Task[None] | None = None
         self._update_buffer_size = update_buffer_size
         self._connections: dict[StationFeedConnection, _ConnectionState] = {}
@@ -148,13 +233,14 @@ class StationFeed:
                 return
             frame_seq = self._frame_seq
             self._frame_seq += 1
+            # Packed on delivery, so frames replaced in the latest-only queue are never copied.
             packet = VoxelPreviewPacket.wrap(
                 frame,
                 channel_id=channel_id,
                 seq=frame_seq,
                 state_cursor=self._cursor_unlocked(),
                 stamped_at_unix_us=_unix_time_us(),
-            ).pack()
+            )
             self._frame_queue.put((channel_id, layer), packet)
             if self._frame_task is None or self._frame_task.done():
                 self._frame_task = asyncio.create_task(self._drain_frames(), name="station-preview-delivery")
@@ -173,6 +259,11 @@ class StationFeed:
         async with self._lock:
             return self._view_unlocked()
 
+    async def latest(self) -> StationFeedRevision:
+        """Return the latest published revision, whose encoded frames are shared with every connection."""
+        async with self._lock:
+            return self._revision
+
     async def _on_state(self, state: StationState) -> None:
         """Materialize one committed reactive station-state change."""
         async with self._lock:
@@ -184,9 +275,10 @@ class StationFeed:
             self._state = state
             self._seq += 1
             view = self._view_unlocked()
+            self._revision = StationFeedRevision(view, self._revision if self._connections else None)
             lagged: list[tuple[StationFeedConnection, _ConnectionState]] = []
             for connection, connection_state in self._connections.items():
-                if not connection_state.offer(view):
+                if not connection_state.offer(self._revision):
                     lagged.append((connection, connection_state))
             for connection, connection_state in lagged:
                 del self._connections[connection]
@@ -200,7 +292,7 @@ class StationFeed:
         """Deliver latest-only packets without propagating consumer delay to Instrument."""
         while not self._closed:
             (channel_id, layer), packet = await self._frame_queue.get()
-            await self._frames.emit((channel_id, layer, packet))
+            await self._frames.emit((channel_id, layer, packet.pack()))
 
     async def close(self) -> None:
         """Close the feed and end all active connection iterators."""
@@ -221,7 +313,7 @@ class StationFeed:
                 raise RuntimeError("station feed is closed")
             state = _ConnectionState(self._update_buffer_size)
             connection = StationFeedConnection(
-                self._view_unlocked(),
+                self._revision,
                 state=state,
                 disconnect=self._disconnect,
             )
@@ -248,4 +340,4 @@ class StationFeed:
         )
 
 
-__all__ = ["StationFeed", "StationFeedConnection", "StationFeedLaggedError"]
+__all__ = ["StationFeed", "StationFeedConnection", "StationFeedLaggedError", "StationFeedRevision"]
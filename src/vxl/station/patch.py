@@ -0,0 +1,131 @@
+"""Structural RFC 6902 patches between JSON-compatible station views.
+
+Operations are plain ``{"op", "path", "value"}`` maps so they pack directly to MessagePack or JSON.
+:func:`diff` emits only ``add``, ``remove`` and ``replace``. Lists of equal length are diffed element by
+element; a list that only grew or shrank at its end becomes appends or trailing removals, and any
+other list change replaces the whole list.
+"""
+
+from typing import Any
+
+type PatchOperation = dict[str, Any]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> list[PatchOperation]:
+    """Return operations that turn ``old`` into ``new``."""
+    ops: list[PatchOperation] = []
+    _diff(old, new, path, ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: list[PatchOperation]) -> None:
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                _diff(old[key], value, child, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        shared = min(len(old), len(new))
+        if len(old) != len(new) and old[:shared] != new[:shared]:
+            ops.append({"op": "replace", "path": path, "value": new})
+            return
+        for index in range(shared):
+            _diff(old[index], new[index], f"{path}/{index}", ops)
+        ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[shared:])
+        ops.extend({"op": "remove", "path": f"{path}/{index}"} for index in range(len(old) - 1, shared - 1, -1))
+        return
+    # bool is an int subclass, so compare types too: True must not stand in for 1.
+    if type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def apply_patch(document: Any, ops: list[PatchOperation]) -> Any:
+    """Return ``document`` with ``ops`` applied, copying only the containers along each changed path."""
+    for op in ops:
+        document = _apply(document, op)
+    return document
+
+
+def _apply(document: Any, op: PatchOperation) -> Any:
+    path = op["path"]
+    if not path:
+        if op["op"] == "remove":
+            raise ValueError("cannot remove the document root")
+        return op["value"]
+    tokens = [_unescape(token) for token in path.split("/")[1:]]
+    root = _copy(document)
+    parent = root
+    for token in tokens[:-1]:
+        key = _key(parent, token)
+        child = _copy(parent[key])
+        parent[key] = child
+        parent = child
+
+    last = tokens[-1]
+    kind = op["op"]
+    if isinstance(parent, list):
+        if kind == "add":
+            index = len(parent) if last == "-" else _key(parent, last, inclusive=True)
+            parent.insert(index, op["value"])
+        elif kind == "remove":
+            del parent[_key(parent, last)]
+        elif kind == "replace":
+            parent[_key(parent, last)] = op["value"]
+        else:
+            raise ValueError(f"unsupported patch operation: {kind}")
+    elif isinstance(parent, dict):
+        if kind in {"add", "replace"}:
+            if kind == "replace" and last not in parent:
+                raise ValueError(f"cannot replace missing member {path}")
+            parent[last] = op["value"]
+        elif kind == "remove":
+            if last not in parent:
+                raise ValueError(f"cannot remove missing member {path}")
+            del parent[last]
+        else:
+            raise ValueError(f"unsupported patch operation: {kind}")
+    else:
+        raise ValueError(f"patch path {path} does not address a container")
+    return root
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _key(container: Any, token: str, *, inclusive: bool = False) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise ValueError(f"patch path member {token!r} does not exist")
+        return token
+    if isinstance(container, list):
+        if not token.isdigit():
+            raise ValueError(f"invalid patch list index {token!r}")
+        index = int(token)
+        if index > len(container) or (index == len(container) and not inclusive):
+            raise ValueError(f"patch list index {index} is out of range")
+        return index
+    raise ValueError(f"patch path token {token!r} does not address a container")
+
+
+__all__ = ["PatchOperation", "apply_patch", "diff"]
@@ -21,6 +21,17 @@ class InstrumentTemplates:
         """Directory containing ``*.voxel.yaml`` instrument templates."""
         return self._directory
 
+    @property
+    def revision(self) -> tuple[tuple[str, int, int], ...]:
+        """Name, size and modification time of every template file.
+
+        Templates are edited outside the station, so their file metadata serves as their revision.
+        """
+        if not self._directory.is_dir():
+            return ()
+        stats = [(path.name, path.stat()) for path in sorted(self._directory.glob("*.voxel.yaml"))]
+        return tuple((name, stat.st_size, stat.st_mtime_ns) for name, stat in stats)
+
     def discover(self) -> dict[str, InstrumentConfig]:
         """Return valid templates while logging every invalid configuration."""
         found: dict[str, InstrumentConfig] = {}
@@ -21,6 +21,7 @@ from vxl.instrument.errors import InstrumentBusyError, OperationRejectedError, S
 from vxl.station import InstrumentTemplates, Station
 from vxl.system import StationConfig, System, load_voxel_env
 
+from .cache import ResponseCache
 from .realtime import Realtime
 from .router import api_router
 
@@ -101,6 +102,7 @@ def create_app(
     app.state.station = station
     app.state.instrument_templates = templates if templates is not None else InstrumentTemplates()
     app.state.realtime = Realtime(station)
+    app.state.response_cache = ResponseCache()
     _register_error_handlers(app)
     app.include_router(api_router, prefix="/api")
 
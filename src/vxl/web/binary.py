@@ -0,0 +1,117 @@
+"""MessagePack content negotiation for JSON API routes.
+
+Routers built with ``route_class=MsgpackRoute`` accept ``Content-Type: application/msgpack`` request
+bodies and answer ``Accept: application/msgpack`` requests with MessagePack bodies, while JSON clients
+see no change. A MessagePack body is decoded with :func:`rigup.wire.unpack` and handed to FastAPI as the
+request's already-decoded JSON, so the route's pydantic parameters validate it exactly as they would a
+JSON body. Error responses raised as exceptions stay JSON.
+"""
+
+import functools
+import inspect
+import json
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any, cast
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from rigup.wire import unpack
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+type _RouteHandler = Callable[[Request], Coroutine[Any, Any, Response]]
+
+_msgpack_response: ContextVar[bool] = ContextVar("msgpack_response", default=False)
+
+
+def _is_msgpack(content_type: str | None) -> bool:
+    return content_type is not None and content_type.partition(";")[0].strip().lower() == MSGPACK_MEDIA_TYPE
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """Whether the client listed ``application/msgpack`` in its ``Accept`` header."""
+    return MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class _MsgpackRequest(Request):
+    """A request whose MessagePack body is presented to FastAPI as decoded JSON."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = unpack(await self.body())
+        return self._json
+
+
+def _as_json_request(request: Request) -> Request:
+    headers = [
+        (name, b"application/json" if name == b"content-type" else value) for name, value in request.scope["headers"]
+    ]
+    return _MsgpackRequest({**request.scope, "headers": headers}, request.receive)
+
+
+def _as_msgpack_response(response: Response) -> Response:
+    body = getattr(response, "body", b"")  # streaming responses have no buffered body
+    if response.media_type != "application/json" or not body:
+        return response
+    headers = {
+        name: value for name, value in response.headers.items() if name not in {"content-length", "content-type"}
+    }
+    return Response(
+        content=cast("bytes", msgpack.packb(json.loads(body))),
+        status_code=response.status_code,
+        headers=headers,
+        media_type=MSGPACK_MEDIA_TYPE,
+        background=response.background,
+    )
+
+
+class MsgpackRoute(APIRoute):
+    """An API route that also speaks ``application/msgpack`` for request and response bodies.
+
+    Async endpoints answer MessagePack requests by dumping their return value through the route's
+    response model straight to MessagePack; other JSON responses are transcoded.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._negotiated(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+        self._msgpack_adapter = TypeAdapter(self.response_model) if self.response_model is not None else None
+
+    def _negotiated(self, endpoint: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Any]:
+        @functools.wraps(endpoint)
+        async def negotiated(*args: Any, **kwargs: Any) -> Any:
+            result = await endpoint(*args, **kwargs)
+            adapter = self._msgpack_adapter
+            if not _msgpack_response.get() or adapter is None or isinstance(result, Response):
+                return result
+            return Response(
+                content=cast("bytes", msgpack.packb(adapter.dump_python(result, mode="json"))),
+                status_code=self.status_code or 200,
+                media_type=MSGPACK_MEDIA_TYPE,
+            )
+
+        return negotiated
+
+    def get_route_handler(self) -> _RouteHandler:
+        handler = super().get_route_handler()
+
+        async def negotiate(request: Request) -> Response:
+            if _is_msgpack(request.headers.get("content-type")):
+                request = _as_json_request(request)
+            if not accepts_msgpack(request):
+                return await handler(request)
+            token = _msgpack_response.set(True)
+            try:
+                response = await handler(request)
+            finally:
+                _msgpack_response.reset(token)
+            return _as_msgpack_response(response)
+
+        return negotiate
+
+
+__all__ = ["MSGPACK_MEDIA_TYPE", "MsgpackRoute", "accepts_msgpack"]
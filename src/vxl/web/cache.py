@@ -0,0 +1,126 @@
+"""Revision-keyed caching of rendered JSON responses with strong ETags and negotiated compression.
+
+Routes whose output only changes with a known revision (installed instruments, templates, presets) pass
+:meth:`ResponseCache.respond` a key that includes that revision and a coroutine that renders the body.
+The body is rendered once per key; every later request reuses its bytes, is answered ``304 Not
+Modified`` when ``If-None-Match`` names the current ETag, and receives a zstd or gzip encoding that is
+also computed once per key when the client accepts one and the body is large enough to benefit.
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Literal
+
+from fastapi import Request, Response
+from numcodecs import Zstd
+
+DEFAULT_MAX_ENTRIES = 256
+MIN_COMPRESS_BYTES = 1024
+
+type ContentCoding = Literal["zstd", "gzip"]
+
+_CODINGS: tuple[ContentCoding, ...] = ("zstd", "gzip")  # server preference among equally weighted codings
+_ZSTD = Zstd(level=3)
+
+
+def _accepted_coding(accept_encoding: str) -> ContentCoding | None:
+    """Return the preferred coding with a non-zero quality in an ``Accept-Encoding`` header."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            weights[coding.lower()] = quality
+    wildcard = weights.get("*", 0.0)
+    ranked = sorted(_CODINGS, key=lambda coding: weights.get(coding, wildcard), reverse=True)
+    best = ranked[0]
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+def _etag_values(if_none_match: str) -> set[str]:
+    """Opaque tags named by ``If-None-Match``, compared weakly as RFC 9110 requires for this header."""
+    return {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}
+
+
+class _Entry:
+    __slots__ = ("_encoded", "body", "digest", "media_type")
+
+    def __init__(self, body: bytes, media_type: str) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._encoded: dict[ContentCoding, bytes] = {}
+
+    def etag(self, coding: ContentCoding | None) -> str:
+        # Each representation gets its own strong validator, all derived from the identity body.
+        return f'"{self.digest}"' if coding is None else f'"{self.digest}-{coding}"'
+
+    def matches(self, tags: set[str]) -> bool:
+        return "*" in tags or any(tag.partition("-")[0] == self.digest for tag in tags)
+
+    def encoded(self, coding: ContentCoding) -> bytes:
+        body = self._encoded.get(coding)
+        if body is None:
+            body = _ZSTD.encode(self.body) if coding == "zstd" else gzip.compress(self.body, mtime=0)
+            self._encoded[coding] = body = bytes(body)
+        return body
+
+
+class ResponseCache:
+    """Least-recently-used cache of rendered response bodies keyed by route and revision."""
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES, min_compress_bytes: int = MIN_COMPRESS_BYTES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._max_entries = max_entries
+        self._min_compress_bytes = min_compress_bytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        render: Callable[[], Awaitable[bytes]],
+        *,
+        media_type: str = "application/json",
+    ) -> Response:
+        """Serve the body cached for ``key``, rendering and storing it first on a miss.
+
+        ``key`` must change whenever the rendered body may change. Errors raised by ``render`` propagate
+        and are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _Entry(await render(), media_type)
+            self._entries[key] = entry
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+
+        coding = _accepted_coding(request.headers.get("accept-encoding", ""))
+        if len(entry.body) < self._min_compress_bytes:
+            coding = None
+        headers = {"etag": entry.etag(coding), "cache-control": "no-cache", "vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and entry.matches(_etag_values(if_none_match)):
+            return Response(status_code=304, headers=headers)
+        if coding is None:
+            return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+        headers["content-encoding"] = coding
+        return Response(content=entry.encoded(coding), media_type=entry.media_type, headers=headers)
+
+
+__all__ = ["DEFAULT_MAX_ENTRIES", "MIN_COMPRESS_BYTES", "ContentCoding", "ResponseCache"]
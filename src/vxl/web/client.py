@@ -0,0 +1,163 @@
+"""Blocking Python client for scripted instrument control over one persistent HTTP/1.1 connection.
+
+Scripts that drive an instrument at high rates spend most of each call on connection setup and JSON
+handling. :class:`InstrumentClient` keeps one keep-alive connection open to the station and, by
+default, exchanges MessagePack bodies with the ``instrument`` routes.
+
+    with InstrumentClient("http://localhost:8000", station_id, session_id) as client:
+        client.patch("/profile", {"label": "fast"})
+        props = client.get("/devices/stage-x/properties")
+"""
+
+import json
+from http.client import HTTPConnection, HTTPResponse
+from typing import Any, Literal, Self, cast
+from urllib.parse import urlencode, urlsplit
+from uuid import UUID
+
+import msgpack
+from rigup.wire import WireFormat
+
+from .binary import MSGPACK_MEDIA_TYPE
+
+type Method = Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+_MEDIA_TYPES: dict[WireFormat, str] = {"json": "application/json", "msgpack": MSGPACK_MEDIA_TYPE}
+_IDEMPOTENT: frozenset[str] = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+
+class InstrumentClientError(Exception):
+    """The station answered an instrument call with an error status."""
+
+    def __init__(self, status: int, detail: Any) -> None:
+        super().__init__(f"HTTP {status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+
+class InstrumentClient:
+    """Call the routes of one open instrument session, reusing a single connection.
+
+    Not thread-safe: an HTTP/1.1 connection carries one request at a time, so use one client per thread.
+    A connection the server closed while idle is reopened once and the request resent, unless a POST or
+    PATCH had already been sent: the server may have run it, so the error is raised instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        station_id: UUID,
+        session_id: UUID,
+        *,
+        fmt: WireFormat = "msgpack",
+        timeout_s: float = 10.0,
+    ) -> None:
+        url = urlsplit(base_url)
+        if url.scheme != "http" or url.hostname is None:
+            raise ValueError(f"expected an http:// station URL, got {base_url!r}")
+        self._host = url.hostname
+        self._port = url.port or 80
+        self._prefix = f"{url.path.rstrip('/')}/api/stations/{station_id}/sessions/{session_id}/instrument"
+        self._fmt: WireFormat = fmt
+        self._timeout_s = timeout_s
+        self._connection: HTTPConnection | None = None
+
+    @property
+    def fmt(self) -> WireFormat:
+        return self._fmt
+
+    def request(self, method: Method, path: str, body: Any = None, *, params: dict[str, Any] | None = None) -> Any:
+        """Send one call and return its decoded response body, or ``None`` for an empty response."""
+        target = self._prefix + path
+        if params:
+            target = f"{target}?{urlencode(params, doseq=True)}"
+        headers = {"accept": _MEDIA_TYPES[self._fmt]}
+        payload: bytes | None = None
+        if body is not None:
+            payload = self._encode(body)
+            headers["content-type"] = _MEDIA_TYPES[self._fmt]
+
+        response, data = self._exchange(method, target, payload, headers)
+        decoded = self._decode(response, data)
+        if response.status >= 400:
+            detail = decoded.get("detail", decoded) if isinstance(decoded, dict) else decoded
+            raise InstrumentClientError(response.status, detail)
+        return decoded
+
+    def get(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, body: Any = None) -> Any:
+        return self.request("POST", path, body)
+
+    def put(self, path: str, body: Any = None) -> Any:
+        return self.request("PUT", path, body)
+
+    def patch(self, path: str, body: Any = None) -> Any:
+        return self.request("PATCH", path, body)
+
+    def delete(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
+        return self.request("DELETE", path, params=params)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _exchange(
+        self, method: str, target: str, payload: bytes | None, headers: dict[str, str]
+    ) -> tuple[HTTPResponse, bytes]:
+        reused = self._connection is not None
+        sent = False
+        try:
+            connection = self._connect()
+            connection.request(method, target, body=payload, headers=headers)
+            sent = True
+            response = connection.getresponse()
+            return response, response.read()
+        except (BrokenPipeError, ConnectionResetError):
+            # The server may close an idle keep-alive connection. Failing to send proves it never saw the
+            # request; a failure once it was sent (``RemoteDisconnected`` is a reset) does not, so only an
+            # idempotent request is resent then.
+            self.close()
+            if not reused or (sent and method not in _IDEMPOTENT):
+                raise
+        return self._send(method, target, payload, headers)
+
+    def _send(
+        self, method: str, target: str, payload: bytes | None, headers: dict[str, str]
+    ) -> tuple[HTTPResponse, bytes]:
+        connection = self._connect()
+        connection.request(method, target, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response, response.read()
+
+    def _connect(self) -> HTTPConnection:
+        if self._connection is None:
+            self._connection = HTTPConnection(self._host, self._port, timeout=self._timeout_s)
+        return self._connection
+
+    def _encode(self, body: Any) -> bytes:
+        if self._fmt == "msgpack":
+            return cast("bytes", msgpack.packb(body))
+        return json.dumps(body).encode()
+
+    @staticmethod
+    def _decode(response: HTTPResponse, data: bytes) -> Any:
+        if not data:
+            return None
+        content_type = response.getheader("content-type", "")
+        if content_type.startswith(MSGPACK_MEDIA_TYPE):
+            return msgpack.unpackb(data)
+        if content_type.startswith("application/json"):
+            return json.loads(data)
+        return data.decode()
+
+
+__all__ = ["InstrumentClient", "InstrumentClientError"]
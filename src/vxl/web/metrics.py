@@ -0,0 +1,283 @@
+"""Per-connection delivery metrics for the realtime WebSockets, as JSON diagnostics or Prometheus text.
+
+Each state, preview and log connection owns one :class:`ConnectionMetrics`. The connection records every
+frame it sends (bytes and how long ``send_bytes`` took), the time it spent encoding frames for itself,
+and every frame it dropped. :class:`RealtimeMetrics` snapshots the live connections and keeps the most
+recently closed ones, so a client that was disconnected for lagging can still be identified afterwards.
+"""
+
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from itertools import accumulate, count
+from typing import Literal
+
+from fastapi import WebSocket
+from pydantic import Field
+from vxlib.schema import FrozenModel
+
+SEND_LATENCY_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RECENTLY_CLOSED = 32  # closed connections kept for diagnostics
+_RATE_WINDOW_S = 5.0  # span over which bytes/s is measured
+
+type RealtimeStream = Literal["state", "preview", "logs"]
+type CloseReason = Literal["disconnected", "lagged", "error", "shutdown"]
+
+
+class SendLatencyHistogram(FrozenModel):
+    """Cumulative counts of ``send_bytes`` durations at or below each bucket bound, Prometheus style."""
+
+    bounds_s: tuple[float, ...]
+    cumulative_counts: tuple[int, ...] = Field(description="One count per bound, followed by the +Inf count.")
+    sum_s: float
+    count: int
+
+
+class RealtimeConnectionDiagnostics(FrozenModel):
+    """Delivery counters of one realtime WebSocket connection."""
+
+    id: int
+    stream: RealtimeStream
+    client: str | None = Field(description="Peer host:port as seen by the server.")
+    connected_s: float = Field(description="Seconds since the connection was accepted, or its lifetime once closed.")
+    queue_depth: int = Field(description="Frames waiting to be sent to this client.")
+    sent_frames: int
+    sent_bytes: int
+    bytes_per_s: float = Field(description="Bytes sent per second over the last few seconds.")
+    dropped: int = Field(description="Frames discarded because this client could not keep up.")
+    dropped_by_channel: dict[str, int] = Field(description="Preview frames replaced before delivery, per channel.")
+    encode_s: float = Field(description="Time spent encoding frames on this connection's behalf.")
+    send_latency: SendLatencyHistogram
+    closed: CloseReason | None = None
+
+
+class RealtimeDiagnostics(FrozenModel):
+    """Live and recently closed realtime connections, with lag disconnects per stream."""
+
+    connections: list[RealtimeConnectionDiagnostics]
+    recently_closed: list[RealtimeConnectionDiagnostics]
+    lagged_disconnects: dict[RealtimeStream, int]
+
+
+class ConnectionMetrics:
+    """Mutable counters for one connection. Recording is synchronous and allocation-light."""
+
+    def __init__(
+        self,
+        connection_id: int,
+        stream: RealtimeStream,
+        client: str | None,
+        queue_depth: Callable[[], int],
+    ) -> None:
+        self.id = connection_id
+        self.stream: RealtimeStream = stream
+        self.client = client
+        self.queue_depth = queue_depth
+        self.sent_frames = 0
+        self.sent_bytes = 0
+        self.dropped = 0
+        self.dropped_by_channel: Counter[str] = Counter()
+        self.encode_s = 0.0
+        self.send_latency_counts = [0] * (len(SEND_LATENCY_BUCKETS_S) + 1)
+        self.send_latency_sum_s = 0.0
+        self.closed: CloseReason | None = None
+        self._connected_at = time.monotonic()
+        self._closed_at: float | None = None
+        self._final_queue_depth = 0
+        self._recent: deque[tuple[float, int]] = deque()
+
+    def record_send(self, nbytes: int, seconds: float) -> None:
+        now = time.monotonic()
+        self.sent_frames += 1
+        self.sent_bytes += nbytes
+        self.send_latency_counts[bisect_left(SEND_LATENCY_BUCKETS_S, seconds)] += 1
+        self.send_latency_sum_s += seconds
+        self._recent.append((now, nbytes))
+
+    def record_drop(self, channel: str | None = None) -> None:
+        self.dropped += 1
+        if channel is not None:
+            self.dropped_by_channel[channel] += 1
+
+    @contextmanager
+    def encoding(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.encode_s += time.perf_counter() - start
+
+    def close(self, reason: CloseReason) -> None:
+        if self.closed is None:
+            self._final_queue_depth = self.queue_depth()
+            self.closed = reason
+            self._closed_at = time.monotonic()
+
+    def snapshot(self) -> RealtimeConnectionDiagnostics:
+        now = self._closed_at if self._closed_at is not None else time.monotonic()
+        while self._recent and now - self._recent[0][0] > _RATE_WINDOW_S:
+            self._recent.popleft()
+        elapsed = min(_RATE_WINDOW_S, max(now - self._connected_at, 1.0))
+        return RealtimeConnectionDiagnostics(
+            id=self.id,
+            stream=self.stream,
+            client=self.client,
+            connected_s=now - self._connected_at,
+            queue_depth=self._final_queue_depth if self.closed is not None else self.queue_depth(),
+            sent_frames=self.sent_frames,
+            sent_bytes=self.sent_bytes,
+            bytes_per_s=sum(nbytes for _, nbytes in self._recent) / elapsed,
+            dropped=self.dropped,
+            dropped_by_channel=dict(self.dropped_by_channel),
+            encode_s=self.encode_s,
+            send_latency=SendLatencyHistogram(
+                bounds_s=SEND_LATENCY_BUCKETS_S,
+                cumulative_counts=tuple(accumulate(self.send_latency_counts)),
+                sum_s=self.send_latency_sum_s,
+                count=self.sent_frames,
+            ),
+            closed=self.closed,
+        )
+
+
+class RealtimeMetrics:
+    """Registry of connection metrics for one :class:`~vxl.web.realtime.Realtime`."""
+
+    def __init__(self, *, recently_closed: int = RECENTLY_CLOSED) -> None:
+        self._ids = count(1)
+        self._live: dict[int, ConnectionMetrics] = {}
+        self._closed: deque[ConnectionMetrics] = deque(maxlen=recently_closed)
+        self._lagged: Counter[RealtimeStream] = Counter()
+
+    def open(
+        self,
+        stream: RealtimeStream,
+        websocket: WebSocket,
+        queue_depth: Callable[[], int] = lambda: 0,
+    ) -> ConnectionMetrics:
+        peer = websocket.client
+        metrics = ConnectionMetrics(
+            next(self._ids),
+            stream,
+            f"{peer.host}:{peer.port}" if peer is not None else None,
+            queue_depth,
+        )
+        self._live[metrics.id] = metrics
+        return metrics
+
+    def close(self, metrics: ConnectionMetrics, reason: CloseReason = "disconnected") -> None:
+        if self._live.pop(metrics.id, None) is None:
+            return
+        metrics.close(reason)
+        if reason == "lagged":
+            self._lagged[metrics.stream] += 1
+        self._closed.append(metrics)
+
+    def close_all(self, reason: CloseReason) -> None:
+        for metrics in tuple(self._live.values()):
+            self.close(metrics, reason)
+
+    def diagnostics(self) -> RealtimeDiagnostics:
+        return RealtimeDiagnostics(
+            connections=[metrics.snapshot() for metrics in self._live.values()],
+            recently_closed=[metrics.snapshot() for metrics in reversed(self._closed)],
+            lagged_disconnects={stream: self._lagged[stream] for stream in ("state", "preview", "logs")},
+        )
+
+
+def _labels(**labels: str | None) -> str:
+    pairs = ",".join(
+        f'{name}="{value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")}"'
+        for name, value in labels.items()
+        if value is not None
+    )
+    return f"{{{pairs}}}"
+
+
+def render_prometheus(diagnostics: RealtimeDiagnostics) -> str:
+    """Render live connection metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: Sequence[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value:g}" for labels, value in samples)
+
+    connections = diagnostics.connections
+    labels = {c.id: {"connection": str(c.id), "stream": c.stream, "client": c.client} for c in connections}
+    family(
+        "vxl_realtime_queue_depth",
+        "gauge",
+        "Frames waiting to be sent to a realtime client.",
+        [(_labels(**labels[c.id]), c.queue_depth) for c in connections],
+    )
+    family(
+        "vxl_realtime_sent_frames_total",
+        "counter",
+        "Frames sent to a realtime client.",
+        [(_labels(**labels[c.id]), c.sent_frames) for c in connections],
+    )
+    family(
+        "vxl_realtime_sent_bytes_total",
+        "counter",
+        "Bytes sent to a realtime client.",
+        [(_labels(**labels[c.id]), c.sent_bytes) for c in connections],
+    )
+    family(
+        "vxl_realtime_send_rate_bytes_per_second",
+        "gauge",
+        "Bytes per second sent to a realtime client over the last few seconds.",
+        [(_labels(**labels[c.id]), c.bytes_per_s) for c in connections],
+    )
+    # Preview drops are broken out per channel; state and log drops have no channel.
+    dropped = [
+        (_labels(**labels[c.id], channel=channel), n)
+        for c in connections
+        for channel, n in c.dropped_by_channel.items()
+    ]
+    dropped += [(_labels(**labels[c.id]), c.dropped) for c in connections if not c.dropped_by_channel]
+    family(
+        "vxl_realtime_dropped_frames_total",
+        "counter",
+        "Frames discarded because a realtime client could not keep up.",
+        dropped,
+    )
+    family(
+        "vxl_realtime_encode_seconds_total",
+        "counter",
+        "Time spent encoding frames for a realtime client.",
+        [(_labels(**labels[c.id]), c.encode_s) for c in connections],
+    )
+
+    lines.append("# HELP vxl_realtime_send_seconds Time spent in one WebSocket send.")
+    lines.append("# TYPE vxl_realtime_send_seconds histogram")
+    for c in connections:
+        histogram = c.send_latency
+        for bound, cumulative in zip((*histogram.bounds_s, "+Inf"), histogram.cumulative_counts, strict=True):
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            lines.append(f"vxl_realtime_send_seconds_bucket{_labels(**labels[c.id], le=le)} {cumulative}")
+        lines.append(f"vxl_realtime_send_seconds_sum{_labels(**labels[c.id])} {histogram.sum_s:g}")
+        lines.append(f"vxl_realtime_send_seconds_count{_labels(**labels[c.id])} {histogram.count}")
+
+    family(
+        "vxl_realtime_lagged_disconnects_total",
+        "counter",
+        "Realtime connections closed because they fell behind.",
+        [(_labels(stream=stream), n) for stream, n in diagnostics.lagged_disconnects.items()],
+    )
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "SEND_LATENCY_BUCKETS_S",
+    "CloseReason",
+    "ConnectionMetrics",
+    "RealtimeConnectionDiagnostics",
+    "RealtimeDiagnostics",
+    "RealtimeMetrics",
+    "RealtimeStream",
+    "SendLatencyHistogram",
+    "render_prometheus",
+]
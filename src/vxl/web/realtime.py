@@ -2,23 +2,42 @@
 
 import asyncio
 import logging
+import time
+from bisect import bisect_right
+from collections import deque
 from contextlib import suppress
-from typing import TYPE_CHECKING, Literal, cast
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Annotated, Literal, cast
 from uuid import UUID
 
 from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import Field, TypeAdapter
 from rigup.wire import pack, unpack
 from vxl_records import LogEntry
 from vxlib.schema import FrozenModel
 
-from vxl.preview import LatestFrameQueue, PreviewEmission, PreviewKey, PreviewViewport
-from vxl.station import Station, StationFeedConnection, StationFeedLaggedError, StationFeedView, StationState
+from vxl.preview import LatestFrameQueue, PreviewCompositeChannel, PreviewEmission, PreviewKey, PreviewViewport
+from vxl.station import (
+    Station,
+    StationFeedConnection,
+    StationFeedLaggedError,
+    StationFeedRevision,
+    StationState,
+)
+
+from .metrics import CloseReason, ConnectionMetrics, RealtimeDiagnostics, RealtimeMetrics
 
 if TYPE_CHECKING:
+    from vxl_records import LogJournal
     from vxlib.lifecycle import Teardown
 
 log = logging.getLogger(__name__)
 
+STATE_KEYFRAME_INTERVAL = 256  # patches a patch-mode client receives between unsolicited keyframes
+LOG_RING_SIZE = 4096  # newest packed log entries kept for reconnecting clients
+LOG_REPLAY_PAGE_SIZE = 1000  # journal page size when a reconnect has aged out of the ring
+
 
 class PreviewViewportUpdate(FrozenModel):
     """Latest requested preview viewport for one expected instrument session."""
@@ -28,13 +47,92 @@ class PreviewViewportUpdate(FrozenModel):
     viewport: PreviewViewport
 
 
+class PreviewCompositeUpdate(FrozenModel):
+    """Switch server-side multi-channel compositing on (with per-channel display settings) or off.
+
+    An empty ``channels`` map composites the active channels with their emission colormaps.
+    """
+
+    action: Literal["preview.composite.update"]
+    session_id: UUID
+    channels: dict[str, PreviewCompositeChannel] | None
+
+
+class StateResyncRequest(FrozenModel):
+    """Ask a patch-mode state stream for a keyframe, e.g. after a patch whose ``base_seq`` did not match."""
+
+    action: Literal["state.resync"]
+
+
+_CONTROL_MESSAGE = TypeAdapter[PreviewViewportUpdate | PreviewCompositeUpdate | StateResyncRequest](
+    Annotated[PreviewViewportUpdate | PreviewCompositeUpdate | StateResyncRequest, Field(discriminator="action")]
+)
+
+
+async def _send_frame(websocket: WebSocket, metrics: ConnectionMetrics, frame: bytes) -> None:
+    start = time.perf_counter()
+    await websocket.send_bytes(frame)
+    metrics.record_send(len(frame), time.perf_counter() - start)
+
+
+class _StateClient:
+    """Send one connection's revisions as complete views, or as keyframes followed by patches.
+
+    Patch mode sends ``{"kind": "keyframe", "view": ...}`` and then ``{"kind": "patch", "stream_id",
+    "base_seq", "seq", "ops"}`` maps whose RFC 6902 ``ops`` turn the view at ``base_seq`` into the one
+    at ``seq``. A client that cannot apply a patch sends :class:`StateResyncRequest`.
+    """
+
+    def __init__(self, websocket: WebSocket, metrics: ConnectionMetrics, *, patches: bool) -> None:
+        self._websocket = websocket
+        self._metrics = metrics
+        self._patches = patches
+        self._send_lock = asyncio.Lock()
+        self._current: StationFeedRevision | None = None
+        self._since_keyframe = 0
+
+    async def send(self, revision: StationFeedRevision) -> None:
+        async with self._send_lock:
+            with self._metrics.encoding():
+                frame = self._encode(revision)
+            await _send_frame(self._websocket, self._metrics, frame)
+            self._current = revision
+
+    async def resync(self) -> None:
+        async with self._send_lock:
+            if self._patches and self._current is not None:
+                with self._metrics.encoding():
+                    frame = self._current.keyframe
+                await _send_frame(self._websocket, self._metrics, frame)
+                self._since_keyframe = 0
+
+    def _encode(self, revision: StationFeedRevision) -> bytes:
+        """Pick the frame for ``revision``; revisions cache their encodings, so only the first client pays."""
+        if not self._patches:
+            return revision.frame
+        if (
+            self._current is None
+            or self._current.cursor.stream_id != revision.cursor.stream_id
+            or self._current.cursor.seq != revision.base_seq
+            or self._since_keyframe >= STATE_KEYFRAME_INTERVAL
+            or (patch := revision.patch) is None
+        ):
+            self._since_keyframe = 0
+            return revision.keyframe
+        self._since_keyframe += 1
+        return patch
+
+
 class _PreviewClient:
-    def __init__(self, websocket: WebSocket) -> None:
+    def __init__(self, websocket: WebSocket, metrics: ConnectionMetrics) -> None:
         self._websocket = websocket
         self._queue = LatestFrameQueue()
+        self._metrics = metrics
+        metrics.queue_depth = self._queue.__len__
 
     def publish(self, key: PreviewKey, packet: bytes) -> None:
-        self._queue.put(key, packet)
+        if self._queue.put(key, packet):
+            self._metrics.record_drop(key[0])
 
     def clear(self) -> None:
         self._queue.clear()
@@ -56,7 +154,7 @@ class _PreviewClient:
     async def _send(self) -> None:
         while True:
             _key, packet = await self._queue.get()
-            await self._websocket.send_bytes(packet)
+            await _send_frame(self._websocket, self._metrics, packet)
 
     async def _receive(self) -> None:
         while True:
@@ -64,19 +162,57 @@ class _PreviewClient:
                 return
 
 
-class _LogClient:
-    """Bound one live log viewer without ever slowing journal commits."""
+class _LogRing:
+    """The newest log entries, each packed once and shared by every log client, ordered by journal seq."""
 
-    def __init__(self, websocket: WebSocket, *, queue_size: int = 200) -> None:
-        self._websocket = websocket
-        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+    def __init__(self, size: int) -> None:
+        self._frames: deque[tuple[int, bytes]] = deque(maxlen=size)
+
+    def append(self, entry: LogEntry) -> bytes:
+        frame = cast("bytes", pack(entry))
+        self._frames.append((entry.seq, frame))
+        return frame
 
-    def publish(self, entry: LogEntry) -> None:
-        packet = cast("bytes", pack(entry))
+    def since(self, seq: int) -> list[tuple[int, bytes]] | None:
+        """Frames after ``seq``, or ``None`` when entries after ``seq`` may already have aged out."""
+        if not self._frames or self._frames[0][0] > seq + 1:
+            return None
+        start = bisect_right(self._frames, seq, key=itemgetter(0))
+        return list(islice(self._frames, start, None))
+
+
+class _LogClient:
+    """Bound one live log viewer without ever slowing journal commits.
+
+    A client connecting with ``since`` first receives every entry after that seq: from the shared ring
+    when it still holds them, otherwise from the journal until the ring takes over. The same replay
+    refills any entries the live queue dropped while the client was slow.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        ring: _LogRing,
+        journal: "LogJournal",
+        metrics: ConnectionMetrics,
+        *,
+        since: int | None = None,
+        queue_size: int = 200,
+    ) -> None:
+        self._websocket = websocket
+        self._ring = ring
+        self._journal = journal
+        self._since = since
+        self._queue: asyncio.Queue[tuple[int, bytes]] = asyncio.Queue(maxsize=queue_size)
+        self._metrics = metrics
+        metrics.queue_depth = self._queue.qsize
+
+    def publish(self, seq: int, frame: bytes) -> None:
         if self._queue.full():
             with suppress(asyncio.QueueEmpty):
                 self._queue.get_nowait()
-        self._queue.put_nowait(packet)
+                self._metrics.record_drop()
+        self._queue.put_nowait((seq, frame))
 
     async def serve(self) -> None:
         sender = asyncio.create_task(self._send(), name="station-log-send")
@@ -93,8 +229,39 @@ class _LogClient:
             await self._websocket.close()
 
     async def _send(self) -> None:
+        last_seq = await self._replay(self._since) if self._since is not None else None
+        while True:
+            seq, frame = await self._queue.get()
+            if last_seq is not None and seq > last_seq + 1:
+                # The queue dropped entries while this client was slow; refill them before going live again.
+                last_seq = await self._replay(last_seq)
+            if last_seq is None or seq > last_seq:
+                await _send_frame(self._websocket, self._metrics, frame)
+                last_seq = seq
+
+    async def _replay(self, last_seq: int) -> int:
+        """Send entries after ``last_seq`` until the ring has nothing newer; return the last seq sent.
+
+        Entries committed while replay is sending are read back from the ring rather than the live queue,
+        which may already have dropped them.
+        """
         while True:
-            await self._websocket.send_bytes(await self._queue.get())
+            frames = self._ring.since(last_seq)
+            if frames is None:
+                entries = await self._journal.query(after_seq=last_seq, limit=LOG_REPLAY_PAGE_SIZE)
+                if not entries:
+                    return last_seq
+                for entry in entries:
+                    with self._metrics.encoding():
+                        frame = cast("bytes", pack(entry))
+                    await _send_frame(self._websocket, self._metrics, frame)
+                last_seq = entries[-1].seq
+                continue
+            if not frames:
+                return last_seq
+            for seq, frame in frames:
+                await _send_frame(self._websocket, self._metrics, frame)
+                last_seq = seq
 
     async def _receive(self) -> None:
         while True:
@@ -103,13 +270,15 @@ class _LogClient:
 
 
 class Realtime:
-    """Serve complete StationFeed views and latest-only preview packets."""
+    """Serve complete StationFeed views and latest-only preview packets, metering every connection."""
 
     def __init__(self, station: Station) -> None:
         self._station = station
+        self._metrics = RealtimeMetrics()
         self._state_clients: set[WebSocket] = set()
         self._preview_clients: set[_PreviewClient] = set()
         self._log_clients: set[_LogClient] = set()
+        self._log_ring = _LogRing(LOG_RING_SIZE)
         self._preview_identity = self._get_preview_identity(station.state.value)
         self._teardowns: list[Teardown] = [
             station.feed.frames.subscribe(self._publish_preview),
@@ -118,13 +287,20 @@ class Realtime:
         ]
 
     async def serve_state(self, websocket: WebSocket) -> None:
-        """Send one atomic initial StationFeed view followed by every later complete view."""
+        """Send one atomic initial StationFeed view followed by every later complete view.
+
+        With ``?encoding=patch`` the initial view is a keyframe and later views are patches against it.
+        """
         await websocket.accept()
         self._state_clients.add(websocket)
+        metrics = self._metrics.open("state", websocket)
+        client = _StateClient(websocket, metrics, patches=websocket.query_params.get("encoding") == "patch")
+        reason: CloseReason = "disconnected"
         try:
             async with self._station.feed.connect() as connection:
-                sender = asyncio.create_task(self._send_state(websocket, connection), name="station-state-send")
-                receiver = asyncio.create_task(self._receive(websocket), name="station-state-receive")
+                metrics.queue_depth = lambda: connection.pending
+                sender = asyncio.create_task(self._send_state(client, connection), name="station-state-send")
+                receiver = asyncio.create_task(self._receive(websocket, client), name="station-state-receive")
                 done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
                 for task in pending:
                     task.cancel()
@@ -133,9 +309,14 @@ class Realtime:
                     task.result()
         except StationFeedLaggedError:
             log.warning("Disconnecting a lagged station-state WebSocket")
+            reason = "lagged"
         except (RuntimeError, WebSocketDisconnect):
             pass
+        except Exception:
+            reason = "error"
+            raise
         finally:
+            self._metrics.close(metrics, reason)
             self._state_clients.discard(websocket)
             with suppress(Exception):
                 await websocket.close()
@@ -143,34 +324,54 @@ class Realtime:
     async def serve_preview(self, websocket: WebSocket) -> None:
         """Send latest-only opaque Station preview packets until the client disconnects."""
         await websocket.accept()
-        client = _PreviewClient(websocket)
+        metrics = self._metrics.open("preview", websocket)
+        client = _PreviewClient(websocket, metrics)
         self._preview_clients.add(client)
+        reason: CloseReason = "disconnected"
         try:
             await client.serve()
         except (RuntimeError, WebSocketDisconnect):
             pass
+        except Exception:
+            reason = "error"
+            raise
         finally:
+            self._metrics.close(metrics, reason)
             self._preview_clients.discard(client)
             await client.close()
 
-    async def serve_logs(self, websocket: WebSocket) -> None:
-        """Send newly committed log entries without coupling clients to journal writes."""
+    async def serve_logs(self, websocket: WebSocket, *, since: int | None = None) -> None:
+        """Send newly committed log entries without coupling clients to journal writes.
+
+        A reconnecting client passes the last seq it received as ``since`` to resume without a gap.
+        """
         await websocket.accept()
-        client = _LogClient(websocket)
+        metrics = self._metrics.open("logs", websocket)
+        client = _LogClient(websocket, self._log_ring, self._station.records.logs, metrics, since=since)
         self._log_clients.add(client)
+        reason: CloseReason = "disconnected"
         try:
             await client.serve()
         except (RuntimeError, WebSocketDisconnect):
             pass
+        except Exception:
+            reason = "error"
+            raise
         finally:
+            self._metrics.close(metrics, reason)
             self._log_clients.discard(client)
             await client.close()
 
+    def diagnostics(self) -> RealtimeDiagnostics:
+        """Delivery metrics of every open connection and of the most recently closed ones."""
+        return self._metrics.diagnostics()
+
     async def close(self) -> None:
         """Detach Station subscriptions and close every connected WebSocket."""
         for teardown in self._teardowns:
             teardown()
         self._teardowns = []
+        self._metrics.close_all("shutdown")
         state_clients = tuple(self._state_clients)
         self._state_clients.clear()
         preview_clients = tuple(self._preview_clients)
@@ -183,16 +384,13 @@ class Realtime:
             *(client.close() for client in log_clients),
         )
 
-    async def _send_state(self, websocket: WebSocket, connection: StationFeedConnection) -> None:
-        await self._send_view(websocket, connection.initial)
-        async for view in connection:
-            await self._send_view(websocket, view)
-
     @staticmethod
-    async def _send_view(websocket: WebSocket, view: StationFeedView) -> None:
-        await websocket.send_bytes(cast("bytes", pack(view)))
+    async def _send_state(client: _StateClient, connection: StationFeedConnection) -> None:
+        await client.send(connection.initial_revision)
+        async for revision in connection.revisions():
+            await client.send(revision)
 
-    async def _receive(self, websocket: WebSocket) -> None:
+    async def _receive(self, websocket: WebSocket, client: _StateClient) -> None:
         while True:
             message = await websocket.receive()
             if message["type"] == "websocket.disconnect":
@@ -202,15 +400,23 @@ class Realtime:
                 log.warning("Ignoring a non-binary station control message")
                 continue
             try:
-                update = PreviewViewportUpdate.model_validate(unpack(payload))
+                update = _CONTROL_MESSAGE.validate_python(unpack(payload))
             except Exception as error:
-                log.warning("Ignoring an invalid preview viewport message: %s", error)
+                log.warning("Ignoring an invalid preview control message: %s", error)
+                continue
+            if isinstance(update, StateResyncRequest):
+                await client.resync()
                 continue
             try:
                 async with self._station.instrument(update.session_id) as instrument:
-                    instrument.update_viewport(update.viewport)
+                    if isinstance(update, PreviewViewportUpdate):
+                        instrument.update_viewport(update.viewport)
+                    elif update.channels == {}:
+                        instrument.set_preview_composite(instrument.preview_composite_defaults())
+                    else:
+                        instrument.set_preview_composite(update.channels)
             except RuntimeError as error:
-                log.debug("Ignoring a preview viewport update for an unavailable session: %s", error)
+                log.debug("Ignoring a preview control update for an unavailable session: %s", error)
 
     @staticmethod
     async def _close_websocket(websocket: WebSocket) -> None:
@@ -224,8 +430,9 @@ class Realtime:
             client.publish(key, packet)
 
     def _publish_log(self, entry: LogEntry) -> None:
+        frame = self._log_ring.append(entry)
         for client in tuple(self._log_clients):
-            client.publish(entry)
+            client.publish(entry.seq, frame)
 
     def _on_station_state(self, state: StationState) -> None:
         identity = self._get_preview_identity(state)
@@ -242,4 +449,4 @@ class Realtime:
         return state.session.info.id, state.session.instrument.preview_revision
 
 
-__all__ = ["PreviewViewportUpdate", "Realtime"]
+__all__ = ["PreviewCompositeUpdate", "PreviewViewportUpdate", "Realtime", "StateResyncRequest"]
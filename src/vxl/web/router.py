@@ -1,14 +1,17 @@
 """Station-scoped REST and WebSocket routes."""
 
 import datetime
+import json
 from collections.abc import AsyncIterator
 from typing import Annotated, Any
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket
-from pydantic import AnyWebsocketUrl, BaseModel, Field, ValidationError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket
+from pydantic import AnyWebsocketUrl, BaseModel, Field, TypeAdapter, ValidationError
 from vxl_records import (
     AcquisitionManifest,
+    AcquisitionStatus,
+    AcquisitionSummaryPage,
     LogEntry,
     ManifestNotFoundError,
     PresetExistsError,
@@ -38,13 +41,19 @@ from vxl.instrument.config import (
 from vxl.instrument.metadata import discover_metadata_schema, resolve_metadata_class
 from vxl.instrument.traversal import TileOrder
 from vxl.preview.protocol import VOXEL_PREVIEW_FRAMING_VERSION
-from vxl.station import InstrumentTemplates, SessionInfo, Station, StationFeedView
+from vxl.station import InstrumentTemplates, SessionInfo, StateCoalescerDiagnostics, Station, StationFeedView
 from vxl.system import StationInfo
 
+from .binary import MSGPACK_MEDIA_TYPE, MsgpackRoute, accepts_msgpack
+from .cache import ResponseCache
+from .metrics import RealtimeDiagnostics, render_prometheus
+from .realtime import Realtime
+
 station_router = APIRouter(prefix="/stations", tags=["station"])
 instrument_router = APIRouter(
     prefix="/stations/{station_id}/sessions/{session_id}/instrument",
     tags=["instrument"],
+    route_class=MsgpackRoute,
 )
 
 
@@ -56,8 +65,20 @@ def _get_templates(request: Request) -> InstrumentTemplates:
     return request.app.state.instrument_templates
 
 
+def _get_response_cache(request: Request) -> ResponseCache:
+    return request.app.state.response_cache
+
+
+def _get_realtime(request: Request) -> Realtime:
+    return request.app.state.realtime
+
+
 StationDep = Annotated[Station, Depends(_get_station)]
 TemplatesDep = Annotated[InstrumentTemplates, Depends(_get_templates)]
+ResponseCacheDep = Annotated[ResponseCache, Depends(_get_response_cache)]
+RealtimeDep = Annotated[Realtime, Depends(_get_realtime)]
+
+_PRESET_LIST = TypeAdapter(list[PresetRecord])
 
 
 def _get_scoped_station(station_id: UUID, station: StationDep) -> Station:
@@ -187,39 +208,79 @@ async def list_stations(station: StationDep) -> list[StationInfo]:
     return [station.config.info]
 
 
-@station_router.get("/{station_id}/discovery")
+@station_router.get("/{station_id}/discovery", response_model=StationDiscovery)
 async def get_discovery(
     station_id: UUID,
     request: Request,
     station: StationDep,
     templates: TemplatesDep,
-) -> StationDiscovery:
+    cache: ResponseCacheDep,
+) -> Response:
     station = _get_scoped_station(station_id, station)
-    return StationDiscovery(
-        station=station.config.info,
-        instruments=station.discover_instruments(),
-        templates=templates.discover(),
-        colormaps=get_colormap_catalog(),
-        metadata_schemas=discover_metadata_schema(),
-        realtime=RealtimeDiscovery(
-            state_websocket_url=AnyWebsocketUrl(
-                str(request.url_for("station_state_websocket", station_id=str(station_id)))
-            ),
-            preview_websocket_url=AnyWebsocketUrl(
-                str(request.url_for("station_preview_websocket", station_id=str(station_id)))
-            ),
-            log_websocket_url=AnyWebsocketUrl(
-                str(request.url_for("station_logs_websocket", station_id=str(station_id)))
+    key = ("discovery", str(request.base_url), station.instruments_revision, templates.revision)
+    return await cache.respond(request, key, lambda: _render_discovery(station_id, request, station, templates))
+
+
+async def _render_discovery(
+    station_id: UUID,
+    request: Request,
+    station: Station,
+    templates: InstrumentTemplates,
+) -> bytes:
+    return (
+        StationDiscovery(
+            station=station.config.info,
+            instruments=station.discover_instruments(),
+            templates=templates.discover(),
+            colormaps=get_colormap_catalog(),
+            metadata_schemas=discover_metadata_schema(),
+            realtime=RealtimeDiscovery(
+                state_websocket_url=AnyWebsocketUrl(
+                    str(request.url_for("station_state_websocket", station_id=str(station_id)))
+                ),
+                preview_websocket_url=AnyWebsocketUrl(
+                    str(request.url_for("station_preview_websocket", station_id=str(station_id)))
+                ),
+                log_websocket_url=AnyWebsocketUrl(
+                    str(request.url_for("station_logs_websocket", station_id=str(station_id)))
+                ),
+                preview_protocol_version=VOXEL_PREVIEW_FRAMING_VERSION,
             ),
-            preview_protocol_version=VOXEL_PREVIEW_FRAMING_VERSION,
-        ),
+        )
+        .model_dump_json()
+        .encode()
     )
 
 
-@station_router.get("/{station_id}/snapshot")
-async def get_snapshot(station_id: UUID, station: StationDep) -> StationFeedView:
+@station_router.get(
+    "/{station_id}/snapshot",
+    response_model=StationFeedView,
+    responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}}}},
+)
+async def get_snapshot(station_id: UUID, station: StationDep, request: Request) -> Response:
+    station = _get_scoped_station(station_id, station)
+    revision = await station.feed.latest()
+    if accepts_msgpack(request):
+        return Response(content=revision.frame, media_type=MSGPACK_MEDIA_TYPE)
+    return Response(content=revision.json, media_type="application/json")
+
+
+@station_router.get("/{station_id}/diagnostics/state")
+async def get_state_diagnostics(station_id: UUID, station: StationDep) -> StateCoalescerDiagnostics:
     station = _get_scoped_station(station_id, station)
-    return await station.feed.snapshot()
+    return station.state_update_diagnostics()
+
+
+@station_router.get("/{station_id}/diagnostics/realtime")
+async def get_realtime_diagnostics(station_id: UUID, station: StationDep, realtime: RealtimeDep) -> RealtimeDiagnostics:
+    _get_scoped_station(station_id, station)
+    return realtime.diagnostics()
+
+
+@station_router.get("/{station_id}/diagnostics/realtime/metrics", response_class=Response)
+async def get_realtime_metrics(station_id: UUID, station: StationDep, realtime: RealtimeDep) -> Response:
+    _get_scoped_station(station_id, station)
+    return Response(content=render_prometheus(realtime.diagnostics()), media_type="text/plain; version=0.0.4")
 
 
 @station_router.post("/{station_id}/instruments", status_code=201)
@@ -251,24 +312,42 @@ async def archive_state(station_id: UUID, instrument_name: str, station: Station
     return {"archived": archive.name}
 
 
-@station_router.get("/{station_id}/instruments/{instrument_name}/presets")
-async def list_presets(station_id: UUID, instrument_name: str, station: StationDep) -> list[PresetRecord]:
+@station_router.get("/{station_id}/instruments/{instrument_name}/presets", response_model=list[PresetRecord])
+async def list_presets(
+    station_id: UUID,
+    instrument_name: str,
+    request: Request,
+    station: StationDep,
+    cache: ResponseCacheDep,
+) -> Response:
     station = _get_scoped_station(station_id, station)
-    return await station.records.presets.list(instrument_name)
+    presets = station.records.presets
 
+    async def render() -> bytes:
+        return _PRESET_LIST.dump_json(await presets.list(instrument_name))
 
-@station_router.get("/{station_id}/instruments/{instrument_name}/presets/{preset_id}")
+    return await cache.respond(request, ("presets", instrument_name, presets.revision), render)
+
+
+@station_router.get("/{station_id}/instruments/{instrument_name}/presets/{preset_id}", response_model=PresetRecord)
 async def get_preset(
     station_id: UUID,
     instrument_name: str,
     preset_id: UUID,
+    request: Request,
     station: StationDep,
-) -> PresetRecord:
+    cache: ResponseCacheDep,
+) -> Response:
     station = _get_scoped_station(station_id, station)
-    preset = await _get_preset(station, preset_id)
-    if preset.instrument != instrument_name:
-        raise HTTPException(status_code=404, detail=f"preset not found: {preset_id}")
-    return preset
+
+    async def render() -> bytes:
+        preset = await _get_preset(station, preset_id)
+        if preset.instrument != instrument_name:
+            raise HTTPException(status_code=404, detail=f"preset not found: {preset_id}")
+        return preset.model_dump_json().encode()
+
+    key = ("preset", instrument_name, preset_id, station.records.presets.revision)
+    return await cache.respond(request, key, render)
 
 
 @station_router.delete("/{station_id}/instruments/{instrument_name}/presets/{preset_id}", status_code=204)
@@ -308,13 +387,24 @@ async def close_session(station_id: UUID, session_id: UUID, station: StationDep)
         raise HTTPException(status_code=409, detail=str(error)) from error
 
 
-@station_router.get("/{station_id}/metadata/schema")
-async def get_metadata_schema(station_id: UUID, target: str, station: StationDep) -> dict[str, Any]:
+@station_router.get("/{station_id}/metadata/schema", response_model=dict[str, Any])
+async def get_metadata_schema(
+    station_id: UUID,
+    target: str,
+    request: Request,
+    station: StationDep,
+    cache: ResponseCacheDep,
+) -> Response:
     _get_scoped_station(station_id, station)
-    try:
-        return resolve_metadata_class(target).model_json_schema()
-    except (ImportError, AttributeError, TypeError) as error:
-        raise HTTPException(status_code=400, detail=str(error)) from error
+
+    async def render() -> bytes:
+        # Metadata classes are imported once per process, so the target alone identifies the schema.
+        try:
+            return json.dumps(resolve_metadata_class(target).model_json_schema()).encode()
+        except (ImportError, AttributeError, TypeError) as error:
+            raise HTTPException(status_code=400, detail=str(error)) from error
+
+    return await cache.respond(request, ("metadata-schema", target), render)
 
 
 @station_router.get("/{station_id}/acquisitions")
@@ -323,6 +413,27 @@ async def list_acquisitions(station_id: UUID, station: StationDep) -> list[Acqui
     return await station.records.acquisitions.list_manifests()
 
 
+@station_router.get("/{station_id}/acquisitions/summaries")
+async def list_acquisition_summaries(
+    station_id: UUID,
+    station: StationDep,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=1_000)] = 100,
+    status: AcquisitionStatus | None = None,
+    instrument: str | None = None,
+) -> AcquisitionSummaryPage:
+    station = _get_scoped_station(station_id, station)
+    try:
+        return await station.records.acquisitions.list_summaries(
+            cursor=cursor,
+            limit=limit,
+            status=status,
+            instrument=instrument,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+
+
 @station_router.get("/{station_id}/acquisitions/{acquisition_id}")
 async def get_acquisition(station_id: UUID, acquisition_id: UUID, station: StationDep) -> AcquisitionManifest:
     station = _get_scoped_station(station_id, station)
@@ -413,11 +524,15 @@ async def station_preview_websocket(websocket: WebSocket, station_id: UUID) -> N
 
 
 @station_router.websocket("/{station_id}/logs/ws", name="station_logs_websocket")
-async def station_logs_websocket(websocket: WebSocket, station_id: UUID) -> None:
+async def station_logs_websocket(
+    websocket: WebSocket,
+    station_id: UUID,
+    since: Annotated[int | None, Query(ge=0)] = None,
+) -> None:
     if websocket.app.state.station.config.id != station_id:
         await websocket.close(code=1008)
         return
-    await websocket.app.state.realtime.serve_logs(websocket)
+    await websocket.app.state.realtime.serve_logs(websocket, since=since)
 
 
 @instrument_router.post("/profile/active")
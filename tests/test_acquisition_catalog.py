@@ -109,6 +109,7 @@ def _instrument(tmp_path: Path, *, close_error: bool = False) -> tuple[Instrumen
     instrument._active_profile_id = Cell("single_gfp")
     instrument._preview_revision = Cell(0)
     instrument._preview_source_ids = {}
+    instrument._compositor = None
     instrument._accept_preview = False
     instrument._routing_targets = Cell({})
     instrument._mode = Cell(AcquisitionMode.IDLE)
@@ -4,6 +4,8 @@ from typing import Any, cast
 
 import numpy as np
 import pytest
+from rigup.node import TransportAdapter
+from rigup.transport import ZMQTransportClient
 from vxl_records import SQLiteRecords
 from vxlib.reactivity import Cell
 
@@ -736,3 +738,51 @@ async def test_live_split_routing_uses_fov_hysteresis(tmp_path: Path) -> None:
         await wait_for_selector("left")
     finally:
         await instrument.close()
+
+
+async def _open_distributed_hal(monkeypatch: pytest.MonkeyPatch) -> tuple[list[tuple[str, int]], dict[str, Any]]:
+    """Open and close the simulated distributed HAL; return each RPC it sent with its reply size."""
+    sent: list[tuple[str, int]] = []
+    request = ZMQTransportClient.request
+    fetch_interface = TransportAdapter.interface
+
+    async def counting_request(self: ZMQTransportClient, action: str, payload: bytes, **kwargs: Any) -> bytes:
+        reply = await request(self, action, payload, **kwargs)
+        sent.append((action, len(reply)))
+        return reply
+
+    async def counting_interface(self: TransportAdapter) -> DeviceInterface:
+        sent.append(("interface", 0))
+        return await fetch_interface(self)
+
+    config = load_yaml(Path("src/vxl/station/templates/builtins/simulated-distributed.voxel.yaml"), InstrumentConfig)
+    hal = HAL(config.hal)
+    with monkeypatch.context() as patch:
+        patch.setattr(ZMQTransportClient, "request", counting_request)
+        patch.setattr(TransportAdapter, "interface", counting_interface)
+        try:
+            await hal.open()
+            interfaces = {uid: interface.model_dump() for uid, interface in hal.device_interfaces.items()}
+        finally:
+            await hal.close()
+    return sent, interfaces
+
+
+@pytest.mark.slow
+async def test_interface_cache_removes_reconnect_round_trips(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("RIGUP_CACHE_DIR", "")
+    uncached, uncached_interfaces = await _open_distributed_hal(monkeypatch)
+
+    monkeypatch.setenv("RIGUP_CACHE_DIR", str(tmp_path))
+    cold, _ = await _open_distributed_hal(monkeypatch)
+    warm, warm_interfaces = await _open_distributed_hal(monkeypatch)
+
+    def build_bytes(sent: list[tuple[str, int]]) -> int:
+        return sum(size for action, size in sent if action == "build_devices")
+
+    # build replies carry the interfaces, so no open asks for them separately
+    assert not [action for action, _ in uncached + cold + warm if action in ("interface", "get_interface")]
+    assert len(warm) == len(cold) == len(uncached)
+    assert build_bytes(cold) == build_bytes(uncached)
+    assert build_bytes(warm) < build_bytes(cold) / 4  # a warm cache leaves only the hashes in the reply
+    assert warm_interfaces == uncached_interfaces
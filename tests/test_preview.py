@@ -1,12 +1,36 @@
 """Tests for raw overview and viewport generation."""
 
 import asyncio
+import time
 from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any, cast
 
 import numpy as np
+from vxlib.reactivity import Cell
 
-from vxl.preview import LatestFrameQueue, PreviewFrame, PreviewGenerator, PreviewLayer, PreviewViewport
-from vxl.preview.generator import RENDER_CAP
+from vxl._utils.color import resolve_colormap
+from vxl.instrument import Instrument
+from vxl.preview import (
+    COMPOSITE_CHANNEL_ID,
+    LatestFrameQueue,
+    PreviewCompositeChannel,
+    PreviewCompositeFrame,
+    PreviewCompositor,
+    PreviewFrame,
+    PreviewGenerator,
+    PreviewLayer,
+    PreviewViewport,
+)
+from vxl.preview.composite import composite_planes
+from vxl.preview.generator import (
+    RENDER_CAP,
+    VIEWPORT_COARSE_WIDTH,
+    _render_grid,
+    _ViewportGrid,
+    _ViewportRender,
+)
+from vxl.preview.protocol import viewport_rect_px
 
 
 def _frame(w: int = 2000, h: int = 1600) -> np.ndarray:
@@ -48,14 +72,35 @@ async def test_viewport_emitted_when_zoomed() -> None:
     finally:
         gen.close()
 
-    assert len(captured) == 1
-    view = captured[0]
+    coarse, view = captured  # a quick coarse pass, then the refinement
+    assert coarse.header.width <= VIEWPORT_COARSE_WIDTH < view.header.width
+    assert coarse.header.frame_idx == view.header.frame_idx == 1
     assert view.header.layer is PreviewLayer.VIEWPORT
     assert view.header.source_rect_px.width > 1000  # includes overscan beyond the requested half-sensor viewport
     assert view.header.width <= RENDER_CAP
     assert view.decode().shape == (view.header.height, view.header.width)
 
 
+async def test_new_frames_at_an_unchanged_viewport_skip_the_coarse_pass() -> None:
+    captured: list[PreviewFrame] = []
+    viewport = PreviewViewport(x=0.25, y=0.25, w=0.5, h=0.5)
+    gen = _gen(sink=captured.append)
+    try:
+        for idx in range(1, 5):  # a live zoomed stream: each frame's render finishes before the next arrives
+            await gen._schedule_viewport(_frame(), idx, viewport, valid_bits=16, source_stream_id="stream-1")
+        await gen._schedule_viewport(
+            _frame(), 5, PreviewViewport(x=0.3, y=0.25, w=0.5, h=0.5), valid_bits=16, source_stream_id="stream-1"
+        )
+    finally:
+        gen.close()
+
+    widths = [f.header.width for f in captured]
+    assert widths[0] <= VIEWPORT_COARSE_WIDTH
+    assert [f.header.frame_idx for f in captured] == [1, 1, 2, 3, 4, 5, 5]  # a pan gets its coarse pass again
+    assert all(width > VIEWPORT_COARSE_WIDTH for width in widths[1:5])
+    assert widths[5] <= VIEWPORT_COARSE_WIDTH < widths[6]
+
+
 async def test_no_viewport_frame_at_full_viewport() -> None:
     captured: list[PreviewFrame] = []
     gen = _gen(sink=captured.append)
@@ -136,3 +181,227 @@ async def test_reset_stream_changes_capture_identity() -> None:
         gen.close()
 
     assert first.header.source_stream_id != second.header.source_stream_id == source_stream_id
+
+
+async def test_governor_waits_for_an_idle_lane() -> None:
+    gen = _gen()
+    try:
+        busy = asyncio.get_running_loop().create_future()
+        gen._overview_future = busy
+        assert not gen.accepts_frame()
+
+        gen.set_viewport(PreviewViewport(x=0.25, y=0.25, w=0.5, h=0.5))
+        assert gen.accepts_frame()  # an idle viewport lane still wants the frame
+
+        gen.set_viewport(PreviewViewport())
+        waiter = asyncio.create_task(gen.ready())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        busy.set_result(None)
+        await asyncio.wait_for(waiter, 1)
+        assert gen.accepts_frame()
+    finally:
+        gen.close()
+
+
+def _packed_source(
+    pixels: np.ndarray, *, camera_id: str, frame_idx: int = 0, source_stream_id: str = "stream-1"
+) -> bytes:
+    return PreviewFrame.from_source(
+        pixels,
+        camera_id=camera_id,
+        source_stream_id=source_stream_id,
+        layer=PreviewLayer.OVERVIEW,
+        frame_idx=frame_idx,
+        viewport=PreviewViewport(),
+        target_width=pixels.shape[1],
+        valid_bits=12,
+    ).pack()
+
+
+def test_composite_planes_blend_additively_and_resample() -> None:
+    red = resolve_colormap("#ff0000").astype(np.float32) / 255
+    green = resolve_colormap("#00ff00").astype(np.float32) / 255
+    left = np.zeros((4, 8), dtype=np.uint16)
+    left[:, :4] = 4095
+    top = np.zeros((2, 4), dtype=np.uint16)  # half resolution; resampled onto 4x8
+    top[0, :] = 1000
+
+    planes = composite_planes([(left, red, 0, 4095), (top, green, 0, 1000)], shape=(4, 8), depth=8)
+
+    assert planes.dtype == np.uint8
+    assert planes.shape == (3, 4, 8)
+    assert tuple(planes[:, 0, 0]) == (255, 255, 0)  # both channels saturate: yellow
+    assert tuple(planes[:, 0, 7]) == (0, 255, 0)
+    assert tuple(planes[:, 3, 0]) == (255, 0, 0)
+    assert tuple(planes[:, 3, 7]) == (0, 0, 0)
+
+    deep = composite_planes([(left, red, 0, 4095)], shape=(4, 8), depth=16)
+    assert deep.dtype == np.uint16
+    assert int(deep[0, 0, 0]) == 65535
+
+
+async def test_compositor_publishes_one_layer_for_all_channels() -> None:
+    emitted: list[tuple[str, PreviewLayer, bytes]] = []
+
+    async def sink(emission: tuple[str, PreviewLayer, bytes]) -> None:
+        emitted.append(emission)
+
+    channels = {
+        "488": PreviewCompositeChannel(colormap="#00ff00", high=2000),
+        "561": PreviewCompositeChannel(colormap="#ff0000"),
+        "off": PreviewCompositeChannel(colormap="#0000ff", visible=False),
+    }
+    compositor = PreviewCompositor(sink, channels)
+    try:
+        bright = np.full((30, 40), 2000, dtype=np.uint16)
+        compositor.submit(("488", PreviewLayer.OVERVIEW, _packed_source(bright, camera_id="cam-a")))
+        compositor.submit(
+            ("561", PreviewLayer.OVERVIEW, _packed_source(np.zeros((60, 80), np.uint16), camera_id="cam-b"))
+        )
+        compositor.submit(("off", PreviewLayer.OVERVIEW, _packed_source(bright, camera_id="cam-c")))
+        assert not compositor.submit(("unknown", PreviewLayer.OVERVIEW, _packed_source(bright, camera_id="cam-d")))
+        await asyncio.wait_for(compositor._tasks[PreviewLayer.OVERVIEW], 10)
+    finally:
+        compositor.close()
+
+    channel_id, layer, packed = emitted[-1]
+    assert channel_id == COMPOSITE_CHANNEL_ID
+    assert layer is PreviewLayer.OVERVIEW
+    frame = PreviewCompositeFrame.from_packed(packed)
+    assert frame.header.channels == ("488", "561")
+    assert frame.header.reference_channel == "488"
+    assert (frame.header.width, frame.header.height) == (40, 30)
+    rgb = frame.decode()
+    assert rgb.shape == (30, 40, 3)
+    assert (rgb == np.array([0, 255, 0], dtype=np.uint8)).all()
+
+
+class _PreviewCamera:
+    def __init__(self, uid: str) -> None:
+        self.uid = uid
+
+    async def reset_preview_stream(self) -> str:
+        return f"{self.uid}-stream"
+
+
+def _compositing_instrument(emitted: list[tuple[str, PreviewLayer, bytes]]) -> Any:
+    instrument = cast("Any", object.__new__(Instrument))
+    profiles = {"green": SimpleNamespace(channels=["488"]), "red": SimpleNamespace(channels=["561"])}
+    configs = {
+        "488": SimpleNamespace(colormap="#00ff00", detection="cam-a"),
+        "561": SimpleNamespace(colormap="#ff0000", detection="cam-b"),
+    }
+    instrument._store = SimpleNamespace(
+        value=SimpleNamespace(imaging=SimpleNamespace(profiles=profiles, channels=configs))
+    )
+    instrument._channels = {ch: SimpleNamespace(camera=_PreviewCamera(c.detection)) for ch, c in configs.items()}
+    instrument._active_profile_id = Cell("green")
+    instrument._preview_revision = Cell(0)
+    instrument._preview_source_ids = {}
+    instrument._accept_preview = False
+    instrument._compositor = None
+
+    async def emit(emission: tuple[str, PreviewLayer, bytes]) -> None:
+        emitted.append(emission)
+
+    instrument._preview = SimpleNamespace(emit=emit)
+    return instrument
+
+
+async def test_profile_switch_recomposes_the_new_active_channels() -> None:
+    emitted: list[tuple[str, PreviewLayer, bytes]] = []
+    instrument = _compositing_instrument(emitted)
+    instrument.set_preview_composite({"488": PreviewCompositeChannel(colormap="#00ffff", high=2000)})
+    try:
+        await instrument._reset_preview()
+        await instrument._active_profile_id.set("red")
+        await instrument._reset_preview()
+        assert instrument._compositor.channels == {"561": PreviewCompositeChannel(colormap="#ff0000")}
+
+        bright = np.full((30, 40), 2000, dtype=np.uint16)
+        frame = _packed_source(bright, camera_id="cam-b", source_stream_id="cam-b-stream")
+        await instrument._emit_preview_frame("cam-b", PreviewLayer.OVERVIEW, frame)
+        await asyncio.wait_for(instrument._compositor._tasks[PreviewLayer.OVERVIEW], 10)
+
+        await instrument._active_profile_id.set("green")
+        await instrument._reset_preview()
+        assert instrument._compositor.channels == {"488": PreviewCompositeChannel(colormap="#00ff00")}
+        instrument._compositor.configure({"488": PreviewCompositeChannel(colormap="#00ffff", high=2000)})
+        await instrument._reset_preview()  # e.g. preview restarts: the user's settings for a kept channel stay
+        assert instrument._compositor.channels == {"488": PreviewCompositeChannel(colormap="#00ffff", high=2000)}
+    finally:
+        instrument.set_preview_composite(None)
+
+    assert [(channel_id, layer) for channel_id, layer, _ in emitted] == [(COMPOSITE_CHANNEL_ID, PreviewLayer.OVERVIEW)]
+    assert PreviewCompositeFrame.from_packed(emitted[0][2]).header.channels == ("561",)
+
+
+async def test_channels_outside_the_composite_are_published_separately() -> None:
+    emitted: list[tuple[str, PreviewLayer, bytes]] = []
+    instrument = _compositing_instrument(emitted)
+    await instrument._reset_preview()
+    instrument.set_preview_composite({"561": PreviewCompositeChannel(colormap="#ff0000")})
+    try:
+        frame = _packed_source(np.zeros((30, 40), np.uint16), camera_id="cam-a", source_stream_id="cam-a-stream")
+        await instrument._emit_preview_frame("cam-a", PreviewLayer.OVERVIEW, frame)
+    finally:
+        instrument.set_preview_composite(None)
+
+    assert emitted == [("488", PreviewLayer.OVERVIEW, frame)]
+
+
+def test_viewport_grid_reuses_overlap_exactly() -> None:
+    frame = _frame(w=3000, h=2000)
+    before = viewport_rect_px(PreviewViewport(x=0.1, y=0.2, w=0.8, h=0.7), sensor_width=3000, sensor_height=2000)
+    after = viewport_rect_px(PreviewViewport(x=0.15, y=0.17, w=0.8, h=0.7), sensor_width=3000, sensor_height=2000)
+    first = _ViewportGrid.covering(before, target_width=RENDER_CAP, sensor_width=3000, sensor_height=2000)
+    second = _ViewportGrid.covering(after, target_width=RENDER_CAP, sensor_width=3000, sensor_height=2000)
+    assert first.step == second.step > 1
+
+    previous = _ViewportRender("stream-1", 1, first, _render_grid(frame, first, None))
+    assert np.array_equal(_render_grid(frame, second, previous), _render_grid(frame, second, None))
+
+
+async def test_rapid_viewport_updates_reach_first_pixel_before_a_full_render() -> None:
+    frame = _frame(w=6000, h=4000)
+    captured: list[tuple[float, PreviewFrame]] = []
+    gen = _gen(sink=lambda f: captured.append((time.perf_counter(), f)))
+    try:
+        gen.submit_frame(frame, 1)
+        assert gen._overview_future is not None
+        await gen._overview_future
+        captured.clear()
+
+        # Simulates a drag: a PreviewViewportUpdate every 5 ms while the camera is idle.
+        started = time.perf_counter()
+        for step in range(40):
+            gen.set_viewport(PreviewViewport(x=0.1 + step * 0.002, y=0.1, w=0.6, h=0.6), regenerate=True)
+            await asyncio.sleep(0.005)
+        drag_ended = time.perf_counter()
+        assert gen._viewport_task is not None
+        await gen._viewport_task
+    finally:
+        gen.close()
+
+    full_started = time.perf_counter()
+    PreviewFrame.from_source(
+        frame,
+        camera_id="camera",
+        source_stream_id="stream-1",
+        layer=PreviewLayer.VIEWPORT,
+        frame_idx=1,
+        viewport=PreviewViewport(x=0.1, y=0.1, w=0.6, h=0.6).expanded(0.05),
+        target_width=RENDER_CAP,
+        valid_bits=16,
+    )
+    full_render_s = time.perf_counter() - full_started
+
+    viewports = [(at, f) for at, f in captured if f.header.layer is PreviewLayer.VIEWPORT]
+    first_pixel_s = viewports[0][0] - started
+    assert first_pixel_s < full_render_s
+    assert sum(at <= drag_ended for at, _ in viewports) >= 5  # panning never starves the viewport
+    final = viewports[-1][1].header
+    assert final.width > VIEWPORT_COARSE_WIDTH
+    assert final.source_rect_px.x <= int((0.1 + 39 * 0.002) * 6000)
@@ -1,38 +1,55 @@
 """Golden and validation tests for the raw preview wire protocol."""
 
+import tracemalloc
 from copy import deepcopy
+from typing import cast
 
 import msgpack
 import numpy as np
 import pytest
+from pydantic import ValidationError
 
 from vxl.preview.protocol import (
+    COMPOSITE_MAGIC,
     DELIVERY_MAGIC,
     DELIVERY_PREFIX,
     SOURCE_FRAMING_VERSION,
     SOURCE_MAGIC,
     SOURCE_PREFIX,
+    TILE_DELTA_MAGIC,
     VOXEL_PREVIEW_FRAMING_VERSION,
+    PreviewCompositeFrame,
     PreviewFrame,
     PreviewLayer,
     PreviewSourceHeader,
+    PreviewSourceView,
+    PreviewTileDecoder,
+    PreviewTileDelta,
+    PreviewTileEncoder,
     PreviewViewport,
     SourceRectPx,
     StreamCursor,
     ValidBits,
     VoxelPreviewPacket,
+    VoxelPreviewView,
     byte_shuffle_u16,
     byte_unshuffle_u16,
 )
 
 
-def _source_frame(frame: np.ndarray, *, valid_bits: ValidBits = 16) -> PreviewFrame:
+def _source_frame(
+    frame: np.ndarray,
+    *,
+    valid_bits: ValidBits = 16,
+    frame_idx: int = 7,
+    source_stream_id: str = "stream-1",
+) -> PreviewFrame:
     return PreviewFrame.from_source(
         frame,
         camera_id="camera-1",
-        source_stream_id="stream-1",
+        source_stream_id=source_stream_id,
         layer=PreviewLayer.OVERVIEW,
-        frame_idx=7,
+        frame_idx=frame_idx,
         viewport=PreviewViewport(),
         target_width=frame.shape[1],
         valid_bits=valid_bits,
@@ -115,6 +132,187 @@ def test_delivery_packet_wraps_frame_without_modifying_it() -> None:
     assert PreviewFrame.from_packed(parsed.frame).header.camera_id == "camera-1"
 
 
+def _wrap(frame: bytes) -> VoxelPreviewPacket:
+    return VoxelPreviewPacket.wrap(
+        frame,
+        channel_id="channel-1",
+        seq=9,
+        state_cursor=StreamCursor(stream_id="state-1", seq=17),
+        stamped_at_unix_us=1_234_567,
+    )
+
+
+def test_delivery_segments_borrow_the_source_frame() -> None:
+    frame = _source_frame(np.arange(12, dtype=np.uint16).reshape(3, 4)).pack()
+    delivery = _wrap(frame)
+
+    header, body = delivery.segments()
+
+    assert body.obj is frame
+    assert bytes(header) + bytes(body) == delivery.pack()
+    assert VoxelPreviewPacket.from_packed(memoryview(delivery.pack())).frame == frame
+
+
+def test_scatter_gather_framing_allocates_only_the_header() -> None:
+    rng = np.random.default_rng(0)
+    source = _source_frame(rng.integers(0, 1 << 16, size=(512, 512), dtype=np.uint16))
+    frame = source.pack()
+    delivery = _wrap(frame)
+
+    def peak_bytes_per_frame(serialize: object) -> int:
+        assert callable(serialize)
+        serialize()  # warm pydantic/msgpack caches outside the measurement
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            result = serialize()
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        del result
+        return peak
+
+    packed_peak = peak_bytes_per_frame(delivery.pack)
+    segments_peak = peak_bytes_per_frame(delivery.segments)
+    source_peak = peak_bytes_per_frame(source.segments)
+
+    assert packed_peak >= len(frame)
+    assert segments_peak < 16 * 1024 < len(frame)
+    assert source_peak < 16 * 1024 < len(source.payload)
+
+
+def test_source_view_defers_header_validation() -> None:
+    frame = _source_frame(np.arange(12, dtype=np.uint16).reshape(3, 4)).pack()
+    _magic, _version, header_length = SOURCE_PREFIX.unpack_from(frame)
+    fields = msgpack.unpackb(frame[SOURCE_PREFIX.size : SOURCE_PREFIX.size + header_length], raw=False)
+    fields["width"] = 0
+    header = cast("bytes", msgpack.packb(fields, use_bin_type=True))
+    invalid = SOURCE_PREFIX.pack(SOURCE_MAGIC, SOURCE_FRAMING_VERSION, len(header)) + header + frame[-8:]
+
+    view = PreviewSourceView(invalid)
+
+    assert view.camera_id == "camera-1"
+    assert view.source_stream_id == "stream-1"
+    assert view.payload == frame[-8:]
+    with pytest.raises(ValidationError):
+        _ = view.header
+    assert PreviewSourceView(frame).header == PreviewFrame.from_packed(frame).header
+
+
+def test_delivery_view_exposes_routing_fields_and_source() -> None:
+    frame = _source_frame(np.arange(12, dtype=np.uint16).reshape(3, 4)).pack()
+    view = VoxelPreviewView(_wrap(frame).pack())
+
+    assert (view.channel_id, view.seq) == ("channel-1", 9)
+    assert view.frame == frame
+    assert view.source().camera_id == "camera-1"
+    assert view.header.state_cursor == StreamCursor(stream_id="state-1", seq=17)
+
+
+def _scene(height: int = 150, width: int = 200) -> np.ndarray:
+    return np.random.default_rng(1).integers(0, 4096, size=(height, width), dtype=np.uint16)
+
+
+def test_tile_delta_round_trip_ships_only_changed_tiles() -> None:
+    encoder = PreviewTileEncoder()
+    decoder = PreviewTileDecoder()
+    first = _scene()
+    keyframe = encoder.encode(_source_frame(first, frame_idx=1))
+    assert keyframe[:4] == SOURCE_MAGIC
+    header, pixels = decoder.decode(keyframe)
+    assert np.array_equal(pixels, first)
+    assert encoder.acknowledge(header.frame_idx)
+
+    second = first.copy()
+    second[70, 10] += 1  # tile (1, 0)
+    second[149, 199] += 1  # clipped corner tile (2, 3)
+    full = _source_frame(second, frame_idx=2)
+    delta = encoder.encode(full)
+
+    assert delta[:4] == TILE_DELTA_MAGIC
+    assert len(delta) < len(full.pack())
+    assert PreviewTileDelta.from_packed(delta).header.tiles == (4, 11)
+    header, pixels = decoder.decode(delta)
+    assert header == full.header
+    assert np.array_equal(pixels, second)
+
+
+def test_tile_delta_survives_delivery_wrapping_and_in_flight_acknowledgements() -> None:
+    encoder = PreviewTileEncoder()
+    decoder = PreviewTileDecoder()
+    frames = [_scene()]
+    for _ in range(3):
+        frames.append(frames[-1].copy())
+        frames[-1][5, 5] += 1
+    decoder.decode(_wrap(encoder.encode(_source_frame(frames[0], frame_idx=0))).frame)
+    encoder.acknowledge(0)
+
+    # Frames 1-3 are all diffed against frame 0 because their acknowledgements have not arrived yet.
+    for idx, frame in enumerate(frames[1:], start=1):
+        packet = VoxelPreviewPacket.from_packed(_wrap(encoder.encode(_source_frame(frame, frame_idx=idx))).pack())
+        assert PreviewTileDelta.from_packed(packet.frame).header.base_frame_idx == 0
+        assert np.array_equal(decoder.decode(packet.frame)[1], frame)
+
+
+def test_tile_encoder_falls_back_to_keyframes() -> None:
+    encoder = PreviewTileEncoder(max_changed_fraction=0.25)
+    first = _scene()
+    encoder.encode(_source_frame(first, frame_idx=1))
+    assert encoder.encode(_source_frame(first, frame_idx=2))[:4] == SOURCE_MAGIC  # nothing acknowledged yet
+
+    encoder.acknowledge(2)
+    assert encoder.encode(_source_frame(first, frame_idx=3, source_stream_id="stream-2"))[:4] == SOURCE_MAGIC
+    assert encoder.encode(_source_frame(_scene(), frame_idx=4))[:4] == TILE_DELTA_MAGIC
+    noisy = np.random.default_rng(2).integers(0, 4096, size=first.shape, dtype=np.uint16)
+    assert encoder.encode(_source_frame(noisy, frame_idx=5))[:4] == SOURCE_MAGIC
+
+    encoder.reset()
+    assert not encoder.acknowledge(4)
+
+
+def test_unchanged_frame_encodes_an_empty_delta() -> None:
+    encoder = PreviewTileEncoder()
+    decoder = PreviewTileDecoder()
+    scene = _scene()
+    decoder.decode(encoder.encode(_source_frame(scene, frame_idx=1)))
+    encoder.acknowledge(1)
+
+    delta = PreviewTileDelta.from_packed(encoder.encode(_source_frame(scene, frame_idx=2)))
+
+    assert delta.header.tiles == ()
+    assert delta.payload == b""
+    assert np.array_equal(decoder.decode(delta.pack())[1], scene)
+
+
+def test_tolerance_compares_against_what_the_client_holds() -> None:
+    encoder = PreviewTileEncoder(tolerance=2)
+    decoder = PreviewTileDecoder()
+    base = _scene(64, 64)
+    decoder.decode(encoder.encode(_source_frame(base, frame_idx=0)))
+    encoder.acknowledge(0)
+
+    drift = base.copy()
+    for idx in range(1, 6):
+        drift = drift + 1  # one count per frame: within tolerance each step, not cumulatively
+        header, pixels = decoder.decode(encoder.encode(_source_frame(drift, frame_idx=idx)))
+        encoder.acknowledge(header.frame_idx)
+        assert np.abs(pixels.astype(np.int32) - drift).max() <= 2
+
+
+def test_tile_delta_requires_its_base_frame() -> None:
+    encoder = PreviewTileEncoder()
+    scene = _scene()
+    encoder.encode(_source_frame(scene, frame_idx=1))
+    encoder.acknowledge(1)
+    delta = encoder.encode(_source_frame(scene, frame_idx=2))
+
+    with pytest.raises(ValueError, match="base frame 1"):
+        PreviewTileDecoder().decode(delta)
+    with pytest.raises(ValueError, match="magic"):
+        PreviewTileDelta.from_packed(b"NOPE" + delta[4:])
+
+
 @pytest.mark.parametrize(
     ("frame", "valid_bits", "error"),
     [
@@ -164,3 +362,29 @@ def test_source_rect_must_fit_sensor() -> None:
             valid_bits=16,
             uncompressed_byte_length=24,
         )
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_composite_frame_round_trips_planar_rgb(dtype: type[np.integer]) -> None:
+    reference = _source_frame(np.zeros((6, 10), dtype=np.uint16)).header
+    planes = np.random.default_rng(3).integers(0, np.iinfo(dtype).max, size=(3, 6, 10), dtype=dtype)
+    frame = PreviewCompositeFrame.from_planes(
+        planes,
+        layer=PreviewLayer.OVERVIEW,
+        frame_idx=4,
+        channels=("488", "561"),
+        reference=reference,
+        reference_channel="488",
+    )
+    packed = frame.pack()
+    assert packed[:4] == COMPOSITE_MAGIC
+
+    decoded = PreviewCompositeFrame.from_packed(packed)
+    assert decoded.header == frame.header
+    assert decoded.header.depth == np.dtype(dtype).itemsize * 8
+    assert np.array_equal(decoded.decode(), planes.transpose(1, 2, 0))
+
+    wrapped = VoxelPreviewView(_wrap(packed).pack())
+    assert bytes(wrapped.frame) == packed
+    with pytest.raises(ValueError, match="magic"):
+        PreviewCompositeFrame.from_packed(_source_frame(np.zeros((6, 10), dtype=np.uint16)).pack())
@@ -0,0 +1,359 @@
+"""Tests for the Realtime WebSocket delivery modes and per-connection metrics."""
+
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.datastructures import Address
+from vxl_records import SQLiteRecords
+from vxlib.reactivity import Cell, Emitter
+
+from vxl.preview.protocol import PreviewLayer
+from vxl.station import StationFeed, StationState, StationStatus
+from vxl.station.patch import apply_patch
+from vxl.system import StationInfo
+from vxl.web import realtime as realtime_module
+from vxl.web.metrics import SEND_LATENCY_BUCKETS_S
+from vxl.web.realtime import Realtime
+from vxl.web.router import _get_realtime, _get_station, station_router
+
+if TYPE_CHECKING:
+    from fastapi import WebSocket
+
+STATION = StationInfo(id=UUID("12345678-1234-5678-1234-567812345678"), name="scope")
+
+
+class StubWebSocket:
+    """Record sent packets and replay queued client messages."""
+
+    def __init__(self, query: dict[str, str] | None = None) -> None:
+        self.query_params = query or {}
+        self.client = Address("127.0.0.1", 50123)
+        self.sent: asyncio.Queue[bytes] = asyncio.Queue()
+        self._incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.sent.put(data)
+
+    async def receive(self) -> dict[str, Any]:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        pass
+
+    def send_control(self, message: dict[str, Any]) -> None:
+        self._incoming.put_nowait({"type": "websocket.receive", "bytes": msgpack.packb(message)})
+
+    def disconnect(self) -> None:
+        self._incoming.put_nowait({"type": "websocket.disconnect"})
+
+    async def next(self) -> dict[str, Any]:
+        return msgpack.unpackb(await asyncio.wait_for(self.sent.get(), timeout=1))
+
+
+class GatedWebSocket(StubWebSocket):
+    """A consumer whose sends stall until :attr:`gate` is set, like a client on a congested link."""
+
+    def __init__(self, query: dict[str, str] | None = None) -> None:
+        super().__init__(query)
+        self.gate = asyncio.Event()
+        self.sending = asyncio.Event()
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sending.set()
+        await self.gate.wait()
+        await super().send_bytes(data)
+
+
+def _station(records: object | None = None) -> tuple[Any, Cell[StationState]]:
+    state = Cell(StationState())
+    station = SimpleNamespace(
+        config=SimpleNamespace(id=STATION.id),
+        feed=StationFeed(STATION, state),
+        state=state,
+        records=records or SimpleNamespace(logs=Emitter()),
+    )
+    return station, state
+
+
+def _realtime() -> tuple[Realtime, Cell[StationState]]:
+    station, state = _station()
+    return Realtime(station), state
+
+
+async def test_patch_mode_sends_a_keyframe_then_chained_patches_and_resyncs_on_request() -> None:
+    realtime, state = _realtime()
+    websocket = StubWebSocket({"encoding": "patch"})
+    serving = asyncio.create_task(realtime.serve_state(cast("WebSocket", websocket)))
+
+    keyframe = await websocket.next()
+    assert keyframe["kind"] == "keyframe"
+    document = keyframe["view"]
+
+    await state.set(StationState(status=StationStatus.OPENING))
+    await state.set(StationState(status=StationStatus.IDLE))
+    for _ in range(2):
+        patch = await websocket.next()
+        assert patch["kind"] == "patch"
+        assert patch["stream_id"] == document["cursor"]["stream_id"]
+        assert patch["base_seq"] == document["cursor"]["seq"]
+        document = apply_patch(document, patch["ops"])
+        assert document["cursor"]["seq"] == patch["seq"]
+    assert document["status"] == StationStatus.IDLE
+
+    websocket.send_control({"action": "state.resync"})
+    resync = await websocket.next()
+    assert resync == {"kind": "keyframe", "view": document}
+
+    websocket.disconnect()
+    await asyncio.wait_for(serving, timeout=1)
+    await realtime.close()
+
+
+async def test_full_mode_sends_every_complete_view() -> None:
+    realtime, state = _realtime()
+    websocket = StubWebSocket()
+    serving = asyncio.create_task(realtime.serve_state(cast("WebSocket", websocket)))
+
+    initial = await websocket.next()
+    await state.set(StationState(status=StationStatus.OPENING))
+    update = await websocket.next()
+
+    assert "kind" not in initial
+    assert update["status"] == StationStatus.OPENING
+    assert update["cursor"]["seq"] == initial["cursor"]["seq"] + 1
+
+    websocket.disconnect()
+    await asyncio.wait_for(serving, timeout=1)
+    await realtime.close()
+
+
+async def test_fifty_clients_share_one_encoded_frame_per_revision() -> None:
+    realtime, state = _realtime()
+    websockets = [StubWebSocket({"encoding": "patch"} if i % 2 else None) for i in range(50)]
+    serving = [asyncio.create_task(realtime.serve_state(cast("WebSocket", ws))) for ws in websockets]
+    initial = [await asyncio.wait_for(ws.sent.get(), timeout=1) for ws in websockets]
+
+    statuses = [StationStatus.OPENING, StationStatus.IDLE] * 10
+    for status in statuses:
+        await state.set(StationState(status=status))
+    received = [[await asyncio.wait_for(ws.sent.get(), timeout=1) for _ in statuses] for ws in websockets]
+
+    # Every connection in a mode sends the very same bytes object, so each revision is encoded once per mode.
+    for mode in (0, 1):
+        clients = range(mode, 50, 2)
+        assert len({id(initial[i]) for i in clients}) == 1
+        for update in range(len(statuses)):
+            assert len({id(received[i][update]) for i in clients}) == 1
+    assert msgpack.unpackb(received[0][-1])["status"] == StationStatus.IDLE
+    assert msgpack.unpackb(received[1][-1])["kind"] == "patch"
+
+    for ws in websockets:
+        ws.disconnect()
+    await asyncio.wait_for(asyncio.gather(*serving), timeout=1)
+    await realtime.close()
+
+
+def test_snapshot_reuses_the_latest_revision_frames() -> None:
+    station, _ = _station()
+    app = FastAPI()
+    app.include_router(station_router)
+    app.dependency_overrides[_get_station] = lambda: station
+    revision = station.feed._revision
+
+    with TestClient(app) as client:
+        as_json = client.get(f"/stations/{STATION.id}/snapshot")
+        as_msgpack = client.get(f"/stations/{STATION.id}/snapshot", headers={"accept": "application/msgpack"})
+
+    assert as_json.headers["content-type"] == "application/json"
+    assert as_json.content == revision.json
+    assert as_json.json()["cursor"] == {"stream_id": revision.cursor.stream_id, "seq": 0}
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert as_msgpack.content == revision.frame
+
+
+async def _append_logs(records: SQLiteRecords, count: int) -> None:
+    for index in range(count):
+        await records.logs.append(emitted_at=datetime.now(UTC), level=20, logger="test", message=f"entry {index}")
+
+
+@pytest.mark.parametrize(("since", "replayed"), [(4, [5, 6]), (1, [2, 3, 4, 5, 6])])
+async def test_log_reconnect_resumes_after_since_from_the_ring_or_the_journal(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, since: int, replayed: list[int]
+) -> None:
+    monkeypatch.setattr(realtime_module, "LOG_RING_SIZE", 4)
+    records = SQLiteRecords(tmp_path / "records.sqlite3", resolve_root=lambda spec: tmp_path / spec.path.as_posix())
+    station, _ = _station(records)
+    realtime = Realtime(station)
+    await _append_logs(records, 6)  # the ring now holds seqs 3-6
+
+    resumed, live = StubWebSocket(), StubWebSocket()
+    serving = [
+        asyncio.create_task(realtime.serve_logs(cast("WebSocket", resumed), since=since)),
+        asyncio.create_task(realtime.serve_logs(cast("WebSocket", live))),
+    ]
+    received = [(await resumed.next())["seq"] for _ in replayed]
+    await _append_logs(records, 1)
+
+    assert received == replayed
+    assert (await resumed.next())["seq"] == 7
+    assert (await live.next())["seq"] == 7
+    assert resumed.sent.empty()
+    assert live.sent.empty()
+
+    for websocket in (resumed, live):
+        websocket.disconnect()
+    await asyncio.wait_for(asyncio.gather(*serving), timeout=1)
+    await realtime.close()
+
+
+@pytest.mark.parametrize("since", [None, 0])
+async def test_slow_log_client_refills_entries_its_queue_dropped(tmp_path: Path, since: int | None) -> None:
+    records = SQLiteRecords(tmp_path / "records.sqlite3", resolve_root=lambda spec: tmp_path / spec.path.as_posix())
+    station, _ = _station(records)
+    realtime = Realtime(station)
+    if since is not None:
+        await _append_logs(records, 1)
+    websocket = GatedWebSocket()
+    serving = asyncio.create_task(realtime.serve_logs(cast("WebSocket", websocket), since=since))
+    await asyncio.sleep(0)
+
+    if since is None:
+        await _append_logs(records, 1)
+    await asyncio.wait_for(websocket.sending.wait(), timeout=1)  # stuck on seq 1, live or replayed
+    await _append_logs(records, 249)  # overflows the 200-entry live queue
+    websocket.gate.set()
+    received = [(await websocket.next())["seq"] for _ in range(250)]
+
+    assert received == list(range(1, 251))
+    assert websocket.sent.empty()
+
+    websocket.disconnect()
+    await asyncio.wait_for(serving, timeout=1)
+    await realtime.close()
+
+
+async def test_live_log_entries_are_packed_once_for_every_client(tmp_path: Path) -> None:
+    records = SQLiteRecords(tmp_path / "records.sqlite3", resolve_root=lambda spec: tmp_path / spec.path.as_posix())
+    station, _ = _station(records)
+    realtime = Realtime(station)
+    websockets = [StubWebSocket() for _ in range(5)]
+    serving = [asyncio.create_task(realtime.serve_logs(cast("WebSocket", ws))) for ws in websockets]
+    await asyncio.sleep(0)
+
+    await _append_logs(records, 3)
+    frames = [[await asyncio.wait_for(ws.sent.get(), timeout=1) for _ in range(3)] for ws in websockets]
+
+    for index in range(3):
+        assert len({id(client[index]) for client in frames}) == 1
+
+    for ws in websockets:
+        ws.disconnect()
+    await asyncio.wait_for(asyncio.gather(*serving), timeout=1)
+    await realtime.close()
+
+
+async def test_slow_preview_client_reports_queue_depth_and_drops_per_channel() -> None:
+    realtime, _ = _realtime()
+    websocket = GatedWebSocket()
+    serving = asyncio.create_task(realtime.serve_preview(cast("WebSocket", websocket)))
+    await asyncio.sleep(0)
+
+    realtime._publish_preview(("ch0", PreviewLayer.VIEWPORT, b"first"))
+    await asyncio.wait_for(websocket.sending.wait(), timeout=1)  # the sender is now stuck on "first"
+    for channel, packet in [("ch0", b"a"), ("ch0", b"bb"), ("ch1", b"c"), ("ch0", b"ddd"), ("ch1", b"ee")]:
+        realtime._publish_preview((channel, PreviewLayer.VIEWPORT, packet))
+
+    (stalled,) = realtime.diagnostics().connections
+    assert stalled.stream == "preview"
+    assert stalled.client == "127.0.0.1:50123"
+    assert stalled.queue_depth == 2
+    assert stalled.dropped == 3
+    assert stalled.dropped_by_channel == {"ch0": 2, "ch1": 1}
+    assert stalled.sent_frames == 0
+
+    websocket.gate.set()
+    delivered = [await asyncio.wait_for(websocket.sent.get(), timeout=1) for _ in range(3)]
+    assert delivered == [b"first", b"ddd", b"ee"]
+    (drained,) = realtime.diagnostics().connections
+    assert drained.queue_depth == 0
+    assert drained.sent_frames == drained.send_latency.count == 3
+    assert drained.sent_bytes == 10
+    assert drained.bytes_per_s > 0
+    assert drained.send_latency.cumulative_counts[-1] == 3
+    assert len(drained.send_latency.cumulative_counts) == len(SEND_LATENCY_BUCKETS_S) + 1
+
+    websocket.disconnect()
+    await asyncio.wait_for(serving, timeout=1)
+    diagnostics = realtime.diagnostics()
+    assert diagnostics.connections == []
+    assert diagnostics.recently_closed[0].id == stalled.id
+    assert diagnostics.recently_closed[0].closed == "disconnected"
+    await realtime.close()
+
+
+async def test_lagged_state_client_is_recorded_as_a_lag_disconnect() -> None:
+    station, state = _station()
+    station.feed = StationFeed(STATION, state, update_buffer_size=2)
+    realtime = Realtime(station)
+    websocket = GatedWebSocket({"encoding": "patch"})
+    serving = asyncio.create_task(realtime.serve_state(cast("WebSocket", websocket)))
+    await asyncio.wait_for(websocket.sending.wait(), timeout=1)
+
+    await state.set(StationState(status=StationStatus.OPENING))
+    await state.set(StationState(status=StationStatus.IDLE))
+    (connection,) = realtime.diagnostics().connections
+    assert connection.queue_depth == 2
+    assert connection.encode_s > 0
+
+    await state.set(StationState(status=StationStatus.OPENING))  # overflows the two-revision buffer
+    websocket.gate.set()
+    await asyncio.wait_for(serving, timeout=1)
+
+    diagnostics = realtime.diagnostics()
+    (closed,) = diagnostics.recently_closed
+    assert closed.closed == "lagged"
+    assert closed.sent_frames == 1
+    assert diagnostics.lagged_disconnects == {"state": 1, "preview": 0, "logs": 0}
+    await realtime.close()
+
+
+def test_realtime_metrics_endpoints_describe_open_connections() -> None:
+    station, _ = _station()
+    realtime = Realtime(station)
+    app = FastAPI()
+    app.include_router(station_router)
+    app.state.station = station
+    app.state.realtime = realtime
+    app.dependency_overrides[_get_station] = lambda: station
+    app.dependency_overrides[_get_realtime] = lambda: realtime
+
+    with TestClient(app) as client, client.websocket_connect(f"/stations/{STATION.id}/ws") as websocket:
+        initial = websocket.receive_bytes()
+        diagnostics = client.get(f"/stations/{STATION.id}/diagnostics/realtime").json()
+        metrics = client.get(f"/stations/{STATION.id}/diagnostics/realtime/metrics")
+        missing = client.get(f"/stations/{UUID(int=0)}/diagnostics/realtime/metrics")
+
+    (connection,) = diagnostics["connections"]
+    assert connection["stream"] == "state"
+    assert connection["sent_bytes"] == len(initial)
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    labels = f'connection="{connection["id"]}",stream="state",client="{connection["client"]}"'
+    lines = metrics.text.splitlines()
+    assert "# TYPE vxl_realtime_send_seconds histogram" in lines
+    assert f"vxl_realtime_sent_bytes_total{{{labels}}} {len(initial)}" in lines
+    assert f'vxl_realtime_send_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"vxl_realtime_send_seconds_count{{{labels}}} 1" in lines
+    assert f"vxl_realtime_queue_depth{{{labels}}} 0" in lines
+    assert 'vxl_realtime_lagged_disconnects_total{stream="state"} 0' in lines
+    assert missing.status_code == 404
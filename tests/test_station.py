@@ -7,7 +7,7 @@ import pytest
 from vxl_records import VoxelRecords
 from vxlib.reactivity import Cell, Emitter, ReactiveQuery
 
-from rigup import DeviceInterface, DeviceProps
+from rigup import DeviceInterface, DeviceProps, PropertyModel
 from vxl import system as system_module
 from vxl._utils.files import load_yaml
 from vxl.instrument import (
@@ -233,3 +233,29 @@ async def test_close_failure_faults_station_and_retains_session_identity(station
     await instrument.preview.emit(("gfp", PreviewLayer.OVERVIEW, b"ignored"))
     assert len(delivered) == 1
     unsubscribe()
+
+
+async def test_device_property_bursts_reach_the_feed_coalesced(station_config: StationConfig) -> None:
+    instrument = FakeInstrument([])
+    instrument.device_interfaces = {"stage": DeviceInterface(uid="stage", type="axis", commands={}, properties={})}
+    instrument.device_props = {"stage": {"position_mm": PropertyModel(value=0.0)}}
+
+    def create(home: Path, records: VoxelRecords) -> Instrument:
+        del home, records
+        return cast("Instrument", instrument)
+
+    station = Station(station_config, instrument_factory=create, state_frame_s=0.02, state_rate_limits={})
+    _installed(station)
+    await station.open_session("instrument")
+
+    async with station.feed.connect() as connection:
+        for step in range(1, 51):
+            await instrument.device_props_updates.emit(("stage", {"position_mm": PropertyModel(value=step / 10)}))
+        update = await asyncio.wait_for(anext(connection), timeout=1)
+
+        assert update.session is not None
+        assert update.session.instrument.devices["stage"].props["position_mm"].value == 5.0
+        diagnostics = station.state_update_diagnostics().topics["stage/position_mm"]
+        assert (diagnostics.submitted, diagnostics.published, diagnostics.suppressed) == (50, 1, 49)
+
+    await station.close()
@@ -0,0 +1,75 @@
+"""Tests for frame-based coalescing of station state updates."""
+
+import asyncio
+
+import pytest
+
+from vxl.station import StateCoalescer
+
+
+async def test_repeated_keys_merge_into_one_frame_with_latest_values() -> None:
+    frames: list[dict[str, int]] = []
+    coalescer = StateCoalescer[int](frames.append, frame_s=0.02, rate_limits={})
+
+    for value in range(10):
+        coalescer.submit("stage/x", value)
+    coalescer.submit("laser/power", 5)
+    await asyncio.sleep(0.06)
+
+    assert frames == [{"stage/x": 9, "laser/power": 5}]
+    diagnostics = coalescer.diagnostics()
+    assert diagnostics.frames == 1
+    assert diagnostics.topics["stage/x"].submitted == 10
+    assert diagnostics.topics["stage/x"].published == 1
+    assert diagnostics.topics["stage/x"].suppressed == 9
+    assert diagnostics.topics["laser/power"].suppressed == 0
+    await coalescer.close()
+
+
+async def test_rate_limited_topics_publish_at_most_their_maximum_rate() -> None:
+    published: dict[str, list[int]] = {"stage/position_mm": [], "stage/temperature_c": [], "laser/power": []}
+
+    def drain(frame: dict[str, int]) -> None:
+        for topic, value in frame.items():
+            published[topic].append(value)
+
+    coalescer = StateCoalescer[int](
+        drain,
+        frame_s=0.01,
+        rate_limits={"*/position*": 20.0, "*/temperature*": 1.0},
+    )
+    for value in range(100):
+        for topic in published:
+            coalescer.submit(topic, value)
+        await asyncio.sleep(0.003)
+    await asyncio.sleep(0.1)
+
+    # Roughly 0.3 s of submissions plus the drain tail.
+    assert len(published["stage/temperature_c"]) == 1
+    assert 2 <= len(published["stage/position_mm"]) <= 9
+    assert len(published["laser/power"]) > len(published["stage/position_mm"])
+    # Whatever was suppressed, the latest value always lands.
+    assert all(values[-1] == 99 for topic, values in published.items() if topic != "stage/temperature_c")
+
+    diagnostics = coalescer.diagnostics()
+    position = diagnostics.topics["stage/position_mm"]
+    assert position.max_hz == 20.0
+    assert position.submitted == 100
+    assert position.published + position.suppressed == 100
+    assert diagnostics.topics["laser/power"].max_hz is None
+    assert diagnostics.topics["stage/temperature_c"].effective_hz <= 1.0
+    await coalescer.close()
+
+
+async def test_cancel_discards_pending_changes_and_close_is_final() -> None:
+    frames: list[dict[str, int]] = []
+    coalescer = StateCoalescer[int](frames.append, frame_s=0.01)
+
+    coalescer.submit("stage/x", 1)
+    coalescer.cancel()
+    await asyncio.sleep(0.03)
+    assert frames == []
+
+    await coalescer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        coalescer.submit("stage/x", 2)
@@ -15,6 +15,7 @@ from vxl.station import (
     StationState,
     StationStatus,
 )
+from vxl.station.patch import apply_patch
 from vxl.system import StationInfo
 
 STATION = StationInfo(id=UUID("12345678-1234-5678-1234-567812345678"), name="scope")
@@ -99,3 +100,30 @@ async def test_slow_connection_is_disconnected_without_affecting_other_consumers
         assert (await anext(current)).status is StationStatus.ACTIVE
         with pytest.raises(StationFeedLaggedError, match="fell behind"):
             await anext(slow)
+
+
+async def test_revision_patches_reproduce_each_view_from_the_previous() -> None:
+    state = Cell(StationState())
+    feed = StationFeed(STATION, state)
+
+    async with feed.connect() as connection:
+        await state.set(StationState(status=StationStatus.OPENING))
+        await state.set(StationState(status=StationStatus.ACTIVE, session=SESSION))
+        moved = SESSION.model_copy(update={"instrument": SESSION.instrument.model_copy(update={"fov": (2.0, 3.0)})})
+        await state.set(StationState(status=StationStatus.ACTIVE, session=moved))
+
+        document = connection.initial_revision.wire
+        revisions = connection.revisions()
+        paths: set[str] = set()
+        for _ in range(3):
+            revision = await anext(revisions)
+            assert revision.ops is not None
+            document = apply_patch(document, revision.ops)
+            assert document == revision.view.wire_dict()
+            paths = {op["path"] for op in revision.ops}
+
+    assert paths == {
+        "/cursor/seq",
+        "/observed_at_unix_us",
+        "/session/instrument/fov",
+    }
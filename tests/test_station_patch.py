@@ -0,0 +1,52 @@
+"""Tests for RFC 6902 station view patches."""
+
+import pytest
+
+from vxl.station.patch import apply_patch, diff
+
+
+def test_diff_emits_minimal_member_operations() -> None:
+    old = {"status": "idle", "devices": {"stage": {"x": 1.0, "y": 2.0}}, "error": None, "gone": 1}
+    new = {"status": "idle", "devices": {"stage": {"x": 1.5, "y": 2.0}, "laser": {"on": True}}, "error": None}
+
+    ops = diff(old, new)
+
+    assert ops == [
+        {"op": "remove", "path": "/gone"},
+        {"op": "replace", "path": "/devices/stage/x", "value": 1.5},
+        {"op": "add", "path": "/devices/laser", "value": {"on": True}},
+    ]
+    assert apply_patch(old, ops) == new
+    assert old["devices"]["stage"]["x"] == 1.0  # the base document is not mutated
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        ([1, 2, 3], [1, 2, 3, 4, 5]),
+        ([1, 2, 3, 4], [1, 2]),
+        ([1, 2, 3], [3, 2]),
+        ([{"a": 1}, {"a": 2}], [{"a": 1}, {"a": 3}]),
+        ([], [1]),
+    ],
+)
+def test_list_changes_round_trip(old: list[object], new: list[object]) -> None:
+    assert apply_patch({"items": old}, diff({"items": old}, {"items": new})) == {"items": new}
+
+
+def test_pointer_tokens_are_escaped_and_types_are_exact() -> None:
+    old = {"a/b": {"m~n": 1}, "flag": 1}
+    new = {"a/b": {"m~n": 2}, "flag": True}
+
+    ops = diff(old, new)
+
+    assert [op["path"] for op in ops] == ["/a~1b/m~0n", "/flag"]
+    assert apply_patch(old, ops) == new
+    assert apply_patch(old, ops)["flag"] is True
+
+
+def test_invalid_paths_are_rejected() -> None:
+    with pytest.raises(ValueError, match="does not exist"):
+        apply_patch({"a": {}}, [{"op": "replace", "path": "/missing/x", "value": 1}])
+    with pytest.raises(ValueError, match="out of range"):
+        apply_patch({"a": [1]}, [{"op": "replace", "path": "/a/3", "value": 1}])
@@ -0,0 +1,166 @@
+"""Revision-keyed response caching of the discovery, metadata schema and preset endpoints."""
+
+import asyncio
+import datetime
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from numcodecs import Zstd
+from vxl_records import PresetRecord
+
+from vxl import system as system_module
+from vxl.station import InstrumentTemplates, Station
+from vxl.system import StationConfig
+from vxl.web import router as router_module
+from vxl.web.cache import ResponseCache
+from vxl.web.router import station_router
+
+STATION_ID = UUID("12345678-1234-5678-1234-567812345678")
+
+
+@pytest.fixture
+def station(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Station:
+    monkeypatch.setattr(system_module, "_voxel_home", lambda: tmp_path / ".voxel")
+    return Station(StationConfig(id=STATION_ID, name="scope"))
+
+
+def _client(station: Station) -> TestClient:
+    app = FastAPI()
+    app.include_router(station_router)
+    app.state.station = station
+    app.state.instrument_templates = InstrumentTemplates()
+    app.state.response_cache = ResponseCache()
+    return TestClient(app)
+
+
+def _counting[**P, R](calls: list[str], fn: Callable[P, R]) -> Callable[P, R]:
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        calls.append(fn.__name__)
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def test_discovery_is_rendered_once_per_instruments_revision(monkeypatch: pytest.MonkeyPatch, station: Station) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(station, "discover_instruments", _counting(calls, station.discover_instruments))
+    url = f"/stations/{STATION_ID}/discovery"
+
+    with _client(station) as client:
+        first = client.get(url)
+        etag = first.headers["etag"]
+        unchanged = client.get(url, headers={"if-none-match": etag})
+        repeated = client.get(url)
+        assert len(calls) == 1
+
+        created = client.post(
+            f"/stations/{STATION_ID}/instruments", json={"template": "simulated-local", "name": "scope"}
+        )
+        stale = client.get(url, headers={"if-none-match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert repeated.content == first.content
+    assert created.status_code == 201
+    assert stale.status_code == 200
+    assert stale.headers["etag"] != etag
+    assert "scope" in stale.json()["instruments"]
+    assert len(calls) == 2
+
+
+def test_discovery_follows_instrument_files_edited_on_disk(station: Station) -> None:
+    url = f"/stations/{STATION_ID}/discovery"
+
+    with _client(station) as client:
+        client.post(f"/stations/{STATION_ID}/instruments", json={"template": "simulated-local", "name": "scope"})
+        first = client.get(url)
+        state = station.instruments_dir / "scope.voxel" / "state.json"
+        state.write_text("{")  # an edit made outside the station
+        edited = client.get(url, headers={"if-none-match": first.headers["etag"]})
+
+    assert first.json()["instruments"]["scope"]["violations"] == []
+    assert edited.status_code == 200
+    assert edited.json()["instruments"]["scope"]["violations"] != []
+
+
+def test_large_bodies_are_compressed_once_and_revalidate_across_codings(station: Station) -> None:
+    url = f"/stations/{STATION_ID}/discovery"
+
+    with _client(station) as client:
+        identity = client.get(url, headers={"accept-encoding": "identity"})
+        gzipped = client.get(url, headers={"accept-encoding": "gzip"})
+        zstd = client.get(url, headers={"accept-encoding": "gzip;q=0.5, zstd"})
+        revalidated = client.get(url, headers={"accept-encoding": "gzip", "if-none-match": f"W/{zstd.headers['etag']}"})
+
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.content == identity.content  # decoded by the client
+    assert zstd.headers["content-encoding"] == "zstd"
+    assert bytes(Zstd().decode(zstd.content)) == identity.content
+    assert len({identity.headers["etag"], gzipped.headers["etag"], zstd.headers["etag"]}) == 3
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == gzipped.headers["etag"]
+
+
+async def _create_preset(station: Station, name: str) -> PresetRecord:
+    return await station.records.presets.create(
+        PresetRecord(
+            id=uuid4(),
+            instrument="scope",
+            name=name,
+            created_at=datetime.datetime.now(tz=datetime.UTC),
+            value={},
+        )
+    )
+
+
+def test_preset_responses_follow_the_preset_revision(monkeypatch: pytest.MonkeyPatch, station: Station) -> None:
+    calls: list[str] = []
+    presets = station.records.presets
+    monkeypatch.setattr(presets, "list", _counting(calls, presets.list))
+    monkeypatch.setattr(presets, "get", _counting(calls, presets.get))
+    url = f"/stations/{STATION_ID}/instruments/scope/presets"
+
+    with _client(station) as client:
+        empty = client.get(url).json()
+        preset = asyncio.run(_create_preset(station, "first"))
+        listed = [client.get(url).json() for _ in range(3)]
+        fetched = [client.get(f"{url}/{preset.id}").status_code for _ in range(3)]
+        assert calls == ["list", "list", "get"]
+
+        deleted = client.delete(f"{url}/{preset.id}")
+        after = client.get(url).json()
+        missing = [client.get(f"{url}/{preset.id}").status_code for _ in range(2)]
+
+    assert empty == []
+    assert [[item["name"] for item in items] for items in listed] == [["first"]] * 3
+    assert fetched == [200] * 3
+    assert deleted.status_code == 204
+    assert after == []
+    assert missing == [404, 404]  # failures are not cached
+    assert calls == ["list", "list", "get", "get", "list", "get", "get"]
+
+
+def test_metadata_schema_is_rendered_once_per_target(monkeypatch: pytest.MonkeyPatch, station: Station) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(router_module, "resolve_metadata_class", _counting(calls, router_module.resolve_metadata_class))
+    url = f"/stations/{STATION_ID}/metadata/schema"
+
+    with _client(station) as client:
+        schemas: list[dict[str, Any]] = [
+            client.get(url, params={"target": "vxl.instrument.metadata.ExperimentMetadata"}).json() for _ in range(3)
+        ]
+        invalid = [client.get(url, params={"target": "vxl.instrument.metadata.Missing"}) for _ in range(2)]
+
+    assert schemas[0] == schemas[2]
+    assert schemas[0]["title"] == "ExperimentMetadata"
+    assert [response.status_code for response in invalid] == [400, 400]
+    assert len(calls) == 3
@@ -0,0 +1,168 @@
+"""MessagePack content negotiation on the instrument routes and the persistent-connection client."""
+
+import socket
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, cast
+from uuid import UUID
+
+import msgpack
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from rigup.wire import WireFormat
+
+from rigup import PropertyModel, PropResults, Result
+from vxl.instrument.config import ProfilePatch
+from vxl.web.client import InstrumentClient, InstrumentClientError
+from vxl.web.router import _get_instrument, api_router
+
+STATION_ID = UUID("12345678-1234-5678-1234-567812345678")
+SESSION_ID = UUID("87654321-4321-8765-4321-876543218765")
+PREFIX = f"/api/stations/{STATION_ID}/sessions/{SESSION_ID}/instrument"
+
+
+class FakeInstrument:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any]] = []
+
+    async def update_profile(self, patch: ProfilePatch) -> None:
+        self.calls.append(("update_profile", patch))
+
+    async def set_device_properties(self, device_id: str, properties: dict[str, Any]) -> PropResults:
+        if device_id != "stage-x":
+            raise KeyError(f"No device '{device_id}'")
+        self.calls.append(("set_device_properties", properties))
+        return PropResults(results={name: Result.ok(PropertyModel(value=value)) for name, value in properties.items()})
+
+
+def _app(instrument: FakeInstrument) -> FastAPI:
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+
+    async def fake_instrument() -> AsyncIterator[FakeInstrument]:
+        yield instrument
+
+    app.dependency_overrides[_get_instrument] = fake_instrument
+    return app
+
+
+def _packb(value: Any) -> bytes:
+    return cast("bytes", msgpack.packb(value))
+
+
+def test_msgpack_bodies_validate_like_json_and_responses_follow_accept() -> None:
+    instrument = FakeInstrument()
+    body = {"properties": {"position_mm": 1.5, "speed": 3}}
+
+    with TestClient(_app(instrument)) as client:
+        patched = client.patch(
+            f"{PREFIX}/profile",
+            content=_packb({"label": "fast", "z_step": 0.5}),
+            headers={"content-type": "application/msgpack"},
+        )
+        as_json = client.patch(f"{PREFIX}/devices/stage-x/properties", json=body)
+        as_msgpack = client.patch(
+            f"{PREFIX}/devices/stage-x/properties",
+            content=_packb(body),
+            headers={"content-type": "application/msgpack", "accept": "application/msgpack"},
+        )
+        invalid = client.patch(
+            f"{PREFIX}/profile", content=_packb({"z_step": -1}), headers={"content-type": "application/msgpack"}
+        )
+        corrupt = client.patch(f"{PREFIX}/profile", content=b"\xc1", headers={"content-type": "application/msgpack"})
+
+    assert patched.status_code == 204
+    assert instrument.calls[0] == ("update_profile", ProfilePatch(label="fast", z_step=0.5))
+    assert as_json.headers["content-type"] == "application/json"
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    assert instrument.calls[1] == instrument.calls[2] == ("set_device_properties", body["properties"])
+    assert invalid.status_code == 422
+    assert corrupt.status_code == 400
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[str, FakeInstrument]]:
+    instrument = FakeInstrument()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_app(instrument), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise TimeoutError("test server did not start")
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}", instrument
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.mark.parametrize("fmt", ["json", "msgpack"])
+def test_client_reuses_one_connection_for_every_call(server: tuple[str, FakeInstrument], fmt: WireFormat) -> None:
+    url, instrument = server
+
+    with InstrumentClient(url, STATION_ID, SESSION_ID, fmt=fmt) as client:
+        assert client.patch("/profile", {"label": "fast"}) is None
+        connection = client._connection
+        results = [client.patch("/devices/stage-x/properties", {"properties": {"speed": n}}) for n in range(5)]
+        with pytest.raises(InstrumentClientError) as missing:
+            client.patch("/devices/stage-y/properties", {"properties": {"speed": 1}})
+        assert client._connection is connection
+
+    assert [result["results"]["speed"]["value"]["value"] for result in results] == list(range(5))
+    assert missing.value.status == 404
+    assert missing.value.detail == "No device 'stage-y'"
+    assert len(instrument.calls) == 6
+
+
+class _DroppingServer:
+    """Answers the first request on each connection, then reads the next one and closes without replying,
+    the way a server that processed a request but died before answering looks to the client."""
+
+    def __init__(self) -> None:
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._listener.getsockname()[1]}"
+        self.requests: list[bytes] = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            with conn:
+                for answer in (True, False):
+                    request = conn.recv(65536)
+                    if not request:
+                        break
+                    self.requests.append(request.split(b" ", 1)[0])
+                    if answer:
+                        conn.sendall(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+
+    def close(self) -> None:
+        self._listener.close()
+
+
+@pytest.mark.parametrize(("method", "retried"), [("PATCH", False), ("POST", False), ("PUT", True), ("GET", True)])
+def test_only_idempotent_requests_are_resent_after_the_connection_drops(method: str, retried: bool) -> None:
+    server = _DroppingServer()
+    try:
+        with InstrumentClient(server.url, STATION_ID, SESSION_ID) as client:
+            assert client.get("/profile") is None
+            if retried:
+                assert client.request(cast("Any", method), "/profile") is None
+            else:
+                with pytest.raises(ConnectionError):
+                    client.request(cast("Any", method), "/profile")
+    finally:
+        server.close()
+
+    sent = [method.encode()] * (2 if retried else 1)
+    assert server.requests == [b"GET", *sent]